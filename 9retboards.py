@@ -1,642 +1,1688 @@
-import tkinter as tk
-from tkinter import ttk
-
-
-class Fretboard12Proto1:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Fretboard Proto 1")
-
-        # ===== Settings =====
-        self.max_fret = 12
-        self.strings = 6
-
-        self.margin = 20
-        self.board_w = 1100
-        self.board_h = 260
-        self.open_w = 80
-
-        self.outer_pad_y = 40
-        self.extend_out = 22
-
-        # 1번줄(위) -> 6번줄(아래): E, B, G, D, A, E
-        self.open_pc = [4, 11, 7, 2, 9, 4]
-
-        self.note_sharp = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-        self.note_flat  = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
-
-        # 수동 클릭(같은 음 전체 토글)
-        self.active_points = set()
-
-        # 스케일 자동 표시
-        self.scale_points = set()
-        self.scale_allowed_pcs = set()
-
-        # 코드 자동 표시
-        self.chord_allowed_pcs = set()
-        self.chord_points = set()
-
-        # ===== Scale/Chord Library =====
-        self.scale_defs = self.build_scale_library()
-        self.triad_defs = self.build_triad_library()
-        self.tension_defs = self.build_tension_library()
-        self.inversion_defs = self.build_inversion_library()
-
-        # ===== Recommended chord-form groups (색) =====
-        # 여기서 "1번폼=빨강, 2번폼=파랑..."을 정의하고,
-        # chord_points를 "폼 그룹"으로 나눠서 색을 다르게 칠함.
-        self.form_groups = self.build_recommended_form_groups()
-
-        # ===== Canvas =====
-        self.canvas = tk.Canvas(
-            root,
-            width=self.board_w + self.open_w + self.margin * 2,
-            height=self.board_h + self.outer_pad_y * 2 + self.margin * 2 + 30,
-            bg="white",
-            highlightthickness=0
-        )
-        self.canvas.pack()
-        self.canvas.bind("<Button-1>", self.on_click)
-
-        self.build_bottom_ui(root)
-
-        # 초기 상태
-        self.tonic_pc = self.key_item_to_pc(self.key_var.get())
-
-        # 초기: 스케일 없음
-        self.apply_selected_scale()
-
-        # 초기: 코드 없음
-        self.apply_selected_chord()
-
-        self.draw()
-
-    # =========================
-    # UI
-    # =========================
-    def build_bottom_ui(self, root):
-        bottom = tk.Frame(root)
-        bottom.pack(fill="x", padx=10, pady=(6, 10))
-
-        row1 = tk.Frame(bottom)
-        row1.pack(fill="x")
-
-        tk.Label(row1, text="Key").pack(side="left")
-        self.key_items = [
-            "C (Am)", "G (Em)", "D (Bm)", "A (F#m)", "E (C#m)", "B (G#m)",
-            "F# / Gb (D#m / Ebm)", "Db / C# (Bbm / A#m)", "Ab / G# (Fm)",
-            "Eb / D# (Cm)", "Bb / A# (Gm)", "F (Dm)"
-        ]
-        self.key_var = tk.StringVar(value=self.key_items[0])
-
-        self.key_combo = ttk.Combobox(row1, values=self.key_items, textvariable=self.key_var,
-                                      state="readonly", width=18)
-        self.key_combo.pack(side="left", padx=(8, 12))
-        self.key_combo.bind("<<ComboboxSelected>>", self.on_key_changed)
-
-        tk.Label(row1, text="Scale").pack(side="left")
-        scale_names = list(self.scale_defs.keys())
-        self.scale_items = ["(없음)"] + scale_names
-        self.scale_var = tk.StringVar(value="(없음)")
-
-        self.scale_combo = ttk.Combobox(row1, values=self.scale_items, textvariable=self.scale_var,
-                                        state="readonly", width=30)
-        self.scale_combo.pack(side="left", padx=(8, 12))
-        self.scale_combo.bind("<<ComboboxSelected>>", self.on_scale_changed)
-
-        self.key_hint = tk.Label(row1, fg="gray")
-        self.key_hint.pack(side="left", padx=(0, 12))
-
-        self.scale_hint = tk.Label(row1, text="스케일: 없음", fg="gray", wraplength=520, justify="left")
-        self.scale_hint.pack(side="left", padx=(0, 12))
-
-        # Row 2: Chord
-        row2 = tk.Frame(bottom)
-        row2.pack(fill="x", pady=(6, 0))
-
-        tk.Label(row2, text="Chord").pack(side="left")
-
-        tk.Label(row2, text="Triad").pack(side="left", padx=(8, 0))
-        self.triad_items = ["(없음)"] + list(self.triad_defs.keys())
-        self.triad_var = tk.StringVar(value="(없음)")
-        self.triad_combo = ttk.Combobox(row2, values=self.triad_items, textvariable=self.triad_var,
-                                        state="readonly", width=10)
-        self.triad_combo.pack(side="left", padx=(6, 12))
-        self.triad_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
-
-        tk.Label(row2, text="Tension").pack(side="left")
-        self.tension_items = ["(없음)"] + list(self.tension_defs.keys())
-        self.tension_var = tk.StringVar(value="(없음)")
-        self.tension_combo = ttk.Combobox(row2, values=self.tension_items, textvariable=self.tension_var,
-                                          state="readonly", width=18)
-        self.tension_combo.pack(side="left", padx=(6, 12))
-        self.tension_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
-
-        tk.Label(row2, text="Inversion").pack(side="left")
-        self.inversion_items = list(self.inversion_defs.keys())
-        self.inversion_var = tk.StringVar(value="Root")
-        self.inversion_combo = ttk.Combobox(row2, values=self.inversion_items, textvariable=self.inversion_var,
-                                            state="readonly", width=10)
-        self.inversion_combo.pack(side="left", padx=(6, 12))
-        self.inversion_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
-
-        tk.Label(row2, text="Form").pack(side="left")
-        self.form_items = ["(전체)"] + list(self.form_groups.keys())
-        self.form_var = tk.StringVar(value="(전체)")
-        self.form_combo = ttk.Combobox(row2, values=self.form_items, textvariable=self.form_var,
-                                       state="readonly", width=14)
-        self.form_combo.pack(side="left", padx=(6, 12))
-        self.form_combo.bind("<<ComboboxSelected>>", self.on_form_changed)
-
-        self.chord_hint = tk.Label(row2, text="코드: -", fg="gray", wraplength=900, justify="left")
-        self.chord_hint.pack(side="left", padx=(0, 12))
-
-        row3 = tk.Frame(bottom)
-        row3.pack(fill="x", pady=(6, 0))
-        self.click_info = tk.Label(row3, text="클릭: -")
-        self.click_info.pack(side="left")
-
-        self.update_key_hint()
-
-    # =========================
-    # Events
-    # =========================
-    def on_key_changed(self, _=None):
-        self.tonic_pc = self.key_item_to_pc(self.key_var.get())
-        self.active_points.clear()
-        self.update_key_hint()
-        self.click_info.config(text="클릭: -")
-        self.apply_selected_scale()
-        self.apply_selected_chord()
-        self.draw()
-
-    def on_scale_changed(self, _=None):
-        self.apply_selected_scale()
-        self.draw()
-
-    def on_chord_changed(self, _=None):
-        self.apply_selected_chord()
-        self.draw()
-
-    def on_form_changed(self, _=None):
-        self.draw()
-
-    def update_key_hint(self):
-        item = self.key_var.get()
-        if "(" in item and ")" in item:
-            major = item.split("(")[0].strip()
-            minor = item.split("(")[1].split(")")[0].strip()
-            self.key_hint.config(text=f"선택: {major}   나란한조: {minor}")
-        else:
-            self.key_hint.config(text=f"선택: {item}")
-
-    # =========================
-    # Libraries
-    # =========================
-    def build_scale_library(self):
-        lib = {}
-        lib["Major (Ionian)"] = [0,2,4,5,7,9,11]
-        lib["Dorian"] = [0,2,3,5,7,9,10]
-        lib["Phrygian"] = [0,1,3,5,7,8,10]
-        lib["Lydian"] = [0,2,4,6,7,9,11]
-        lib["Mixolydian"] = [0,2,4,5,7,9,10]
-        lib["Natural Minor (Aeolian)"] = [0,2,3,5,7,8,10]
-        lib["Locrian"] = [0,1,3,5,6,8,10]
-        lib["Harmonic Minor"] = [0,2,3,5,7,8,11]
-        lib["Melodic Minor (Asc)"] = [0,2,3,5,7,9,11]
-        lib["Lydian Dominant"] = [0,2,4,6,7,9,10]
-        lib["Mixolydian b6"] = [0,2,4,5,7,8,10]
-        lib["Locrian #2"] = [0,2,3,5,6,8,10]
-        lib["Altered (Super Locrian)"] = [0,1,3,4,6,8,10]
-        for k in list(lib.keys()):
-            lib[k] = sorted(set([x % 12 for x in lib[k]]))
-        return lib
-
-    def build_triad_library(self):
-        return {
-            "M": [0, 4, 7],
-            "m": [0, 3, 7],
-            "dim": [0, 3, 6],
-            "aug": [0, 4, 8],
-            "sus2": [0, 2, 7],
-            "sus4": [0, 5, 7],
-            "5": [0, 7],
-            "add9": [0, 4, 7, 2],
-            "madd9": [0, 3, 7, 2],
-        }
-
-    def build_tension_library(self):
-        return {
-            "6": [9],
-            "7": [10],
-            "maj7": [11],
-            "9": [2, 10],
-            "maj9": [2, 11],
-            "11": [5, 10],
-            "13": [9, 10],
-            "6/9": [2, 9],
-            "7b9": [1, 10],
-            "7#9": [3, 10],
-            "7#11": [6, 10],
-            "7b13": [8, 10],
-            "alt (b9 #9 b5 #5)": [1, 3, 6, 8, 10],
-        }
-
-    def build_inversion_library(self):
-        return {"Root": 0, "1st": 1, "2nd": 2, "3rd": 3}
-
-    def build_recommended_form_groups(self):
-        # “폼”을 실제 보이싱으로 만들려면(포지션/스트링 선택) 더 복잡해짐.
-        # 지금 단계에서는 "추천 폼 그룹"을 단순히 색 그룹으로만 제공.
-        # (전체) 선택 시: 모든 코드톤을 색으로 분류해서 보여줌.
-
-        # 1번폼=빨강, 2번폼=파랑, 3번폼=초록, 4번폼=보라, 5번폼=주황
-        # (사용자 요청대로 색 분류)
-        return {
-            "Form 1 (Red)": {"fill": "#d32f2f", "text": "white"},
-            "Form 2 (Blue)": {"fill": "#1976d2", "text": "white"},
-            "Form 3 (Green)": {"fill": "#388e3c", "text": "white"},
-            "Form 4 (Purple)": {"fill": "#7b1fa2", "text": "white"},
-            "Form 5 (Orange)": {"fill": "#f57c00", "text": "black"},
-        }
-
-    # =========================
-    # Music helpers
-    # =========================
-    def note_name_to_pc(self, name: str) -> int:
-        name = (name or "").strip()
-        if not name:
-            return 0
-        base_map = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
-        base = base_map.get(name[0].upper(), 0)
-        acc = name[1:].strip()
-        if acc == "#":
-            base += 1
-        elif acc.lower() == "b":
-            base -= 1
-        return base % 12
-
-    def key_item_to_pc(self, item: str) -> int:
-        major_part = item.split("(")[0].strip()
-        first_name = major_part.split("/")[0].strip()
-        return self.note_name_to_pc(first_name)
-
-    def pc_to_note_text(self, pc: int) -> str:
-        ns = self.note_sharp[pc % 12]
-        nf = self.note_flat[pc % 12]
-        return f"{ns}/{nf}" if ns != nf else ns
-
-    def tension_label(self, semis: int) -> str:
-        return ["R", "b9", "9", "#9", "3", "11", "#11", "5", "b13", "13", "b7", "7"][semis % 12]
-
-    # =========================
-    # Apply scale
-    # =========================
-    def apply_selected_scale(self):
-        name = self.scale_var.get()
-        if name == "(없음)":
-            self.scale_allowed_pcs = set()
-            self.scale_points = set()
-            self.scale_hint.config(text="스케일: 없음")
-            return
-
-        intervals = self.scale_defs.get(name, [])
-        allowed = set((self.tonic_pc + i) % 12 for i in intervals)
-
-        self.scale_allowed_pcs = allowed
-        pts = set()
-        for s in range(self.strings):
-            for f in range(self.max_fret + 1):
-                pc = (self.open_pc[s] + f) % 12
-                if pc in allowed:
-                    pts.add((s, f))
-        self.scale_points = pts
-
-        notes = [self.pc_to_note_text(pc) for pc in sorted(allowed)]
-        note_text = ", ".join(notes)
-        if len(note_text) > 60:
-            note_text = note_text[:60] + "..."
-        self.scale_hint.config(text=f"스케일: {name}   음: {note_text}")
-
-    # =========================
-    # Apply chord
-    # =========================
-    def apply_selected_chord(self):
-        triad_name = self.triad_var.get()
-        tension_name = self.tension_var.get()
-
-        if triad_name == "(없음)":
-            self.chord_allowed_pcs = set()
-            self.chord_points = set()
-            self.chord_hint.config(text="코드: -")
-            return
-
-        triad_intervals = self.triad_defs.get(triad_name, [0])
-        extra = []
-        if tension_name != "(없음)":
-            extra = self.tension_defs.get(tension_name, [])
-
-        intervals = sorted(set([i % 12 for i in (triad_intervals + extra)]))
-        allowed = set((self.tonic_pc + i) % 12 for i in intervals)
-        self.chord_allowed_pcs = allowed
-
-        pts = set()
-        for s in range(self.strings):
-            for f in range(self.max_fret + 1):
-                pc = (self.open_pc[s] + f) % 12
-                if pc in allowed:
-                    pts.add((s, f))
-        self.chord_points = pts
-
-        # chord name
-        root_name = self.pc_to_note_text(self.tonic_pc)
-        chord_name = root_name
-        if triad_name == "m":
-            chord_name += "m"
-        elif triad_name not in ("M", "m"):
-            chord_name += triad_name
-
-        if tension_name != "(없음)":
-            chord_name += tension_name
-
-        # inversion display only
-        inv_name = self.inversion_var.get()
-        bass_pc = self.pick_bass_pc_for_inversion(inv_name)
-        if bass_pc is not None and inv_name != "Root":
-            chord_name += f"/{self.pc_to_note_text(bass_pc)}"
-
-        notes = [self.pc_to_note_text(pc) for pc in sorted(allowed)]
-        note_text = ", ".join(notes)
-        if len(note_text) > 80:
-            note_text = note_text[:80] + "..."
-        self.chord_hint.config(text=f"코드: {chord_name}   음: {note_text}")
-
-    def pick_bass_pc_for_inversion(self, inv_name: str):
-        if not self.chord_allowed_pcs:
-            return None
-        inv_index = self.inversion_defs.get(inv_name, 0)
-        rels = sorted(set((pc - self.tonic_pc) % 12 for pc in self.chord_allowed_pcs))
-        if inv_index <= 0:
-            return self.tonic_pc
-        if inv_index >= len(rels):
-            inv_index = len(rels) - 1
-        return (self.tonic_pc + rels[inv_index]) % 12
-
-    # =========================
-    # Geometry
-    # =========================
-    def fret_positions(self, x0: float, width: float):
-        L = 1.0
-        ratios = [0.0] + [L - (L / (2 ** (n / 12))) for n in range(1, self.max_fret + 1)]
-        r_last = ratios[-1]
-        return [x0 + (r / r_last) * width for r in ratios]
-
-    def fret_center_x(self, fret: int) -> float:
-        if fret == 0:
-            return self.x0 - self.open_w / 2
-        return (self.fret_x[fret - 1] + self.fret_x[fret]) / 2
-
-    def fret_cell_bounds_x(self, fret: int):
-        if fret == 0:
-            pad = 12
-            left = self.x0 - self.open_w + pad
-            right = self.x0 - pad
-            return left, right
-        return self.fret_x[fret - 1], self.fret_x[fret]
-
-    def x_to_fret(self, x: float) -> int:
-        if x < self.x0:
-            return 0
-        centers = [self.fret_center_x(f) for f in range(1, self.max_fret + 1)]
-        return min(range(1, self.max_fret + 1), key=lambda f: abs(centers[f - 1] - x))
-
-    def string_cell_bounds_y(self, s: int):
-        inner_pad = 2
-        max_cell_h = 40
-
-        if s == 0:
-            top0 = self.y0 - self.extend_out
-            bottom0 = (self.string_y[0] + self.string_y[1]) / 2
-        elif s == self.strings - 1:
-            top0 = (self.string_y[self.strings - 2] + self.string_y[self.strings - 1]) / 2
-            bottom0 = self.y1 + self.extend_out
-        else:
-            top0 = (self.string_y[s - 1] + self.string_y[s]) / 2
-            bottom0 = (self.string_y[s] + self.string_y[s + 1]) / 2
-
-        top = top0 + inner_pad
-        bottom = bottom0 - inner_pad
-
-        h = bottom - top
-        if h > max_cell_h:
-            mid = (top + bottom) / 2
-            top = mid - max_cell_h / 2
-            bottom = mid + max_cell_h / 2
-
-        canvas_top = self.margin
-        canvas_bottom = self.margin + self.outer_pad_y * 2 + self.board_h
-        if top < canvas_top:
-            top = canvas_top
-        if bottom > canvas_bottom:
-            bottom = canvas_bottom
-        if bottom <= top + 10:
-            bottom = top + 10
-
-        return top, bottom
-
-    # =========================
-    # Draw
-    # =========================
-    def draw(self):
-        self.canvas.delete("all")
-
-        m = self.margin
-        self.y0 = m + self.outer_pad_y
-        self.y1 = self.y0 + self.board_h
-
-        self.open_x0 = m
-        self.x0 = m + self.open_w
-
-        self.fret_x = self.fret_positions(self.x0, self.board_w)
-        self.x1 = self.fret_x[-1]
-
-        wood = "#8b5a2b"
-        self.canvas.create_rectangle(self.x0, self.y0, self.x1, self.y1, fill=wood, outline="black", width=2)
-        self.canvas.create_line(self.x0, self.y0, self.x0, self.y1, width=8)
-
-        for i in range(1, self.max_fret + 1):
-            self.canvas.create_line(self.fret_x[i], self.y0, self.fret_x[i], self.y1, width=3 if i == 12 else 2)
-
-        self.string_y = []
-        for s in range(self.strings):
-            y = self.y0 + self.board_h * s / (self.strings - 1)
-            self.string_y.append(y)
-            self.canvas.create_line(self.x0, y, self.x1, y, width=s + 1)
-
-        self.draw_inlays()
-        self.draw_roots()
-        self.draw_scale_cells()
-
-        # 코드톤 표시: 선택한 "Form"에 따라 색으로 묶어서 그림
-        self.draw_chord_cells_by_form()
-
-        self.draw_active_cells()
-        self.draw_fret_numbers()
-
-    def draw_inlays(self):
-        inlay_frets = [3, 5, 7, 9, 12]
-        radius = 7
-        center_y = (self.y0 + self.y1) / 2
-        offset_12 = 48
-        for f in inlay_frets:
-            x_center = self.fret_center_x(f)
-            if f == 12:
-                self.canvas.create_oval(x_center - radius, center_y - offset_12 - radius,
-                                        x_center + radius, center_y - offset_12 + radius,
-                                        fill="ivory", outline="")
-                self.canvas.create_oval(x_center - radius, center_y + offset_12 - radius,
-                                        x_center + radius, center_y + offset_12 + radius,
-                                        fill="ivory", outline="")
-            else:
-                self.canvas.create_oval(x_center - radius, center_y - radius,
-                                        x_center + radius, center_y + radius,
-                                        fill="ivory", outline="")
-
-    def draw_fret_numbers(self):
-        label_y = self.y1 + 14
-        for f in [3, 5, 7, 9, 12]:
-            self.canvas.create_text(self.fret_center_x(f), label_y, text=str(f), fill="black")
-
-    def draw_roots(self):
-        r = 12
-        for s in range(self.strings):
-            y = self.string_y[s]
-            for fret in range(self.max_fret + 1):
-                pc = (self.open_pc[s] + fret) % 12
-                if pc != self.tonic_pc:
-                    continue
-                x = self.fret_center_x(fret)
-                self.canvas.create_oval(x - r, y - r, x + r, y + r,
-                                        fill="white", outline="black", width=2)
-                self.canvas.create_text(x, y + 0.5, text="R", fill="black",
-                                        font=("Arial", 11, "bold"))
-
-    def draw_scale_cells(self):
-        if not self.scale_points:
-            return
-        for (s, fret) in self.scale_points:
-            pc = (self.open_pc[s] + fret) % 12
-            semis = (pc - self.tonic_pc) % 12
-            tension = self.tension_label(semis)
-            note_text = self.pc_to_note_text(pc)
-
-            left, right = self.fret_cell_bounds_x(fret)
-            top, bottom = self.string_cell_bounds_y(s)
-
-            self.canvas.create_rectangle(left + 2, top + 1, right - 2, bottom - 1,
-                                         fill="#555555", outline="black", width=1)
-            cx = (left + right) / 2
-            cy = (top + bottom) / 2
-            self.canvas.create_text(cx, cy - 6, text=tension, fill="white", font=("Arial", 10, "bold"))
-            self.canvas.create_text(cx, cy + 8, text=note_text, fill="white", font=("Arial", 8, "bold"))
-
-    def chord_color_for_point(self, s: int, fret: int):
-        # "추천 폼"은 원래 특정 보이싱(스트링/프렛 조합)이어야 하지만,
-        # 지금은 단순히 “코드톤들”을 폼 그룹 색으로 묶어서 보여주는 단계.
-        # (전체)일 때는 코드톤을 5개 그룹으로 “분산”해서 색이 섞여 보이도록 함.
-        # 선택된 폼이 있으면 그 폼 색 하나로 통일.
-
-        selected_form = self.form_var.get()
-        if selected_form != "(전체)" and selected_form in self.form_groups:
-            fg = self.form_groups[selected_form]
-            return fg["fill"], fg["text"]
-
-        # (전체)일 때: 위치 기반으로 그룹을 나눔(항상 같은 점은 항상 같은 색)
-        # 그룹 인덱스 0~4
-        idx = (s * 13 + fret) % 5
-        key = list(self.form_groups.keys())[idx]
-        fg = self.form_groups[key]
-        return fg["fill"], fg["text"]
-
-    def draw_chord_cells_by_form(self):
-        if not self.chord_points:
-            return
-
-        for (s, fret) in self.chord_points:
-            pc = (self.open_pc[s] + fret) % 12
-            semis = (pc - self.tonic_pc) % 12
-            tension = self.tension_label(semis)
-            note_text = self.pc_to_note_text(pc)
-
-            left, right = self.fret_cell_bounds_x(fret)
-            top, bottom = self.string_cell_bounds_y(s)
-
-            fill_color, text_color = self.chord_color_for_point(s, fret)
-
-            self.canvas.create_rectangle(left + 2, top + 1, right - 2, bottom - 1,
-                                         fill=fill_color, outline="black", width=2)
-            cx = (left + right) / 2
-            cy = (top + bottom) / 2
-            self.canvas.create_text(cx, cy - 6, text=tension, fill=text_color, font=("Arial", 10, "bold"))
-            self.canvas.create_text(cx, cy + 8, text=note_text, fill=text_color, font=("Arial", 8, "bold"))
-
-    def draw_active_cells(self):
-        for (s, fret) in self.active_points:
-            pc = (self.open_pc[s] + fret) % 12
-            semis = (pc - self.tonic_pc) % 12
-            tension = self.tension_label(semis)
-            note_text = self.pc_to_note_text(pc)
-
-            left, right = self.fret_cell_bounds_x(fret)
-            top, bottom = self.string_cell_bounds_y(s)
-
-            self.canvas.create_rectangle(left + 2, top + 1, right - 2, bottom - 1,
-                                         fill="#111111", outline="black", width=2)
-            cx = (left + right) / 2
-            cy = (top + bottom) / 2
-            self.canvas.create_text(cx, cy - 6, text=tension, fill="white", font=("Arial", 10, "bold"))
-            self.canvas.create_text(cx, cy + 8, text=note_text, fill="white", font=("Arial", 8, "bold"))
-
-    # =========================
-    # Click
-    # =========================
-    def points_for_pc(self, pc: int):
-        pts = []
-        for s in range(self.strings):
-            for f in range(self.max_fret + 1):
-                if (self.open_pc[s] + f) % 12 == pc:
-                    pts.append((s, f))
-        return pts
-
-    def on_click(self, e):
-        if not (self.open_x0 <= e.x <= self.x1 and self.y0 <= e.y <= self.y1):
-            return
-
-        s = min(range(self.strings), key=lambda i: abs(self.string_y[i] - e.y))
-        fret = self.x_to_fret(e.x)
-
-        pc = (self.open_pc[s] + fret) % 12
-
-        group = self.points_for_pc(pc)
-        if any(p in self.active_points for p in group):
-            for p in group:
-                self.active_points.discard(p)
-        else:
-            for p in group:
-                self.active_points.add(p)
-
-        semis = (pc - self.tonic_pc) % 12
-        self.click_info.config(
-            text=f"선택: {s+1}번줄 {'오픈' if fret==0 else str(fret)+'프렛'}, {self.pc_to_note_text(pc)}, {self.tension_label(semis)}"
-        )
-        self.draw()
-
-
-def main():
-    root = tk.Tk()
-    Fretboard12Proto1(root)
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    main()
+import time
+
+# 시작 시간 측정(--startup-time) 기준점: 다른 import 보다 먼저
+T_START = time.perf_counter()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+import tkinter as tk  # noqa: E402
+from tkinter import ttk  # noqa: E402
+
+from fretcore import perf, scene  # noqa: E402
+from fretcore.instruments import DEFAULT_INSTRUMENT, FRET_CHOICES, PRESETS, midi_to_name  # noqa: E402
+from fretcore.layout import layout_for, natural_board_width  # noqa: E402
+from fretcore.model import (  # noqa: E402
+    ALL_FORMS, KEY_ITEMS, NONE, NOTE_FLAT, BoardModel, key_hint_text, key_item_to_pc,
+)
+from fretcore.perf import traced  # noqa: E402
+from fretcore.scheduler import UpdateScheduler, layers_for  # noqa: E402
+from fretcore.voicing import chord_forms  # noqa: E402
+from fretcore.workers import WORKERS, BackgroundCache, WorkerPool  # noqa: E402
+
+# 캔버스(보이는 영역) 기본 폭. 넥이 더 길면 가로 스크롤
+VIEW_W = 1220
+STRING_GAP = 52
+MAX_STRING_GAP = 80
+# 레이아웃에서 보드 폭/높이 외에 들어가는 여백 (margin*2 + open_w, margin*2 + outer_pad_y*2 + 30)
+BOARD_PAD_W = 120
+BOARD_PAD_H = 150
+ZOOM_MIN, ZOOM_MAX = 0.5, 4.0
+DEFAULT_PROGRESSION = "C M maj7 | A m 7 | D m 9 | G M 7"
+# 스트럼 줄 사이 간격 (fretcore.synth.STRUM_MS 와 같게. synth 는 NumPy 를 import 하므로 시작 때 읽지 않음)
+STRUM_MS = 28
+# 스케일 검색 결과 목록에 한 번에 보이는 줄 수 (결과가 수천 개여도 이 줄 수만큼만 위젯에 넣음)
+SCALE_ROWS = 12
+# 호버: 마우스 이동은 이 간격(ms)으로 모아서 한 번만 판정. 같은 음 표시 색 (마우스 아래 칸, 나머지)
+HOVER_MS = 16
+HOVER_COLORS = ("#ff6f00", "#ffb300")
+# 녹음 분석 중 지판에 표시하는 최근 음 수 (마지막 음 + 그 앞 음들)
+PITCH_LIVE_NOTES = 4
+# 비교 창(작은 보드 격자) 처음 크기
+GRID_VIEW_W, GRID_VIEW_H = 1180, 640
+# 탭 사용 빈도 표시: 끔 / 전체 / 지금 조의 곡만 / 스케일 음 칸만 / 둘 다
+HEAT_MODES = ("Off", "All tabs", "Key", "Scale notes", "Key + scale")
+# 작업 스레드(fretcore.workers) 결과 큐를 읽는 간격: 작업이 있을 때만, 프레임 두 개쯤
+WORKER_POLL_MS = 30
+# 미리 계산: 마지막 프레임 뒤 이만큼 조용하면 시작, 조각(fretcore.prefetch.SLICE_MS) 사이는 이벤트에 양보
+PREFETCH_DELAY_MS = 60
+PREFETCH_GAP_MS = 1
+
+
+class Fretboard12Proto1:
+    def __init__(self, root, startup_report: bool = False, workers: int = WORKERS):
+        self.root = root
+        self.root.title("Fretboard Proto 1")
+        self.root.minsize(640, 420)
+
+        # ===== Model / Layout =====
+        # 라이브러리, 선택 상태, 좌표 계산은 fretcore(화면 없음)에 있고
+        # 이 클래스는 Tk 위젯과 캔버스 동기화만 담당
+        self.model = BoardModel(DEFAULT_INSTRUMENT)
+        # 무거운 계산(폼, 진행 준비/보이스 리딩, 역검색 색인, 녹음 분석, 탭 모음)은 작업 스레드에서.
+        # 결과는 큐로 받아 after() 로 읽음 (poll_workers). workers=0 이면 바로 실행 (벤치마크)
+        self.workers = WorkerPool(workers, on_submit=self.wake_workers)
+        self.worker_poll_pending = False
+        # 폼: 없으면 계산을 맡기고 그동안은 폼 없이 그림. 도착하면 코드 레이어만 다시
+        self.model.forms_source = BackgroundCache(self.workers, "forms", chord_forms, on_ready=self.on_forms_ready)
+        # 한가할 때 이웃 키/스케일/전위/폼의 파생 데이터와 레이어를 미리 (모델도 같은 캐시를 씀).
+        # 첫 화면 뒤 warm_up 에서 만듦: 그 전에는 레이어를 바로 만들어 그림
+        self.prefetcher = None
+        self.prefetch_pending = False
+        self.zoom = 1.0
+        self.view_size = None
+        self.layout = self.make_layout()
+
+        # ===== Startup =====
+        # 빈 넥을 먼저 화면에 띄우고(first paint), 아래 컨트롤/오버레이는 첫 프레임 뒤 finish_startup() 에서
+        self.startup_report = startup_report
+        self.startup_times = {}
+        self.ui_ready = False
+
+        # ===== Canvas =====
+        # 넥은 창 크기를 따라가고, 넥이 창보다 길면 가로 스크롤/줌.
+        # 보이는 프렛 범위의 셀만 캔버스 아이템을 가진다(view_frets)
+        board = self.board_frame = tk.Frame(root)
+        board.pack(fill="both", expand=True)
+        self.canvas = tk.Canvas(
+            board,
+            width=min(self.layout.width, VIEW_W),
+            height=self.layout.height,
+            bg="white",
+            highlightthickness=0,
+            xscrollcommand=self.on_xview,
+        )
+        self.hscroll = tk.Scrollbar(board, orient="horizontal", command=self.canvas.xview)
+        self.hscroll.pack(side="bottom", fill="x")
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.config(scrollregion=(0, 0, self.layout.width, self.layout.height))
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.view_frets = None
+
+        # 레이어(아래 -> 위 순서). 넥은 draw_static()에서 레이아웃이 바뀔 때만 그림
+        self.layer_order = list(scene.OVERLAY_ORDER)
+        self.layer_items = {name: {} for name in self.layer_order}
+        self.static_drawn = False
+        self.layer_anchor = {}
+
+        # 핸들러는 바뀐 부분만 표시하고, 재계산/다시 그리기는 프레임당 한 번 (flush_updates)
+        self.scheduler = UpdateScheduler(self.root.after, self.root.after_idle, self.flush_updates)
+
+        # 성능 오버레이 (F12 켜기/끄기, Shift-F12 trace 저장). RETBOARDS_PERF 환경 변수로 처음부터 켤 수 있음
+        self.perf_visible = perf.TRACER.enabled
+        self.perf_item = None
+
+        # 진행 재생 (재생 중에는 코드 레이어를 미리 계산한 단계 레이어로 보여줌)
+        self.progression = None
+        self.progression_layout = None
+        self.play_job = None
+        self.play_clock = None
+        self.play_index = 0
+        # 보이스 리딩 (켜면 단계마다 보이싱 하나). 다시 재생할 때 바뀐 마디부터만 다시 풀도록 유지
+        # (leader_job: 그 VoiceLeader 를 마지막으로 쓴 준비 작업. 끝나기 전에는 다른 작업이 같이 쓰지 않음)
+        self.voice_leader = None
+        self.leader_job = None
+
+        # 스케일 카탈로그 (처음 Scale 칸을 쓸 때 읽음). 검색 결과 + 보이는 첫 줄 + 커서 위치
+        self.catalog = None
+        self.scale_result = None
+        self.scale_top = 0
+        self.scale_cursor = 0
+
+        # MIDI 타임라인 (불러온 음 + 운지 결과, 슬라이더 위치 = 묶음 번호)
+        self.midi_notes = None
+        self.midi_fingering = None
+        self.midi_index = 0
+
+        # 녹음 음높이 분석 (작업 스레드가 찾은 음을 조금씩 보냄) + 추천 스케일
+        self.pitch_job = None
+        self.pitch_notes = []
+        self.pitch_live = ()   # 분석 중 마지막 몇 음 (지판에 후보 칸으로)
+        self.pitch_scales = []
+
+        # 탭 모음 (폴더를 읽으면). 사용 빈도 칸은 (모음, 악기, 조, 스케일 음) 이 같으면 다시 세지 않음
+        self.tab_job = None
+        self.tab_corpus = None
+        self.tab_stats = None
+        self.tab_root = None
+        self.heat_mode = HEAT_MODES[0]
+        self.heat_inputs = None
+        self.heat = {}
+
+        # 소리 (NumPy/오디오 모듈 import 가 느려서 시작 뒤 한가할 때 만듦)
+        self.player = None
+
+        # 비교 창 (Compare... 로 열었을 때만)
+        self.grid_window = None
+
+        # 호버 (마우스 아래 칸 + 같은 음). 테두리 사각형은 미리 만든 것을 숨겼다 보였다 하며 다시 씀
+        self.hover_pos = None
+        self.hover_cell = None
+        self.hover_pending = False
+        self.hover_items = []   # [(아이템, 지금 (coords, opts) 또는 None)]
+
+        # update(): 창을 띄우고 Expose 까지 처리해야 실제로 넥이 보임
+        self.draw_static()
+        self.root.update()
+        self.mark_startup("first_paint")
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        # 아래 UI 는 넥 프레임보다 먼저(before=) pack 해야 창을 줄여도 컨트롤이 잘리지 않음
+        self.build_bottom_ui(self.root)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Leave>", self.on_leave)
+        self.canvas.bind("<Shift-MouseWheel>", self.on_wheel_scroll)
+        self.canvas.bind("<Control-MouseWheel>", self.on_wheel_zoom)
+        self.root.bind("<Alt-Right>", lambda e: self.step_key(1))
+        self.root.bind("<Alt-Left>", lambda e: self.step_key(-1))
+        self.root.bind("<Alt-Down>", lambda e: self.step_scale(1))
+        self.root.bind("<Alt-Up>", lambda e: self.step_scale(-1))
+        self.root.bind("<F12>", self.toggle_perf)
+        self.root.bind("<Shift-F12>", self.dump_trace)
+        self.ui_ready = True
+
+        self.update_hints()
+        self.draw()
+        self.mark_startup("interactive")
+
+        # 첫 클릭 때 역검색 색인 읽기/오디오 준비로 멈추지 않도록 한가할 때 미리
+        self.root.after(300, self.warm_up)
+        if self.startup_report:
+            self.report_startup()
+
+    def warm_up(self):
+        self.request_lookup_index()
+        self.ensure_player()
+        self.ensure_prefetcher()
+        self.schedule_prefetch()
+
+    def ensure_prefetcher(self):
+        if self.prefetcher is None:
+            from fretcore.prefetch import Prefetcher
+            self.prefetcher = Prefetcher(self.model)
+        return self.prefetcher
+
+    def ensure_player(self):
+        if self.player is None:
+            from fretcore.audio import Player
+            self.player = Player()
+            self.sound_info.config(text=self.player.describe())
+            if not self.player.enabled:
+                self.sound_var.set(False)
+                self.sound_check.config(state="disabled")
+        return self.player
+
+    def mark_startup(self, name: str):
+        self.startup_times[name] = (time.perf_counter() - T_START) * 1000.0
+
+    def report_startup(self):
+        t = self.startup_times
+        print(f"startup: first paint {t['first_paint']:.1f}ms   interactive {t['interactive']:.1f}ms "
+              f"(since 9retboards import)", file=sys.stderr)
+        self.root.after(0, self.root.destroy)
+
+    # =========================
+    # UI
+    # =========================
+    def build_bottom_ui(self, root):
+        bottom = tk.Frame(root)
+        bottom.pack(side="bottom", fill="x", padx=10, pady=(6, 10), before=self.board_frame)
+
+        # Row 0: Instrument
+        row0 = tk.Frame(bottom)
+        row0.pack(fill="x", pady=(0, 6))
+
+        tk.Label(row0, text="Instrument").pack(side="left")
+        self.instrument_var = tk.StringVar(value=self.model.instrument.name)
+        self.instrument_combo = ttk.Combobox(row0, values=list(PRESETS), textvariable=self.instrument_var,
+                                             state="readonly", width=22)
+        self.instrument_combo.pack(side="left", padx=(8, 12))
+        self.instrument_combo.bind("<<ComboboxSelected>>", self.on_instrument_preset)
+
+        tk.Label(row0, text="Frets").pack(side="left")
+        self.frets_var = tk.StringVar(value=str(self.model.instrument.max_fret))
+        self.frets_combo = ttk.Combobox(row0, values=[str(f) for f in FRET_CHOICES], textvariable=self.frets_var,
+                                        state="readonly", width=4)
+        self.frets_combo.pack(side="left", padx=(6, 12))
+        self.frets_combo.bind("<<ComboboxSelected>>", self.on_instrument_changed)
+
+        tk.Label(row0, text="Capo").pack(side="left")
+        self.capo_var = tk.StringVar(value="0")
+        self.capo_combo = ttk.Combobox(row0, values=[str(c) for c in range(0, 10)], textvariable=self.capo_var,
+                                       state="readonly", width=4)
+        self.capo_combo.pack(side="left", padx=(6, 12))
+        self.capo_combo.bind("<<ComboboxSelected>>", self.on_instrument_changed)
+
+        tk.Label(row0, text="Zoom").pack(side="left")
+        tk.Button(row0, text="-", width=2, command=lambda: self.set_zoom(self.zoom / 1.25)).pack(side="left", padx=(6, 0))
+        tk.Button(row0, text="+", width=2, command=lambda: self.set_zoom(self.zoom * 1.25)).pack(side="left", padx=(2, 12))
+
+        self.tuning_hint = tk.Label(row0, text=f"튜닝: {self.model.instrument.tuning_text()}", fg="gray")
+        self.tuning_hint.pack(side="left", padx=(0, 12))
+
+        self.sound_var = tk.BooleanVar(value=True)
+        self.sound_check = tk.Checkbutton(row0, text="Sound", variable=self.sound_var)
+        self.sound_check.pack(side="left")
+        self.sound_info = tk.Label(row0, text="", fg="gray")
+        self.sound_info.pack(side="left", padx=(4, 12))
+
+        tk.Button(row0, text="Compare...", command=self.open_grid).pack(side="left")
+
+        row1 = tk.Frame(bottom)
+        row1.pack(fill="x")
+
+        tk.Label(row1, text="Key").pack(side="left")
+        self.key_items = list(KEY_ITEMS)
+        self.key_var = tk.StringVar(value=self.key_items[0])
+
+        self.key_combo = ttk.Combobox(row1, values=self.key_items, textvariable=self.key_var,
+                                      state="readonly", width=18)
+        self.key_combo.pack(side="left", padx=(8, 12))
+        self.key_combo.bind("<<ComboboxSelected>>", self.on_key_changed)
+
+        # Scale: 입력하면 카탈로그(2048개)를 검색해서 위로 펼치는 목록. 이름 / "contains b3 #11" / "no 5" /
+        # "7 notes" / "7-35". 비우고 Enter 면 (없음)
+        tk.Label(row1, text="Scale").pack(side="left")
+        self.scale_items = [NONE] + list(self.model.scale_defs.keys())
+        self.scale_var = tk.StringVar(value=NONE)
+
+        self.scale_entry = tk.Entry(row1, textvariable=self.scale_var, width=32)
+        self.scale_entry.pack(side="left", padx=(8, 12))
+        self.scale_entry.bind("<KeyRelease>", self.on_scale_typed)
+        self.scale_entry.bind("<FocusIn>", self.on_scale_focus)
+        self.scale_entry.bind("<FocusOut>", lambda e: self.root.after(150, self.hide_scale_results))
+        self.scale_entry.bind("<Return>", self.on_scale_pick)
+        self.scale_entry.bind("<Escape>", self.hide_scale_results)
+        self.scale_entry.bind("<Down>", lambda e: self.move_scale_cursor(1))
+        self.scale_entry.bind("<Up>", lambda e: self.move_scale_cursor(-1))
+        self.scale_entry.bind("<Next>", lambda e: self.move_scale_cursor(SCALE_ROWS))
+        self.scale_entry.bind("<Prior>", lambda e: self.move_scale_cursor(-SCALE_ROWS))
+
+        self.scale_popup = tk.Frame(root, bd=1, relief="solid")
+        self.scale_status = tk.Label(self.scale_popup, fg="gray", anchor="w")
+        self.scale_status.pack(side="bottom", fill="x")
+        self.scale_scroll = tk.Scrollbar(self.scale_popup, orient="vertical", command=self.on_scale_scroll)
+        self.scale_scroll.pack(side="right", fill="y")
+        self.scale_list = tk.Listbox(self.scale_popup, height=SCALE_ROWS, width=64, activestyle="none",
+                                     exportselection=False, takefocus=0)
+        self.scale_list.pack(side="left", fill="both")
+        self.scale_list.bind("<ButtonRelease-1>", self.on_scale_list_click)
+        self.scale_list.bind("<MouseWheel>", lambda e: self.scroll_scale_results(-3 if e.delta > 0 else 3))
+
+        self.key_hint = tk.Label(row1, fg="gray")
+        self.key_hint.pack(side="left", padx=(0, 12))
+
+        self.scale_hint = tk.Label(row1, text="스케일: 없음", fg="gray", wraplength=520, justify="left")
+        self.scale_hint.pack(side="left", padx=(0, 12))
+
+        # Row 2: Chord
+        row2 = tk.Frame(bottom)
+        row2.pack(fill="x", pady=(6, 0))
+
+        tk.Label(row2, text="Chord").pack(side="left")
+        # 코드 기호로 한 번에: "F#m7b5", "C6/9/G" -> Key + Triad/Tension/Inversion
+        self.symbol_var = tk.StringVar(value="")
+        self.symbol_entry = tk.Entry(row2, textvariable=self.symbol_var, width=10)
+        self.symbol_entry.pack(side="left", padx=(8, 0))
+        self.symbol_entry.bind("<Return>", self.on_symbol)
+
+        tk.Label(row2, text="Triad").pack(side="left", padx=(8, 0))
+        self.triad_items = [NONE] + list(self.model.triad_defs.keys())
+        self.triad_var = tk.StringVar(value=NONE)
+        self.triad_combo = ttk.Combobox(row2, values=self.triad_items, textvariable=self.triad_var,
+                                        state="readonly", width=10)
+        self.triad_combo.pack(side="left", padx=(6, 12))
+        self.triad_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
+
+        tk.Label(row2, text="Tension").pack(side="left")
+        self.tension_items = [NONE] + list(self.model.tension_defs.keys())
+        self.tension_var = tk.StringVar(value=NONE)
+        self.tension_combo = ttk.Combobox(row2, values=self.tension_items, textvariable=self.tension_var,
+                                          state="readonly", width=18)
+        self.tension_combo.pack(side="left", padx=(6, 12))
+        self.tension_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
+
+        tk.Label(row2, text="Inversion").pack(side="left")
+        self.inversion_items = list(self.model.inversion_defs.keys())
+        self.inversion_var = tk.StringVar(value="Root")
+        self.inversion_combo = ttk.Combobox(row2, values=self.inversion_items, textvariable=self.inversion_var,
+                                            state="readonly", width=10)
+        self.inversion_combo.pack(side="left", padx=(6, 12))
+        self.inversion_combo.bind("<<ComboboxSelected>>", self.on_chord_changed)
+
+        tk.Label(row2, text="Form").pack(side="left")
+        self.form_items = [ALL_FORMS] + list(self.model.form_groups.keys())
+        self.form_var = tk.StringVar(value=ALL_FORMS)
+        self.form_combo = ttk.Combobox(row2, values=self.form_items, textvariable=self.form_var,
+                                       state="readonly", width=14)
+        self.form_combo.pack(side="left", padx=(6, 12))
+        self.form_combo.bind("<<ComboboxSelected>>", self.on_form_changed)
+
+        tk.Button(row2, text="Strum", width=6, command=self.on_strum).pack(side="left", padx=(0, 12))
+
+        self.chord_hint = tk.Label(row2, text="코드: -", fg="gray", wraplength=900, justify="left")
+        self.chord_hint.pack(side="left", padx=(0, 12))
+
+        # Row 2b: Progression
+        row2b = tk.Frame(bottom)
+        row2b.pack(fill="x", pady=(6, 0))
+
+        tk.Label(row2b, text="Progression").pack(side="left")
+        self.progression_var = tk.StringVar(value=DEFAULT_PROGRESSION)
+        self.progression_entry = tk.Entry(row2b, textvariable=self.progression_var, width=48)
+        self.progression_entry.pack(side="left", padx=(8, 12))
+        self.progression_entry.bind("<Return>", self.on_play)
+
+        tk.Label(row2b, text="BPM").pack(side="left")
+        self.tempo_var = tk.StringVar(value="120")
+        self.tempo_spin = tk.Spinbox(row2b, from_=30, to=300, increment=5, textvariable=self.tempo_var, width=5,
+                                     command=self.on_tempo_changed)
+        self.tempo_spin.pack(side="left", padx=(6, 12))
+        self.tempo_spin.bind("<Return>", self.on_tempo_changed)
+
+        tk.Label(row2b, text="Beats").pack(side="left")
+        self.beats_var = tk.StringVar(value="4")
+        self.beats_combo = ttk.Combobox(row2b, values=["1", "2", "3", "4", "8"], textvariable=self.beats_var,
+                                        state="readonly", width=3)
+        self.beats_combo.pack(side="left", padx=(6, 12))
+
+        self.lead_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(row2b, text="Voice leading", variable=self.lead_var).pack(side="left", padx=(0, 12))
+
+        tk.Button(row2b, text="Chart...", command=self.on_chart_open).pack(side="left", padx=(0, 12))
+        tk.Button(row2b, text="Play", width=6, command=self.on_play).pack(side="left")
+        tk.Button(row2b, text="Stop", width=6, command=self.on_stop).pack(side="left", padx=(4, 12))
+
+        self.play_info = tk.Label(row2b, text="", fg="gray")
+        self.play_info.pack(side="left")
+
+        # Row 2c: MIDI timeline
+        row2c = tk.Frame(bottom)
+        row2c.pack(fill="x", pady=(6, 0))
+
+        tk.Label(row2c, text="MIDI").pack(side="left")
+        tk.Button(row2c, text="Open...", command=self.on_midi_open).pack(side="left", padx=(8, 12))
+        tk.Button(row2c, text="◀", width=2, command=lambda: self.midi_step(-1)).pack(side="left")
+        self.midi_var = tk.IntVar(value=0)
+        self.midi_scale = tk.Scale(row2c, from_=0, to=0, orient="horizontal", showvalue=False, length=420,
+                                   variable=self.midi_var, command=self.on_midi_scrub)
+        self.midi_scale.pack(side="left", padx=4)
+        tk.Button(row2c, text="▶", width=2, command=lambda: self.midi_step(1)).pack(side="left", padx=(0, 12))
+        self.midi_info = tk.Label(row2c, text="", fg="gray")
+        self.midi_info.pack(side="left")
+
+        # Row 2d: 녹음(WAV) 음높이 분석 -> 위 MIDI 타임라인으로
+        row2d = tk.Frame(bottom)
+        row2d.pack(fill="x", pady=(6, 0))
+
+        tk.Label(row2d, text="Audio").pack(side="left")
+        tk.Button(row2d, text="Open...", command=self.on_audio_open).pack(side="left", padx=(8, 4))
+        self.audio_cancel = tk.Button(row2d, text="Cancel", state="disabled", command=self.on_audio_cancel)
+        self.audio_cancel.pack(side="left", padx=(0, 4))
+        self.audio_apply = tk.Button(row2d, text="Use scale", state="disabled", command=self.on_audio_apply)
+        self.audio_apply.pack(side="left", padx=(0, 12))
+        self.audio_info = tk.Label(row2d, text="", fg="gray")
+        self.audio_info.pack(side="left")
+
+        # Row 2e: 탭 모음 -> 프렛 사용 빈도
+        row2e = tk.Frame(bottom)
+        row2e.pack(fill="x", pady=(6, 0))
+
+        tk.Label(row2e, text="Tabs").pack(side="left")
+        tk.Button(row2e, text="Folder...", command=self.on_tabs_open).pack(side="left", padx=(8, 4))
+        self.tabs_cancel = tk.Button(row2e, text="Cancel", state="disabled", command=self.on_tabs_cancel)
+        self.tabs_cancel.pack(side="left", padx=(0, 12))
+        tk.Label(row2e, text="Heatmap").pack(side="left")
+        self.heat_var = tk.StringVar(value=self.heat_mode)
+        heat_combo = ttk.Combobox(row2e, values=HEAT_MODES, textvariable=self.heat_var, state="readonly", width=12)
+        heat_combo.pack(side="left", padx=(8, 12))
+        heat_combo.bind("<<ComboboxSelected>>", self.on_heat_mode)
+        self.tabs_info = tk.Label(row2e, text="", fg="gray")
+        self.tabs_info.pack(side="left")
+
+        row3 = tk.Frame(bottom)
+        row3.pack(fill="x", pady=(6, 0))
+        self.click_info = tk.Label(row3, text="클릭: -")
+        self.click_info.pack(side="left")
+        self.hover_info = tk.Label(row3, text="", fg="gray")
+        self.hover_info.pack(side="left", padx=(24, 0))
+
+        # Row 4: 클릭한 음으로 코드/스케일 찾기
+        row4 = tk.Frame(bottom)
+        row4.pack(fill="x", pady=(6, 0))
+        self.lookup_chords = tk.Label(row4, text="찾은 코드: -", fg="gray", wraplength=1100, justify="left")
+        self.lookup_chords.pack(anchor="w")
+        self.lookup_scales = tk.Label(row4, text="찾은 스케일: -", fg="gray", wraplength=1100, justify="left")
+        self.lookup_scales.pack(anchor="w")
+
+
+    # =========================
+    # Events
+    # =========================
+    @traced(cat="handler")
+    def on_key_changed(self, _=None):
+        self.model.set_key(self.key_var.get(), update=False)
+        self.click_info.config(text="클릭: -")
+        self.scheduler.mark("key")
+
+    def step_key(self, step: int):
+        # Alt+←/→: 이전/다음 키 (끝에서는 처음으로)
+        items = self.key_items
+        i = items.index(self.key_var.get()) if self.key_var.get() in items else 0
+        self.key_var.set(items[(i + step) % len(items)])
+        self.on_key_changed()
+
+    def step_scale(self, step: int):
+        # Alt+↑/↓: 목록의 이전/다음 스케일. 카탈로그에서 고른 스케일이면 목록 처음부터
+        items = self.scale_items
+        name = self.scale_var.get()
+        i = items.index(name) if name in items else (0 if step > 0 else 1)
+        self.scale_var.set(items[(i + step) % len(items)])
+        self.hide_scale_results()
+        self.on_scale_changed()
+
+    @traced(cat="handler")
+    def on_scale_changed(self, _=None):
+        name = self.scale_var.get().strip() or NONE
+        if name != NONE and name not in self.model.scale_defs:
+            i = self.ensure_catalog().find(name)
+            if i is None:
+                return
+            name = self.catalog.name(i)
+            self.model.add_scale(name, self.catalog.intervals(i))
+        self.scale_var.set(name)
+        self.model.set_scale(name, update=False)
+        self.scheduler.mark("scale")
+
+    # ----- scale picker -----
+    def ensure_catalog(self):
+        if self.catalog is None:
+            from fretcore.catalog import load_catalog
+            self.catalog = load_catalog(self.model.scale_defs)
+        return self.catalog
+
+    def on_scale_focus(self, _=None):
+        self.scale_entry.select_range(0, "end")
+        self.search_scales("" if self.scale_var.get() == NONE else self.scale_var.get())
+
+    def on_scale_typed(self, e):
+        if e.keysym in ("Return", "Escape", "Up", "Down", "Prior", "Next", "Tab"):
+            return
+        self.search_scales(self.scale_var.get())
+
+    @traced(cat="handler")
+    def search_scales(self, query: str):
+        self.scale_result = self.ensure_catalog().search(query)
+        self.scale_top = 0
+        self.scale_cursor = 0
+        self.render_scale_results()
+        self.scale_popup.place(in_=self.scale_entry, relx=0, rely=0, anchor="sw")
+        self.scale_popup.lift()
+
+    def render_scale_results(self):
+        # 보이는 SCALE_ROWS 줄만 목록에 넣고 스크롤바는 전체 결과 수 기준으로 직접 맞춤
+        result = self.scale_result
+        rows = result.page(self.scale_top, SCALE_ROWS)
+        self.scale_list.delete(0, "end")
+        self.scale_list.insert("end", *[self.catalog.describe(i) for i in rows])
+        if self.scale_top <= self.scale_cursor < self.scale_top + len(rows):
+            self.scale_list.selection_set(self.scale_cursor - self.scale_top)
+        count = max(1, result.count)
+        self.scale_scroll.set(self.scale_top / count, min(1.0, (self.scale_top + SCALE_ROWS) / count))
+        errors = f"   (scales.txt 오류 {len(self.catalog.errors)}줄)" if self.catalog.errors else ""
+        self.scale_status.config(text=f"{result.count} / {self.catalog.count}{errors}")
+
+    def scroll_scale_results(self, top: int):
+        if self.scale_result is None:
+            return
+        top = max(0, min(top, self.scale_result.count - SCALE_ROWS))
+        if top != self.scale_top:
+            self.scale_top = top
+            self.render_scale_results()
+
+    def on_scale_scroll(self, *args):
+        if self.scale_result is None:
+            return
+        if args[0] == "moveto":
+            self.scroll_scale_results(int(float(args[1]) * self.scale_result.count))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (SCALE_ROWS if args[2] == "pages" else 1)
+            self.scroll_scale_results(self.scale_top + step)
+
+    def move_scale_cursor(self, step: int):
+        result = self.scale_result
+        if result is None or not result.count:
+            return
+        self.scale_cursor = max(0, min(result.count - 1, self.scale_cursor + step))
+        if self.scale_cursor < self.scale_top:
+            self.scale_top = self.scale_cursor
+        elif self.scale_cursor >= self.scale_top + SCALE_ROWS:
+            self.scale_top = self.scale_cursor - SCALE_ROWS + 1
+        self.render_scale_results()
+
+    def on_scale_list_click(self, e):
+        if self.scale_result is None:
+            return
+        self.scale_cursor = self.scale_top + self.scale_list.nearest(e.y)
+        self.on_scale_pick()
+
+    def on_scale_pick(self, _=None):
+        result = self.scale_result
+        if not self.scale_var.get().strip():
+            self.scale_var.set(NONE)
+        elif result is not None and result.count:
+            self.scale_var.set(self.catalog.name(result.page(self.scale_cursor, 1)[0]))
+        self.hide_scale_results()
+        self.on_scale_changed()
+
+    def hide_scale_results(self, _=None):
+        self.scale_popup.place_forget()
+
+    @traced(cat="handler")
+    def on_chord_changed(self, _=None):
+        self.model.set_chord(self.triad_var.get(), self.tension_var.get(), self.inversion_var.get(), update=False)
+        self.scheduler.mark("chord")
+
+    @traced(cat="handler")
+    def on_symbol(self, _=None):
+        text = self.symbol_var.get().strip()
+        if not text:
+            return
+        from fretcore.chordsym import SymbolError, parse_symbol
+        try:
+            chord = parse_symbol(text)
+        except SymbolError as exc:
+            self.chord_hint.config(text=f"코드 기호: {exc}", fg="#c62828")
+            self.symbol_entry.icursor(exc.pos)
+            return
+        item = next(item for item in self.key_items if key_item_to_pc(item) == chord.root_pc)
+        self.key_var.set(item)
+        self.triad_var.set(chord.triad)
+        self.tension_var.set(chord.tension)
+        self.inversion_var.set(chord.inversion)
+        self.model.set_key(item, update=False)
+        self.model.set_chord(chord.triad, chord.tension, chord.inversion, update=False)
+        self.update_key_hint()
+        self.scheduler.mark("key")
+        self.scheduler.mark("chord")
+
+    @traced(cat="handler")
+    def on_form_changed(self, _=None):
+        self.model.set_form(self.form_var.get())
+        self.scheduler.mark("form")
+
+    def on_instrument_preset(self, _=None):
+        # 프리셋 기본 프렛 수로 맞추고 카포는 유지
+        self.frets_var.set(str(PRESETS[self.instrument_var.get()].max_fret))
+        self.on_instrument_changed()
+
+    @traced(cat="handler")
+    def on_instrument_changed(self, _=None):
+        preset = PRESETS[self.instrument_var.get()]
+        instrument = preset.with_options(max_fret=int(self.frets_var.get()), capo=int(self.capo_var.get()))
+        self.capo_var.set(str(instrument.capo))
+        self.model.set_instrument(instrument, update=False)
+        self.tuning_hint.config(text=f"튜닝: {instrument.tuning_text()}")
+        self.click_info.config(text="클릭: -")
+        self.scheduler.mark("instrument")
+
+    def set_zoom(self, zoom: float):
+        zoom = max(ZOOM_MIN, min(ZOOM_MAX, zoom))
+        if zoom == self.zoom:
+            return
+        # 화면 가운데 지점이 줌 후에도 가운데 오도록
+        first, last = self.canvas.xview()
+        center = (first + last) / 2
+        self.zoom = zoom
+        self.apply_layout()
+        first, last = self.canvas.xview()
+        self.canvas.xview_moveto(max(0.0, center - (last - first) / 2))
+        self.scheduler.mark("layout")
+
+    def on_wheel_scroll(self, e):
+        self.canvas.xview_scroll(-1 if e.delta > 0 else 1, "units")
+
+    def on_wheel_zoom(self, e):
+        self.set_zoom(self.zoom * (1.25 if e.delta > 0 else 1 / 1.25))
+
+    def on_xview(self, first, last):
+        self.hscroll.set(first, last)
+        # 스크롤 이벤트가 몰려도 보이는 범위 동기화는 프레임당 한 번
+        if self.ui_ready:
+            self.scheduler.mark("view")
+
+    # ----- progression -----
+    def read_tempo(self) -> float:
+        try:
+            return min(300.0, max(30.0, float(self.tempo_var.get())))
+        except ValueError:
+            return 120.0
+
+    @traced(cat="handler")
+    def on_play(self, _=None):
+        from fretcore.progression import parse_progression
+        self.on_stop()
+        try:
+            steps = parse_progression(self.progression_var.get(), self.model)
+        except ValueError as exc:
+            self.play_info.config(text=str(exc), fg="#c62828")
+            return
+
+        # 재생 전에 단계별 레이어/변화분을 모두 계산 -> 박마다 바뀌는 셀만 고침
+        self.play_info.config(text=f"진행 준비 중... ({len(steps)}마디)", fg="gray")
+        self.submit_progression(steps, int(self.beats_var.get()), self.start_progression)
+
+    def submit_progression(self, steps, beats: int, on_done):
+        # 보이싱/보이스 리딩은 작업 스레드에서 (준비 중에 다시 누르거나 정지하면 옛 결과는 버려짐).
+        # 매번 새 Progression: 취소된 작업이 아직 옛 객체를 채우는 중일 수 있음
+        from fretcore.progression import Progression
+        leader = self.progression_leader()
+        self.play_job = self.workers.submit("progression", self.prepare_job, Progression(steps, beats), self.layout,
+                                            leader, on_done=on_done, on_error=self.on_progression_error)
+        if leader is not None:
+            self.leader_job = self.play_job
+
+    def prepare_job(self, job, prog, layout, leader):
+        # 작업 스레드: prepare 는 화면 모델을 읽기만 함 (작업용 모델을 따로 만듦)
+        return prog.prepare(self.model, layout, leader)
+
+    def start_progression(self, job, prog):
+        from fretcore.progression import BeatClock
+        self.play_job = None
+        self.progression = prog
+        self.progression_layout = job.args[1]
+        self.play_index = -1
+        self.play_clock = BeatClock(self.root.after, self.root.after_cancel, self.play_step,
+                                    prog.interval(self.read_tempo()))
+        self.play_clock.start()
+
+    def swap_progression(self, job, prog):
+        # 재생 중 좌표/폼이 바뀌어 다시 준비한 것: 재생 위치는 그대로, 지금 단계만 화면과 맞춤
+        self.play_job = None
+        self.progression = prog
+        self.progression_layout = job.args[1]
+        if self.play_index >= 0:
+            self.sync_layer("chord", prog.layers[self.play_index])
+
+    def on_progression_error(self, job, exc):
+        self.play_job = None
+        self.play_info.config(text=f"진행 준비 실패: {exc}", fg="#c62828")
+
+    def on_chart_open(self, _=None):
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(filetypes=[("Chord charts", "*.txt *.crd *.cho *.chopro *.chordpro *.pro"),
+                                                     ("All files", "*")])
+        if path:
+            self.load_chart(path)
+
+    def load_chart(self, path: str):
+        # 리드 시트 -> Progression 입력칸 (코드 기호 형식). 읽지 못한 기호는 첫 번째 위치를 표시
+        from fretcore.chordsym import load_chart
+        try:
+            chart = load_chart(path)
+        except OSError as exc:
+            self.play_info.config(text=str(exc), fg="#c62828")
+            return
+        if not chart.bars:
+            self.play_info.config(text=f"{os.path.basename(path)}: 코드를 찾지 못함", fg="#c62828")
+            return
+        self.on_stop()
+        self.progression_var.set(chart.progression_text())
+        text = f"{chart.title}: {len(chart.bars)}마디"
+        if chart.errors:
+            text += f", 읽지 못한 기호 {len(chart.errors)}개 (첫 번째 {chart.errors[0]})"
+        self.play_info.config(text=text, fg="#c62828" if chart.errors else "gray")
+
+    def progression_leader(self):
+        if not self.lead_var.get():
+            return None
+        # 취소된 준비 작업이 아직 옛 VoiceLeader 로 푸는 중일 수 있음 -> 그때는 새로 (한 번에 한 스레드만)
+        busy = self.leader_job is not None and not self.leader_job.finished
+        if busy or self.voice_leader is None or not self.voice_leader.matches(self.model):
+            from fretcore.voiceleading import VoiceLeader
+            self.voice_leader = VoiceLeader(self.model)
+        return self.voice_leader
+
+    def on_stop(self, _=None):
+        if self.play_job is not None:
+            self.workers.cancel("progression")
+            self.play_job = None
+            self.play_info.config(text="정지", fg="gray")
+        if self.play_clock is not None:
+            self.play_clock.stop()
+            stats = self.play_clock.stats()
+            self.play_info.config(text=f"정지 ({stats['ticks']}박, 최대 지연 {stats['max_late_ms']:.1f}ms, "
+                                       f"건너뜀 {stats['skipped']})", fg="gray")
+        self.play_clock = None
+        if self.progression is not None:
+            self.progression = None
+            self.draw_chord_cells_by_form()
+
+    def on_tempo_changed(self, _=None):
+        if self.play_clock is not None:
+            self.play_clock.set_interval(self.progression.interval(self.read_tempo()))
+
+    @traced("play_step", cat="draw")
+    def play_step(self, index: int):
+        prog = self.progression
+        n = len(prog.steps)
+        i = index % n
+        if self.progression_layout is not self.layout:
+            pass   # 새 좌표로 다시 준비하는 중 (swap_progression 에서 맞춤)
+        elif self.play_index >= 0 and (self.play_index + 1) % n == i:
+            self.patch_layer("chord", prog.deltas[i])
+        else:
+            # 첫 박이거나 박을 건너뛴 경우: 지금 화면과 비교해서 맞춤
+            self.sync_layer("chord", prog.layers[i])
+        self.play_index = i
+        text = f"▶ {i + 1}/{n}  {prog.names[i]}"
+        if prog.leading is not None:
+            st = prog.leading.stats
+            text += (f"   (보이스 리딩: 이동 {prog.leading.cost:.1f}, {st['resolved']}/{st['steps']}마디 다시 계산, "
+                     f"{st['elapsed_ms']:.1f}ms)")
+        self.play_info.config(text=text, fg="black")
+        if prog.voicings[i] is not None:
+            self.play_notes(self.model.instrument.voicing_notes(prog.voicings[i]))
+
+    # ----- MIDI -----
+    def on_midi_open(self, _=None):
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(filetypes=[("MIDI", "*.mid *.midi"), ("All files", "*")])
+        if path:
+            self.load_midi(path)
+
+    def load_midi(self, path: str):
+        # 읽기/운지는 작업 스레드에서 (큰 파일은 몇 초). 다른 파일을 열면 이전 읽기는 버려짐
+        from fretcore.midi import load_job
+        if self.pitch_job is not None:
+            # 녹음 분석 결과가 나중에 와서 이 파일의 타임라인을 덮지 않게
+            self.workers.cancel("pitch")
+            self.pitch_job = None
+            self.pitch_live = ()
+            self.audio_cancel.config(state="disabled")
+            self.audio_info.config(text="분석 취소됨", fg="gray")
+        self.midi_info.config(text=f"{os.path.basename(path)}: 읽는 중...", fg="gray")
+        self.workers.submit("midi", load_job, path, on_done=self.on_midi_loaded, on_error=self.on_midi_error)
+
+    def on_midi_loaded(self, job, notes):
+        self.midi_notes = notes
+        self.midi_index = 0
+        self.midi_var.set(0)
+        self.refinger_midi()
+
+    def on_midi_error(self, job, exc):
+        self.midi_info.config(text=str(exc), fg="#c62828")
+
+    # ----- audio (pitch detection) -----
+    def on_audio_open(self, _=None):
+        from fretcore import pitch
+        if not pitch.available():
+            self.audio_info.config(text="음높이 분석에는 NumPy 가 필요합니다 (pip install numpy)", fg="#c62828")
+            return
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(filetypes=[("WAV", "*.wav"), ("All files", "*")])
+        if path:
+            self.load_audio(path)
+
+    def load_audio(self, path: str):
+        from fretcore.pitch import analyze
+        self.on_audio_cancel()
+        self.workers.cancel("midi")
+        self.workers.cancel("fingering")
+        self.pitch_notes = []
+        self.pitch_live = ()
+        self.pitch_scales = []
+        # 타임라인은 분석이 끝나면 채움 (그동안은 찾은 음 수만)
+        self.midi_notes = None
+        self.midi_fingering = None
+        self.midi_index = 0
+        self.midi_var.set(0)
+        self.midi_info.config(text="", fg="gray")
+        self.scheduler.mark("midi")
+        self.audio_cancel.config(state="normal")
+        self.audio_apply.config(state="disabled")
+        self.audio_info.config(text=f"{os.path.basename(path)}: 분석 중...", fg="gray")
+        # 다른 파일을 열면 이전 분석은 취소되고 늦게 온 결과는 버려짐
+        self.pitch_job = self.workers.submit("pitch", analyze, path, on_partial=self.on_pitch_partial,
+                                             on_done=self.on_pitch_done, on_error=self.on_pitch_error)
+
+    def on_audio_cancel(self, _=None):
+        # 세대는 그대로 두고 멈추기만: 거기까지 찾은 음은 on_pitch_done 으로 옴
+        if self.pitch_job is not None:
+            self.pitch_job.cancel()
+        self.audio_cancel.config(state="disabled")
+
+    def on_pitch_partial(self, job, value):
+        # 분석 중에는 찾은 음을 모으기만 (운지는 끝났을 때 한 번: 부분 결과마다 전체를 다시 배정하면 길이의 제곱)
+        found, progress, duration, elapsed = value
+        self.pitch_notes.extend(found)
+        if found:
+            # 운지는 아직 없으니 새로 찾은 음을 낼 수 있는 칸을 모두 표시
+            self.pitch_live = tuple(self.pitch_notes[-PITCH_LIVE_NOTES:])
+            self.scheduler.mark("midi")
+        speed = duration * progress / elapsed if elapsed > 0 else 0.0
+        last = f" (마지막 {midi_to_name(self.pitch_notes[-1].midi)})" if self.pitch_notes else ""
+        self.audio_info.config(text=f"{os.path.basename(job.args[0])}: {progress * 100:.0f}%  "
+                                    f"{len(self.pitch_notes)}음{last}  (실시간의 {speed:.0f}배)", fg="gray")
+
+    def on_pitch_done(self, job, value):
+        found, duration, elapsed, cancelled = value
+        self.pitch_notes.extend(found)
+        self.pitch_job = None
+        self.pitch_live = ()
+        self.midi_notes = self.pitch_notes
+        self.refinger_midi()
+        self.audio_cancel.config(state="disabled")
+        self.show_audio_result(job.args[0], self.pitch_notes, duration, elapsed, cancelled)
+
+    def on_pitch_error(self, job, exc):
+        self.pitch_job = None
+        self.pitch_live = ()
+        self.scheduler.mark("midi")
+        self.audio_cancel.config(state="disabled")
+        self.audio_info.config(text=str(exc), fg="#c62828")
+
+    def show_audio_result(self, path, notes, duration, elapsed, cancelled):
+        from fretcore.pitch import suggest_scales
+        self.pitch_scales = suggest_scales(notes, self.model.scale_defs, 3)
+        scales = ", ".join(f"{NOTE_FLAT[tonic]} {name} {inside * 100:.0f}%"
+                           for tonic, name, inside in self.pitch_scales)
+        state = "취소됨" if cancelled else f"{duration:.1f}s 를 {elapsed:.2f}s 에"
+        self.audio_info.config(text=f"{os.path.basename(path)}: {len(notes)}음 ({state})   "
+                                    f"추천 스케일: {scales or '-'}", fg="black")
+        self.audio_apply.config(state="normal" if self.pitch_scales else "disabled")
+
+    def on_audio_apply(self, _=None):
+        # 가장 어울리는 (으뜸음, 스케일)로 Key/Scale 을 맞춤
+        if not self.pitch_scales:
+            return
+        tonic, name, _ = self.pitch_scales[0]
+        item = next(item for item in self.key_items if key_item_to_pc(item) == tonic)
+        self.key_var.set(item)
+        self.scale_var.set(name)
+        self.model.set_key(item, update=False)
+        self.model.set_scale(name, update=False)
+        self.update_key_hint()
+        self.scheduler.mark("key")
+        self.scheduler.mark("scale")
+
+    # ----- tab corpus (heatmap) -----
+    def on_tabs_open(self, _=None):
+        from tkinter import filedialog
+        path = filedialog.askdirectory(mustexist=True)
+        if path:
+            self.load_tabs(path)
+
+    def load_tabs(self, path: str):
+        from fretcore.tabs import ingest_job
+        self.on_tabs_cancel()
+        self.tabs_cancel.config(state="normal")
+        self.tabs_info.config(text=f"{os.path.basename(path)}: 읽는 중...", fg="gray")
+        self.tab_job = self.workers.submit("tabs", ingest_job, path, on_partial=self.on_tabs_partial,
+                                           on_done=self.on_tabs_done, on_error=self.on_tabs_error)
+
+    def on_tabs_cancel(self, _=None):
+        # 멈추기만: 거기까지 읽은 것은 저장되고 on_tabs_done 으로 옴
+        if self.tab_job is not None:
+            self.tab_job.cancel()
+        self.tabs_cancel.config(state="disabled")
+
+    def on_tabs_partial(self, job, value):
+        done, total = value
+        self.tabs_info.config(text=f"{os.path.basename(job.args[0])}: {done}/{total or '?'} 파일", fg="gray")
+
+    def on_tabs_done(self, job, value):
+        self.tab_job = None
+        self.tabs_cancel.config(state="disabled")
+        self.tab_corpus, self.tab_stats = value
+        self.tab_root = job.args[0]
+        if self.heat_mode == HEAT_MODES[0]:
+            self.heat_mode = HEAT_MODES[1]
+            self.heat_var.set(self.heat_mode)
+        self.update_tabs_info()
+        self.scheduler.mark("heat")
+
+    def on_tabs_error(self, job, exc):
+        self.tab_job = None
+        self.tabs_cancel.config(state="disabled")
+        self.tabs_info.config(text=str(exc), fg="#c62828")
+
+    def on_heat_mode(self, _=None):
+        self.heat_mode = self.heat_var.get()
+        self.update_tabs_info()
+        self.scheduler.mark("heat")
+
+    def update_tabs_info(self):
+        st = self.tab_stats
+        if st is None:
+            return
+        text = (f"{os.path.basename(self.tab_root)}: {st['files']} 파일, {st['notes']}음 "
+                f"(새로 읽음 {st['parsed']}, 캐시 {st['reused']}, {st['elapsed_ms']:.0f}ms"
+                + (", 취소됨" if st["cancelled"] else "") + ")")
+        if self.heat_mode in ("Key", "Key + scale"):
+            text += f"   {NOTE_FLAT[self.model.tonic_pc]} 조 곡 {self.tab_corpus.files.get(self.model.tonic_pc, 0)}개"
+        self.tabs_info.config(text=text, fg="black")
+
+    def current_heat(self) -> dict:
+        mode = self.heat_mode
+        if self.tab_corpus is None or mode == HEAT_MODES[0]:
+            return {}
+        key_pc = self.model.tonic_pc if mode in ("Key", "Key + scale") else None
+        # 스케일을 고르지 않았으면 스케일 음으로 거르지 않음
+        allowed = frozenset(self.model.scale_allowed_pcs) if mode in ("Scale notes", "Key + scale") else None
+        inputs = (self.tab_corpus, self.model.instrument, key_pc, allowed or None)
+        if inputs != self.heat_inputs:
+            from fretcore.tabs import heat_counts
+            self.heat_inputs = inputs
+            self.heat = heat_counts(*inputs)
+        return self.heat
+
+    def refinger_midi(self):
+        # 악기/튜닝/카포가 바뀌면 같은 음을 다시 배정 (작업 스레드에서. 옛 악기의 운지는 그동안 지움)
+        from fretcore.midi import fingering_job
+        self.midi_fingering = None
+        self.scheduler.mark("midi")
+        if self.midi_notes:
+            self.midi_info.config(text=f"운지 계산 중... ({len(self.midi_notes)}음)", fg="gray")
+        self.workers.submit("fingering", fingering_job, self.midi_notes, self.model.instrument,
+                            on_done=self.on_midi_fingered, on_error=self.on_midi_error)
+
+    def on_midi_fingered(self, job, fingering):
+        self.midi_fingering = fingering
+        groups = fingering.groups
+        self.midi_index = min(self.midi_index, max(0, len(groups) - 1))
+        self.midi_scale.config(to=max(0, len(groups) - 1))
+        self.update_midi_info()
+        self.scheduler.mark("midi")
+
+    def on_midi_scrub(self, value):
+        index = int(float(value))
+        if self.midi_fingering is None or index == self.midi_index:
+            return
+        self.midi_index = index
+        self.update_midi_info()
+        self.scheduler.mark("midi")
+        group = self.midi_fingering.groups[index]
+        self.play_notes([(self.model.instrument.pitch(s, 0), fret) for s, fret, _ in group.notes], 0)
+
+    def midi_step(self, step: int):
+        if self.midi_fingering is None or not self.midi_fingering.groups:
+            return
+        index = max(0, min(len(self.midi_fingering.groups) - 1, self.midi_index + step))
+        self.midi_var.set(index)
+        self.on_midi_scrub(index)
+
+    def update_midi_info(self):
+        from fretcore.midi import group_text
+        fg = self.midi_fingering
+        if not fg.groups:
+            self.midi_info.config(text=f"연주할 수 있는 음 없음 ({len(self.midi_notes)}음)", fg="#c62828")
+            return
+        group = fg.groups[self.midi_index]
+        st = fg.stats()
+        self.midi_info.config(text=f"{group.start:.2f}s / {fg.duration:.2f}s   {self.midi_index + 1}/{st['groups']}   "
+                                   f"{group_text(group)}   (운지 {st['elapsed_ms']}ms, 범위 밖 {st['unplayable']})",
+                              fg="black")
+
+    def open_grid(self, _=None):
+        if self.grid_window is None:
+            self.grid_window = BoardGridWindow(self)
+        else:
+            self.grid_window.top.lift()
+
+    def update_key_hint(self):
+        self.key_hint.config(text=key_hint_text(self.key_var.get()))
+
+    def update_hints(self):
+        self.update_key_hint()
+        self.scale_hint.config(text=self.model.scale_hint)
+        self.chord_hint.config(text=self.model.chord_hint, fg="gray")
+
+    @traced(cat="handler")
+    def on_click(self, e):
+        cell = self.layout.hit(self.canvas.canvasx(e.x), self.canvas.canvasy(e.y))
+        if cell is None:
+            return
+
+        s, fret = cell
+        self.model.toggle_pc_at(s, fret)
+        self.click_info.config(text=self.model.click_text(s, fret))
+        self.scheduler.mark("active")
+        self.play_notes([(self.model.instrument.pitch(s, 0), fret)], 0)
+
+    # ----- hover -----
+    # <Motion> 은 위치만 기록하고 HOVER_MS 마다 한 번 판정. 칸이 바뀔 때만 미리 만든 테두리의
+    # coords/itemconfig 를 바꾼다 (레이어는 다시 그리지 않음)
+    def on_motion(self, e):
+        self.hover_pos = (e.x, e.y)
+        if not self.hover_pending:
+            self.hover_pending = True
+            self.root.after(HOVER_MS, self.apply_hover)
+
+    def on_leave(self, _=None):
+        self.hover_pos = None
+        self.apply_hover()
+
+    @traced(cat="handler")
+    def apply_hover(self):
+        self.hover_pending = False
+        cell = None
+        if self.hover_pos is not None:
+            x, y = self.hover_pos
+            cell = self.layout.hit(self.canvas.canvasx(x), self.canvas.canvasy(y))
+        if cell == self.hover_cell:
+            return
+        self.hover_cell = cell
+        self.show_hover()
+
+    def show_hover(self):
+        wanted = []
+        if self.hover_cell is not None:
+            s, fret = self.hover_cell
+            pc = self.model.pos_index.pc_at(s, fret)
+            for point in self.model.pos_index.points_for_pc(pc):
+                left, top, right, bottom = self.layout.cell_bounds(*point)
+                color = HOVER_COLORS[0] if point == self.hover_cell else HOVER_COLORS[1]
+                wanted.append(((left + 1, top, right - 1, bottom),
+                               {"outline": color, "width": 3 if point == self.hover_cell else 2}))
+            self.hover_info.config(text=self.hover_text(s, fret, pc))
+        else:
+            self.hover_info.config(text="")
+
+        while len(self.hover_items) < len(wanted):
+            item = self.canvas.create_rectangle(0, 0, 0, 0, fill="", state="hidden", tags=("hover",))
+            self.canvas.tag_lower(item, self.layer_anchor["top"])
+            self.hover_items.append((item, None))
+        for i, (item, cur) in enumerate(self.hover_items):
+            spec = wanted[i] if i < len(wanted) else None
+            if spec == cur:
+                continue
+            if spec is None:
+                self.canvas.itemconfig(item, state="hidden")
+            else:
+                coords, opts = spec
+                if cur is None or cur[0] != coords:
+                    self.canvas.coords(item, *coords)
+                changed = {k: v for k, v in opts.items() if cur is None or cur[1].get(k) != v}
+                if cur is None:
+                    changed["state"] = "normal"
+                if changed:
+                    self.canvas.itemconfig(item, **changed)
+            self.hover_items[i] = (item, spec)
+
+    def hover_text(self, s: int, fret: int, pc: int) -> str:
+        text = self.model.hover_text(s, fret)
+        if self.progression is not None:
+            theory = self.model.theory
+            bars = [str(i + 1) for i, step in enumerate(self.progression.steps)
+                    if theory.chord_mask(step.triad, step.tension, step.root_pc) >> pc & 1]
+            text += f"   ·   진행 {', '.join(bars)}마디" if bars else "   ·   진행에 없음"
+        return text
+
+    # ----- sound -----
+    def play_notes(self, notes, spacing_ms: float = STRUM_MS):
+        # 합성/재생은 Player 작업 스레드에서. 여기서는 요청만 넣음 (NumPy 는 거기서 import 됨)
+        if self.sound_var.get():
+            self.ensure_player().play_notes(notes, spacing_ms)
+
+    def on_strum(self, _=None):
+        # 선택한 폼(전체면 첫 폼)의 보이싱을 낮은 줄부터
+        forms = self.model.forms
+        if not forms:
+            return
+        idx = self.model.selected_form_index()
+        voicing = forms[idx if idx is not None and idx < len(forms) else 0]
+        self.play_notes(self.model.instrument.voicing_notes(voicing.frets))
+
+    def request_lookup_index(self):
+        if not self.model.lookup_ready and not self.workers.active("lookup"):
+            self.workers.submit("lookup", lambda job: self.model.build_lookup_index(), on_done=self.on_lookup_ready)
+
+    def on_lookup_ready(self, job, index):
+        self.model.set_lookup_index(index)
+        if self.ui_ready and self.model.active_points:
+            self.update_lookup()
+
+    def update_lookup(self):
+        if self.model.active_points and not self.model.lookup_ready:
+            # 색인이 아직이면 작업 스레드에 맡기고 (도착하면 on_lookup_ready 가 다시 부름)
+            self.request_lookup_index()
+            if not self.model.lookup_ready:
+                self.lookup_chords.config(text="찾은 코드: (색인 준비 중...)")
+                self.lookup_scales.config(text="찾은 스케일: (색인 준비 중...)")
+                return
+        chords, scales = self.model.identify_active()
+        if not chords and not scales:
+            self.lookup_chords.config(text="찾은 코드: -")
+            self.lookup_scales.config(text="찾은 스케일: -")
+            return
+
+        def fmt(r):
+            name = r["name"]
+            if r.get("inversion") not in (None, "Root"):
+                name += f" ({r['inversion']})"
+            return name if r["exact"] else f"{name} +{r['extra']}"
+
+        self.lookup_chords.config(text="찾은 코드: " + ("  ·  ".join(fmt(r) for r in chords) or "-"))
+        self.lookup_scales.config(text="찾은 스케일: " + ("  ·  ".join(fmt(r) for r in scales) or "-"))
+
+    # =========================
+    # Layout / viewport
+    # =========================
+    def make_layout(self):
+        # 기본은 실제 줄 길이 비율의 폭. 창이 더 넓거나 높으면 넥을 늘려서 채움
+        inst = self.model.instrument
+        board_w = natural_board_width(inst.frets, inst.capo, self.zoom)
+        board_h = STRING_GAP * (inst.strings - 1)
+        if self.view_size is not None:
+            view_w, view_h = self.view_size
+            board_w = max(board_w, view_w - BOARD_PAD_W)
+            board_h = min(max(board_h, view_h - BOARD_PAD_H), MAX_STRING_GAP * (inst.strings - 1))
+        return layout_for(inst.strings, inst.frets, inst.capo, int(board_w), int(board_h))
+
+    def apply_layout(self) -> bool:
+        # 좌표와 스크롤 영역만 바꾸고 넥은 다음 draw 때 다시 그림
+        layout = self.make_layout()
+        if layout is self.layout:
+            return False
+        self.layout = layout
+        self.canvas.config(scrollregion=(0, 0, layout.width, layout.height))
+        self.static_drawn = False
+        return True
+
+    def on_canvas_configure(self, e):
+        # 리사이즈 이벤트가 연달아 와도 다시 배치는 프레임당 한 번
+        self.view_size = (e.width, e.height)
+        self.scheduler.mark("layout")
+
+    def visible_frets(self):
+        # 보이는 영역 + 양옆 여유(스크롤 시 빈칸이 보이지 않도록)
+        pad = 80
+        w = self.canvas.winfo_width()
+        if w <= 1:
+            w = int(self.canvas.cget("width"))
+        left = self.canvas.canvasx(0)
+        return self.layout.visible_frets(left - pad, left + w + pad)
+
+    # =========================
+    # Draw
+    # =========================
+    # 넥(나무/프렛/줄/인레이/프렛번호)은 레이아웃이 바뀔 때만 다시 그리고,
+    # 루트/스케일/코드/클릭 레이어는 (줄, 프렛) 키로 기존 아이템과 비교해서
+    # 바뀐 것만 create / itemconfig / coords / delete 한다. (리사이즈 때도 coords 만 바뀜)
+    def flush_updates(self, parts):
+        # 스케줄러가 프레임마다 한 번 부름: 바뀐 부분의 파생 데이터 -> 라벨 -> 해당 레이어만
+        tracer = perf.TRACER
+        if not tracer.enabled:
+            self.update_parts(parts)
+            return
+        tracer.begin_frame()
+        start = tracer.now_us()
+        self.update_parts(parts)
+        dur = tracer.now_us() - start
+        tracer.record("frame", "frame", start, dur, {"parts": sorted(parts)})
+        tracer.end_frame(dur / 1000.0)
+        tracer.counter("canvas", items=len(self.canvas.find_all()))
+        self.update_perf_overlay()
+
+    def update_parts(self, parts):
+        self.model.refresh(parts)
+        if not self.ui_ready:
+            # 시작 중(아래 UI 전): 레이아웃만 맞추고 나머지는 finish_startup() 의 draw 에서
+            if parts & {"layout", "instrument"}:
+                self.apply_layout()
+                self.draw_static()
+            return
+        if parts & {"key", "scale", "chord", "instrument"}:
+            self.update_hints()
+        if parts & {"key", "active", "instrument"}:
+            self.update_lookup()
+        relayout = bool(parts & {"layout", "instrument"}) and self.apply_layout()
+        if relayout or "form" in parts:
+            # 좌표/폼이 바뀌었으니 단계 레이어를 작업 스레드에서 다시 계산 (재생 중이면 위치는 그대로)
+            if self.progression is not None:
+                self.submit_progression(self.progression.steps, self.progression.beats, self.swap_progression)
+            elif self.play_job is not None:
+                prog = self.play_job.args[0]
+                self.submit_progression(prog.steps, prog.beats, self.start_progression)
+        if self.midi_notes is not None and "instrument" in parts:
+            self.refinger_midi()
+        if self.tab_corpus is not None and "key" in parts:
+            self.update_tabs_info()
+        if self.grid_window is not None and parts & {"key", "scale", "chord", "form", "instrument"}:
+            self.grid_window.rebuild()
+        self.draw(layers_for(parts))
+        if parts & {"key", "scale", "chord", "form", "instrument", "layout", "view"}:
+            self.schedule_prefetch()
+        if self.hover_cell is not None and (relayout or parts & {"key", "scale", "chord", "instrument"}):
+            # 좌표나 설명이 바뀜: 마지막 마우스 위치로 다시 판정
+            self.hover_cell = None
+            self.apply_hover()
+
+    # =========================
+    # Background workers
+    # =========================
+    def wake_workers(self):
+        if not self.worker_poll_pending:
+            self.worker_poll_pending = True
+            self.root.after(WORKER_POLL_MS, self.poll_workers)
+
+    def poll_workers(self):
+        # 도착한 결과를 콜백으로 (화면 갱신은 콜백이 mark 해서 다음 프레임에). 남은 작업이 있으면 다시
+        self.worker_poll_pending = False
+        with perf.TRACER.span("workers", cat="idle"):
+            busy = self.workers.poll()
+        if busy:
+            self.wake_workers()
+
+    def on_forms_ready(self):
+        self.model.forms_arrived()
+        self.scheduler.mark("chord")
+
+    # =========================
+    # Idle prefetch
+    # =========================
+    def schedule_prefetch(self):
+        # 계획은 매 프레임 새로 (지금 선택 기준), 실행은 조용해진 뒤 조각 단위로
+        if self.prefetcher is None:
+            return
+        self.prefetcher.replan(self.key_items, self.scale_items, self.layout, self.view_frets)
+        if not self.prefetch_pending and self.prefetcher.pending:
+            self.prefetch_pending = True
+            self.root.after(PREFETCH_DELAY_MS, self.run_prefetch)
+
+    def run_prefetch(self):
+        self.prefetch_pending = False
+        if self.scheduler.pending:
+            # 그릴 프레임이 먼저. 그 프레임이 끝나면 다시 예약됨
+            return
+        with perf.TRACER.span("prefetch", cat="idle"):
+            more = self.prefetcher.run()
+        if more:
+            self.prefetch_pending = True
+            self.root.after(PREFETCH_GAP_MS, self.run_prefetch)
+        self.update_perf_overlay()
+
+    # =========================
+    # Perf overlay
+    # =========================
+    def toggle_perf(self, _=None):
+        self.perf_visible = not self.perf_visible
+        perf.TRACER.enabled = self.perf_visible
+        self.update_perf_overlay()
+
+    def dump_trace(self, _=None):
+        path = perf.TRACER.dump(perf.default_trace_path())
+        self.click_info.config(text=f"trace 저장: {path} ({len(perf.TRACER.events)} events)")
+
+    def update_perf_overlay(self):
+        if not self.perf_visible:
+            if self.perf_item is not None:
+                self.canvas.delete(self.perf_item)
+                self.perf_item = None
+            return
+
+        tracer = perf.TRACER
+        slowest = tracer.slowest()
+        text = (f"frame {tracer.frame_ms:.1f}ms   {self.scheduler.fps():.0f} fps   "
+                f"items {len(self.canvas.find_all())}   "
+                + (f"slowest {slowest[1]} {slowest[0]:.1f}ms" if slowest else "slowest -")
+                + f"   {self.prefetcher.stats_text() if self.prefetcher is not None else 'prefetch -'}"
+                + f"\n{self.workers.stats_text()}")
+        x = self.canvas.canvasx(0) + 6
+        if self.perf_item is None:
+            self.perf_item = self.canvas.create_text(x, 4, anchor="nw", text=text, fill="#c62828",
+                                                     font=("Courier", 9, "bold"), tags=("perf",))
+        else:
+            self.canvas.coords(self.perf_item, x, 4)
+            self.canvas.itemconfig(self.perf_item, text=text)
+        self.canvas.tag_raise(self.perf_item)
+
+    def draw(self, layers=None):
+        # layers=None 이면 전부. 넥이 바뀌었거나 보이는 프렛 범위가 바뀌면 역시 전부
+        if not self.static_drawn:
+            self.draw_static()
+            layers = None
+        frets = self.visible_frets()
+        if frets != self.view_frets:
+            self.view_frets = frets
+            layers = None
+        if layers is None:
+            layers = self.layer_order
+
+        if "roots" in layers:
+            self.draw_roots()
+        if "scale" in layers:
+            self.draw_scale_cells()
+
+        # 코드톤 표시: 선택한 "Form"에 따라 색으로 묶어서 그림
+        if "chord" in layers:
+            self.draw_chord_cells_by_form()
+
+        if "active" in layers:
+            self.draw_active_cells()
+
+        if "heat" in layers:
+            self.draw_heat()
+
+        if "midi" in layers:
+            self.draw_midi()
+
+    @traced(cat="draw")
+    def draw_static(self):
+        # 레이어 경계 표시용(안 보이는) 아이템: 새 아이템은 다음 레이어 경계 바로 아래로 내려서 순서를 유지
+        if not self.layer_anchor:
+            for name in self.layer_order + ["hover", "top"]:
+                self.layer_anchor[name] = self.canvas.create_line(0, 0, 0, 0, state="hidden",
+                                                                  tags=("anchor", f"anchor:{name}"))
+
+        # 넥만 지우고 다시 그림. 오버레이 아이템은 그대로 두고 sync_layer 가 coords 를 맞춤
+        self.canvas.delete("neck")
+        first = self.layer_anchor[self.layer_order[0]]
+        for kind, coords, opts in scene.neck_primitives(self.layout):
+            self.canvas.tag_lower(self.create_item(kind, coords, opts, ("neck",)), first)
+
+        for kind, coords, opts in scene.fret_number_primitives(self.layout):
+            self.create_item(kind, coords, opts, ("neck",))
+        self.static_drawn = True
+
+    def create_item(self, kind: str, coords, opts, tags):
+        if kind == "rect":
+            return self.canvas.create_rectangle(*coords, tags=tags, **opts)
+        if kind == "oval":
+            return self.canvas.create_oval(*coords, tags=tags, **opts)
+        if kind == "line":
+            return self.canvas.create_line(*coords, tags=tags, **opts)
+        return self.canvas.create_text(*coords, tags=tags, **opts)
+
+    def sync_layer(self, layer: str, wanted: dict):
+        # wanted: {(s, fret): ((kind, coords, opts), ...)}
+        items = self.layer_items[layer]
+        delta = {key: None for key in items if key not in wanted}
+        for key, spec in wanted.items():
+            cur = items.get(key)
+            if cur is None or cur[1] != spec:
+                delta[key] = spec
+        self.patch_layer(layer, delta)
+
+    def patch_layer(self, layer: str, delta: dict):
+        # delta: {(s, fret): spec 또는 None(지움)} -- 바뀐 셀만 (scene.layer_delta 로 미리 만든 것도 그대로)
+        items = self.layer_items[layer]
+
+        next_layer = self.layer_order[self.layer_order.index(layer) + 1] \
+            if layer != self.layer_order[-1] else "hover"
+        below = self.layer_anchor[next_layer]
+        tags = ("overlay", f"layer:{layer}")
+
+        for key, spec in delta.items():
+            cur = items.get(key)
+            if spec is None:
+                if cur is not None:
+                    self.canvas.delete(*items.pop(key)[0])
+                continue
+            if cur is None:
+                ids = []
+                for kind, coords, opts in spec:
+                    item = self.create_item(kind, coords, opts, tags)
+                    self.canvas.tag_lower(item, below)
+                    ids.append(item)
+                items[key] = (ids, spec)
+                continue
+
+            ids, old = cur
+            if old == spec:
+                continue
+            for item, (_, coords, opts), (_, old_coords, old_opts) in zip(ids, spec, old):
+                if coords != old_coords:
+                    self.canvas.coords(item, *coords)
+                changed = {k: v for k, v in opts.items() if old_opts.get(k) != v}
+                if changed:
+                    self.canvas.itemconfig(item, **changed)
+            items[key] = (ids, spec)
+
+    @traced(cat="draw")
+    def draw_roots(self):
+        self.sync_layer("roots", self.cached_layer("roots", scene.roots_layer))
+
+    @traced(cat="draw")
+    def draw_scale_cells(self):
+        self.sync_layer("scale", self.cached_layer("scale", scene.scale_layer))
+
+    @traced(cat="draw")
+    def draw_chord_cells_by_form(self):
+        if self.progression is not None and self.play_index >= 0:
+            # 옛 좌표의 단계 레이어는 그리지 않음 (다시 준비한 것이 오면 swap_progression 이 그림)
+            stale = self.progression_layout is not self.layout
+            self.sync_layer("chord", {} if stale else self.progression.layers[self.play_index])
+            return
+        self.sync_layer("chord", self.cached_layer("chord", scene.chord_layer))
+
+    def cached_layer(self, name: str, build) -> dict:
+        # 미리 계산 캐시가 생기기 전(첫 화면)에는 바로 만듦
+        if self.prefetcher is None:
+            return build(self.model, self.layout, self.view_frets)
+        return self.prefetcher.layer(name, self.layout, self.view_frets)
+
+    @traced(cat="draw")
+    def draw_active_cells(self):
+        self.sync_layer("active", scene.active_layer(self.model, self.layout, self.view_frets))
+
+    @traced(cat="draw")
+    def draw_heat(self):
+        self.sync_layer("heat", scene.heat_layer(self.current_heat(), self.layout, self.view_frets))
+
+    @traced(cat="draw")
+    def draw_midi(self):
+        if self.pitch_live:
+            # 음높이 분석 중: 마지막 음은 채운 원, 그 앞 몇 음은 점선 원 (음마다 같은 음높이의 모든 칸)
+            *recent, last = self.pitch_live
+            current = scene.pitch_points(self.model, last.midi)
+            before = [p for note in recent for p in scene.pitch_points(self.model, note.midi)]
+            self.sync_layer("midi", scene.midi_layer(current, before, self.layout, self.view_frets))
+            return
+        groups = self.midi_fingering.groups if self.midi_fingering is not None else ()
+        if not groups:
+            self.sync_layer("midi", {})
+            return
+        i = self.midi_index
+        upcoming = groups[i + 1].notes if i + 1 < len(groups) else ()
+        self.sync_layer("midi", scene.midi_layer(groups[i].notes, upcoming, self.layout, self.view_frets))
+
+
+# =========================
+# Compare window
+# =========================
+# 작은 보드 격자 (fretcore.grid). 넥은 PhotoImage 한 장에 한 번만 그려서 모든 보드가 create_image 로 같이 쓰고,
+# 보드마다 제목 + 점만 캔버스 아이템. 세로로 보이는 줄(+위아래 한 줄)의 보드만 아이템을 가진다.
+# 점은 작업 스레드에서 계산(grid.layers_job): 그동안은 빈 넥만 두고 도착하는 대로 그 보드만 다시 만든다.
+class BoardGridWindow:
+    def __init__(self, app, kind: str = "Modes"):
+        from fretcore.grid import GRID_KINDS
+        self.app = app
+        self.top = tk.Toplevel(app.root)
+        self.top.title("Compare")
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+
+        bar = tk.Frame(self.top)
+        bar.pack(fill="x", padx=8, pady=6)
+        tk.Label(bar, text="Boards").pack(side="left")
+        self.kind_var = tk.StringVar(value=kind)
+        self.kind_combo = ttk.Combobox(bar, values=list(GRID_KINDS), textvariable=self.kind_var,
+                                       state="readonly", width=16)
+        self.kind_combo.pack(side="left", padx=(6, 12))
+        self.kind_combo.bind("<<ComboboxSelected>>", self.rebuild)
+        self.info = tk.Label(bar, text="", fg="gray")
+        self.info.pack(side="left")
+
+        body = tk.Frame(self.top)
+        body.pack(fill="both", expand=True)
+        self.canvas = tk.Canvas(body, width=GRID_VIEW_W, height=GRID_VIEW_H, bg="white", highlightthickness=0,
+                                yscrollincrement=20, xscrollcommand=self.on_xview, yscrollcommand=self.on_yview)
+        self.vscroll = tk.Scrollbar(body, orient="vertical", command=self.canvas.yview)
+        self.vscroll.pack(side="right", fill="y")
+        self.hscroll = tk.Scrollbar(body, orient="horizontal", command=self.canvas.xview)
+        self.hscroll.pack(side="bottom", fill="x")
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(-3 if e.delta > 0 else 3, "units"))
+
+        self.grid = None
+        self.boards = set()        # 지금 아이템이 있는 보드 번호
+        self.neck_image = None
+        self.neck_layout = None
+        # 보드 점 캐시: 악기/폼이 같은 동안 종류를 바꾸거나 다시 만들어도 이어 씀
+        self.layers = {}
+        self.layers_key = None
+        self.sync_pending = False
+        self.layers_job = None     # 지금 점을 계산 중인 작업 (args[1] = 그 보드 설정들)
+        self.build_ms = 0.0
+        self.rebuild()
+
+    def close(self):
+        self.app.workers.cancel("grid")
+        self.top.destroy()
+        self.app.grid_window = None
+
+    def view_size(self):
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        # 창이 아직 안 뜬 상태면 처음 요청한 크기
+        return (w if w > 1 else GRID_VIEW_W), (h if h > 1 else GRID_VIEW_H)
+
+    @traced(cat="draw")
+    def rebuild(self, _=None):
+        from fretcore.grid import BoardGrid
+        t = time.perf_counter()
+        model = self.app.model
+        key = (model.instrument, model.form_name)
+        if key != self.layers_key:
+            self.layers, self.layers_key = {}, key
+        self.grid = BoardGrid(model, self.kind_var.get(), layers=self.layers)
+        self.grid.fit_cols(self.view_size()[0])
+        if self.grid.layout is not self.neck_layout:
+            self.draw_neck_image()
+
+        self.canvas.delete("board")
+        self.boards.clear()
+        self.app.workers.cancel("grid")   # 옛 격자(다른 키/폼)의 점은 버림
+        self.layers_job = None
+        self.apply_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.sync_visible()
+        self.build_ms = (time.perf_counter() - t) * 1000.0
+        self.update_info()
+
+    def draw_neck_image(self):
+        # 채운 사각형 몇십 개를 put 으로 한 번만 (Pillow 없이 Tk 만으로)
+        L = self.grid.layout
+        self.neck_image = tk.PhotoImage(width=int(L.width), height=self.grid.board_h)
+        for color, box in self.grid.neck_rects():
+            self.neck_image.put(color, to=box)
+        self.neck_layout = L
+
+    def apply_scrollregion(self):
+        w, h = self.grid.size
+        self.canvas.config(scrollregion=(0, 0, w, h))
+
+    def on_configure(self, _=None):
+        if self.grid is not None and self.grid.fit_cols(self.view_size()[0]):
+            # 칸 수가 바뀌면 보드 위치가 전부 바뀜
+            self.canvas.delete("board")
+            self.boards.clear()
+            self.apply_scrollregion()
+        self.schedule_sync()
+
+    def on_xview(self, first, last):
+        self.hscroll.set(first, last)
+
+    def on_yview(self, first, last):
+        self.vscroll.set(first, last)
+        self.schedule_sync()
+
+    def schedule_sync(self):
+        # 스크롤 이벤트가 몰려도 보드 만들기/지우기는 한 번
+        if not self.sync_pending:
+            self.sync_pending = True
+            self.app.root.after_idle(self.sync_visible)
+
+    @traced(cat="draw")
+    def sync_visible(self):
+        self.sync_pending = False
+        if self.grid is None:
+            return
+        top = self.canvas.canvasy(0)
+        wanted = set(self.grid.visible(top, top + self.view_size()[1]))
+        for i in self.boards - wanted:
+            self.canvas.delete(f"board:{i}")
+        for i in sorted(wanted - self.boards):
+            self.create_board(i)
+        self.boards = wanted
+        self.request_layers()
+
+    def request_layers(self):
+        # 보이는 보드 중 점이 없는 것을 작업 스레드에. 지금 작업이 이미 다 맡고 있으면 그대로 둠
+        from fretcore.grid import layers_job
+        missing = self.grid.missing(sorted(self.boards))
+        job = self.layers_job
+        if not missing or (job is not None and not job.finished and set(missing) <= set(job.args[1])):
+            return
+        self.layers_job = self.app.workers.submit("grid", layers_job, self.grid, missing,
+                                                  on_partial=self.on_layers, on_done=self.on_layers)
+
+    def on_layers(self, job, results):
+        # 도착한 점: 지금 아이템이 있는 보드 중 그 설정인 것만 다시 만듦
+        self.grid.arrived(results)
+        ready = {spec for spec, _ in results}
+        for i in sorted(self.boards):
+            if self.grid.specs[i] in ready:
+                self.canvas.delete(f"board:{i}")
+                self.create_board(i)
+        self.update_info()
+
+    def create_board(self, i: int):
+        from fretcore.grid import TITLE_H
+        grid = self.grid
+        x, y = grid.origin(i)
+        tags = ("board", f"board:{i}")
+        self.canvas.create_text(x + 4, y, anchor="nw", text=grid.specs[i].title, fill="black",
+                                font=("Arial", 9, "bold"), tags=tags)
+        y += TITLE_H
+        self.canvas.create_image(x, y, anchor="nw", image=self.neck_image, tags=tags)
+        for spec in (grid.layer(i) or {}).values():
+            for _, (x0, y0, x1, y1), opts in spec:   # 작은 보드의 점은 모두 oval
+                self.canvas.create_oval(x0 + x, y0 + y, x1 + x, y1 + y, tags=tags, **opts)
+
+    def update_info(self):
+        grid = self.grid
+        waiting = len(grid.missing(self.boards))
+        self.info.config(text=f"{grid.count}개 보드 ({grid.rows} x {grid.cols})  보이는 {len(self.boards)}개  "
+                              f"{self.build_ms:.0f}ms  점 계산 {grid.computed}개"
+                              + (f"  (계산 중 {waiting}개)" if waiting else ""))
+
+
+def main():
+    # 인자가 있으면 화면 없는 명령 모드 (export 등). 패키징된 앱의 프로세스 풀을 위해 freeze_support 필요
+    # (multiprocessing import 는 느려서 패키징된 앱에서만)
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    args = sys.argv[1:]
+    startup_report = bool(args) and args[0] == "--startup-time"
+    if args and not startup_report and not args[0].startswith("-psn"):
+        from fretcore.cli import main as cli_main
+        sys.exit(cli_main(args))
+
+    root = tk.Tk()
+    app = Fretboard12Proto1(root, startup_report=startup_report)
+    root.mainloop()
+    app.workers.shutdown()
+    if app.player is not None:
+        app.player.close()
+
+    enabled, trace_path = perf.env_setting()
+    if enabled and trace_path:
+        perf.TRACER.dump(trace_path)
+
+
+if __name__ == "__main__":
+    main()
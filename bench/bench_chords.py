@@ -0,0 +1,100 @@
+# 코드 기호/차트 읽기: 가짜 리드 시트 N 개(마디줄, 가사 위 코드줄, ChordPro 섞음)를 만들어
+# 처음 읽기(기호 캐시 비움), 다시 읽기(캐시 채워짐), 기호 하나 분석 시간(캐시 없이)
+#   python bench/bench_chords.py [--files 5000]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore import chordsym  # noqa: E402
+
+ROOTS = ("C", "Db", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B")
+SUFFIXES = ("", "m", "7", "maj7", "m7", "m7b5", "dim7", "6", "m6", "9", "m9", "13", "7b9", "7#9", "7alt",
+            "sus4", "7sus4", "add9", "6/9", "maj9", "aug", "7#5", "m(maj7)", "ø7", "5")
+# 진행 모양 (근음 간격, 접미): ii-V-I, 블루스, 팝 등
+PATTERNS = (
+    ((2, "m7"), (7, "7"), (0, "maj7")),
+    ((0, "7"), (5, "7"), (0, "7"), (7, "7")),
+    ((0, ""), (7, ""), (9, "m"), (5, "")),
+    ((11, "m7b5"), (4, "7alt"), (9, "m7"), (9, "m7")),
+    ((0, "6/9"), (9, "m9"), (2, "m7"), (7, "13")),
+)
+LYRICS = ("the night is long and the road is wide", "I never knew a love like this before",
+          "A day goes by and nothing ever changes", "hold on to me", "la la la")
+
+
+def fake_chart(rng: random.Random) -> str:
+    key = rng.randrange(12)
+    style = rng.randrange(3)
+    lines = [f"Song {rng.randrange(10 ** 6)}", f"Key: {ROOTS[key]}", ""]
+    for section in ("Intro", "Verse", "Chorus", "Verse", "Bridge", "Chorus"):
+        lines.append(f"[{section}]")
+        for _ in range(rng.randrange(2, 6)):
+            bars = []
+            for interval, suffix in rng.choice(PATTERNS):
+                if rng.random() < 0.15:
+                    suffix = rng.choice(SUFFIXES)
+                bars.append(ROOTS[(key + interval) % 12] + suffix)
+            if rng.random() < 0.1:
+                # 5도 베이스 (b5/#5 코드면 오류로 잡힘)
+                bars[-1] += "/" + ROOTS[(key + interval + 7) % 12]
+            if rng.random() < 0.02:
+                bars[0] = "Xm7"   # 오타
+            if style == 0:
+                lines.append("| " + " | ".join(bars) + " |")
+            elif style == 1:
+                lines.append("   ".join(bars))
+                lines.append(rng.choice(LYRICS))
+            else:
+                words = rng.choice(LYRICS).split()
+                lines.append(" ".join(f"[{bars[i]}]{w}" if i < len(bars) else w for i, w in enumerate(words)))
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def make_library(root: str, files: int, seed: int = 1):
+    rng = random.Random(seed)
+    for i in range(files):
+        folder = os.path.join(root, f"book{i % 20:02d}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"chart{i:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(fake_chart(rng))
+
+
+def timed(label, root):
+    t = time.perf_counter()
+    charts, stats = chordsym.load_library(root)
+    ms = (time.perf_counter() - t) * 1000.0
+    print(f"  {label:<14}{ms:8.1f}ms  {stats['charts']} charts  {stats['chords']} chords  "
+          f"{stats['errors']} errors  {stats['symbols']} cached  {stats['cache_hits']} hits")
+    return charts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=5000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_library(tmp, args.files)
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(tmp) for f in fs) / 1024 / 1024
+        print(f"{args.files} charts, {size:.1f}MB")
+        chordsym._parse_cached.cache_clear()
+        timed("cold", tmp)
+        charts = timed("warm", tmp)
+
+    symbols = sorted({chordsym.symbol_text(c) for chart in charts for c in chart.chords})
+    t = time.perf_counter()
+    for _ in range(20):
+        for s in symbols:
+            chordsym._parse(s)
+    us = (time.perf_counter() - t) * 1e6 / (20 * len(symbols))
+    print(f"  uncached parse {us:8.1f}us per symbol ({len(symbols)} distinct)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# MIDI 읽기 + 운지 배정 시간 (임의로 만든 곡: 멜로디 + 가끔 화음, 두 트랙 + 템포 변화)
+#   python bench/bench_fingering.py [--notes 10000]
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore.instruments import PRESETS  # noqa: E402
+from fretcore.midi import assign_fingering, group_candidates, read_notes  # noqa: E402
+
+DIVISION = 480
+
+
+def varlen(value: int) -> bytes:
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def track(events) -> bytes:
+    # events: (tick, bytes) 정렬됨
+    body = bytearray()
+    last = 0
+    for tick, data in events:
+        body += varlen(tick - last) + data
+        last = tick
+    body += varlen(0) + b"\xFF\x2F\x00"
+    return b"MTrk" + struct.pack(">I", len(body)) + bytes(body)
+
+
+def make_song(count: int, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    tempo = [(0, b"\xFF\x51\x03" + (500000).to_bytes(3, "big")),
+             (DIVISION * 64, b"\xFF\x51\x03" + (400000).to_bytes(3, "big"))]
+    events = []
+    tick = 0
+    pitch = 60
+    made = 0
+    scale = (0, 2, 4, 5, 7, 9, 11)
+    while made < count:
+        length = rng.choice((DIVISION // 4, DIVISION // 2, DIVISION))
+        pitch = max(45, min(81, pitch + rng.choice((-4, -3, -2, -1, 1, 2, 3, 4))))
+        chord = [pitch]
+        if rng.random() < 0.15:
+            root = pitch - 12
+            chord = [root + scale[i] for i in (0, 2, 4)] + [pitch]
+        for p in chord:
+            events.append((tick, 1, bytes((0x90, p, 90))))
+            events.append((tick + length, 0, bytes((0x80, p, 0))))
+        made += len(chord)
+        tick += length
+    events.sort()
+    header = b"MThd" + struct.pack(">IHHH", 6, 1, 2, DIVISION)
+    return header + track(tempo) + track([(t, d) for t, _, d in events])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--notes", type=int, default=10000)
+    args = ap.parse_args()
+
+    data = make_song(args.notes)
+    for name in ("Guitar 6 (Standard)", "Guitar 8 (Standard)", "Bass 4 (Standard)"):
+        instrument = PRESETS[name]
+        group_candidates.cache_clear()
+        t = time.perf_counter()
+        notes = read_notes(data)
+        parse_ms = (time.perf_counter() - t) * 1e3
+        fingering = assign_fingering(notes, instrument)
+        warm = assign_fingering(notes, instrument)
+        st = fingering.stats()
+        print(f"{instrument.name}: {len(data) / 1024:.0f}KB {len(notes)} notes  parse {parse_ms:.1f}ms  "
+              f"fingering cold {st['elapsed_ms']:.1f}ms warm {warm.elapsed_ms:.1f}ms  "
+              f"groups {st['groups']} unplayable {st['unplayable']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# 탭 모음 읽기: 가짜 탭 N 개(6/7현, 4현 베이스 섞음)를 만들어 처음 읽기(프로세스 1개 / 여러 개),
+# 바뀐 것 없이 다시, 1% 고친 뒤, 사용 빈도 레이어 계산 시간
+#   python bench/bench_tabs.py [--files 3000] [--jobs 8]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore import scene, tabs  # noqa: E402
+from fretcore.instruments import PRESETS  # noqa: E402
+from fretcore.layout import layout_for  # noqa: E402
+
+LABELS = {4: "GDAE", 6: "eBGDAE", 7: "eBGDAEB"}
+SCALE = (0, 2, 4, 5, 7, 9, 11)
+# 으뜸음/5도/3도가 많이 나오게 (실제 곡처럼)
+DEGREE_WEIGHTS = (6, 2, 4, 3, 5, 2, 1)
+
+
+def fake_tab(rng: random.Random, strings: int, staves: int) -> str:
+    # 한 곡 = 한 조 + 한 포지션(12프렛 안)에서 움직이는 리프, 보표 사이 가사/코드 줄
+    key = rng.randrange(12)
+    open_pc = PRESETS[{4: "Bass 4 (Standard)", 6: "Guitar 6 (Standard)", 7: "Guitar 7 (Standard)"}[strings]].open_pc
+    lines = [f"Song {rng.randrange(10 ** 6)} - tabbed by someone", "Tuning: standard", ""]
+    pos = rng.choice((0, 0, 3, 5, 7, 12))
+    for _ in range(staves):
+        cols = [["-"] * 64 for _ in range(strings)]
+        for c in range(2, 62, 3):
+            s = rng.randrange(strings)
+            pc = (key + rng.choices(SCALE, DEGREE_WEIGHTS)[0]) % 12
+            fret = pos + (pc - open_pc[s] - pos) % 12
+            text = str(fret)
+            cols[s][c:c + len(text)] = list(text)
+        lines.append("[Verse]   G   D   Em   C")
+        for s in range(strings):
+            lines.append(f"{LABELS[strings][s]}|{''.join(cols[s])}|")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def make_corpus(root: str, files: int, seed: int = 1):
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        folder = os.path.join(root, f"artist{i % 50:02d}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"song{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(fake_tab(rng, rng.choice((6, 6, 6, 7, 4)), rng.randrange(8, 40)))
+        paths.append(path)
+    return paths
+
+
+def timed(label, root, jobs, cache):
+    t = time.perf_counter()
+    corpus, stats = tabs.ingest(root, jobs, directory=cache)
+    ms = (time.perf_counter() - t) * 1000.0
+    print(f"  {label:<18}{ms:8.1f}ms  parsed {stats['parsed']:>5}  cached {stats['reused']:>5}  "
+          f"notes {stats['notes']}")
+    return corpus
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=3000)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, cache = os.path.join(tmp, "tabs"), os.path.join(tmp, "cache")
+        paths = make_corpus(root, args.files)
+        size = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+        print(f"{args.files} tabs, {size:.1f}MB")
+
+        cache_file = tabs.cache_path(root, cache)
+        timed("cold, 1 process", root, 1, cache)
+        os.remove(cache_file)
+        timed(f"cold, {args.jobs} processes", root, args.jobs, cache)
+        print(f"  cache file {os.path.getsize(cache_file) / 1024:.0f}KB")
+        timed("unchanged", root, args.jobs, cache)
+        rng = random.Random(2)
+        for path in rng.sample(paths, max(1, args.files // 100)):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(fake_tab(rng, 6, 2))
+        corpus = timed("1% edited", root, args.jobs, cache)
+
+        inst = PRESETS["Guitar 6 (Standard)"].with_options(max_fret=24)
+        layout = layout_for(inst.strings, inst.frets, 0, 1800, 300)
+        t = time.perf_counter()
+        for key in range(12):
+            scene.heat_layer(tabs.heat_counts(corpus, inst, key, {0, 2, 4, 5, 7, 9, 11}), layout)
+        print(f"  heat layer        {(time.perf_counter() - t) * 1000.0 / 12:8.2f}ms per key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# 집합(set) 기반 기존 경로 vs 비트마스크 엔진 비교용 마이크로 벤치마크
+#   python bench/bench_theory.py [--repeat N]
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore.model import (  # noqa: E402
+    STANDARD_OPEN_PC, build_scale_library, build_tension_library, build_triad_library,
+)
+from fretcore.theory import PositionIndex, TheoryTables, mask_to_pcs  # noqa: E402
+
+OPEN_PC = STANDARD_OPEN_PC
+MAX_FRET = 12
+
+SCALES = build_scale_library()
+TRIADS = build_triad_library()
+TENSIONS = build_tension_library()
+
+
+# ----- 기존 방식: 이벤트마다 set 을 새로 만들고 모든 줄 x 프렛을 훑음 -----
+def set_scale(tonic, intervals, open_pc=OPEN_PC, max_fret=MAX_FRET):
+    allowed = set((tonic + i) % 12 for i in intervals)
+    pts = set()
+    for s in range(len(open_pc)):
+        for f in range(max_fret + 1):
+            if (open_pc[s] + f) % 12 in allowed:
+                pts.add((s, f))
+    return allowed, pts
+
+
+def set_chord(tonic, triad, extra, open_pc=OPEN_PC, max_fret=MAX_FRET):
+    intervals = sorted(set([i % 12 for i in (triad + extra)]))
+    return set_scale(tonic, intervals, open_pc, max_fret)
+
+
+# ----- 비트마스크 엔진 -----
+def mask_scale(tables, index, name, tonic):
+    mask = tables.scale_mask(name, tonic)
+    return mask_to_pcs(mask), index.points_for_mask(mask)
+
+
+def mask_chord(tables, index, triad, tension, tonic):
+    mask = tables.chord_mask(triad, tension, tonic)
+    return mask_to_pcs(mask), index.points_for_mask(mask)
+
+
+def check(tables, index):
+    for tonic in range(12):
+        for name, iv in SCALES.items():
+            a, p = set_scale(tonic, iv)
+            b, q = mask_scale(tables, index, name, tonic)
+            assert a == set(b) and p == q, (tonic, name)
+        for t, tiv in TRIADS.items():
+            for n, niv in TENSIONS.items():
+                a, p = set_chord(tonic, tiv, niv)
+                b, q = mask_chord(tables, index, t, n, tonic)
+                assert a == set(b) and p == q, (tonic, t, n)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="set 기반 vs 비트마스크 엔진 마이크로 벤치마크")
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    tables = TheoryTables(SCALES, TRIADS, TENSIONS)
+    index = PositionIndex(OPEN_PC, MAX_FRET)
+    check(tables, index)
+
+    def run_sets():
+        for tonic in range(12):
+            for iv in SCALES.values():
+                set_scale(tonic, iv)
+            for tiv in TRIADS.values():
+                for niv in TENSIONS.values():
+                    set_chord(tonic, tiv, niv)
+
+    def run_masks():
+        for tonic in range(12):
+            for name in SCALES:
+                mask_scale(tables, index, name, tonic)
+            for t in TRIADS:
+                for n in TENSIONS:
+                    mask_chord(tables, index, t, n, tonic)
+
+    ops = 12 * (len(SCALES) + len(TRIADS) * len(TENSIONS))
+    build = min(timeit.repeat(lambda: (TheoryTables(SCALES, TRIADS, TENSIONS), PositionIndex(OPEN_PC, MAX_FRET)),
+                              number=10, repeat=3)) / 10
+    t_set = min(timeit.repeat(run_sets, number=args.repeat, repeat=3)) / (args.repeat * ops)
+    t_mask = min(timeit.repeat(run_masks, number=args.repeat, repeat=3)) / (args.repeat * ops)
+
+    print(f"ops per pass      : {ops}")
+    print(f"table build (1x)  : {build * 1e6:8.1f} us")
+    print(f"set-based apply   : {t_set * 1e6:8.2f} us/op")
+    print(f"bitmask apply     : {t_mask * 1e6:8.2f} us/op")
+    print(f"speedup           : {t_set / t_mask:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
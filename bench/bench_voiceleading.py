@@ -0,0 +1,71 @@
+# 보이스 리딩 풀이 시간: 64마디 진행 처음 풀기 / 그대로 다시 / 마디 하나 고친 뒤 (앞·가운데·끝)
+#   python bench/bench_voiceleading.py [--bars 64] [--instrument "Guitar 7 (Standard)"]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore.instruments import PRESETS  # noqa: E402
+from fretcore.model import NOTE_FLAT, BoardModel  # noqa: E402
+from fretcore.progression import parse_progression  # noqa: E402
+from fretcore.voiceleading import VoiceLeader  # noqa: E402
+from fretcore.voicing import chord_forms, find_voicings  # noqa: E402
+
+# (루트 이동(반음), 트라이어드, 텐션) -- ii-V-I 와 흔한 대리 코드
+CHORDS = [(2, "m", "7"), (7, "M", "7"), (0, "M", "maj7"), (9, "m", "7"), (5, "M", "maj7"), (4, "m", "7"),
+          (10, "M", "7"), (0, "M", "6"), (2, "m", "9"), (7, "M", "9")]
+
+
+def make_tune(bars: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    key = 0
+    out = []
+    for i in range(bars):
+        if i % 8 == 0:
+            key = rng.randrange(12)
+        move, triad, tension = rng.choice(CHORDS)
+        out.append(f"{NOTE_FLAT[(key + move) % 12]} {triad} {tension}")
+    return " | ".join(out)
+
+
+def timed(leader, steps):
+    t = time.perf_counter()
+    lead = leader.solve(steps)
+    return (time.perf_counter() - t) * 1000.0, lead
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bars", type=int, default=64)
+    ap.add_argument("--instrument", default="Guitar 6 (Standard)", choices=list(PRESETS))
+    args = ap.parse_args()
+
+    model = BoardModel(PRESETS[args.instrument])
+    steps = parse_progression(make_tune(args.bars), model)
+    find_voicings.cache_clear()
+    chord_forms.cache_clear()
+    leader = VoiceLeader(model)
+
+    ms, lead = timed(leader, steps)
+    print(f"{args.instrument}, {len(steps)} bars")
+    print(f"  cold       {ms:7.1f}ms  cost {lead.cost:.1f}  {lead.stats}")
+    ms, lead = timed(leader, steps)
+    print(f"  unchanged  {ms:7.1f}ms  resolved {lead.stats['resolved']}")
+    other = parse_progression("F# m 7 1st", model)[0]
+    for where in (len(steps) - 1, len(steps) // 2, 0):
+        edited = list(steps)
+        edited[where] = other
+        ms, lead = timed(leader, edited)
+        st = lead.stats
+        print(f"  edit bar {where + 1:<3}{ms:7.1f}ms  resolved {st['resolved']}  pairs computed {st['pairs_computed']} "
+              f"reused {st['pairs_reused']}  pruned {st['pruned']}")
+        timed(leader, steps)   # 되돌리기
+    common = sum(len(c) for c in lead.common)
+    print(f"  common tones kept: {common} over {len(steps) - 1} changes")
+
+
+if __name__ == "__main__":
+    main()
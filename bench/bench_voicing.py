@@ -0,0 +1,52 @@
+# 보이싱 검색 지연 시간 (라이브러리의 모든 트라이어드 x 텐션 x 전위)
+#   python bench/bench_voicing.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fretcore.model import (  # noqa: E402
+    NONE, STANDARD_OPEN_PC, build_inversion_library, build_tension_library, build_triad_library,
+)
+from fretcore.theory import TheoryTables, mask_to_pcs  # noqa: E402
+from fretcore.voicing import chord_forms, find_voicings  # noqa: E402
+
+BOARDS = {
+    "6-string x 12": (tuple(STANDARD_OPEN_PC), 12),
+    "7-string x 24": (tuple(STANDARD_OPEN_PC) + (11,), 24),
+}
+
+
+def main():
+    tables = TheoryTables({}, build_triad_library(), build_tension_library())
+    inversions = build_inversion_library()
+    for label, (tuning, max_fret) in BOARDS.items():
+        find_voicings.cache_clear()
+        chord_forms.cache_clear()
+        times = []
+        worst = (0.0, "")
+        for triad in tables.triads:
+            for tension in [NONE] + list(tables.tensions):
+                mask = tables.chord_mask(triad, tension, 0)
+                rels = mask_to_pcs(mask)
+                for inv, idx in inversions.items():
+                    if idx >= len(rels):
+                        continue
+                    t = time.perf_counter()
+                    chord_forms(tuning, max_fret, mask, 0, rels[idx])
+                    dt = time.perf_counter() - t
+                    times.append(dt)
+                    if dt > worst[0]:
+                        worst = (dt, f"C{triad} {tension} {inv}")
+        t = time.perf_counter()
+        mask = tables.chord_mask("M", "alt (b9 #9 b5 #5)", 0)
+        chord_forms(tuning, max_fret, mask, 0, 0)
+        memo = time.perf_counter() - t
+        times.sort()
+        print(f"{label}: {len(times)} chords  median {times[len(times) // 2] * 1e3:.1f}ms  "
+              f"max {worst[0] * 1e3:.1f}ms ({worst[1]})  memo hit {memo * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+# 화면 없이 9retboards.py 를 돌리기 위한 가짜 tkinter (기록하는 캔버스 + 아무것도 안 하는 위젯)
+#   app, root = load_app()         -> Fretboard12Proto1 인스턴스와 가짜 루트
+#   root.flush()                   -> after_idle / after 예약을 모두 실행 (한 "프레임")
+# 캔버스는 아이템/쌓임 순서/태그를 실제처럼 관리하고 create / delete / coords / itemconfig 횟수를 센다.
+import importlib
+import os
+import sys
+import types
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RecordingCanvas:
+    def __init__(self, master=None, **kw):
+        self.kw = dict(kw)
+        self.items = {}
+        self.order = []
+        self.bindings = {}
+        self.next_id = 1
+        self.counts = {"create": 0, "delete": 0, "coords": 0, "itemconfig": 0}
+        self.view_x = 0.0
+        self.view_y = 0.0
+
+    # ----- items -----
+    def _create(self, kind, coords, kw):
+        item = self.next_id
+        self.next_id += 1
+        tags = kw.get("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        self.items[item] = {"kind": kind, "coords": list(coords), "opts": dict(kw), "tags": set(tags)}
+        self.order.append(item)
+        self.counts["create"] += 1
+        return item
+
+    def create_rectangle(self, *coords, **kw):
+        return self._create("rect", coords, kw)
+
+    def create_oval(self, *coords, **kw):
+        return self._create("oval", coords, kw)
+
+    def create_line(self, *coords, **kw):
+        return self._create("line", coords, kw)
+
+    def create_text(self, *coords, **kw):
+        return self._create("text", coords, kw)
+
+    def create_image(self, *coords, **kw):
+        return self._create("image", coords, kw)
+
+    def _resolve(self, tag):
+        if isinstance(tag, int):
+            return [tag] if tag in self.items else []
+        if tag == "all":
+            return list(self.order)
+        return [i for i in self.order if tag in self.items[i]["tags"]]
+
+    def delete(self, *tags):
+        for tag in tags:
+            for item in self._resolve(tag):
+                del self.items[item]
+                self.order.remove(item)
+                self.counts["delete"] += 1
+
+    def itemconfig(self, tag, **kw):
+        for item in self._resolve(tag):
+            self.items[item]["opts"].update(kw)
+            self.counts["itemconfig"] += 1
+
+    itemconfigure = itemconfig
+
+    def coords(self, tag, *coords):
+        ids = self._resolve(tag)
+        if not coords:
+            return self.items[ids[0]]["coords"] if ids else []
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        for item in ids:
+            self.items[item]["coords"] = list(coords)
+            self.counts["coords"] += 1
+
+    def move(self, tag, dx, dy):
+        for item in self._resolve(tag):
+            cs = self.items[item]["coords"]
+            self.items[item]["coords"] = [v + (dx if k % 2 == 0 else dy) for k, v in enumerate(cs)]
+            self.counts["coords"] += 1
+
+    def tag_lower(self, tag, below=None):
+        ids = self._resolve(tag)
+        for item in ids:
+            self.order.remove(item)
+        pos = 0 if below is None else self.order.index(self._resolve(below)[0])
+        self.order[pos:pos] = ids
+
+    def tag_raise(self, tag, above=None):
+        ids = self._resolve(tag)
+        for item in ids:
+            self.order.remove(item)
+        pos = len(self.order) if above is None else self.order.index(self._resolve(above)[-1]) + 1
+        self.order[pos:pos] = ids
+
+    def find_all(self):
+        return tuple(self.order)
+
+    def find_withtag(self, tag):
+        return tuple(self._resolve(tag))
+
+    def type(self, item):
+        return self.items[item]["kind"]
+
+    # ----- widget / view -----
+    def bind(self, event, fn, add=None):
+        self.bindings[event] = fn
+
+    def pack(self, **kw):
+        pass
+
+    def grid(self, **kw):
+        pass
+
+    def config(self, **kw):
+        self.kw.update(kw)
+
+    configure = config
+
+    def cget(self, key):
+        return self.kw.get(key)
+
+    def winfo_width(self):
+        return int(self.kw.get("width", 1))
+
+    def winfo_height(self):
+        return int(self.kw.get("height", 1))
+
+    def canvasx(self, x):
+        return x + self.view_x
+
+    def canvasy(self, y):
+        return y + self.view_y
+
+    def _region_w(self):
+        region = self.kw.get("scrollregion")
+        return region[2] if region else self.winfo_width()
+
+    def _region_h(self):
+        region = self.kw.get("scrollregion")
+        return region[3] if region else self.winfo_height()
+
+    def xview(self, *args):
+        if args:
+            return
+        w = self._region_w()
+        return self.view_x / w, min(1.0, (self.view_x + self.winfo_width()) / w)
+
+    def xview_moveto(self, fraction):
+        w = self._region_w()
+        self.view_x = max(0.0, min(fraction * w, w - self.winfo_width()))
+        self._scrolled()
+
+    def xview_scroll(self, n, what):
+        self.xview_moveto((self.view_x + n * 20) / self._region_w())
+
+    def yview(self, *args):
+        if args:
+            return
+        h = self._region_h()
+        return self.view_y / h, min(1.0, (self.view_y + self.winfo_height()) / h)
+
+    def yview_moveto(self, fraction):
+        h = self._region_h()
+        self.view_y = max(0.0, min(fraction * h, h - self.winfo_height()))
+        cb = self.kw.get("yscrollcommand")
+        if cb:
+            cb(*self.yview())
+
+    def yview_scroll(self, n, what):
+        self.yview_moveto((self.view_y + n * int(self.kw.get("yscrollincrement", 20))) / self._region_h())
+
+    def _scrolled(self):
+        cb = self.kw.get("xscrollcommand")
+        if cb:
+            cb(*self.xview())
+
+    def focus_set(self):
+        pass
+
+
+class FakeWidget:
+    def __init__(self, master=None, **kw):
+        self.kw = dict(kw)
+        self.bindings = {}
+
+    def pack(self, **kw):
+        pass
+
+    def grid(self, **kw):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def config(self, **kw):
+        self.kw.update(kw)
+
+    configure = config
+
+    def cget(self, key):
+        return self.kw.get(key)
+
+    def bind(self, event, fn, add=None):
+        self.bindings[event] = fn
+
+    def set(self, *args):
+        self.kw["_set"] = args
+
+    def get(self):
+        return self.kw.get("_value", "")
+
+    def __setitem__(self, key, value):
+        self.kw[key] = value
+
+    def __getitem__(self, key):
+        return self.kw.get(key)
+
+    def destroy(self):
+        pass
+
+    def place(self, **kw):
+        self.kw["_placed"] = True
+
+    def place_forget(self):
+        self.kw["_placed"] = False
+
+    def lift(self, *args):
+        pass
+
+    def select_range(self, *args):
+        pass
+
+    def icursor(self, index):
+        self.kw["_cursor"] = index
+
+    def focus_set(self):
+        pass
+
+
+class FakeListbox(FakeWidget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.rows = []
+        self.selected = set()
+
+    def delete(self, first, last=None):
+        del self.rows[first:None if last == "end" else (last or first) + 1]
+
+    def insert(self, index, *items):
+        pos = len(self.rows) if index == "end" else index
+        self.rows[pos:pos] = items
+
+    def size(self):
+        return len(self.rows)
+
+    def selection_clear(self, first, last=None):
+        self.selected.clear()
+
+    def selection_set(self, first, last=None):
+        self.selected.add(first)
+
+    def curselection(self):
+        return tuple(sorted(self.selected))
+
+    def see(self, index):
+        pass
+
+    def nearest(self, y):
+        return min(max(0, len(self.rows) - 1), int(y // 16))
+
+
+class FakePhotoImage(FakeWidget):
+    # put(색, to=(x0, y0, x1, y1)) 는 횟수만 셈
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.puts = 0
+
+    def put(self, data, to=None):
+        self.puts += 1
+
+    def width(self):
+        return int(self.kw.get("width", 0))
+
+    def height(self):
+        return int(self.kw.get("height", 0))
+
+
+class FakeToplevel(FakeWidget):
+    def title(self, *args):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+
+class FakeVar:
+    def __init__(self, master=None, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def trace_add(self, *args):
+        pass
+
+
+class FakeRoot(FakeWidget):
+    def __init__(self):
+        super().__init__()
+        self.idle = []
+        self.timers = []
+
+    def title(self, *args):
+        pass
+
+    def geometry(self, *args):
+        pass
+
+    def minsize(self, *args):
+        pass
+
+    def protocol(self, *args):
+        pass
+
+    def after_idle(self, fn, *args):
+        self.idle.append((fn, args))
+        return f"idle#{len(self.idle)}"
+
+    def after(self, ms, fn=None, *args):
+        if fn is None:
+            return None
+        self.timers.append((ms, fn, args))
+        return f"after#{len(self.timers)}"
+
+    def after_cancel(self, token):
+        pass
+
+    def update_idletasks(self):
+        self.flush()
+
+    update = update_idletasks
+
+    def flush(self, timers: bool = True, limit: int = 10000, max_ms=None):
+        # 예약된 콜백을 모두 실행. 시간은 흐르지 않으므로 after(ms) 도 바로 실행.
+        # max_ms 를 주면 그보다 긴 after(ms) 는 남겨 둠 (한가할 때 하는 일은 빼고 재기)
+        n = 0
+        while True:
+            if self.idle:
+                fn, args = self.idle.pop(0)
+            else:
+                due = [i for i, (ms, _, _) in enumerate(self.timers) if max_ms is None or ms <= max_ms]
+                if not timers or not due:
+                    break
+                _, fn, args = self.timers.pop(due[0])
+            fn(*args)
+            n += 1
+            if n >= limit:
+                break
+        return n
+
+    def mainloop(self):
+        pass
+
+
+def make_modules():
+    tk = types.ModuleType("tkinter")
+    tk.Canvas = RecordingCanvas
+    for name in ["Frame", "Label", "Button", "Entry", "Scrollbar", "Scale", "Checkbutton",
+                 "Spinbox", "Text"]:
+        setattr(tk, name, type(name, (FakeWidget,), {}))
+    tk.Listbox = FakeListbox
+    tk.PhotoImage = FakePhotoImage
+    tk.Toplevel = FakeToplevel
+    tk.StringVar = tk.IntVar = tk.BooleanVar = tk.DoubleVar = FakeVar
+    tk.Tk = FakeRoot
+    tk.TclError = RuntimeError
+    tk.END = "end"
+
+    ttk = types.ModuleType("tkinter.ttk")
+    for name in ["Combobox", "Frame", "Label", "Button", "Scrollbar", "Spinbox", "Checkbutton", "Entry",
+                 "Progressbar"]:
+        setattr(ttk, name, type(name, (FakeWidget,), {}))
+    tk.ttk = ttk
+    return tk, ttk
+
+
+def load_module():
+    # tkinter 가 없거나 화면이 없어도 되도록 import 하는 동안만 가짜 모듈로 바꿔 끼움
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    tk, ttk = make_modules()
+    saved = {name: sys.modules.get(name) for name in ("tkinter", "tkinter.ttk", "9retboards")}
+    sys.modules["tkinter"], sys.modules["tkinter.ttk"] = tk, ttk
+    sys.modules.pop("9retboards", None)
+    try:
+        return importlib.import_module("9retboards")
+    finally:
+        for name, mod in saved.items():
+            if name == "9retboards":
+                continue
+            if mod is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = mod
+
+
+def load_app(module=None, **options):
+    module = module or load_module()
+    root = module.tk.Tk()
+    app = module.Fretboard12Proto1(root, **options)
+    root.flush()
+    return app, root
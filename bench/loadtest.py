@@ -0,0 +1,144 @@
+# 다이어그램 서버(fretcore/server.py) 부하 테스트. 연결 N 개가 keep-alive 로 요청을 계속 보내고
+# 초당 요청 수와 지연 시간(p50/p90/p99/max), 상태 코드 수를 출력한다.
+#   python bench/loadtest.py --spawn                      # 서버를 따로 띄워서 (빈 캐시부터)
+#   python bench/loadtest.py --port 8765 --seconds 10     # 이미 떠 있는 서버에
+#   python bench/loadtest.py --spawn --distinct 2000      # 서로 다른 URL 수 (캐시 크기보다 크면 렌더링이 섞임)
+# URL 은 키 x 스케일 x 코드 조합에서 고정 시드로 골라서 매번 같은 순서로 보낸다.
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.suite import percentile  # noqa: E402
+from fretcore.export import key_slug  # noqa: E402
+from fretcore.model import (  # noqa: E402
+    KEY_ITEMS, build_inversion_library, build_scale_library, build_tension_library, build_triad_library,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_urls(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    keys = [key_slug(k) for k in KEY_ITEMS]
+    scales = ["none"] + list(build_scale_library())
+    triads = ["none"] + list(build_triad_library())
+    tensions = ["none"] + list(build_tension_library())
+    inversions = list(build_inversion_library())
+    urls = set()
+    while len(urls) < count:
+        params = {"key": rng.choice(keys), "scale": rng.choice(scales)}
+        triad = rng.choice(triads)
+        if triad != "none":
+            params.update(triad=triad, tension=rng.choice(tensions), inversion=rng.choice(inversions[:3]),
+                          form=rng.choice(["all", "1", "2", "3"]))
+        urls.add("/board.svg?" + urlencode(params))
+    return sorted(urls)
+
+
+async def client(host, port, urls, deadline, latencies, statuses, revalidate):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for url in urls:
+            if time.perf_counter() > deadline:
+                break
+            extra = f"If-None-Match: {etags[url]}\r\n" if revalidate and url in etags else ""
+            t = time.perf_counter()
+            writer.write(f"GET {url} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode("latin-1"))
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            status = int(lines[0].split(" ")[1])
+            length = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                name = name.lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "etag":
+                    etags[url] = value.strip()
+            if length:
+                await reader.readexactly(length)
+            latencies.append((time.perf_counter() - t) * 1000.0)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, urls, connections, seconds, revalidate):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + seconds
+    streams = []
+    for i in range(connections):
+        # 연결마다 시작 위치를 달리해서 같은 URL 이 한꺼번에 몰리지 않게
+        start = i * len(urls) // connections
+        streams.append(itertools.islice(itertools.cycle(urls[start:] + urls[:start]), 10 ** 9))
+    t = time.perf_counter()
+    await asyncio.gather(*(client(host, port, s, deadline, latencies, statuses, revalidate) for s in streams))
+    return time.perf_counter() - t, latencies, statuses
+
+
+def wait_for_port(host, port, timeout=10.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            with socket.create_connection((host, port), 0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit(f"server did not start on {host}:{port}")
+
+
+def free_port(host) -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def report(label, elapsed, latencies, statuses):
+    n = len(latencies)
+    codes = "  ".join(f"{code}:{count}" for code, count in sorted(statuses.items()))
+    print(f"{label:<12}{n:>8} req  {n / elapsed:>8.0f} req/s   p50 {percentile(latencies, 0.5):.2f}ms  "
+          f"p90 {percentile(latencies, 0.9):.2f}ms  p99 {percentile(latencies, 0.99):.2f}ms  "
+          f"max {max(latencies, default=0):.2f}ms   {codes}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load test for the diagram server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, help="server port (default 8765, or a free port with --spawn)")
+    ap.add_argument("--spawn", action="store_true", help="start `python -m fretcore serve` for the run")
+    ap.add_argument("--connections", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=5.0, help="duration of each phase")
+    ap.add_argument("--distinct", type=int, default=300, help="number of distinct URLs")
+    args = ap.parse_args(argv)
+
+    port = args.port or (free_port(args.host) if args.spawn else 8765)
+    proc = None
+    if args.spawn:
+        proc = subprocess.Popen([sys.executable, "-m", "fretcore", "serve", "--host", args.host,
+                                 "--port", str(port)], cwd=ROOT_DIR)
+    try:
+        wait_for_port(args.host, port)
+        urls = make_urls(args.distinct)
+        # 1) 빈 캐시부터(처음 한 바퀴는 렌더링) 2) 다시 받기 3) ETag 로 다시 확인(304)
+        for label, revalidate in (("cold+warm", False), ("warm", False), ("revalidate", True)):
+            elapsed, latencies, statuses = asyncio.run(
+                run(args.host, port, urls, args.connections, args.seconds, revalidate))
+            report(label, elapsed, latencies, statuses)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+# 화면 없는 UI 벤치마크: 가짜 캔버스(bench/fake_tk.py)로 앱을 띄우고 시나리오를 돌려
+# 조작별 지연 시간(p50/p90/p99/max)과 캔버스 아이템 수를 잰다.
+#   python bench/suite.py                       # 전체 실행, 표 출력
+#   python bench/suite.py --save                # 결과를 기준값(bench/baseline.json)으로 저장
+#   python bench/suite.py --compare             # 기준값과 비교, 느려졌으면 종료 코드 1
+#   python bench/suite.py --only clicks large --quick
+# 한 조작 = 핸들러 호출 + 예약된 프레임 처리(root.flush). 아이템 수는 시간과 달리 결정적이라 그대로 비교.
+# 작업 스레드는 workers=0 (바로 실행)으로 띄워 조작 하나에 드는 계산 전체를 잰다. workers 시나리오만 실제 스레드.
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.fake_tk import load_app, load_module  # noqa: E402
+from fretcore.grid import GRID_KINDS  # noqa: E402
+from fretcore.model import KEY_ITEMS, NONE  # noqa: E402
+from fretcore.voicing import chord_forms, find_voicings  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BASELINE_VERSION = 1
+
+# 시간 비교 여유: 상대 threshold + 절대 FLOOR_MS (아주 짧은 조작의 잡음 흡수)
+FLOOR_MS = 0.05
+# 조작 하나로 재는 예약 콜백: 프레임/호버 묶음(after 16~17ms)까지. 더 늦은 것(미리 계산 등)은 한가할 때 일
+OP_TIMER_MS = 20
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+
+class Recorder:
+    def __init__(self):
+        self.ops = {}
+
+    def measure(self, name: str, app, root, fn, *args):
+        canvas = app.canvas
+        created = canvas.counts["create"]
+        gc.disable()   # GC 멈춤이 우연히 걸린 조작만 튀지 않도록
+        try:
+            t = time.perf_counter()
+            fn(*args)
+            root.flush(max_ms=OP_TIMER_MS)
+            dt = (time.perf_counter() - t) * 1000.0
+        finally:
+            gc.enable()
+        op = self.ops.setdefault(name, {"ms": [], "created": [], "alive": 0})
+        op["ms"].append(dt)
+        op["created"].append(canvas.counts["create"] - created)
+        op["alive"] = max(op["alive"], len(canvas.items))
+        return dt
+
+    def summary(self) -> dict:
+        out = {}
+        for name, op in self.ops.items():
+            ms = op["ms"]
+            out[name] = {
+                "n": len(ms),
+                "p50": percentile(ms, 0.50),
+                "p90": percentile(ms, 0.90),
+                "p99": percentile(ms, 0.99),
+                "max": max(ms),
+                "created": sum(op["created"]) / len(ms),
+                "alive": op["alive"],
+            }
+        return out
+
+
+# ===== helpers =====
+def select(app, var, value, handler):
+    getattr(app, var).set(value)
+    handler()
+
+
+def click_event(app, s: int, fret: int):
+    L = app.layout
+    return SimpleNamespace(x=L.fret_center_x(fret) - app.canvas.view_x, y=L.string_y[s])
+
+
+def visible_cells(app):
+    lo, hi = app.view_frets
+    return [(s, f) for s in range(app.layout.strings) for f in range(lo, hi + 1)]
+
+
+def force_recompute(model):
+    model._scale_inputs = None
+    model._chord_inputs = None
+
+
+def uncached(model, fn):
+    # 미리 계산 캐시를 거치지 않은 계산 시간
+    def run():
+        cache, model.derived_cache = model.derived_cache, None
+        try:
+            fn()
+        finally:
+            model.derived_cache = cache
+    return run
+
+
+def all_chords(model):
+    for triad in model.triad_defs:
+        for tension in [NONE] + list(model.tension_defs):
+            tones = len(model.triad_defs[triad]) + len(model.tension_defs.get(tension, []))
+            for inversion, idx in model.inversion_defs.items():
+                if idx < tones:
+                    yield triad, tension, inversion
+
+
+# =========================
+# Scenarios
+# =========================
+def scenario_startup(rec, module, quick):
+    # 생성 -> 첫 화면 -> 조작 가능(idle 콜백까지). 그 뒤 예약된 미리 읽기(after) 는 빼고 잰다
+    for _ in range(5 if quick else 20):
+        t = time.perf_counter()
+        root = module.tk.Tk()
+        app = module.Fretboard12Proto1(root, workers=0)
+        root.flush(timers=False)
+        op = rec.ops.setdefault("startup", {"ms": [], "created": [], "alive": 0})
+        op["ms"].append((time.perf_counter() - t) * 1000.0)
+        op["created"].append(app.canvas.counts["create"])
+        op["alive"] = max(op["alive"], len(app.canvas.items))
+
+
+def scenario_keys(rec, module, quick):
+    # 모든 키 x 스케일 (코드 없음 / 코드 있음)
+    app, root = load_app(module, workers=0)
+    model = app.model
+    keys = KEY_ITEMS[::3] if quick else KEY_ITEMS
+    scales = [NONE] + list(model.scale_defs)
+    for key in keys:
+        rec.measure("key", app, root, select, app, "key_var", key, app.on_key_changed)
+        for scale in scales:
+            rec.measure("scale", app, root, select, app, "scale_var", scale, app.on_scale_changed)
+            force_recompute(model)
+            rec.measure("apply_selected_scale", app, root, uncached(model, model.apply_selected_scale))
+    select(app, "triad_var", "M", lambda: None)
+    select(app, "tension_var", "maj7", app.on_chord_changed)
+    root.flush()
+    for key in keys:
+        rec.measure("key+chord", app, root, select, app, "key_var", key, app.on_key_changed)
+
+
+def scenario_chords(rec, module, quick):
+    # 모든 트라이어드 x 텐션 x 전위. 첫 바퀴는 보이싱 캐시를 비우고(cold), 두 번째는 캐시 적중(warm)
+    app, root = load_app(module, workers=0)
+    model = app.model
+    select(app, "scale_var", "Major (Ionian)", app.on_scale_changed)
+    root.flush()
+    chords = list(all_chords(model))
+    if quick:
+        chords = chords[::4]
+    find_voicings.cache_clear()
+    chord_forms.cache_clear()
+    for label in ("chord (cold)", "chord (warm)"):
+        for triad, tension, inversion in chords:
+            app.triad_var.set(triad)
+            app.tension_var.set(tension)
+            app.inversion_var.set(inversion)
+            rec.measure(label, app, root, app.on_chord_changed)
+    for triad, tension, inversion in chords[::8]:
+        model.set_chord(triad, tension, inversion, update=False)
+        force_recompute(model)
+        rec.measure("apply_selected_chord", app, root, uncached(model, model.apply_selected_chord))
+    for _ in range(5 if quick else 20):
+        rec.measure("draw", app, root, app.draw)
+        app.static_drawn = False
+        rec.measure("draw (neck)", app, root, app.draw)
+
+
+def scenario_clicks(rec, module, quick):
+    # 클릭 폭주: 한 번씩 처리 / 여러 번 몰아서 한 프레임
+    app, root = load_app(module, workers=0)
+    rng = random.Random(9)
+    select(app, "scale_var", "Dorian", app.on_scale_changed)
+    select(app, "triad_var", "m", lambda: None)
+    select(app, "tension_var", "7", app.on_chord_changed)
+    root.flush()
+    cells = visible_cells(app)
+    for _ in range(100 if quick else 500):
+        s, fret = rng.choice(cells)
+        rec.measure("click", app, root, app.on_click, click_event(app, s, fret))
+
+    def burst(events):
+        for e in events:
+            app.on_click(e)
+
+    for _ in range(10 if quick else 50):
+        events = [click_event(app, *rng.choice(cells)) for _ in range(20)]
+        rec.measure("click burst x20", app, root, burst, events)
+
+
+def scenario_large(rec, module, quick):
+    # 8현 24프렛: 키/코드 바꾸기 + 가로 스크롤(보이는 프렛만 아이템 유지)
+    app, root = load_app(module, workers=0)
+    model = app.model
+    app.instrument_var.set("Guitar 8 (Standard)")
+    app.frets_var.set("24")
+    rec.measure("instrument", app, root, app.on_instrument_changed)
+    select(app, "scale_var", "Mixolydian", app.on_scale_changed)
+    root.flush()
+    for key in KEY_ITEMS[::4] if quick else KEY_ITEMS:
+        rec.measure("large key", app, root, select, app, "key_var", key, app.on_key_changed)
+    chords = list(all_chords(model))[::6 if quick else 2]
+    for triad, tension, inversion in chords:
+        app.triad_var.set(triad)
+        app.tension_var.set(tension)
+        app.inversion_var.set(inversion)
+        rec.measure("large chord", app, root, app.on_chord_changed)
+    steps = 20 if quick else 60
+    for i in range(steps + 1):
+        rec.measure("scroll", app, root, app.canvas.xview_moveto, i / steps)
+    for zoom in (1.5, 2.0, 3.0, 1.0):
+        rec.measure("zoom", app, root, app.set_zoom, zoom)
+    for w in range(1220, 1700, 40):
+        rec.measure("resize", app, root, app.on_canvas_configure, SimpleNamespace(width=w, height=520))
+
+
+def scenario_playback(rec, module, quick):
+    # 진행 재생: 미리 계산(prepare) 시간과 박마다 바뀌는 셀만 고치는 시간. 240 BPM 1박 = 250ms 예산
+    app, root = load_app(module, workers=0)
+    select(app, "scale_var", "Major (Ionian)", app.on_scale_changed)
+    root.flush()
+    bars = ["C M maj7", "A m 7", "D m 9", "G M 7", "E m 7 2nd", "A M 7b9", "D m 7", "G M 13",
+            "F M maj9", "Bb M 7#11", "Eb M maj7", "Ab M 6/9"]
+    app.progression_var.set(" | ".join(bars * (2 if quick else 8)))
+    app.tempo_var.set("240")
+    app.beats_var.set("1")
+
+    def play():
+        app.on_play()
+        root.timers.clear()   # 가짜 루트에서는 시간이 흐르지 않으므로 박은 직접 진행
+
+    rec.measure("playback prepare", app, root, play)
+    for i in range(1, len(app.progression.steps) * 2):
+        rec.measure("playback step", app, root, app.play_step, i)
+    rec.measure("playback stop", app, root, app.on_stop)
+
+
+def scenario_catalog(rec, module, quick):
+    # 스케일 카탈로그: 캐시 없이 만들기 / 캐시 파일 읽기 / 한 글자마다 검색 + 보이는 줄만 다시 채우기
+    from fretcore.catalog import load_catalog
+
+    app, root = load_app(module, workers=0)
+    with tempfile.TemporaryDirectory() as cache:
+        def load():
+            app.catalog = load_catalog(app.model.scale_defs, directory=cache)
+
+        for _ in range(1 if quick else 3):
+            for name in os.listdir(cache):
+                os.remove(os.path.join(cache, name))
+            rec.measure("catalog build", app, root, load)
+            rec.measure("catalog load", app, root, load)
+
+    queries = ["lydian dominant", "mode 3 of harm", "contains b3 #11", "no 5 7 notes", "7-35", "set 1 b2 3"]
+    for query in queries * (1 if quick else 5):
+        for n in range(1, len(query) + 1):
+            rec.measure("scale typeahead", app, root, app.search_scales, query[:n])
+    app.search_scales("")
+    for top in range(0, 2048, 64 if quick else 16):
+        rec.measure("scale list scroll", app, root, app.scroll_scale_results, top)
+    app.search_scales("hira")
+    rec.measure("scale pick", app, root, app.on_scale_pick)
+
+
+def scenario_hover(rec, module, quick):
+    # 빠른 마우스 이동: 24프렛 8현에서 화면을 가로지르는 이벤트 묶음(한 프레임에 여러 개) -> 판정 한 번
+    app, root = load_app(module, workers=0)
+    select(app, "instrument_var", "Guitar 8 (Standard)", app.on_instrument_preset)
+    select(app, "scale_var", "Dorian", app.on_scale_changed)
+    select(app, "triad_var", "m", app.on_chord_changed)
+    root.flush()
+    L = app.layout
+    width = min(L.x1, app.canvas.winfo_width())
+    rng = random.Random(3)
+
+    def burst(x, y):
+        for dx in range(0, 40, 5):
+            app.on_motion(SimpleNamespace(x=x + dx, y=y))
+
+    for _ in range(2 if quick else 10):
+        y = rng.uniform(L.y0, L.y1)
+        for x in range(int(L.open_x0), int(width) - 40, 40):
+            rec.measure("hover move", app, root, burst, x, y)
+    rec.measure("hover leave", app, root, app.on_leave)
+    for _ in range(5 if quick else 50):
+        s, fret = rng.randrange(L.strings), rng.randrange(1, app.view_frets[1] + 1)
+        rec.measure("hover click", app, root, app.on_click, click_event(app, s, fret))
+
+
+def scenario_grid(rec, module, quick):
+    # 비교 창: 12키 x 7모드(84개) 처음 그리기(점 계산 포함) / 캐시된 다시 그리기 / 끝까지 세로 스크롤
+    app, root = load_app(module, workers=0)
+    app.open_grid()
+    win = app.grid_window
+    root.flush()
+    for _ in range(1 if quick else 3):
+        win.layers.clear()
+        win.kind_var.set("12 Keys x Modes")
+        rec.measure("grid 12x7 cold", win, root, win.rebuild)
+        rec.measure("grid 12x7 warm", win, root, win.rebuild)
+    step = 3 if quick else 1
+    for _ in range(0, win.grid.size[1] // 20, step):
+        rec.measure("grid scroll", win, root, win.canvas.yview_scroll, step, "units")
+    for kind in GRID_KINDS:
+        win.kind_var.set(kind)
+        rec.measure("grid kind", win, root, win.rebuild)
+    select(app, "key_var", KEY_ITEMS[3], app.on_key_changed)
+    rec.measure("grid follow key", win, root, root.flush)
+
+
+def scenario_browse(rec, module, quick):
+    # 레슨처럼 키/스케일 넘기기 (Alt+화살표). 조작 사이에 한가한 시간이 없을 때와, 있어서 미리 계산했을 때.
+    # 같은 (키, 스케일)은 다시 나오지 않게 키를 한 바퀴 돌 때마다 스케일을 하나 넘김
+    app, root = load_app(module, workers=0)
+    select(app, "triad_var", "m", lambda: None)
+    select(app, "tension_var", "7", app.on_chord_changed)
+    root.flush()
+    steps = 24 if quick else 96
+    for label, idle in (("browse (busy)", False), ("browse (prefetched)", True)):
+        app.prefetcher.cache.clear()
+        find_voicings.cache_clear()
+        chord_forms.cache_clear()
+        for i in range(steps):
+            if idle:
+                rec.measure("prefetch idle", app, root, root.flush)
+            if i % len(KEY_ITEMS) == len(KEY_ITEMS) - 1:
+                rec.measure(label, app, root, app.step_scale, 1)
+            else:
+                rec.measure(label, app, root, app.step_key, 1)
+    st = app.prefetcher.stats()
+    print(f"  browse: prefetch hit rate {st['hit_rate'] * 100:.0f}%, {st['entries']} entries "
+          f"~{st['bytes'] / 1024 / 1024:.1f}MB, {st['slices']} slices {st['busy_ms']:.0f}ms", file=sys.stderr)
+
+
+def scenario_workers(rec, module, quick):
+    # large 의 코드 바꾸기를 실제 작업 스레드로: 화면 스레드가 막히는 시간(조작 -> 폼 없는 프레임),
+    # 폼이 도착해서 다시 그리는 시간, 조작부터 폼이 보일 때까지. 연달아 바꾸면 앞 요청은 취소/버려짐
+    app, root = load_app(module)
+    model = app.model
+    app.instrument_var.set("Guitar 8 (Standard)")
+    app.frets_var.set("24")
+    app.on_instrument_changed()
+    select(app, "scale_var", "Mixolydian", app.on_scale_changed)
+    root.flush(max_ms=OP_TIMER_MS)
+    find_voicings.cache_clear()
+    chord_forms.cache_clear()
+    chords = list(all_chords(model))[::6 if quick else 2]
+
+    def change(triad, tension, inversion):
+        app.triad_var.set(triad)
+        app.tension_var.set(tension)
+        app.inversion_var.set(inversion)
+        app.on_chord_changed()
+
+    def arrive():
+        # 결과 큐를 읽는 after(WORKER_POLL_MS) 는 조작 재기(OP_TIMER_MS)에서 빠지므로 여기서
+        root.flush(max_ms=module.WORKER_POLL_MS)
+
+    ready = []
+    for chord in chords:
+        t = time.perf_counter()
+        rec.measure("worker chord", app, root, change, *chord)
+        if model.forms_pending:
+            while app.workers.results.empty():
+                time.sleep(0.0005)
+            rec.measure("worker chord arrive", app, root, arrive)
+        ready.append((time.perf_counter() - t) * 1000.0)
+    app.prefetcher.cache.clear()
+    model.forms_source.values.clear()
+    chord_forms.cache_clear()
+    for i in range(0, len(chords) - 4, 5):
+        # 한 프레임에 하나씩 5번 연달아: 마지막 것만 보여야 함
+        for chord in chords[i:i + 5]:
+            rec.measure("worker chord burst", app, root, change, *chord)
+        while app.workers.pending:
+            time.sleep(0.0005)
+            arrive()
+    st = app.workers.stats()
+    print(f"  workers: forms ready p50 {percentile(ready, 0.5):.1f}ms p99 {percentile(ready, 0.99):.1f}ms, "
+          f"{st['submitted']} jobs, cancelled {st['cancelled']} (skipped {st['skipped']}, dropped {st['dropped']}), "
+          f"queue max {st['max_depth']}", file=sys.stderr)
+    app.workers.shutdown()
+
+
+SCENARIOS = {
+    "startup": scenario_startup,
+    "keys": scenario_keys,
+    "chords": scenario_chords,
+    "clicks": scenario_clicks,
+    "large": scenario_large,
+    "playback": scenario_playback,
+    "catalog": scenario_catalog,
+    "hover": scenario_hover,
+    "grid": scenario_grid,
+    "browse": scenario_browse,
+    "workers": scenario_workers,
+}
+
+
+# =========================
+# Report / baseline
+# =========================
+def print_table(summary: dict, baseline=None):
+    print(f"{'operation':<22}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'created':>9}{'alive':>7}")
+    for name, r in summary.items():
+        line = (f"{name:<22}{r['n']:>6}{r['p50']:>9.3f}{r['p90']:>9.3f}{r['p99']:>9.3f}{r['max']:>9.3f}"
+                f"{r['created']:>9.1f}{r['alive']:>7}")
+        base = (baseline or {}).get(name)
+        if base and base["p50"] > 0:
+            line += f"   p50 {r['p50'] / base['p50'] * 100 - 100:+.0f}%"
+        print(line)
+    print("(ms per operation; created = canvas items created per operation, alive = max items on canvas)")
+
+
+def load_baseline(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise SystemExit(f"baseline {path} has version {data.get('version')}, expected {BASELINE_VERSION}")
+    return data["ops"]
+
+
+def save_baseline(path: str, summary: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": BASELINE_VERSION, "python": sys.version.split()[0], "ops": summary}, f, indent=1)
+        f.write("\n")
+
+
+def regressions(summary: dict, baseline: dict, threshold: float):
+    found = []
+    for name, r in summary.items():
+        base = baseline.get(name)
+        if base is None or r["n"] != base["n"]:
+            continue  # 다른 설정(--quick 등)으로 만든 기준값과는 비교하지 않음
+        for stat in ("p50", "p90"):
+            limit = base[stat] * (1 + threshold) + FLOOR_MS
+            if r[stat] > limit:
+                found.append(f"{name}: {stat} {r[stat]:.3f}ms > {limit:.3f}ms (baseline {base[stat]:.3f}ms)")
+        if r["created"] > base["created"] + 1e-9:
+            found.append(f"{name}: {r['created']:.1f} items created/op > baseline {base['created']:.1f}")
+        if r["alive"] > base["alive"]:
+            found.append(f"{name}: {r['alive']} items alive > baseline {base['alive']}")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless UI benchmark (latency percentiles, canvas items)")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="run only these scenarios")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations (not comparable with full runs)")
+    parser.add_argument("--save", nargs="?", const=BASELINE_PATH, help="write the results as a baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown of p50/p90 (default 0.25 = 25%%)")
+    parser.add_argument("--json", help="also write the full summary to this file")
+    args = parser.parse_args(argv)
+
+    module = load_module()
+    rec = Recorder()
+    for name in args.only or SCENARIOS:
+        t = time.perf_counter()
+        SCENARIOS[name](rec, module, args.quick)
+        print(f"[{name}] {time.perf_counter() - t:.1f}s", file=sys.stderr)
+
+    summary = rec.summary()
+    baseline = load_baseline(args.compare) if args.compare else None
+    print_table(summary, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+    if args.save:
+        save_baseline(args.save, summary)
+        print(f"baseline saved: {args.save}")
+    if baseline is not None:
+        found = regressions(summary, baseline, args.threshold)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            return 1
+        print(f"no regressions (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
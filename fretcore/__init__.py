@@ -0,0 +1 @@
+# 9retboards 코어(화면 없이 동작하는 계산 모듈 모음)
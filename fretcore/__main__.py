@@ -0,0 +1,5 @@
+import sys
+
+from fretcore.cli import main
+
+sys.exit(main())
@@ -0,0 +1,135 @@
+# =========================
+# Audio output (background thread)
+# =========================
+# 합성(fretcore.synth)과 재생을 Tk 스레드 밖의 작업 스레드 하나에서 한다.
+# 화면 쪽은 play_notes() 로 요청만 넣고 바로 돌아감. 요청이 밀리면 가장 최근 것만 재생.
+# 출력 장치: sounddevice / simpleaudio 가 있으면 그것, 없으면 OS 기본 (winsound, afplay, aplay/paplay).
+# 어느 것도 없으면 소리 없이 조용히 무시 (WAV 저장은 synth 명령으로 가능).
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from fretcore import synth
+
+
+def _backend():
+    try:
+        import sounddevice
+        return "sounddevice", sounddevice
+    except Exception:  # 없음 또는 PortAudio 장치 없음
+        pass
+    try:
+        import simpleaudio
+        return "simpleaudio", simpleaudio
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        import winsound
+        return "winsound", winsound
+    for tool in ("afplay", "paplay", "aplay"):
+        path = shutil.which(tool)
+        if path:
+            return "command", path
+    return None, None
+
+
+class Player:
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.bank = synth.WaveBank() if synth.available() else None
+        self.kind, self.backend = _backend() if self.bank is not None else (None, None)
+        self.thread = None
+        self.current = None   # 재생 중인 객체(프로세스/핸들) -> 새 요청이 오면 멈춤
+        self.tmp_path = None
+        self.played = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.kind is not None
+
+    def describe(self) -> str:
+        if self.bank is None:
+            return "소리 없음 (NumPy 필요)"
+        if self.kind is None:
+            return "소리 없음 (출력 장치 없음)"
+        return f"소리: {self.kind}"
+
+    # ----- UI thread -----
+    def play_notes(self, notes, spacing_ms: float = synth.STRUM_MS):
+        # notes: [(open_midi, fret), ...] 낮은 줄부터
+        if not self.enabled or not notes:
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="9retboards-audio", daemon=True)
+            self.thread.start()
+        self.requests.put((tuple(notes), spacing_ms))
+
+    def close(self, timeout: float = 0.5):
+        # 재생 중인 소리를 멈추고 임시 WAV 정리 (daemon 스레드라 오래 기다리지 않음)
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join(timeout)
+
+    # ----- worker thread -----
+    def _run(self):
+        while True:
+            req = self.requests.get()
+            # 밀린 요청은 건너뛰고 가장 최근 것만 (클릭 연타). None = 종료
+            while req is not None:
+                try:
+                    newer = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                self.dropped += 1
+                req = newer
+            if req is None:
+                self._stop_current()
+                if self.tmp_path is not None:
+                    try:
+                        os.remove(self.tmp_path)
+                    except OSError:
+                        pass
+                return
+            notes, spacing_ms = req
+            try:
+                self._play(self.bank.strum(notes, spacing_ms))
+                self.played += 1
+            except Exception:  # 장치 오류 등으로 앱이 죽지 않도록
+                self.errors += 1
+
+    def _stop_current(self):
+        cur, self.current = self.current, None
+        if cur is None:
+            return
+        if self.kind == "command":
+            cur.terminate()
+        elif self.kind == "simpleaudio":
+            cur.stop()
+        elif self.kind == "sounddevice":
+            self.backend.stop()
+
+    def _play(self, samples):
+        self._stop_current()
+        if self.kind == "sounddevice":
+            self.backend.play(samples, synth.SAMPLE_RATE)
+            self.current = True
+        elif self.kind == "simpleaudio":
+            pcm = (samples.clip(-1.0, 1.0) * 32767).astype("<i2")
+            self.current = self.backend.play_buffer(pcm.tobytes(), 1, 2, synth.SAMPLE_RATE)
+        elif self.kind == "winsound":
+            # SND_MEMORY 는 비동기 불가 -> 이 작업 스레드에서 끝날 때까지 재생
+            self.backend.PlaySound(synth.to_wav_bytes(samples),
+                                   self.backend.SND_MEMORY | self.backend.SND_NODEFAULT)
+        elif self.kind == "command":
+            if self.tmp_path is None:
+                fd, self.tmp_path = tempfile.mkstemp(prefix="9retboards-", suffix=".wav")
+                os.close(fd)
+            synth.write_wav(self.tmp_path, samples)
+            self.current = subprocess.Popen([self.backend, self.tmp_path],
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -0,0 +1,435 @@
+# =========================
+# Scale catalog (all pitch-class sets)
+# =========================
+# 루트를 포함하는 12음 집합 전체(2048개)에 이름을 붙인 스케일 목록.
+#  - 이름: 기본 라이브러리 -> 널리 쓰는 스케일과 그 모든 모드 -> 사용자 파일 -> 이름 없는 집합은 "Set 1 b2 3 ..."
+#  - Forte 번호: 224 집합류 전체 (프라임 폼은 Rahn 방식으로 비교. 표에는 집합류의 아무 원소나 적어도 됨)
+#  - 검색: 이름 토큰 접두어 색인 + 음정 마스크 조건 ("contains b3 #11", "no 5", "7 notes", "7-35")
+# 항목 번호 = 정렬 순서(이름 있는 것 먼저)이고, 항목 집합은 2048비트 정수로 다뤄서 조건은 & 한 번.
+# 만든 카탈로그는 작은 바이너리 파일(마스크 배열 + 이름 + 토큰 색인)로 캐시했다가 다음에 읽는다.
+import hashlib
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+
+from fretcore.lookup import cache_dir
+from fretcore.model import build_scale_library
+from fretcore.theory import FULL_MASK, mask_from_intervals, mask_to_pcs, popcount, transpose_mask
+
+CATALOG_VERSION = 2
+MAGIC = b"9RSC"
+USER_ENV_VAR = "RETBOARDS_SCALES"
+
+DEGREE_NAMES = ("1", "b2", "2", "b3", "3", "4", "b5", "5", "b6", "6", "b7", "7")
+
+# 검색/사용자 파일에서 읽는 음정 표기 -> 반음
+INTERVAL_WORDS = {
+    "1": 0, "b2": 1, "b9": 1, "2": 2, "9": 2, "#2": 3, "#9": 3, "b3": 3, "3": 4, "b4": 4,
+    "4": 5, "11": 5, "#4": 6, "#11": 6, "b5": 6, "5": 7, "#5": 8, "b6": 8, "b13": 8,
+    "6": 9, "13": 9, "bb7": 9, "b7": 10, "#6": 10, "7": 11, "maj7": 11,
+}
+
+# (부모 스케일, 음정, 모드 이름 또는 None = "Mode k of 부모")
+PARENTS = (
+    ("Major", (0, 2, 4, 5, 7, 9, 11),
+     ("Major (Ionian)", "Dorian", "Phrygian", "Lydian", "Mixolydian", "Natural Minor (Aeolian)", "Locrian")),
+    ("Melodic Minor", (0, 2, 3, 5, 7, 9, 11),
+     ("Melodic Minor (Asc)", "Dorian b2", "Lydian Augmented", "Lydian Dominant", "Mixolydian b6",
+      "Locrian #2", "Altered (Super Locrian)")),
+    ("Harmonic Minor", (0, 2, 3, 5, 7, 8, 11),
+     ("Harmonic Minor", "Locrian #6", "Ionian #5", "Dorian #4", "Phrygian Dominant", "Lydian #2",
+      "Altered bb7")),
+    ("Harmonic Major", (0, 2, 4, 5, 7, 8, 11),
+     ("Harmonic Major", "Dorian b5", "Phrygian b4", "Lydian b3", "Mixolydian b2", "Lydian Augmented #2",
+      "Locrian bb7")),
+    ("Double Harmonic", (0, 1, 4, 5, 7, 8, 11),
+     ("Double Harmonic Major", "Lydian #2 #6", "Ultraphrygian", "Hungarian Minor", "Oriental",
+      "Ionian #2 #5", "Locrian bb3 bb7")),
+    ("Major Pentatonic", (0, 2, 4, 7, 9),
+     ("Major Pentatonic", "Suspended Pentatonic", "Man Gong", "Ritsusen", "Minor Pentatonic")),
+    ("Blues", (0, 3, 5, 6, 7, 10), ("Blues (Minor)", "Blues (Major)", None, None, None, None)),
+    ("Whole Tone", (0, 2, 4, 6, 8, 10), ("Whole Tone",)),
+    ("Diminished", (0, 1, 3, 4, 6, 7, 9, 10), ("Diminished (Half-Whole)", "Diminished (Whole-Half)")),
+    ("Augmented", (0, 3, 4, 7, 8, 11), ("Augmented", "Augmented Inverse")),
+    ("Bebop Dominant", (0, 2, 4, 5, 7, 9, 10, 11), None),
+    ("Bebop Major", (0, 2, 4, 5, 7, 8, 9, 11), None),
+    ("Neapolitan Major", (0, 1, 3, 5, 7, 9, 11), None),
+    ("Neapolitan Minor", (0, 1, 3, 5, 7, 8, 11), None),
+    ("Enigmatic", (0, 1, 4, 6, 8, 10, 11), None),
+    ("Persian", (0, 1, 4, 5, 6, 8, 11), None),
+    ("Prometheus", (0, 2, 4, 6, 9, 10), None),
+    ("Hirajoshi", (0, 2, 3, 7, 8), None),
+    ("In Sen", (0, 1, 5, 7, 10), None),
+    ("Iwato", (0, 1, 5, 6, 10), None),
+    ("Kumoi", (0, 2, 3, 7, 9), None),
+)
+
+# Forte 번호 (Forte 1973 의 224 집합류 전체): 음 수 -> 서수 순서대로 집합류 하나의 원소 (t = 10, e = 11).
+# 7음 이상은 여집합의 서수: n-k <-> (12-n)-k. 6음은 Z 쌍이 서로 여집합이라 50개를 모두 적음
+PC_DIGITS = "0123456789te"
+FORTE_SETS = {
+    1: "0",
+    2: "01 02 03 04 05 06",
+    3: "012 013 014 015 016 024 025 026 027 036 037 048",
+    4: "0123 0124 0134 0125 0126 0127 0145 0156 0167 0235 0135 0236 0136 0237 0146 0157 0347 0147 0148 0158 "
+       "0246 0247 0257 0248 0268 0358 0258 0369 0137",
+    5: "01234 01235 01245 01236 01237 01256 01267 02346 01246 01346 02347 01356 01248 01257 01268 01347 01348 "
+       "01457 01367 01568 01458 01478 02357 01357 02358 02458 01358 02368 01368 01468 01369 01469 02468 02469 "
+       "02479 01247 03458 01258",
+    6: "012345 012346 012356 012456 012367 012567 012678 023457 012357 013457 012457 012467 013467 013458 012458 "
+       "014568 012478 012578 013478 014589 023468 012468 023568 013468 013568 013578 013469 013569 013689 013679 "
+       "013589 024579 023579 013579 02468t 012347 012348 012378 023458 012358 012368 012369 012568 012569 023469 "
+       "012469 012479 012579 013479 014679",
+    12: "0123456789te",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9#]+")
+FORTE_RE = re.compile(r"\d{1,2}-\d{1,2}")
+
+
+def invert_mask(mask: int) -> int:
+    return sum(1 << (-pc % 12) for pc in mask_to_pcs(mask))
+
+
+def prime_mask(mask: int) -> int:
+    # 프라임 폼(Rahn): 집합과 그 전위를 0 으로 옮긴 모든 회전 중 정수값이 가장 작은 것
+    best = FULL_MASK
+    for m in (mask, invert_mask(mask)):
+        for pc in mask_to_pcs(m):
+            best = min(best, transpose_mask(m, -pc))
+    return best
+
+
+def forte_table() -> dict:
+    # 프라임 폼 마스크 -> "n-k" (루트를 포함하는 2048개 집합이 모두 번호를 가짐)
+    table = {}
+    for n, text in FORTE_SETS.items():
+        for k, word in enumerate(text.split(), 1):
+            mask = mask_from_intervals(PC_DIGITS.index(c) for c in word)
+            table[prime_mask(mask)] = f"{n}-{k}"
+            comp = FULL_MASK & ~mask
+            if comp and n < 6:
+                table[prime_mask(comp)] = f"{12 - n}-{k}"
+    return table
+
+
+def degree_text(mask: int) -> str:
+    return " ".join(DEGREE_NAMES[pc] for pc in mask_to_pcs(mask))
+
+
+def tokens(text: str):
+    return TOKEN_RE.findall(text.lower())
+
+
+def config_dir() -> str:
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "9retboards")
+
+
+def user_scales_path() -> str:
+    return os.environ.get(USER_ENV_VAR) or os.path.join(config_dir(), "scales.txt")
+
+
+def parse_user_scales(text: str):
+    # 한 줄에 하나: "이름 = 1 2 b3 4 5 6 b7" (음정) 또는 "이름 = 0 2 3 5 7 9 10" (반음). '#' 로 시작하면 주석
+    entries, errors = [], []
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, body = line.partition("=")
+        name, words = name.strip(), body.split()
+        if not sep or not name or not words:
+            errors.append(f"{n}번째 줄: '이름 = 음정...' 형식이 아님")
+            continue
+        if "0" in words and all(w.isdigit() for w in words):
+            pcs = [int(w) for w in words]
+            bad = [w for w, pc in zip(words, pcs) if pc > 11]
+        else:
+            bad = [w for w in words if w.lower() not in INTERVAL_WORDS]
+            pcs = [INTERVAL_WORDS.get(w.lower(), 0) for w in words]
+        if bad:
+            errors.append(f"{n}번째 줄: 알 수 없는 음정 {' '.join(bad)}")
+            continue
+        entries.append((name, tuple(sorted(set(pcs) | {0}))))
+    return entries, errors
+
+
+# =========================
+# Catalog
+# =========================
+class ScaleCatalog:
+    def __init__(self, masks, names, forte, token_list, postings):
+        self.masks = masks            # array('H'), 항목 번호 순 (루트 기준 마스크)
+        self.names = names            # [(대표 이름, 별칭...), ...]
+        self.forte = forte            # [Forte 번호 "n-k"]
+        self.token_list = token_list  # 정렬된 이름 토큰 (접두어 검색은 bisect)
+        self.postings = postings      # 토큰별 항목 번호 배열
+        self.count = len(masks)
+        self.errors = []
+
+        self.all_ids = (1 << self.count) - 1
+        self._token_bits = {}
+        self._by_name = None
+        self._by_bit = None
+        self._by_size = None
+
+    # ----- build -----
+    @classmethod
+    def build(cls, scale_defs=None, user_entries=()):
+        named = {}   # mask -> [이름...] (처음 붙은 이름이 대표)
+        rank = {}    # mask -> (정렬 순위, 처음 나온 순서)
+
+        def add(name, mask, order):
+            names = named.setdefault(mask, [])
+            if name not in names:
+                names.append(name)
+            rank.setdefault(mask, (order, len(rank)))
+
+        for name, intervals in (scale_defs or build_scale_library()).items():
+            add(name, mask_from_intervals(intervals), 0)
+        for name, intervals in user_entries:
+            add(name, mask_from_intervals(intervals), 1)
+        # 실제 이름(부모 + 이름 있는 모드)을 모두 넣은 뒤에 "Mode k of 부모": 다른 부모의 모드가 실제 이름이 있는
+        # 스케일이면 (Iwato = Hirajoshi 의 2번째 모드) 그 이름이 대표 이름/순위가 되고 만든 이름은 별칭으로
+        generated = []
+        for parent, intervals, modes in PARENTS:
+            mask = mask_from_intervals(intervals)
+            seen = set()
+            for k, pc in enumerate(mask_to_pcs(mask)):
+                mode = transpose_mask(mask, -pc)
+                if mode in seen:
+                    continue   # 대칭 스케일(온음, 디미니시드 등)은 같은 모드가 반복됨
+                seen.add(mode)
+                mode_name = modes[k] if modes and k < len(modes) else None
+                if mode_name is None and k == 0:
+                    mode_name = parent
+                if mode_name is None:
+                    generated.append((f"Mode {k + 1} of {parent}", mode))
+                else:
+                    add(mode_name, mode, 2)
+        for mode_name, mode in generated:
+            add(mode_name, mode, 3)
+
+        # 이름 없는 집합: 음 수가 7 에 가까운 것부터 (스케일로 자주 쓰는 크기)
+        masks = sorted((m for m in range(1, FULL_MASK + 1) if m & 1),
+                       key=lambda m: (rank.get(m, (4, 0)), abs(popcount(m) - 7), popcount(m), m))
+        table = forte_table()
+        names = [tuple(named.get(m) or (f"Set {degree_text(m)}",)) for m in masks]
+        forte = [table.get(prime_mask(m), "") for m in masks]
+
+        index = {}
+        for i, entry in enumerate(names):
+            for tok in {t for name in entry for t in tokens(name)} | ({forte[i]} if forte[i] else set()):
+                index.setdefault(tok, []).append(i)
+        token_list = sorted(index)
+        postings = [array("H", index[t]) for t in token_list]
+        return cls(array("H", masks), names, forte, token_list, postings)
+
+    # ----- compact file -----
+    # MAGIC, 버전, 항목 수, 토큰 수 / 마스크(u16 x 항목) / 이름 블록 / Forte 블록 / 토큰 블록 /
+    # 토큰별 항목 수(u16) / 항목 번호(u16 전부 이어서). 문자열 블록은 UTF-8, 항목 "\n" / 별칭 "\t"
+    def to_bytes(self, signature: str) -> bytes:
+        names = "\n".join("\t".join(entry) for entry in self.names).encode("utf-8")
+        forte = "\n".join(self.forte).encode("utf-8")
+        toks = "\n".join(self.token_list).encode("utf-8")
+        sizes = array("H", [len(p) for p in self.postings])
+        flat = array("H")
+        for p in self.postings:
+            flat.extend(p)
+        header = struct.pack("<4sH16sHHIII", MAGIC, CATALOG_VERSION, signature.encode("ascii"), self.count,
+                             len(self.token_list), len(names), len(forte), len(toks))
+        return b"".join([header, self.masks.tobytes(), names, forte, toks, sizes.tobytes(), flat.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data: bytes, signature: str):
+        head = struct.calcsize("<4sH16sHHIII")
+        magic, version, sig, count, ntok, nlen, flen, tlen = struct.unpack_from("<4sH16sHHIII", data)
+        if magic != MAGIC or version != CATALOG_VERSION or sig.decode("ascii") != signature:
+            raise ValueError("catalog cache mismatch")
+        pos = head
+        masks = array("H")
+        masks.frombytes(data[pos:pos + 2 * count])
+        pos += 2 * count
+        names = [tuple(line.split("\t")) for line in data[pos:pos + nlen].decode("utf-8").split("\n")]
+        pos += nlen
+        forte = data[pos:pos + flen].decode("utf-8").split("\n")
+        pos += flen
+        token_list = data[pos:pos + tlen].decode("utf-8").split("\n")
+        pos += tlen
+        sizes = array("H")
+        sizes.frombytes(data[pos:pos + 2 * ntok])
+        pos += 2 * ntok
+        flat = array("H")
+        flat.frombytes(data[pos:])
+        postings, start = [], 0
+        for n in sizes:
+            postings.append(flat[start:start + n])
+            start += n
+        if len(names) != count or len(forte) != count or start != len(flat):
+            raise ValueError("catalog cache truncated")
+        return cls(masks, names, forte, token_list, postings)
+
+    # ----- entries -----
+    def name(self, i: int) -> str:
+        return self.names[i][0]
+
+    def intervals(self, i: int) -> tuple:
+        return mask_to_pcs(self.masks[i])
+
+    def describe(self, i: int) -> str:
+        mask = self.masks[i]
+        label = self.name(i)
+        if len(self.names[i]) > 1:
+            label += f" ({', '.join(self.names[i][1:3])})"
+        forte = f"  [{self.forte[i]}]" if self.forte[i] else ""
+        return f"{label}{forte}   {degree_text(mask)}"
+
+    def find(self, name: str):
+        # 대표 이름/별칭 -> 항목 번호 (대소문자 무시)
+        if self._by_name is None:
+            self._by_name = {}
+            for i, entry in enumerate(self.names):
+                for n in entry:
+                    self._by_name.setdefault(n.lower(), i)
+        return self._by_name.get(name.strip().lower())
+
+    # ----- search -----
+    def _bits(self, ids) -> int:
+        return int.from_bytes(bytes(_bitmap(ids, self.count)), "little")
+
+    def token_bits(self, i: int) -> int:
+        bits = self._token_bits.get(i)
+        if bits is None:
+            bits = self._token_bits[i] = self._bits(self.postings[i])
+        return bits
+
+    def exact_bits(self, token: str) -> int:
+        i = bisect_left(self.token_list, token)
+        found = i < len(self.token_list) and self.token_list[i] == token
+        return self.token_bits(i) if found else 0
+
+    def prefix_bits(self, prefix: str) -> int:
+        lo = bisect_left(self.token_list, prefix)
+        hi = bisect_left(self.token_list, prefix + "\uffff")
+        bits = 0
+        for i in range(lo, hi):
+            bits |= self.token_bits(i)
+        return bits
+
+    def interval_bits(self, pc: int) -> int:
+        if self._by_bit is None:
+            self._by_bit = [self._bits([i for i, m in enumerate(self.masks) if m >> b & 1]) for b in range(12)]
+        return self._by_bit[pc]
+
+    def size_bits(self, n: int) -> int:
+        if self._by_size is None:
+            by_size = {}
+            for i, m in enumerate(self.masks):
+                by_size.setdefault(popcount(m), []).append(i)
+            self._by_size = {k: self._bits(v) for k, v in by_size.items()}
+        return self._by_size.get(n, 0)
+
+    def search(self, query: str) -> "SearchResult":
+        # 단어마다 항목 집합을 만들어 모두 & : 이름 접두어 / 음정 조건 / 제외 / 음 수 / Forte 번호
+        words = query.lower().replace(",", " ").split()
+        bits = self.all_ids
+        intervals = False
+        negate = False
+        k = 0
+        while k < len(words):
+            w = words[k]
+            k += 1
+            if w in ("contains", "contain", "with", "has", "and", "+"):
+                intervals = True
+                continue
+            if w in ("no", "without", "not"):
+                negate = intervals = True
+                continue
+            if w.startswith("-") and w[1:] in INTERVAL_WORDS:
+                w, negate = w[1:], True
+            if FORTE_RE.fullmatch(w):
+                bits &= self.exact_bits(w)
+                continue
+            if w.isdigit() and k < len(words) and words[k].startswith("note"):
+                bits &= self.size_bits(int(w))
+                k += 1
+                continue
+            if w in INTERVAL_WORDS and (intervals or negate or not w.isdigit()):
+                sel = self.interval_bits(INTERVAL_WORDS[w])
+                bits &= (self.all_ids & ~sel) if negate else sel
+                negate = False
+                continue
+            for tok in tokens(w):
+                bits &= self.prefix_bits(tok)
+            negate = False
+        return SearchResult(self, bits)
+
+
+class SearchResult:
+    # 찾은 항목 집합(비트). 화면에 보이는 몇 줄만 page() 로 꺼냄 (항목 번호 목록은 처음 필요할 때 한 번)
+    def __init__(self, catalog, bits: int):
+        self.catalog = catalog
+        self.bits = bits
+        self.count = popcount(bits)
+        self._ids = None
+
+    def ids(self):
+        if self._ids is None:
+            digits = bin(self.bits)[:1:-1]
+            self._ids = [i for i, c in enumerate(digits) if c == "1"]
+        return self._ids
+
+    def page(self, start: int, rows: int):
+        return self.ids()[start:start + rows]
+
+
+def _bitmap(ids, count: int) -> bytearray:
+    buf = bytearray((count + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return buf
+
+
+# =========================
+# Load (cache file)
+# =========================
+def catalog_signature(scale_defs, user_text: str) -> str:
+    key = repr((CATALOG_VERSION, sorted(scale_defs.items()), PARENTS, FORTE_SETS, user_text))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def load_catalog(scale_defs=None, user_path=None, directory=None) -> ScaleCatalog:
+    # 캐시 파일이 있고 라이브러리/사용자 파일이 그대로면 읽기만, 아니면 만들고 저장
+    scale_defs = scale_defs or build_scale_library()
+    path = user_path or user_scales_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            user_text = f.read()
+    except OSError:
+        user_text = ""
+    signature = catalog_signature(scale_defs, user_text)
+    cache = os.path.join(directory or cache_dir(), f"catalog-{signature}.bin")
+
+    user_entries, errors = parse_user_scales(user_text)
+    try:
+        with open(cache, "rb") as f:
+            catalog = ScaleCatalog.from_bytes(f.read(), signature)
+        catalog.errors = errors
+        return catalog
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        pass
+
+    catalog = ScaleCatalog.build(scale_defs, user_entries)
+    catalog.errors = errors
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        tmp = f"{cache}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(catalog.to_bytes(signature))
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # 캐시 저장 실패는 무시 (다음 실행 때 다시 만듦)
+    return catalog
@@ -0,0 +1,522 @@
+# =========================
+# Chord symbols + lead-sheet charts
+# =========================
+#   python -m fretcore chords "F#m7b5 Bb13 E7alt C6/9/G"
+#   python -m fretcore chords ~/charts [--list]
+# "F#m7b5", "Bb13", "E7alt", "C6/9/G" 같은 코드 기호를 모델의 Triad/Tension/Inversion 이름으로 바꾼다.
+#  - 루트 뒤를 토큰(품질, 숫자, 변화음, sus/add/alt)으로 나눈 뒤 조합을 기존 어휘
+#    (build_triad_library / build_tension_library)로 옮김. 옮길 수 없으면 그 토큰 위치와 함께 SymbolError
+#  - 슬래시 베이스는 코드톤 중 몇 번째인지로 전위를 정함. 순서는 pick_bass_pc_for_inversion 과 같음
+#    (루트 기준 반음 오름차순: C6/9 = C D E G A 이므로 C6/9/G = 3rd)
+#  - 기호마다 한 번만 분석 (lru_cache, 실패도 같이 기억). 차트 수천 개라도 서로 다른 기호는 수백 개 정도
+# 차트 = 리드 시트 텍스트: 마디줄("| Cmaj7 | Am7 D7 |"), 가사 위 코드줄, ChordPro("[Am7]가사", "{title: ...}")
+import argparse
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from fretcore.instruments import NOTE_INDEX
+from fretcore.model import NONE, NOTE_FLAT, build_inversion_library, build_tension_library, build_triad_library
+
+TRIADS = build_triad_library()
+TENSIONS = build_tension_library()
+INVERSION_NAMES = {index: name for name, index in build_inversion_library().items()}
+ALT_TENSION = next(name for name in TENSIONS if name.startswith("alt"))
+
+CHART_EXTENSIONS = (".txt", ".crd", ".cho", ".chopro", ".chordpro", ".pro")
+
+ROOT_RE = re.compile(r"([A-G])([#b♯♭]?)")
+ACCIDENTALS = {"": 0, "#": 1, "♯": 1, "b": -1, "♭": -1}
+
+# 루트 뒤 토큰: 표기 -> 종류. 같은 위치에서는 긴 표기부터 맞춰 봄 ("maj7" 이 "m" 으로 읽히지 않게)
+SUFFIX_TOKENS = {
+    "maj": "maj", "Maj": "maj", "M": "maj", "Δ": "delta", "^": "delta",
+    "min": "m", "mi": "m", "m": "m", "-": "m",
+    "dim": "dim", "°": "dim", "o": "dim",
+    "aug": "aug", "+": "aug",
+    "ø": "half",
+    "sus2": "sus2", "sus4": "sus4", "sus": "sus4",
+    "add9": "add9", "add2": "add9",
+    "alt": "alt",
+    "6/9": "69", "69": "69",
+    "13": "13", "11": "11", "9": "9", "7": "7", "6": "6", "5": "5",
+}
+for _flat in "b♭":
+    for _n in ("5", "9", "13"):
+        SUFFIX_TOKENS[_flat + _n] = "b" + _n
+for _sharp in "#♯+":
+    for _n in ("5", "9", "11"):
+        SUFFIX_TOKENS[_sharp + _n] = "#" + _n
+TOKEN_RE = re.compile("|".join(re.escape(t) for t in sorted(SUFFIX_TOKENS, key=len, reverse=True)))
+QUALITIES = ("m", "dim", "aug", "half")
+EXTENSIONS = ("6", "69", "7", "9", "11", "13")
+# 토큰 사이에 와도 되는 글자: C7(b9), Cm(maj7), C7,#11
+SKIP = "(), "
+
+
+class SymbolError(ValueError):
+    def __init__(self, symbol: str, pos: int, message: str):
+        self.symbol = symbol
+        self.pos = pos
+        self.message = message
+        super().__init__(f"'{symbol}' {pos + 1}번째 글자: {message}")
+
+    def caret(self) -> str:
+        # 기호 아래 ^ 로 위치 표시 (두 줄)
+        return f"{self.symbol}\n{' ' * self.pos}^"
+
+
+class ChordSymbol(NamedTuple):
+    # 앞 네 필드는 progression.Step 과 같은 순서
+    root_pc: int
+    triad: str
+    tension: str
+    inversion: str
+    bass_pc: object   # 슬래시 베이스 pitch class (없거나 루트면 None)
+
+
+# =========================
+# Symbol parser
+# =========================
+def parse_symbol(text: str) -> ChordSymbol:
+    result = _parse_cached(text.strip())
+    if isinstance(result, ChordSymbol):
+        return result
+    pos, message = result
+    raise SymbolError(text.strip(), pos, message)
+
+
+def is_symbol(text: str) -> bool:
+    return isinstance(_parse_cached(text), ChordSymbol)
+
+
+def cache_info():
+    return _parse_cached.cache_info()
+
+
+@lru_cache(maxsize=8192)
+def _parse_cached(text: str):
+    # ChordSymbol 또는 (위치, 메시지). 예외를 캐시에 넣지 않으려고 실패도 값으로 돌려줌
+    try:
+        return _parse(text)
+    except SymbolError as exc:
+        return exc.pos, exc.message
+
+
+def _parse(text: str) -> ChordSymbol:
+    m = ROOT_RE.match(text)
+    if not m:
+        raise SymbolError(text, 0, "루트 음 이름(A-G)이 아님")
+    root_pc = (NOTE_INDEX[m.group(1)] + ACCIDENTALS[m.group(2)]) % 12
+
+    # 슬래시 베이스: 마지막 "/" 뒤가 음 이름일 때만 ("6/9" 의 "/" 는 토큰)
+    end = len(text)
+    bass = None
+    slash = text.rfind("/")
+    if slash >= m.end() and not text[slash - 1:slash + 2] == "6/9":
+        b = ROOT_RE.fullmatch(text, slash + 1)
+        if not b:
+            raise SymbolError(text, slash + 1, "슬래시 뒤에 베이스 음 이름이 없음")
+        bass = (NOTE_INDEX[b.group(1)] + ACCIDENTALS[b.group(2)]) % 12, slash + 1
+        end = slash
+
+    tokens = []
+    pos = m.end()
+    while pos < end:
+        if text[pos] in SKIP:
+            pos += 1
+            continue
+        t = TOKEN_RE.match(text, pos, end)
+        if not t:
+            raise SymbolError(text, pos, f"알 수 없는 표기 '{text[pos:end]}'")
+        tokens.append((SUFFIX_TOKENS[t.group()], pos))
+        pos = t.end()
+
+    triad, tension = _vocabulary(text, tokens)
+    inversion = "Root"
+    bass_pc = None
+    if bass is not None and bass[0] != root_pc:
+        bass_pc, at = bass
+        rels = sorted({p % 12 for p in TRIADS[triad] + TENSIONS.get(tension, [])})
+        rel = (bass_pc - root_pc) % 12
+        if rel not in rels:
+            raise SymbolError(text, at, "베이스 음이 코드톤이 아님")
+        index = rels.index(rel)
+        if index not in INVERSION_NAMES:
+            last = INVERSION_NAMES[max(INVERSION_NAMES)]
+            raise SymbolError(text, at, f"코드톤 {index + 1}번째 음이 베이스 (전위는 {last} 까지)")
+        inversion = INVERSION_NAMES[index]
+    return ChordSymbol(root_pc, triad, tension, inversion, bass_pc)
+
+
+def _vocabulary(text: str, tokens):
+    # 토큰 목록 -> (트라이어드 이름, 텐션 이름). 토큰 = (종류, 기호 안 위치)
+    quality = sus = add = power = seventh_maj = None
+    ext = None
+    alt = None
+    alters = []
+    pending_maj = None
+    for kind, pos in tokens:
+        if kind not in ("7", "9", "11", "13"):
+            # "maj"/"M" 뒤에 숫자가 없으면 장3화음 표시 (CM, Cmaj). "Δ"/"^" 는 혼자서 maj7
+            pending_maj = None
+        if kind in ("maj", "delta"):
+            if seventh_maj is not None or ext is not None:
+                raise SymbolError(text, pos, "maj 가 두 번 / 숫자 뒤에 옴")
+            pending_maj = pos
+            if kind == "delta":
+                ext, seventh_maj = ("7", pos), pos
+        elif kind in QUALITIES:
+            if quality is not None:
+                raise SymbolError(text, pos, "코드 품질(m/dim/aug)이 두 번")
+            quality = kind, pos
+        elif kind in EXTENSIONS:
+            if ext is not None and ext[1] != pending_maj:
+                raise SymbolError(text, pos, "숫자(6/7/9/11/13)가 두 번")
+            ext = kind, pos
+            if pending_maj is not None:
+                seventh_maj = pending_maj
+                pending_maj = None
+        elif kind == "5":
+            power = pos
+        elif kind in ("sus2", "sus4"):
+            sus = kind, pos
+        elif kind == "add9":
+            add = pos
+        elif kind == "alt":
+            alt = pos
+        else:
+            alters.append((kind, pos))
+
+    if power is not None:
+        if len(tokens) > 1:
+            raise SymbolError(text, power, "파워 코드(5)에는 다른 표기를 붙일 수 없음")
+        return "5", NONE
+
+    q = quality[0] if quality else None
+    triad = "M"
+    if q == "half":
+        # ø = m7b5 (dim + b7)
+        if ext is not None and ext[0] != "7":
+            raise SymbolError(text, ext[1], "ø 뒤에는 7 만")
+        triad, ext = "dim", ("7", quality[1])
+    elif q == "dim":
+        triad = "dim"
+        if ext is not None and ext[0] == "7" and seventh_maj is None:
+            # 온음 감7 = dim + bb7(= 장6도). 텐션 어휘로는 "6"
+            ext = ("6", ext[1])
+    elif q == "aug":
+        triad = "aug"
+    elif q == "m":
+        triad = "m"
+        if "b5" in [k for k, _ in alters]:
+            # m7b5
+            triad = "dim"
+            alters = [a for a in alters if a[0] != "b5"]
+    if "#5" in [k for k, _ in alters] and triad == "M":
+        # C7#5, Cmaj7#5 = aug 위에 7
+        triad = "aug"
+        alters = [a for a in alters if a[0] != "#5"]
+
+    if sus is not None:
+        if quality is not None:
+            raise SymbolError(text, sus[1], "sus 는 m/dim/aug 와 같이 쓸 수 없음")
+        triad = sus[0]
+    if add is not None:
+        if triad not in ("M", "m") or ext is not None:
+            raise SymbolError(text, add, "add9 는 장/단3화음에만 (텐션 없이)")
+        triad = "add9" if triad == "M" else "madd9"
+
+    if alt is not None:
+        if alters or (ext is not None and ext[0] != "7") or seventh_maj is not None:
+            raise SymbolError(text, alt, "alt 는 7 하고만")
+        return triad, ALT_TENSION
+
+    tension = NONE
+    if ext is not None:
+        number, pos = ext
+        tension = {"69": "6/9"}.get(number, number)
+        if seventh_maj is not None:
+            tension = "maj" + number
+        if tension not in TENSIONS:
+            raise SymbolError(text, seventh_maj if seventh_maj is not None else pos,
+                              f"텐션 '{tension}' 은 없음 ({', '.join(TENSIONS)})")
+    for kind, pos in alters:
+        # 남은 변화음은 7 위에 하나만 (7b9, 7#9, 7#11, 7b13)
+        if tension != "7" or kind in ("b5", "#5"):
+            raise SymbolError(text, pos, f"'{kind}' 를 이 코드에 붙일 수 없음")
+        tension = "7" + kind
+    return triad, tension
+
+
+# =========================
+# Charts (lead-sheet text)
+# =========================
+CHART_TOKEN_RE = re.compile(r"(\|)|([^\s|]+)")
+BRACKET_RE = re.compile(r"\[([^\]]*)\]")
+DIRECTIVE_RE = re.compile(r"\{\s*(\w+)\s*(?::\s*(.*?))?\s*\}")
+# 줄 맨 앞 이름표: "[Verse]" (코드가 아닐 때) 또는 "Intro:", "Key:"
+LABEL_RE = re.compile(r"\s*(?:\[([^\]]+)\]|([A-Za-z][A-Za-z0-9 ]{0,15}):)")
+# 구간이 아니라 곡 정보인 이름표 (줄 전체를 건너뜀)
+METADATA_LABELS = {"key", "capo", "tempo", "bpm", "time", "artist", "composer", "lyrics", "music", "tuning",
+                   "album", "year", "subtitle", "copyright"}
+# 마디줄에 섞여 나오는 코드 아닌 표기: 반복(x2, (x4)), N.C., 박자 슬래시, 점, 대시, 콜론(|: :|)
+FILLER_RE = re.compile(r"\(?[xX×]\d+\)?|\(?\d+[xX×]\)?|N\.?C\.?|/+|\.+|-+|:+")
+REPEAT_BAR = "%"
+
+
+class ChartError(NamedTuple):
+    line: int    # 1부터
+    col: int     # 1부터, 잘못된 글자 위치
+    symbol: str
+    message: str
+
+    def __str__(self):
+        return f"{self.line}:{self.col}: {self.message} ('{self.symbol}')"
+
+
+class Chart:
+    __slots__ = ("path", "title", "bars", "sections", "errors")
+
+    def __init__(self, path: str = "", title: str = ""):
+        self.path = path
+        self.title = title
+        self.bars = []       # 마디마다 [ChordSymbol ...]
+        self.sections = []   # (이름, 시작 마디 번호)
+        self.errors = []     # ChartError
+
+    @property
+    def chords(self):
+        return [c for bar in self.bars for c in bar]
+
+    def progression_text(self) -> str:
+        # Progression 입력칸에 넣을 글자: "Cmaj7 | Am7 D7 | ..."
+        return " | ".join(" ".join(symbol_text(c) for c in bar) for bar in self.bars)
+
+
+def symbol_text(chord: ChordSymbol) -> str:
+    # parse_symbol 로 다시 읽으면 같은 값이 나오는 표기
+    triad, tension = chord.triad, chord.tension
+    quality = {"M": "", "sus2": "", "sus4": ""}.get(triad, triad)
+    if tension == ALT_TENSION:
+        tension = "7alt"
+    elif tension == NONE:
+        tension = ""
+    if triad == "dim" and tension == "6":
+        quality, tension = "dim", "7"
+    elif triad == "dim" and tension.startswith("7"):
+        quality, tension = "m", tension + "b5"
+    elif triad == "aug" and tension:
+        quality, tension = "", tension + "#5"
+    text = NOTE_FLAT[chord.root_pc] + quality + tension
+    if triad in ("sus2", "sus4"):
+        text += triad
+    if chord.bass_pc is not None:
+        text += "/" + NOTE_FLAT[chord.bass_pc]
+    return text
+
+
+def parse_chart(lines, path: str = "") -> Chart:
+    chart = Chart(path)
+    first_text = None
+    for n, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        d = DIRECTIVE_RE.fullmatch(stripped)
+        if d:
+            name, value = d.group(1).lower(), d.group(2) or ""
+            if name in ("title", "t"):
+                chart.title = value
+            elif name.startswith("start_of_") or name in ("soc", "sov", "sob"):
+                label = {"soc": "chorus", "sov": "verse", "sob": "bridge"}.get(name, name[len("start_of_"):])
+                chart.sections.append((value or label.capitalize(), len(chart.bars)))
+            continue
+
+        m = LABEL_RE.match(line)
+        label = m and (m.group(1) or m.group(2)).strip()
+        if label and not (m.group(1) and is_symbol(label)):
+            key = label.lower()
+            if key == "title":
+                chart.title = line[m.end():].strip()
+                continue
+            if key in METADATA_LABELS:
+                continue
+            chart.sections.append((label, len(chart.bars)))
+            # 이름표 자리는 공백으로 (오류 열 번호 유지)
+            line = " " * m.end() + line[m.end():]
+            if not line.strip():
+                continue
+
+        if "[" in line and read_chordpro(chart, line, n):
+            continue
+        if not read_chord_line(chart, line, n) and first_text is None:
+            first_text = stripped
+    if not chart.title:
+        chart.title = first_text or os.path.splitext(os.path.basename(path))[0]
+    return chart
+
+
+def read_chordpro(chart: Chart, line: str, n: int) -> bool:
+    # "[Am7]가사 [D7]가사": 괄호 안 코드마다 한 마디. 코드인 괄호가 하나도 없으면 ChordPro 줄이 아님
+    found = [b for b in BRACKET_RE.finditer(line) if b.group(1).strip()]
+    if not any(is_symbol(b.group(1).strip()) for b in found):
+        return False
+    for b in found:
+        text = b.group(1)
+        col = b.start(1) + len(text) - len(text.lstrip())
+        chord = read_symbol(chart, text.strip(), n, col)
+        if chord is not None:
+            chart.bars.append([chord])
+    return True
+
+
+def read_chord_line(chart: Chart, line: str, n: int) -> bool:
+    # 마디선("|")이 있으면 코드줄. 없으면 낱말이 모두 코드이거나, 2개 이상 중 절반 이상이 코드일 때만
+    words = []
+    has_bars = False
+    good = 0
+    for t in CHART_TOKEN_RE.finditer(line):
+        if t.group(1):
+            has_bars = True
+            words.append(None)
+            continue
+        value, shift, word = chart_word(t.group(2))
+        if value is None:
+            continue
+        if value is REPEAT_BAR or isinstance(value, ChordSymbol):
+            good += 1
+        words.append((value, t.start(2) + shift, word))
+
+    if not has_bars and (not good or (good < len(words) and (len(words) < 2 or good * 2 < len(words)))):
+        return False
+
+    bar = []
+    for w in words + [None]:
+        if w is None:
+            if bar:
+                chart.bars.append(bar)
+                bar = []
+            continue
+        value, col, word = w
+        if value is REPEAT_BAR:
+            if chart.bars:
+                bar.extend(chart.bars[-1])
+        elif isinstance(value, ChordSymbol):
+            bar.append(value)
+        else:
+            chart.errors.append(ChartError(n, col + value[0] + 1, word, value[1]))
+        if bar and not has_bars:
+            # 마디선 없는 코드줄: 코드 하나 = 한 마디
+            chart.bars.append(bar)
+            bar = []
+    return True
+
+
+@lru_cache(maxsize=16384)
+def chart_word(word: str):
+    # 코드줄 낱말 하나 -> (값, 열 보정, 기호). 값 = ChordSymbol, REPEAT_BAR, None(채움 표기), (위치, 메시지)
+    if FILLER_RE.fullmatch(word):
+        return None, 0, word
+    if word == REPEAT_BAR:
+        return REPEAT_BAR, 0, word
+    if word.startswith("(") and word.endswith(")") and len(word) > 2:
+        return _parse_cached(word[1:-1]), 1, word[1:-1]
+    return _parse_cached(word), 0, word
+
+
+def read_symbol(chart: Chart, word: str, n: int, col: int):
+    try:
+        return parse_symbol(word)
+    except SymbolError as exc:
+        chart.errors.append(ChartError(n, col + exc.pos + 1, word, exc.message))
+        return None
+
+
+def load_chart(path: str) -> Chart:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return parse_chart(f, path)
+
+
+def scan(root: str):
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, name) for name in sorted(filenames)
+                     if name.lower().endswith(CHART_EXTENSIONS))
+    return found
+
+
+def load_library(root: str, progress=None, cancel=None):
+    # 폴더 아래 차트 전부: (차트 목록, 통계). 기호 분석은 캐시되므로 프로세스 풀 없이 현재 프로세스에서
+    t0 = time.perf_counter()
+    paths = scan(root)
+    charts = []
+    unreadable = 0
+    for i, path in enumerate(paths):
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            charts.append(load_chart(path))
+        except OSError:
+            unreadable += 1
+        if progress is not None:
+            progress(i + 1, len(paths))
+    info = cache_info()
+    stats = {
+        "files": len(paths),
+        "charts": len(charts),
+        "unreadable": unreadable,
+        "chords": sum(len(c.chords) for c in charts),
+        "errors": sum(len(c.errors) for c in charts),
+        "symbols": info.currsize,
+        "cache_hits": info.hits,
+        "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+    }
+    return charts, stats
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards chords", description="코드 기호 / 리드 시트 차트 분석")
+    ap.add_argument("inputs", nargs="+", help="코드 기호, 또는 차트 파일/폴더")
+    ap.add_argument("--list", action="store_true", help="차트마다 마디 진행 출력")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    from fretcore.model import format_chord_name
+
+    bad = 0
+    for item in args.inputs:
+        if not os.path.exists(item):
+            try:
+                c = parse_symbol(item)
+            except SymbolError as exc:
+                print(f"{exc.caret()}\n{exc.message}", file=sys.stderr)
+                bad += 1
+                continue
+            name = format_chord_name(c.root_pc, c.triad, c.tension, c.bass_pc)
+            print(f"{item:<12} {name:<16} triad={c.triad} tension={c.tension} inversion={c.inversion}")
+            continue
+
+        charts, stats = load_library(item)
+        for chart in charts:
+            if args.list:
+                print(f"{chart.title} ({len(chart.bars)} bars): {chart.progression_text()}")
+            for err in chart.errors:
+                print(f"{chart.path}:{err}", file=sys.stderr)
+        bad += stats["errors"]
+        print(f"{stats['charts']} charts, {stats['chords']} chords, {stats['symbols']} distinct symbols, "
+              f"{stats['errors']} errors, {stats['elapsed_ms']:.0f}ms", file=sys.stderr)
+    return 1 if bad else 0
@@ -0,0 +1,34 @@
+# =========================
+# Command line entry
+# =========================
+#   python -m fretcore <command> [options]
+#   9retboards <command> [options]      (패키징된 앱에서도 동일)
+# 명령 모듈은 선택된 것만 import 한다.
+import importlib
+import sys
+
+COMMANDS = {
+    "export": ("fretcore.export", "키/스케일/코드 조합 전체를 SVG/PNG 로 일괄 출력"),
+    "synth": ("fretcore.synth", "줄/프렛 음이나 코드 보이싱을 WAV 로 합성"),
+    "midi": ("fretcore.midi", "MIDI 파일의 음을 지판 위 운지로 배정"),
+    "serve": ("fretcore.server", "다이어그램 SVG/PNG 를 로컬 HTTP 서버로 제공"),
+    "pitch": ("fretcore.pitch", "WAV 녹음에서 음높이를 찾아 음/스케일 추천"),
+    "tabs": ("fretcore.tabs", "ASCII 탭 폴더의 프렛 사용 빈도/조 분포 집계"),
+    "chords": ("fretcore.chordsym", "코드 기호 / 리드 시트 차트를 Triad/Tension/Inversion 으로 분석"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: 9retboards <command> [options]", "", "commands:"]
+    for name, (_, help_text) in COMMANDS.items():
+        lines.append(f"  {name:<10} {help_text}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        return 2
+    module = importlib.import_module(COMMANDS[argv[0]][0])
+    return module.main(argv[1:]) or 0
@@ -0,0 +1,248 @@
+# =========================
+# Batch export (SVG / PNG)
+# =========================
+#   python -m fretcore export --out sheets --format svg --jobs 8
+# 키 x 스케일 x (트라이어드 x 텐션 x 전위) 조합을 프로세스 풀로 나눠 렌더링하고,
+# 끝나는 대로 파일로 바로 쓴다. 이미 최신인 파일은 건너뛴다.
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from fretcore import raster
+from fretcore.layout import BoardLayout
+from fretcore.model import (
+    ALL_FORMS, KEY_ITEMS, NONE, BoardModel, build_inversion_library, build_recommended_form_groups,
+    build_scale_library, build_tension_library, build_triad_library, key_item_to_pc,
+)
+from fretcore.scene import board_scene
+from fretcore.svg import render_svg
+from fretcore.theory import TheoryTables, popcount
+
+BATCH_SIZE = 64
+
+# 대소문자 구분 없는 파일시스템(macOS 기본)에서 M / m 이 겹치지 않도록
+TRIAD_SLUGS = {"M": "maj", "m": "min"}
+
+
+def slug(text: str) -> str:
+    text = text.replace("#", "s").replace("/", "-")
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-") or "none"
+
+
+def key_slug(item: str) -> str:
+    return slug(item.split("(")[0].split("/")[0].strip())
+
+
+def output_path(out_dir: str, job, fmt: str) -> str:
+    key, scale, triad, tension, inversion, form = job
+    if triad == NONE:
+        chord = "no-chord"
+    else:
+        parts = [TRIAD_SLUGS.get(triad, slug(triad))]
+        if tension != NONE:
+            parts.append(slug(tension))
+        parts.append(slug(inversion))
+        chord = "_".join(parts)
+    if form != ALL_FORMS:
+        chord += "_" + slug(form.split("(")[0])
+    scale_dir = "no-scale" if scale == NONE else slug(scale)
+    return os.path.join(out_dir, key_slug(key), scale_dir, f"{chord}.{fmt}")
+
+
+def iter_jobs(keys, scales, triads, tensions, inversions, forms):
+    # 코드톤 수보다 큰 전위는 pick_bass_pc_for_inversion 에서 마지막 음으로 잘리므로(같은 그림) 건너뜀
+    tables = TheoryTables({}, build_triad_library(), build_tension_library())
+    inversion_defs = build_inversion_library()
+
+    chords = []
+    if NONE in triads:
+        chords.append((NONE, NONE, "Root"))
+    for triad, tension in product([t for t in triads if t != NONE], tensions):
+        size = popcount(tables.chord_mask(triad, tension, 0))
+        for inversion in inversions:
+            if inversion_defs[inversion] < size:
+                chords.append((triad, tension, inversion))
+
+    for key, scale, chord, form in product(keys, scales, chords, forms):
+        if chord[0] == NONE and form != ALL_FORMS:
+            continue
+        yield (key,) + (scale,) + chord + (form,)
+
+
+def source_stamp() -> float:
+    # 렌더링 코드가 바뀌면 기존 출력은 모두 다시 만든다
+    here = os.path.dirname(os.path.abspath(__file__))
+    stamp = 0.0
+    try:
+        for name in os.listdir(here):
+            if name.endswith(".py"):
+                stamp = max(stamp, os.path.getmtime(os.path.join(here, name)))
+    except OSError:
+        pass
+    return stamp
+
+
+def up_to_date(path: str, stamp: float) -> bool:
+    try:
+        return os.path.getmtime(path) >= stamp
+    except OSError:
+        return False
+
+
+def render_job(model: BoardModel, layout: BoardLayout, job, fmt: str, png_scale: float = 1.0) -> bytes:
+    key, scale, triad, tension, inversion, form = job
+    model.set_key(key, update=False)
+    model.set_scale(scale, update=False)
+    model.set_chord(triad, tension, inversion, update=False)
+    model.set_form(form)
+    model.refresh({"key"})
+    board = board_scene(model, layout, caption=True)
+    if fmt == "png":
+        return raster.render_png(board, png_scale)
+    return render_svg(board).encode("utf-8")
+
+
+def write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ----- worker process -----
+_worker = None
+
+
+def _init_worker():
+    global _worker
+    model = BoardModel()
+    _worker = (model, BoardLayout(strings=model.strings, max_fret=model.max_fret))
+
+
+def _render_batch(jobs, out_dir: str, fmt: str, stamp: float, force: bool, png_scale: float):
+    if _worker is None:
+        _init_worker()
+    model, layout = _worker
+    written = skipped = 0
+    for job in jobs:
+        path = output_path(out_dir, job, fmt)
+        if not force and up_to_date(path, stamp):
+            skipped += 1
+            continue
+        write_atomic(path, render_job(model, layout, job, fmt, png_scale))
+        written += 1
+    return written, skipped
+
+
+def _batches(jobs, size: int):
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _pick(value, choices, name: str):
+    # "C,G,Eb" 처럼 쉼표로 구분. 이름 그대로 또는 slug 로 지정 가능
+    if value is None:
+        return list(choices)
+    picked = []
+    for token in [t.strip() for t in value.split(",") if t.strip()]:
+        match = [c for c in choices if token == c]
+        if not match:
+            match = [c for c in choices if slug(token).lower() == slug(c).lower()
+                     or (name == "key" and slug(token).lower() == key_slug(c).lower())]
+        if not match:
+            raise SystemExit(f"unknown {name}: {token!r} (choices: {', '.join(choices)})")
+        picked.extend(m for m in match if m not in picked)
+    return picked
+
+
+def _none_alias(value):
+    # 명령줄에서는 "(없음)" 대신 none 으로 써도 됨
+    if value is None:
+        return None
+    return ",".join(NONE if t.strip().lower() == "none" else t for t in value.split(","))
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards export",
+                                 description="키 x 스케일 x 코드 조합 다이어그램 일괄 출력")
+    ap.add_argument("--out", default="fretboard_export", help="출력 디렉터리")
+    ap.add_argument("--format", choices=["svg", "png"], default="svg")
+    ap.add_argument("--png-scale", type=float, default=1.0, help="PNG 배율 (인쇄용이면 2~3)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="프로세스 수 (1 이면 현재 프로세스에서)")
+    ap.add_argument("--keys", help="예: C,G,Eb")
+    ap.add_argument("--scales", help="예: Dorian,Lydian ((없음) 은 none)")
+    ap.add_argument("--triads", help="예: M,m,dim")
+    ap.add_argument("--tensions", help="예: 7,maj7")
+    ap.add_argument("--inversions", help="예: Root,1st")
+    ap.add_argument("--forms", help="기본은 (전체)만. 예: all 또는 Form 1,Form 2")
+    ap.add_argument("--force", action="store_true", help="최신 파일도 다시 렌더링")
+    ap.add_argument("--limit", type=int, help="앞에서부터 N 개만")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.format == "png" and not raster.available():
+        print("PNG 출력에는 Pillow 가 필요합니다 (pip install pillow)", file=sys.stderr)
+        return 1
+
+    keys = _pick(args.keys, KEY_ITEMS, "key")
+    scales = _pick(_none_alias(args.scales), [NONE] + list(build_scale_library()), "scale")
+    triads = _pick(_none_alias(args.triads), [NONE] + list(build_triad_library()), "triad")
+    tensions = _pick(_none_alias(args.tensions), [NONE] + list(build_tension_library()), "tension")
+    inversions = _pick(args.inversions, list(build_inversion_library()), "inversion")
+    form_names = list(build_recommended_form_groups())
+    if args.forms is None:
+        forms = [ALL_FORMS]
+    elif args.forms.strip().lower() == "all":
+        forms = [ALL_FORMS] + form_names
+    else:
+        forms = [f for t in args.forms.split(",") for f in form_names if f.startswith(t.strip())]
+
+    jobs = list(iter_jobs(keys, scales, triads, tensions, inversions, forms))
+    jobs.sort(key=lambda j: (key_item_to_pc(j[0]), j[1]))
+    if args.limit:
+        jobs = jobs[:args.limit]
+
+    stamp = source_stamp()
+    total = len(jobs)
+    written = skipped = 0
+    t0 = time.perf_counter()
+    print(f"{total} diagrams -> {args.out} ({args.format}, jobs={args.jobs})", file=sys.stderr)
+
+    batches = _batches(jobs, BATCH_SIZE)
+    work = (args.out, args.format, stamp, args.force, args.png_scale)
+    if args.jobs <= 1:
+        for batch in batches:
+            w, s = _render_batch(batch, *work)
+            written += w
+            skipped += s
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_batch, batch, *work) for batch in batches]
+            last = 0.0
+            for fut in as_completed(futures):
+                w, s = fut.result()
+                written += w
+                skipped += s
+                now = time.perf_counter()
+                if now - last > 1.0:
+                    last = now
+                    done = written + skipped
+                    print(f"  {done}/{total}  {written / max(now - t0, 1e-9):.0f} diagrams/s", file=sys.stderr)
+
+    elapsed = time.perf_counter() - t0
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"done: {written} written, {skipped} up to date, {elapsed:.2f}s, {rate:.1f} diagrams/s")
+    return 0
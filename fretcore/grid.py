@@ -0,0 +1,261 @@
+# =========================
+# Multi-board grid (comparison view)
+# =========================
+# 작은 보드 여러 개를 격자로: 선택한 키의 7개 모드, 코드의 모든 전위, 12키, 12키 x 7모드.
+#  - 넥 배경은 크기가 모두 같으므로 한 번만 만들어서(fill_rects -> 이미지) 모든 보드가 같이 씀
+#  - 보드마다의 점(스케일/루트/코드톤)은 작업 스레드에서 작업용 모델로 계산 (layers_job: 코드 폼 탐색이 보드마다
+#    수십 ms 라 12키면 창이 멈춤). 이론표/위치 색인은 화면 모델 것을 공유하고 결과는 보드 설정(BoardSpec) 단위로 캐시
+#  - 격자 좌표 계산만 여기서 하고, 화면에 보이는 줄의 보드만 뷰가 만든다
+from functools import lru_cache
+from typing import NamedTuple
+
+from fretcore.layout import BoardLayout
+from fretcore.model import KEY_ITEMS, NONE, BoardModel
+from fretcore.scene import WOOD, board_inlay_frets, in_frets
+
+MODE_NAMES = ("Major (Ionian)", "Dorian", "Phrygian", "Lydian", "Mixolydian", "Natural Minor (Aeolian)", "Locrian")
+
+MINI_W = 250        # 작은 보드의 지판 폭 (px)
+MINI_GAP = 9        # 줄 간격
+TITLE_H = 16
+CELL_PAD = 10
+PARTIAL_MS = 50     # layers_job 이 계산한 보드 점을 이 간격으로 모아서 보냄
+
+
+class BoardSpec(NamedTuple):
+    title: str
+    key_item: str
+    scale: str
+    triad: str
+    tension: str
+    inversion: str
+
+
+def key_label(item: str) -> str:
+    return item.split("(")[0].split("/")[0].strip()
+
+
+def mode_specs(model):
+    # 같은 으뜸음의 7개 모드 (나란한 모드)
+    key = key_label(model.key_item)
+    return [BoardSpec(f"{key} {mode}", model.key_item, mode, NONE, NONE, "Root") for mode in MODE_NAMES]
+
+
+def inversion_specs(model):
+    # 지금 코드(없으면 메이저 트라이어드)의 가능한 전위 전부
+    triad = model.triad_name if model.triad_name != NONE else "M"
+    tension = model.tension_name if model.triad_name != NONE else NONE
+    tones = len(set(model.triad_defs[triad] + model.tension_defs.get(tension, [])))
+    name = key_label(model.key_item) + ("" if triad == "M" else triad) + ("" if tension == NONE else tension)
+    return [BoardSpec(f"{name} {inv}", model.key_item, model.scale_name, triad, tension, inv)
+            for inv, idx in model.inversion_defs.items() if idx < tones]
+
+
+def key_specs(model):
+    # 12키에서 같은 스케일/코드 (둘 다 없으면 메이저 스케일)
+    scale = model.scale_name
+    if scale == NONE and model.triad_name == NONE:
+        scale = MODE_NAMES[0]
+    return [BoardSpec(key_label(item), item, scale, model.triad_name, model.tension_name, model.inversion_name)
+            for item in KEY_ITEMS]
+
+
+def key_mode_specs(model):
+    # 12키(줄) x 7모드(칸)
+    return [BoardSpec(f"{key_label(item)} {mode}", item, mode, NONE, NONE, "Root")
+            for item in KEY_ITEMS for mode in MODE_NAMES]
+
+
+# 종류 -> (보드 목록, 칸 수). 칸 수가 None 이면 창 폭에 맞춤, 숫자면 표(줄=키, 칸=모드)라서 고정
+GRID_KINDS = {
+    "Modes": (mode_specs, None),
+    "Inversions": (inversion_specs, None),
+    "12 Keys": (key_specs, None),
+    "12 Keys x Modes": (key_mode_specs, len(MODE_NAMES)),
+}
+
+
+@lru_cache(maxsize=8)
+def mini_layout(strings: int, max_fret: int, first_fret: int) -> BoardLayout:
+    return BoardLayout(strings=strings, max_fret=max_fret, first_fret=first_fret, margin=2,
+                       board_w=MINI_W, board_h=MINI_GAP * (strings - 1), open_w=16,
+                       outer_pad_y=4, extend_out=3)
+
+
+def mini_height(layout) -> int:
+    # BoardLayout.height 의 프렛 번호 자리(30px)는 작은 보드에서 쓰지 않음
+    return int(layout.height - 30)
+
+
+def mini_neck_primitives(layout):
+    # 큰 넥(scene.neck_primitives)과 같은 모양을 작은 크기로: 선 굵기 1, 인레이 점 반지름 2
+    L = layout
+    prims = [
+        ("rect", (L.x0, L.y0, L.x1, L.y1), {"fill": WOOD}),
+        ("line", (L.x0, L.y0, L.x0, L.y1), {"width": 3, "fill": "black"}),
+    ]
+    for i in range(1, L.max_fret + 1):
+        prims.append(("line", (L.fret_x[i], L.y0, L.fret_x[i], L.y1), {"width": 1, "fill": "#d8d8d8"}))
+    for s in range(L.strings):
+        y = L.string_y[s]
+        prims.append(("line", (L.x0, y, L.x1, y), {"width": 1, "fill": "black"}))
+    cy = (L.y0 + L.y1) / 2
+    for _, board_fret in board_inlay_frets(L):
+        x = L.fret_center_x(board_fret)
+        prims.append(("oval", (x - 2, cy - 2, x + 2, cy + 2), {"fill": "ivory"}))
+    return prims
+
+
+def fill_rects(prims):
+    # 축에 나란한 선/사각형/작은 원을 채운 사각형 (색, (x0, y0, x1, y1)) 목록으로 -> PhotoImage.put(색, to=...)
+    out = []
+    for kind, coords, opts in prims:
+        color = opts.get("fill") or "black"
+        if kind == "rect":
+            x0, y0, x1, y1 = (int(round(v)) for v in coords)
+            out.append((color, (x0, y0, x1, y1)))
+        elif kind == "line":
+            x0, y0, x1, y1 = coords
+            half = max(1, int(opts.get("width", 1))) / 2
+            if x0 == x1:
+                out.append((color, (int(x0 - half + 0.5), int(round(y0)), int(x0 + half + 0.5), int(round(y1)))))
+            else:
+                out.append((color, (int(round(x0)), int(y0 - half + 0.5), int(round(x1)), int(y0 + half + 0.5))))
+        elif kind == "oval":
+            # 가로줄 단위로 원을 채움
+            x0, y0, x1, y1 = coords
+            cx, cy, r = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2
+            for y in range(int(y0), int(y1) + 1):
+                dy = y + 0.5 - cy
+                if abs(dy) > r:
+                    continue
+                dx = (r * r - dy * dy) ** 0.5
+                left, right = int(round(cx - dx)), int(round(cx + dx))
+                if right > left:
+                    out.append((color, (left, y, right, y + 1)))
+    return out
+
+
+def mini_layer(model, layout, frets=None):
+    # 셀마다 점 하나: 코드톤(폼 색) > 루트(흰 점) > 스케일(회색)
+    r = max(2.0, MINI_GAP / 2 - 0.5)
+    wanted = {}
+
+    def dot(s, fret, fill, outline):
+        x, y = layout.fret_center_x(fret), layout.string_y[s]
+        wanted[(s, fret)] = (("oval", (x - r, y - r, x + r, y + r), {"fill": fill, "outline": outline}),)
+
+    for (s, fret) in model.scale_points:
+        if in_frets(fret, frets):
+            dot(s, fret, "#555555", "")
+    if model.scale_name != NONE or model.triad_name != NONE:
+        for (s, fret) in model.pos_index.points_for_pc(model.tonic_pc):
+            if in_frets(fret, frets) and ((s, fret) in wanted or model.triad_name != NONE):
+                dot(s, fret, "white", "black")
+    for (s, fret) in model.chord_display_points():
+        if in_frets(fret, frets):
+            fill, _ = model.chord_color_for_point(s, fret)
+            dot(s, fret, fill, "black")
+    return wanted
+
+
+class BoardGrid:
+    def __init__(self, model, kind: str, cols: int = 4, layers=None):
+        specs_for, fixed_cols = GRID_KINDS[kind]
+        self.kind = kind
+        self.specs = specs_for(model)
+        self.fixed_cols = fixed_cols
+        self.cols = max(1, fixed_cols or cols)
+
+        inst = model.instrument
+        self.model = model
+        self.form_name = model.form_name
+        self.layout = mini_layout(inst.strings, inst.frets, inst.capo)
+        self.board_h = mini_height(self.layout)
+        self.cell_w = int(self.layout.width) + CELL_PAD
+        self.cell_h = self.board_h + TITLE_H + CELL_PAD
+
+        # BoardSpec -> {(줄, 프렛): (점,)}. 같은 악기/폼이면 종류를 바꿔도 이어 쓸 수 있게 밖에서 넘겨받음
+        self.layers = {} if layers is None else layers
+        self.computed = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.specs)
+
+    @property
+    def rows(self) -> int:
+        return -(-self.count // self.cols)
+
+    @property
+    def size(self):
+        return self.cols * self.cell_w, self.rows * self.cell_h
+
+    def fit_cols(self, width: float) -> bool:
+        # 창 폭에 들어가는 만큼 칸 수를 맞춤 (표 종류는 그대로). 바뀌었으면 True
+        if self.fixed_cols:
+            return False
+        cols = max(1, min(int(width // self.cell_w), self.count))
+        changed = cols != self.cols
+        self.cols = cols
+        return changed
+
+    def origin(self, i: int):
+        # 보드 i 의 왼쪽 위 (제목 포함)
+        row, col = divmod(i, self.cols)
+        return col * self.cell_w + CELL_PAD / 2, row * self.cell_h + CELL_PAD / 2
+
+    def visible(self, top: float, bottom: float, margin_rows: int = 1) -> range:
+        # 세로로 [top, bottom] 에 걸치는 줄의 보드 번호 (위아래 한 줄씩 여유)
+        first = max(0, int(top // self.cell_h) - margin_rows)
+        last = min(self.rows - 1, int(bottom // self.cell_h) + margin_rows)
+        return range(first * self.cols, min(self.count, (last + 1) * self.cols))
+
+    def layer(self, i: int):
+        # 계산해 둔 보드 점. 아직 없으면 None (missing -> layers_job 으로 계산)
+        return self.layers.get(self.specs[i])
+
+    def missing(self, ids):
+        return list(dict.fromkeys(self.specs[i] for i in ids if self.specs[i] not in self.layers))
+
+    def arrived(self, results):
+        # 메인 스레드: layers_job 의 (BoardSpec, 점) 묶음을 캐시에 넣음
+        for spec, layer in results:
+            self.layers[spec] = layer
+        self.computed += len(results)
+
+    def work_model(self) -> BoardModel:
+        # 작업용 모델 (작업마다 새로: 취소된 작업이 아직 돌고 있어도 같은 모델을 같이 쓰지 않게).
+        # 화면 모델의 이론표/위치 색인을 그대로 씀 (같은 악기). 보이싱은 전역 lru 캐시 공유
+        m = self.model
+        w = BoardModel(m.instrument)
+        w._theory = m.theory
+        w.pos_index = m.pos_index
+        w.voicing_constraints = m.voicing_constraints
+        w.set_form(self.form_name)
+        return w
+
+    def compute(self, w: BoardModel, spec: BoardSpec) -> dict:
+        w.set_key(spec.key_item, update=False)
+        w.set_scale(spec.scale, update=False)
+        w.set_chord(spec.triad, spec.tension, spec.inversion, update=False)
+        w.refresh({"key"})
+        return mini_layer(w, self.layout)
+
+    def neck_rects(self):
+        return fill_rects(mini_neck_primitives(self.layout))
+
+
+def layers_job(job, grid: BoardGrid, specs):
+    # workers.WorkerPool 작업: 보드 점을 차례로 계산해서 PARTIAL_MS 마다 [(BoardSpec, 점), ...] 를 job.emit.
+    # 나머지는 결과로. job.cancel() 이면 거기서 멈춤 (스크롤해서 안 보이게 된 보드는 계산하지 않음)
+    w = grid.work_model()
+    batch = []
+    for spec in specs:
+        if job.cancelled:
+            break
+        batch.append((spec, grid.compute(w, spec)))
+        if job.due(PARTIAL_MS):
+            job.emit(batch)
+            batch = []
+    return batch
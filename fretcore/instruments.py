@@ -0,0 +1,96 @@
+# =========================
+# Instruments / tunings
+# =========================
+# 줄 순서는 화면과 같음: 0 = 1번줄(가장 높은 줄) -> 마지막 = 가장 낮은 줄.
+# 음높이는 MIDI 번호(E4 = 64)로 저장하고 pitch class 는 여기서 계산한다.
+# 카포는 개방현을 올리고, 보드에는 카포 위 프렛만(0 = 카포 자리) 보여준다.
+import re
+from dataclasses import dataclass, replace
+
+NOTE_INDEX = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+FRET_CHOICES = [12, 15, 19, 21, 22, 24]
+
+
+@dataclass(frozen=True)
+class Instrument:
+    name: str
+    open_midi: tuple
+    max_fret: int = 12
+    capo: int = 0
+
+    @property
+    def strings(self) -> int:
+        return len(self.open_midi)
+
+    @property
+    def frets(self) -> int:
+        # 카포 위에서 쓸 수 있는 프렛 수
+        return self.max_fret - self.capo
+
+    @property
+    def open_pc(self) -> list:
+        return [(m + self.capo) % 12 for m in self.open_midi]
+
+    def pitch(self, s: int, fret: int) -> int:
+        return self.open_midi[s] + self.capo + fret
+
+    def absolute_fret(self, fret: int) -> int:
+        return fret + self.capo
+
+    def voicing_notes(self, frets):
+        # Voicing.frets (줄별 프렛, None = 뮤트) -> 낮은 줄부터 (줄 개방음(카포 포함), 프렛)
+        return [(self.pitch(s, 0), f) for s, f in reversed(list(enumerate(frets))) if f is not None]
+
+    def with_options(self, max_fret=None, capo=None) -> "Instrument":
+        max_fret = self.max_fret if max_fret is None else max_fret
+        capo = self.capo if capo is None else capo
+        capo = max(0, min(capo, max_fret - 1))
+        return replace(self, max_fret=max_fret, capo=capo)
+
+    def tuning_text(self) -> str:
+        # 낮은 줄 -> 높은 줄 (관례적인 표기)
+        return " ".join(midi_to_name(m) for m in reversed(self.open_midi))
+
+
+def note_to_midi(text: str) -> int:
+    # "E2", "F#1", "Bb0" -> MIDI 번호
+    m = re.fullmatch(r"\s*([A-Ga-g])([#b]?)(-?\d)\s*", text)
+    if not m:
+        raise ValueError(f"bad note name: {text!r}")
+    pc = NOTE_INDEX[m.group(1).upper()] + {"#": 1, "b": -1, "": 0}[m.group(2)]
+    return (int(m.group(3)) + 1) * 12 + pc
+
+
+def midi_to_name(midi: int) -> str:
+    names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+    return f"{names[midi % 12]}{midi // 12 - 1}"
+
+
+def parse_tuning(text: str, name: str = "Custom", max_fret: int = 12) -> Instrument:
+    # "D2 A2 D3 G3 B3 E4" (낮은 줄 -> 높은 줄)
+    notes = [note_to_midi(t) for t in text.replace(",", " ").split()]
+    if len(notes) < 2:
+        raise ValueError("tuning needs at least two strings")
+    return Instrument(name, tuple(reversed(notes)), max_fret)
+
+
+def _preset(name: str, low_to_high: str, max_fret: int = 12) -> Instrument:
+    return parse_tuning(low_to_high, name, max_fret)
+
+
+PRESETS = {
+    inst.name: inst for inst in [
+        _preset("Guitar 6 (Standard)", "E2 A2 D3 G3 B3 E4"),
+        _preset("Guitar 6 (Drop D)", "D2 A2 D3 G3 B3 E4"),
+        _preset("Guitar 6 (DADGAD)", "D2 A2 D3 G3 A3 D4"),
+        _preset("Guitar 6 (Open G)", "D2 G2 D3 G3 B3 D4"),
+        _preset("Guitar 6 (Open D)", "D2 A2 D3 F#3 A3 D4"),
+        _preset("Guitar 7 (Standard)", "B1 E2 A2 D3 G3 B3 E4", 24),
+        _preset("Guitar 8 (Standard)", "F#1 B1 E2 A2 D3 G3 B3 E4", 24),
+        _preset("Bass 4 (Standard)", "E1 A1 D2 G2", 24),
+        _preset("Bass 5 (Standard)", "B0 E1 A1 D2 G2", 24),
+        _preset("Bass 6 (Standard)", "B0 E1 A1 D2 G2 C3", 24),
+    ]
+}
+
+DEFAULT_INSTRUMENT = PRESETS["Guitar 6 (Standard)"]
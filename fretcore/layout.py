@@ -0,0 +1,166 @@
+# =========================
+# Board geometry
+# =========================
+# 캔버스 좌표 계산(프렛 x, 줄 y, 셀 사각형)만 담당한다. tkinter 없음.
+# 프렛 번호는 보드 기준(0 = 너트 또는 카포). first_fret 은 카포 위치(실제 프렛 번호 오프셋).
+# 좌표표(프렛 x, 줄 y, 셀 사각형)는 크기마다 한 번만 계산하고, 같은 크기의 레이아웃은 layout_for() 로 재사용.
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+# 12프렛 넥 폭(px, zoom 1) -> 프렛 수/카포에 따라 실제 줄 길이 비율로 늘고 줄어듦
+BASE_BOARD_W = 1100
+
+
+def fret_ratio(n: int) -> float:
+    return 1.0 - 1.0 / (2 ** (n / 12))
+
+
+@lru_cache(maxsize=64)
+def fret_ratios(max_fret: int, first_fret: int = 0) -> tuple:
+    # 0 ~ 1 로 정규화한 프렛 위치 (폭과 무관하므로 크기가 바뀌어도 그대로 씀)
+    r0 = fret_ratio(first_fret)
+    ratios = [fret_ratio(first_fret + n) - r0 for n in range(max_fret + 1)]
+    r_last = ratios[-1]
+    return tuple(r / r_last for r in ratios)
+
+
+def fret_positions(x0: float, width: float, max_fret: int, first_fret: int = 0):
+    return [x0 + r * width for r in fret_ratios(max_fret, first_fret)]
+
+
+def natural_board_width(max_fret: int, first_fret: int = 0, zoom: float = 1.0) -> float:
+    span = fret_ratio(first_fret + max_fret) - fret_ratio(first_fret)
+    return BASE_BOARD_W * span / fret_ratio(12) * zoom
+
+
+class BoardLayout:
+    def __init__(self, strings: int = 6, max_fret: int = 12, margin: float = 20,
+                 board_w: float = 1100, board_h: float = 260, open_w: float = 80,
+                 outer_pad_y: float = 40, extend_out: float = 22, first_fret: int = 0):
+        self.strings = strings
+        self.max_fret = max_fret
+        self.first_fret = first_fret
+
+        self.margin = margin
+        self.board_w = board_w
+        self.board_h = board_h
+        self.open_w = open_w
+
+        self.outer_pad_y = outer_pad_y
+        self.extend_out = extend_out
+
+        m = self.margin
+        self.width = self.board_w + self.open_w + m * 2
+        self.height = self.board_h + self.outer_pad_y * 2 + m * 2 + 30
+
+        self.y0 = m + self.outer_pad_y
+        self.y1 = self.y0 + self.board_h
+
+        self.open_x0 = m
+        self.x0 = m + self.open_w
+
+        self.fret_x = fret_positions(self.x0, self.board_w, self.max_fret, self.first_fret)
+        self.x1 = self.fret_x[-1]
+
+        self.string_y = [self.y0 + self.board_h * s / (self.strings - 1) for s in range(self.strings)]
+
+        # 셀 좌표표: 그릴 때마다 다시 계산하지 않도록 여기서 한 번만
+        self.center_x = [self._fret_center_x(f) for f in range(self.max_fret + 1)]
+        self.cell_x = [self._fret_cell_bounds_x(f) for f in range(self.max_fret + 1)]
+        self.cell_y = [self._string_cell_bounds_y(s) for s in range(self.strings)]
+        self.cells = [[(left, top, right, bottom) for left, right in self.cell_x] for top, bottom in self.cell_y]
+
+        # 클릭/호버 판정용 경계: 이웃한 프렛 중심, 이웃한 줄 사이의 가운데 (bisect 로 찾음)
+        self.fret_edges = [(self.center_x[f] + self.center_x[f + 1]) / 2 for f in range(1, self.max_fret)]
+        self.string_edges = [(self.string_y[s] + self.string_y[s + 1]) / 2 for s in range(self.strings - 1)]
+
+    def _fret_center_x(self, fret: int) -> float:
+        if fret == 0:
+            return self.x0 - self.open_w / 2
+        return (self.fret_x[fret - 1] + self.fret_x[fret]) / 2
+
+    def _fret_cell_bounds_x(self, fret: int):
+        if fret == 0:
+            pad = 12
+            left = self.x0 - self.open_w + pad
+            right = self.x0 - pad
+            return left, right
+        return self.fret_x[fret - 1], self.fret_x[fret]
+
+    def fret_center_x(self, fret: int) -> float:
+        return self.center_x[fret]
+
+    def fret_cell_bounds_x(self, fret: int):
+        return self.cell_x[fret]
+
+    def visible_frets(self, left: float, right: float):
+        # 화면에 일부라도 보이는 프렛 범위 (lo, hi), 양끝 포함
+        lo = 0 if left <= self.x0 else max(0, bisect_right(self.fret_x, left) - 1) + 1
+        hi = bisect_left(self.fret_x, right)
+        if right < self.x0:
+            hi = 0
+        return min(lo, self.max_fret), min(max(hi, 0), self.max_fret)
+
+    def x_to_fret(self, x: float) -> int:
+        # 가장 가까운 프렛 중심 (같은 거리면 낮은 프렛)
+        if x < self.x0:
+            return 0
+        return 1 + bisect_left(self.fret_edges, x)
+
+    def y_to_string(self, y: float) -> int:
+        return bisect_left(self.string_edges, y)
+
+    def contains(self, x: float, y: float) -> bool:
+        return self.open_x0 <= x <= self.x1 and self.y0 <= y <= self.y1
+
+    def hit(self, x: float, y: float):
+        # 캔버스 좌표 -> (줄, 프렛), 넥 밖이면 None
+        if not self.contains(x, y):
+            return None
+        return self.y_to_string(y), self.x_to_fret(x)
+
+    def string_cell_bounds_y(self, s: int):
+        return self.cell_y[s]
+
+    def _string_cell_bounds_y(self, s: int):
+        inner_pad = 2
+        max_cell_h = 40
+
+        if s == 0:
+            top0 = self.y0 - self.extend_out
+            bottom0 = (self.string_y[0] + self.string_y[1]) / 2
+        elif s == self.strings - 1:
+            top0 = (self.string_y[self.strings - 2] + self.string_y[self.strings - 1]) / 2
+            bottom0 = self.y1 + self.extend_out
+        else:
+            top0 = (self.string_y[s - 1] + self.string_y[s]) / 2
+            bottom0 = (self.string_y[s] + self.string_y[s + 1]) / 2
+
+        top = top0 + inner_pad
+        bottom = bottom0 - inner_pad
+
+        h = bottom - top
+        if h > max_cell_h:
+            mid = (top + bottom) / 2
+            top = mid - max_cell_h / 2
+            bottom = mid + max_cell_h / 2
+
+        canvas_top = self.margin
+        canvas_bottom = self.margin + self.outer_pad_y * 2 + self.board_h
+        if top < canvas_top:
+            top = canvas_top
+        if bottom > canvas_bottom:
+            bottom = canvas_bottom
+        if bottom <= top + 10:
+            bottom = top + 10
+
+        return top, bottom
+
+    def cell_bounds(self, s: int, fret: int):
+        return self.cells[s][fret]
+
+
+@lru_cache(maxsize=16)
+def layout_for(strings: int, max_fret: int, first_fret: int, board_w: int, board_h: int) -> BoardLayout:
+    # 크기(정수 px)별 레이아웃 캐시. 창 크기를 오가도 좌표표를 다시 만들지 않음
+    return BoardLayout(strings=strings, max_fret=max_fret, first_fret=first_fret, board_w=board_w, board_h=board_h)
@@ -0,0 +1,152 @@
+# =========================
+# Reverse lookup (notes -> chords / scales)
+# =========================
+# 클릭한 음 집합(12비트 마스크)을 포함하는 코드/스케일을 찾는다.
+# 4096 개 마스크 전체에 대해 "이 마스크를 포함하는 항목" 목록을 적합도 순으로 미리 만들어 두므로
+# 조회는 표 한 칸 읽기. 한 번 만든 색인은 캐시 파일로 저장했다가 다음 실행 때 읽는다.
+import hashlib
+import os
+import pickle
+
+from fretcore.model import NONE, format_chord_name, pc_to_note_text
+from fretcore.theory import mask_from_intervals, mask_to_pcs, popcount, transpose_mask
+
+INDEX_VERSION = 1
+
+
+def cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "9retboards")
+
+
+def submasks(mask: int):
+    # mask 의 공집합이 아닌 모든 부분집합
+    sub = mask
+    while sub:
+        yield sub
+        sub = (sub - 1) & mask
+
+
+class ChordScaleIndex:
+    def __init__(self, scale_defs: dict, triad_defs: dict, tension_defs: dict, inversion_defs: dict):
+        self.inversion_names = {idx: name for name, idx in inversion_defs.items()}
+
+        # 항목: (root_pc, triad, tension, mask) / (root_pc, scale, mask)
+        self.triad_rank = {name: i for i, name in enumerate(triad_defs)}
+        self.tension_rank = {name: i for i, name in enumerate([NONE] + list(tension_defs))}
+
+        # 같은 루트/같은 음 집합(예: Am7 = A m + 7#9 의 #9 = b3)은 더 단순한 이름 하나만
+        self.chords = []
+        seen = set()
+        for root in range(12):
+            for triad in triad_defs:
+                for tension in self.tension_rank:
+                    mask = mask_from_intervals(triad_defs[triad] + tension_defs.get(tension, []), root)
+                    if (root, mask) in seen:
+                        continue
+                    seen.add((root, mask))
+                    self.chords.append((root, triad, tension, mask))
+        self.scales = []
+        for root in range(12):
+            for name, intervals in scale_defs.items():
+                self.scales.append((root, name, mask_from_intervals(intervals, root)))
+
+        self.signature = self.library_signature(scale_defs, triad_defs, tension_defs, inversion_defs)
+        self.chord_index = None
+        self.scale_index = None
+
+    @staticmethod
+    def library_signature(*libs) -> str:
+        return hashlib.sha1(repr((INDEX_VERSION,) + libs).encode("utf-8")).hexdigest()[:16]
+
+    # ----- build / cache -----
+    def build(self):
+        chord_index = [[] for _ in range(4096)]
+        for i, (root, triad, tension, mask) in enumerate(self.chords):
+            for sub in submasks(mask):
+                chord_index[sub].append(i)
+        scale_index = [[] for _ in range(4096)]
+        for i, (root, name, mask) in enumerate(self.scales):
+            for sub in submasks(mask):
+                scale_index[sub].append(i)
+
+        # 적합도: 남는 음이 적을수록(정확히 일치 = 0) -> 단순한 코드(텐션 없음) 먼저
+        chord_key = [(popcount(mask), self.triad_rank[triad], self.tension_rank[tension], root)
+                     for root, triad, tension, mask in self.chords]
+        for q in range(1, 4096):
+            chord_index[q].sort(key=chord_key.__getitem__)
+            scale_index[q].sort(key=lambda i: (popcount(self.scales[i][2]), i))
+        self.chord_index = tuple(tuple(ids) for ids in chord_index)
+        self.scale_index = tuple(tuple(ids) for ids in scale_index)
+        return self
+
+    def cache_path(self, directory=None) -> str:
+        return os.path.join(directory or cache_dir(), f"lookup-{self.signature}.pickle")
+
+    def load_or_build(self, directory=None):
+        path = self.cache_path(directory)
+        try:
+            with open(path, "rb") as f:
+                signature, chord_index, scale_index = pickle.load(f)
+            if signature == self.signature and len(chord_index) == 4096:
+                self.chord_index, self.scale_index = chord_index, scale_index
+                return self
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            pass
+
+        self.build()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump((self.signature, self.chord_index, self.scale_index), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # 캐시 저장 실패는 무시 (다음 실행 때 다시 만듦)
+        return self
+
+    # ----- query -----
+    def chord_result(self, i: int, query: int, bass_pc=None) -> dict:
+        root, triad, tension, mask = self.chords[i]
+        inversion = None
+        if bass_pc is not None and mask >> bass_pc & 1:
+            rels = mask_to_pcs(transpose_mask(mask, -root))
+            inversion = self.inversion_names.get(rels.index((bass_pc - root) % 12))
+        slash = bass_pc if inversion not in (None, "Root") else None
+        return {
+            "kind": "chord",
+            "name": format_chord_name(root, triad, tension, slash),
+            "root_pc": root,
+            "triad": triad,
+            "tension": tension,
+            "inversion": inversion,
+            "mask": mask,
+            "extra": popcount(mask) - popcount(query),
+            "exact": mask == query,
+        }
+
+    def scale_result(self, i: int, query: int) -> dict:
+        root, name, mask = self.scales[i]
+        return {
+            "kind": "scale",
+            "name": f"{pc_to_note_text(root)} {name}",
+            "root_pc": root,
+            "scale": name,
+            "mask": mask,
+            "extra": popcount(mask) - popcount(query),
+            "exact": mask == query,
+        }
+
+    def lookup(self, query: int, bass_pc=None, limit: int = 8):
+        if self.chord_index is None:
+            self.build()
+        query &= 0xFFF
+        if not query:
+            return [], []
+        chord_ids = self.chord_index[query][:limit * 4]
+        chords = [self.chord_result(i, query, bass_pc) for i in chord_ids]
+        if bass_pc is not None:
+            # 같은 적합도 안에서는 베이스가 루트인 코드 -> 전위로 설명되는 코드 순
+            chords.sort(key=lambda r: (r["extra"], r["root_pc"] != bass_pc, r["inversion"] is None))
+        scales = [self.scale_result(i, query) for i in self.scale_index[query][:limit]]
+        return chords[:limit], scales
@@ -0,0 +1,396 @@
+# =========================
+# MIDI import + fingering
+# =========================
+# Standard MIDI File(형식 0/1/2)를 읽어서 음을 지판 위 (줄, 프렛)에 배정한다.
+#  - 파서: 파일을 mmap 으로 열고 트랙마다 제너레이터로 이벤트를 하나씩 읽음.
+#    트랙들은 heapq.merge 로 tick 순서로 합치고, 객체로 남는 것은 완성된 음(Note)뿐.
+#  - 운지: 동시에 울리는 음 묶음(그룹)마다 가능한 (줄, 프렛) 배정 후보를 만들고
+#    Viterbi(동적 계획법)로 손 위치 이동이 가장 적은 경로를 고른다.
+#   python -m fretcore midi song.mid --show 20
+import argparse
+import heapq
+import mmap
+import struct
+import sys
+import time
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple
+
+DRUM_CHANNEL = 9
+CHORD_WINDOW = 0.03   # 이 시간(초) 안에 시작하는 음은 한 묶음(화음)으로
+MAX_SPAN = 4          # 한 묶음 안에서 눌러 잡는 프렛의 최고 - 최저
+MAX_CANDIDATES = 12   # 묶음마다 남기는 배정 후보 수
+CANCEL_EVERY = 256    # 운지 계산 중 취소 확인 간격 (묶음 수)
+
+# 운지 비용 가중치
+MOVE_COST = 1.0       # 손 위치(검지 프렛) 1칸 이동
+SPAN_COST = 0.6       # 묶음 안에서 손가락을 벌리는 정도
+HIGH_COST = 0.08      # 높은 포지션 (같은 음이면 낮은 포지션 선호)
+OPEN_MOVE = 0.5       # 개방현만 있는 묶음으로/에서 넘어갈 때 (손은 자유)
+
+TEMPO = 0x51
+END_OF_TRACK = 0x2F
+
+
+class Note(NamedTuple):
+    start: float   # 초
+    end: float
+    midi: int
+    channel: int
+    track: int
+
+
+class Group(NamedTuple):
+    start: float
+    end: float
+    notes: tuple   # ((줄, 프렛, midi), ...) 낮은 음부터
+
+
+# =========================
+# Parser
+# =========================
+def _varlen(data, pos: int):
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def _track_events(data, pos: int, end: int, track: int):
+    # (tick, track, kind, a, b, c): kind 0 = note off, 1 = note on, 2 = 템포 (a = 4분음표당 마이크로초)
+    # 그 밖의 이벤트(컨트롤, sysex, 메타)는 길이만 읽고 건너뜀
+    tick = 0
+    status = 0
+    while pos < end:
+        delta, pos = _varlen(data, pos)
+        tick += delta
+        byte = data[pos]
+        if byte >= 0x80:
+            status = byte
+            pos += 1
+        elif status < 0x80:
+            raise ValueError(f"트랙 {track}: running status 없이 데이터 바이트 (offset {pos})")
+
+        kind = status & 0xF0
+        if kind == 0x90 or kind == 0x80:
+            note, vel = data[pos], data[pos + 1]
+            pos += 2
+            yield tick, track, 1 if kind == 0x90 and vel else 0, status & 0x0F, note, vel
+        elif kind in (0xA0, 0xB0, 0xE0):
+            pos += 2
+        elif kind in (0xC0, 0xD0):
+            pos += 1
+        elif status == 0xFF:
+            meta = data[pos]
+            length, pos = _varlen(data, pos + 1)
+            if meta == TEMPO and length == 3:
+                yield tick, track, 2, (data[pos] << 16) | (data[pos + 1] << 8) | data[pos + 2], 0, 0
+            pos += length
+            status = 0   # 메타/sysex 뒤에는 running status 없음
+            if meta == END_OF_TRACK:
+                return
+        elif status in (0xF0, 0xF7):
+            length, pos = _varlen(data, pos)
+            pos += length
+            status = 0
+        else:
+            raise ValueError(f"트랙 {track}: 알 수 없는 상태 바이트 0x{status:02X} (offset {pos})")
+
+
+def _chunks(data):
+    if data[:4] != b"MThd":
+        raise ValueError("MIDI 파일이 아님 (MThd 없음)")
+    length, fmt, ntracks, division = struct.unpack(">IHHH", data[4:14])
+    pos = 8 + length
+    tracks = []
+    while pos + 8 <= len(data) and len(tracks) < ntracks:
+        tag, size = data[pos:pos + 4], struct.unpack(">I", data[pos + 4:pos + 8])[0]
+        if tag == b"MTrk":
+            tracks.append((pos + 8, min(pos + 8 + size, len(data))))
+        pos += 8 + size
+    return fmt, division, tracks
+
+
+def read_notes(data, channels=None, drums: bool = False):
+    # data: bytes/mmap. 시작 시각 순 Note 목록
+    fmt, division, tracks = _chunks(data)
+    if division & 0x8000:
+        # SMPTE: 초당 프레임 x 프레임당 tick (템포 무관)
+        fps = 256 - (division >> 8)
+        seconds_per_tick = 1.0 / (fps * (division & 0xFF))
+        tick_scale = None
+    else:
+        seconds_per_tick = 500000 / 1e6 / division   # 기본 템포 120 BPM
+        tick_scale = division
+
+    streams = [_track_events(data, start, end, i) for i, (start, end) in enumerate(tracks)]
+    # 형식 2 는 트랙마다 독립된 곡이지만 이어 붙이지 않고 같은 시간축에 겹쳐 읽음
+    merged = heapq.merge(*streams)
+
+    notes = []
+    sounding = {}   # (track, channel, note) -> [시작 시각, ...]
+    last_tick = 0
+    last_time = 0.0
+    for tick, track, kind, a, b, _vel in merged:
+        now = last_time + (tick - last_tick) * seconds_per_tick
+        last_tick, last_time = tick, now
+        if kind == 2:
+            if tick_scale is not None:
+                seconds_per_tick = a / 1e6 / tick_scale
+            continue
+        channel, note = a, b
+        if channel == DRUM_CHANNEL and not drums:
+            continue
+        if channels is not None and channel not in channels:
+            continue
+        key = (track, channel, note)
+        if kind == 1:
+            sounding.setdefault(key, []).append(now)
+        else:
+            starts = sounding.get(key)
+            if starts:
+                notes.append(Note(starts.pop(0), now, note, channel, track))
+
+    # 끝까지 꺼지지 않은 음은 마지막 이벤트에서 끝냄
+    for (track, channel, note), starts in sounding.items():
+        notes.extend(Note(start, last_time, note, channel, track) for start in starts)
+    notes.sort()
+    return notes
+
+
+def load_notes(path: str, channels=None, drums: bool = False):
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:   # 빈 파일
+            raise ValueError(f"{path}: 빈 파일")
+        try:
+            return read_notes(data, channels, drums)
+        except (IndexError, struct.error):
+            raise ValueError(f"{path}: 파일이 중간에 끊김")
+        finally:
+            data.close()
+
+
+# =========================
+# Fingering (Viterbi)
+# =========================
+def group_notes(notes, max_notes: int):
+    # 시작 시각이 CHORD_WINDOW 안인 음을 묶음으로. 줄 수보다 많으면 낮은 음부터 버림
+    groups = []
+    dropped = 0
+    i, n = 0, len(notes)
+    while i < n:
+        start = notes[i].start
+        j = i
+        pitches = set()
+        end = start
+        while j < n and notes[j].start - start <= CHORD_WINDOW:
+            pitches.add(notes[j].midi)
+            end = max(end, notes[j].end)
+            j += 1
+        pitches = sorted(pitches)
+        if len(pitches) > max_notes:
+            dropped += len(pitches) - max_notes
+            pitches = pitches[-max_notes:]
+        groups.append((start, end, tuple(pitches)))
+        i = j
+    return groups, dropped
+
+
+@lru_cache(maxsize=8192)
+def group_candidates(open_midi: tuple, max_fret: int, pitches: tuple):
+    # 묶음의 음들을 서로 다른 줄에 배정하는 방법들 -> ((배정, 손 위치, 비용), ...) 비용 낮은 순
+    # 배정 = ((줄, 프렛, midi), ...) / 손 위치 = 눌러 잡는 최저 프렛 (개방현만이면 None)
+    # 연주할 수 없는 음(음역 밖)은 빼고 배정. 곡에서 같은 묶음이 반복되므로 메모이즈
+    options = []
+    for m in pitches:
+        places = [(s, m - o) for s, o in enumerate(open_midi) if 0 <= m - o <= max_fret]
+        if places:
+            options.append((m, places))
+
+    found = []
+    used = set()
+    chosen = []
+
+    def walk(k, lo, hi):
+        if k == len(options):
+            span = hi - lo if lo is not None else 0
+            cost = SPAN_COST * span + HIGH_COST * (lo or 0)
+            found.append((tuple(sorted(chosen, key=lambda p: p[2])), lo, cost))
+            return
+        m, places = options[k]
+        for s, fret in places:
+            if s in used:
+                continue
+            nlo, nhi = lo, hi
+            if fret > 0:
+                nlo = fret if lo is None else min(lo, fret)
+                nhi = fret if hi is None else max(hi, fret)
+                if nhi - nlo > MAX_SPAN:
+                    continue
+            used.add(s)
+            chosen.append((s, fret, m))
+            walk(k + 1, nlo, nhi)
+            chosen.pop()
+            used.discard(s)
+
+    walk(0, None, None)
+    if not found and len(pitches) > 1:
+        # 한 손으로 못 잡는 화음: 가장 낮은 음을 빼고 다시
+        cands, missing = group_candidates(open_midi, max_fret, pitches[1:])
+        return cands, missing + 1
+    found.sort(key=lambda c: c[2])
+    return tuple(found[:MAX_CANDIDATES]), len(pitches) - len(options)
+
+
+def move_cost(a, b, gap: float) -> float:
+    # 손 위치 a -> b. 쉬는 시간이 길수록 이동 부담이 적음
+    if a is None or b is None:
+        return OPEN_MOVE
+    return MOVE_COST * abs(a - b) / (1.0 + 2.0 * gap)
+
+
+class Fingering:
+    def __init__(self, groups, cost: float, unplayable: int, dropped: int, elapsed_ms: float):
+        # 합계는 만들 때 한 번만 (작업 스레드에서). 화면은 슬라이더를 움직일 때마다 stats() 를 읽음
+        self.groups = groups
+        self.starts = [g.start for g in groups]
+        self.duration = max((g.end for g in groups), default=0.0)
+        self.notes = sum(len(g.notes) for g in groups)
+        self.cost = cost
+        self.unplayable = unplayable
+        self.dropped = dropped
+        self.elapsed_ms = elapsed_ms
+
+    def index_at(self, t: float) -> int:
+        # t 초에 울리고 있는(마지막으로 시작한) 묶음
+        return max(0, bisect_right(self.starts, t) - 1)
+
+    def stats(self) -> dict:
+        return {
+            "groups": len(self.groups),
+            "notes": self.notes,
+            "cost": round(self.cost, 2),
+            "unplayable": self.unplayable,
+            "dropped": self.dropped,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+
+def assign_fingering(notes, instrument, cancel=None) -> Fingering:
+    # instrument.open_midi(옥타브 포함 튜닝)와 카포로 후보 위치를 만들고, 묶음 사이 이동 비용 합이 최소인 경로
+    # cancel() 이 True 가 되면 (CANCEL_EVERY 묶음마다 확인) 거기서 멈추고 None
+    t0 = time.perf_counter()
+    open_midi = tuple(instrument.pitch(s, 0) for s in range(instrument.strings))
+    max_fret = instrument.frets
+    raw, dropped = group_notes(notes, instrument.strings)
+
+    steps = []   # (start, end, candidates)
+    unplayable = 0
+    for k, (start, end, pitches) in enumerate(raw):
+        if cancel is not None and k % CANCEL_EVERY == 0 and cancel():
+            return None
+        cands, missing = group_candidates(open_midi, max_fret, pitches)
+        unplayable += missing
+        if cands:
+            steps.append((start, end, cands))
+    if not steps:
+        return Fingering([], 0.0, unplayable, dropped, (time.perf_counter() - t0) * 1000.0)
+
+    # Viterbi: cost[j] = 지금 묶음을 후보 j 로 잡았을 때까지의 최소 비용, back[k][j] = 이전 후보
+    first = steps[0][2]
+    cost = [c[2] for c in first]
+    back = [None]
+    prev_end = steps[0][1]
+    prev = first
+    for k, (start, end, cands) in enumerate(steps[1:]):
+        if cancel is not None and k % CANCEL_EVERY == 0 and cancel():
+            return None
+        gap = max(0.0, start - prev_end)
+        new_cost = []
+        pointers = []
+        for _, hand, own in cands:
+            best_i, best = 0, None
+            for i, (_, prev_hand, _) in enumerate(prev):
+                c = cost[i] + move_cost(prev_hand, hand, gap)
+                if best is None or c < best:
+                    best_i, best = i, c
+            new_cost.append(best + own)
+            pointers.append(best_i)
+        cost = new_cost
+        back.append(pointers)
+        prev = cands
+        prev_end = end
+
+    j = min(range(len(cost)), key=cost.__getitem__)
+    total = cost[j]
+    path = [0] * len(steps)
+    for k in range(len(steps) - 1, -1, -1):
+        path[k] = j
+        if k:
+            j = back[k][j]
+    groups = [Group(start, end, cands[path[k]][0]) for k, (start, end, cands) in enumerate(steps)]
+    return Fingering(groups, total, unplayable, dropped, (time.perf_counter() - t0) * 1000.0)
+
+
+def load_job(job, path: str):
+    # workers.WorkerPool 작업: 파일 읽기만 (운지는 악기가 바뀔 때마다 다시 하므로 fingering_job 따로)
+    return load_notes(path)
+
+
+def fingering_job(job, notes, instrument):
+    # workers.WorkerPool 작업: 같은 채널에 새 배정을 내면 (악기를 연달아 바꿈) 이전 것은 중간에 멈추고 None
+    return assign_fingering(notes, instrument, cancel=lambda: job.cancelled)
+
+
+def group_text(group: Group) -> str:
+    return " ".join(f"{s + 1}/{fret}" for s, fret, _ in group.notes)
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards midi", description="MIDI 파일의 음을 지판 위 운지로 배정")
+    ap.add_argument("path", help="Standard MIDI File (.mid)")
+    ap.add_argument("--instrument", default=None, help="악기 프리셋 이름 (기본 Guitar 6 (Standard))")
+    ap.add_argument("--frets", type=int, default=None, help="프렛 수 (기본: 프리셋)")
+    ap.add_argument("--capo", type=int, default=0)
+    ap.add_argument("--channels", default=None, help="읽을 채널 (1~16, 쉼표로). 기본: 드럼 빼고 전부")
+    ap.add_argument("--show", type=int, default=0, help="앞에서부터 묶음 N 개를 출력 (줄/프렛, 줄 1 = 가장 높은 줄)")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    from fretcore.instruments import DEFAULT_INSTRUMENT, PRESETS, midi_to_name
+
+    if args.instrument and args.instrument not in PRESETS:
+        raise SystemExit(f"unknown instrument: {args.instrument!r} (choices: {', '.join(PRESETS)})")
+    instrument = (PRESETS[args.instrument] if args.instrument else DEFAULT_INSTRUMENT).with_options(
+        max_fret=args.frets, capo=args.capo)
+    channels = None
+    if args.channels:
+        channels = {int(c) - 1 for c in args.channels.split(",")}
+
+    t0 = time.perf_counter()
+    try:
+        notes = load_notes(args.path, channels)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    parse_ms = (time.perf_counter() - t0) * 1000.0
+    fingering = assign_fingering(notes, instrument)
+
+    for g in fingering.groups[:args.show]:
+        names = " ".join(midi_to_name(m) for _, _, m in g.notes)
+        print(f"{g.start:8.3f}s  {names:<24} {group_text(g)}")
+    st = fingering.stats()
+    print(f"{len(notes)} notes -> {st['groups']} groups  parse {parse_ms:.1f}ms  fingering {st['elapsed_ms']}ms  "
+          f"cost {st['cost']}  unplayable {st['unplayable']}  dropped {st['dropped']}", file=sys.stderr)
+    return 0
@@ -0,0 +1,550 @@
+# =========================
+# Headless board model
+# =========================
+# 라이브러리/음이름 헬퍼/선택 상태를 tkinter 없이 다룬다.
+# Tk 화면(9retboards.py)과 배치 작업이 같은 모델을 공유한다.
+from fretcore.instruments import DEFAULT_INSTRUMENT
+from fretcore.theory import PositionIndex, TheoryTables, mask_to_pcs, transpose_mask
+from fretcore.voicing import VoicingConstraints, chord_forms
+
+NONE = "(없음)"
+ALL_FORMS = "(전체)"
+
+KEY_ITEMS = [
+    "C (Am)", "G (Em)", "D (Bm)", "A (F#m)", "E (C#m)", "B (G#m)",
+    "F# / Gb (D#m / Ebm)", "Db / C# (Bbm / A#m)", "Ab / G# (Fm)",
+    "Eb / D# (Cm)", "Bb / A# (Gm)", "F (Dm)"
+]
+
+# 폼 보이싱에 속하지 않는 코드톤 색
+CHORD_TONE_COLOR = {"fill": "#9e9e9e", "text": "black"}
+
+# 1번줄(위) -> 6번줄(아래): E, B, G, D, A, E
+STANDARD_OPEN_PC = [4, 11, 7, 2, 9, 4]
+
+NOTE_SHARP = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+NOTE_FLAT = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+
+# 선택(스케일 / 코드)마다 계산되는 파생 필드. 캐시에는 이 순서의 튜플로 넣는다
+SCALE_FIELDS = ("scale_mask", "scale_allowed_pcs", "scale_points", "scale_hint")
+CHORD_FIELDS = ("chord_mask", "chord_allowed_pcs", "chord_points", "chord_hint", "forms", "point_forms")
+
+
+# =========================
+# Libraries
+# =========================
+def build_scale_library():
+    lib = {}
+    lib["Major (Ionian)"] = [0,2,4,5,7,9,11]
+    lib["Dorian"] = [0,2,3,5,7,9,10]
+    lib["Phrygian"] = [0,1,3,5,7,8,10]
+    lib["Lydian"] = [0,2,4,6,7,9,11]
+    lib["Mixolydian"] = [0,2,4,5,7,9,10]
+    lib["Natural Minor (Aeolian)"] = [0,2,3,5,7,8,10]
+    lib["Locrian"] = [0,1,3,5,6,8,10]
+    lib["Harmonic Minor"] = [0,2,3,5,7,8,11]
+    lib["Melodic Minor (Asc)"] = [0,2,3,5,7,9,11]
+    lib["Lydian Dominant"] = [0,2,4,6,7,9,10]
+    lib["Mixolydian b6"] = [0,2,4,5,7,8,10]
+    lib["Locrian #2"] = [0,2,3,5,6,8,10]
+    lib["Altered (Super Locrian)"] = [0,1,3,4,6,8,10]
+    for k in list(lib.keys()):
+        lib[k] = sorted(set([x % 12 for x in lib[k]]))
+    return lib
+
+
+def build_triad_library():
+    return {
+        "M": [0, 4, 7],
+        "m": [0, 3, 7],
+        "dim": [0, 3, 6],
+        "aug": [0, 4, 8],
+        "sus2": [0, 2, 7],
+        "sus4": [0, 5, 7],
+        "5": [0, 7],
+        "add9": [0, 4, 7, 2],
+        "madd9": [0, 3, 7, 2],
+    }
+
+
+def build_tension_library():
+    return {
+        "6": [9],
+        "7": [10],
+        "maj7": [11],
+        "9": [2, 10],
+        "maj9": [2, 11],
+        "11": [5, 10],
+        "13": [9, 10],
+        "6/9": [2, 9],
+        "7b9": [1, 10],
+        "7#9": [3, 10],
+        "7#11": [6, 10],
+        "7b13": [8, 10],
+        "alt (b9 #9 b5 #5)": [1, 3, 6, 8, 10],
+    }
+
+
+def build_inversion_library():
+    return {"Root": 0, "1st": 1, "2nd": 2, "3rd": 3}
+
+
+def build_recommended_form_groups():
+    # 폼 = voicing.chord_forms() 가 고른 실제 보이싱(넥 아래쪽부터 1..5번)
+    # (전체) 선택 시: 모든 코드톤을 보여주고, 폼에 속한 음은 그 폼 색으로 칠함.
+
+    # 1번폼=빨강, 2번폼=파랑, 3번폼=초록, 4번폼=보라, 5번폼=주황
+    # (사용자 요청대로 색 분류)
+    return {
+        "Form 1 (Red)": {"fill": "#d32f2f", "text": "white"},
+        "Form 2 (Blue)": {"fill": "#1976d2", "text": "white"},
+        "Form 3 (Green)": {"fill": "#388e3c", "text": "white"},
+        "Form 4 (Purple)": {"fill": "#7b1fa2", "text": "white"},
+        "Form 5 (Orange)": {"fill": "#f57c00", "text": "black"},
+    }
+
+
+# =========================
+# Music helpers
+# =========================
+def note_name_to_pc(name: str) -> int:
+    name = (name or "").strip()
+    if not name:
+        return 0
+    base_map = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+    base = base_map.get(name[0].upper(), 0)
+    acc = name[1:].strip()
+    if acc == "#":
+        base += 1
+    elif acc.lower() == "b":
+        base -= 1
+    return base % 12
+
+
+def key_item_to_pc(item: str) -> int:
+    major_part = item.split("(")[0].strip()
+    first_name = major_part.split("/")[0].strip()
+    return note_name_to_pc(first_name)
+
+
+def key_hint_text(item: str) -> str:
+    if "(" in item and ")" in item:
+        major = item.split("(")[0].strip()
+        minor = item.split("(")[1].split(")")[0].strip()
+        return f"선택: {major}   나란한조: {minor}"
+    return f"선택: {item}"
+
+
+def pc_to_note_text(pc: int) -> str:
+    ns = NOTE_SHARP[pc % 12]
+    nf = NOTE_FLAT[pc % 12]
+    return f"{ns}/{nf}" if ns != nf else ns
+
+
+def tension_label(semis: int) -> str:
+    return ["R", "b9", "9", "#9", "3", "11", "#11", "5", "b13", "13", "b7", "7"][semis % 12]
+
+
+def format_chord_name(root_pc: int, triad_name: str, tension_name: str, bass_pc=None) -> str:
+    chord_name = pc_to_note_text(root_pc)
+    if triad_name == "m":
+        chord_name += "m"
+    elif triad_name not in ("M", "m"):
+        chord_name += triad_name
+
+    if tension_name != NONE:
+        chord_name += tension_name
+
+    if bass_pc is not None:
+        chord_name += f"/{pc_to_note_text(bass_pc)}"
+    return chord_name
+
+
+# =========================
+# Board model
+# =========================
+class BoardModel:
+    def __init__(self, instrument=None):
+        # 악기(튜닝/프렛 수/카포). max_fret 은 카포 위에서 보이는 프렛 수
+        self.instrument = instrument or DEFAULT_INSTRUMENT
+        self.open_pc = self.instrument.open_pc
+        self.strings = self.instrument.strings
+        self.max_fret = self.instrument.frets
+
+        # ===== Scale/Chord Library =====
+        self.scale_defs = build_scale_library()
+        # 카탈로그에서 고른 스케일 (라이브러리 밖). 역검색 색인/일괄 출력에는 들어가지 않음
+        self.extra_scales = {}
+        self.triad_defs = build_triad_library()
+        self.tension_defs = build_tension_library()
+        self.inversion_defs = build_inversion_library()
+        self.form_groups = build_recommended_form_groups()
+
+        # 12조 전체 마스크 표는 처음 스케일/코드를 고를 때 만든다 (시작할 때는 둘 다 "(없음)")
+        self._theory = None
+        self.pos_index = PositionIndex(self.open_pc, self.max_fret)
+
+        # ===== Selection =====
+        self.key_item = KEY_ITEMS[0]
+        self.tonic_pc = key_item_to_pc(self.key_item)
+        self.scale_name = NONE
+        self.triad_name = NONE
+        self.tension_name = NONE
+        self.inversion_name = "Root"
+        self.form_name = ALL_FORMS
+
+        # 수동 클릭(같은 음 전체 토글)
+        self.active_points = set()
+
+        # ===== Derived =====
+        self.scale_mask = 0
+        self.scale_points = frozenset()
+        self.scale_allowed_pcs = set()
+        self.scale_hint = "스케일: 없음"
+
+        self.chord_mask = 0
+        self.chord_allowed_pcs = set()
+        self.chord_points = frozenset()
+        self.chord_hint = "코드: -"
+
+        # 역검색 색인(클릭한 음 -> 코드/스케일). 처음 쓸 때 캐시 파일에서 읽거나 만든다
+        self._lookup_index = None
+
+        # 추천 폼(실제 보이싱). point_forms: (줄, 프렛) -> 가장 앞 폼 번호
+        self.voicing_constraints = VoicingConstraints()
+        self.forms = ()
+        self.point_forms = {}
+        # 폼 계산을 맡길 곳 (workers.BackgroundCache: 작업 스레드). None 이면 바로 chord_forms().
+        # 돌려받은 값이 None 이면 아직 계산 중 -> forms_pending, 도착하면 화면이 forms_arrived() 를 부름
+        self.forms_source = None
+        self.forms_pending = False
+
+        # 재계산 입력값 기록: 같은 입력이면 다시 계산하지 않음 (recomputed / skipped 로 셈)
+        self._scale_inputs = None
+        self._chord_inputs = None
+        self.recomputed = 0
+        self.skipped = 0
+        # 입력별 파생 데이터 캐시 (prefetch.PrefetchCache). 있으면 계산 전에 찾아보고, 계산한 것은 넣어 둠
+        self.derived_cache = None
+        self.cache_hits = 0
+
+        self.apply_selected_scale()
+        self.apply_selected_chord()
+
+    @property
+    def theory(self) -> TheoryTables:
+        if self._theory is None:
+            self._theory = TheoryTables({**self.scale_defs, **self.extra_scales}, self.triad_defs,
+                                        self.tension_defs)
+        return self._theory
+
+    # ----- selection -----
+    # update=False 면 선택만 바꾸고 파생 데이터는 refresh() 때 (화면은 스케줄러가 프레임마다 한 번)
+    def set_instrument(self, instrument, update: bool = True):
+        self.instrument = instrument
+        self.open_pc = instrument.open_pc
+        self.strings = instrument.strings
+        self.max_fret = instrument.frets
+        self.pos_index = PositionIndex(self.open_pc, self.max_fret)
+        self.active_points.clear()
+        if update:
+            self.refresh({"instrument"})
+
+    def set_key(self, item: str, update: bool = True):
+        self.key_item = item
+        self.tonic_pc = key_item_to_pc(item)
+        self.active_points.clear()
+        if update:
+            self.refresh({"key"})
+
+    def add_scale(self, name: str, intervals):
+        if name in self.scale_defs or name in self.extra_scales:
+            return
+        self.extra_scales[name] = sorted(set(x % 12 for x in intervals))
+        if self._theory is not None:
+            self._theory.add_scale(name, self.extra_scales[name])
+
+    def set_scale(self, name: str, update: bool = True):
+        self.scale_name = name
+        if update:
+            self.refresh({"scale"})
+
+    def set_chord(self, triad_name: str, tension_name: str, inversion_name: str, update: bool = True):
+        self.triad_name = triad_name
+        self.tension_name = tension_name
+        self.inversion_name = inversion_name
+        if update:
+            self.refresh({"chord"})
+
+    def set_form(self, name: str):
+        self.form_name = name
+
+    def refresh(self, parts):
+        # parts: 바뀐 선택 {"key", "scale", "chord", "form", "active", "instrument"}
+        if parts & {"key", "scale", "instrument"}:
+            self.apply_selected_scale()
+        if parts & {"key", "chord", "instrument"}:
+            self.apply_selected_chord()
+
+    # ----- derived cache -----
+    def scale_inputs(self):
+        return self.scale_name, self.tonic_pc, self.instrument
+
+    def chord_inputs(self):
+        return (self.triad_name, self.tension_name, self.inversion_name, self.tonic_pc, self.instrument,
+                self.voicing_constraints)
+
+    def restore_derived(self, key, fields) -> bool:
+        cache = self.derived_cache
+        state = cache.get(key) if cache is not None else None
+        if state is None:
+            return False
+        for name, value in zip(fields, state):
+            setattr(self, name, value)
+        self.cache_hits += 1
+        return True
+
+    def store_derived(self, key, fields):
+        if self.derived_cache is not None:
+            self.derived_cache.put(key, tuple(getattr(self, name) for name in fields))
+
+    # ----- apply scale -----
+    def apply_selected_scale(self):
+        inputs = self.scale_inputs()
+        if inputs == self._scale_inputs:
+            self.skipped += 1
+            return
+        self._scale_inputs = inputs
+        if self.restore_derived(("scale", inputs), SCALE_FIELDS):
+            return
+        self.recomputed += 1
+        self.compute_scale()
+        self.store_derived(("scale", inputs), SCALE_FIELDS)
+
+    def compute_scale(self):
+        name = self.scale_name
+        if name == NONE:
+            self.scale_mask = 0
+            self.scale_allowed_pcs = set()
+            self.scale_points = frozenset()
+            self.scale_hint = "스케일: 없음"
+            return
+
+        self.scale_mask = self.theory.scale_mask(name, self.tonic_pc)
+        allowed = mask_to_pcs(self.scale_mask)
+        self.scale_allowed_pcs = set(allowed)
+        self.scale_points = self.pos_index.points_for_mask(self.scale_mask)
+
+        notes = [pc_to_note_text(pc) for pc in allowed]
+        note_text = ", ".join(notes)
+        if len(note_text) > 60:
+            note_text = note_text[:60] + "..."
+        self.scale_hint = f"스케일: {name}   음: {note_text}"
+
+    # ----- apply chord -----
+    def apply_selected_chord(self):
+        inputs = self.chord_inputs()
+        if inputs == self._chord_inputs:
+            self.skipped += 1
+            return
+        self._chord_inputs = inputs
+        if self.restore_derived(("chord", inputs), CHORD_FIELDS):
+            self.forms_pending = False
+            return
+        self.recomputed += 1
+        self.compute_chord()
+        if not self.forms_pending:
+            self.store_derived(("chord", inputs), CHORD_FIELDS)
+
+    def forms_arrived(self):
+        # 작업 스레드가 폼을 끝냄: 다음 refresh 에서 같은 입력이라도 다시 적용 (폼은 forms_source 캐시에서 바로)
+        self._chord_inputs = None
+
+    def compute_chord(self):
+        if self.triad_name == NONE:
+            self.chord_mask = 0
+            self.chord_allowed_pcs = set()
+            self.chord_points = frozenset()
+            self.chord_hint = "코드: -"
+            self.forms = ()
+            self.point_forms = {}
+            self.forms_pending = False
+            return
+
+        self.chord_mask = self.theory.chord_mask(self.triad_name, self.tension_name, self.tonic_pc)
+        allowed = mask_to_pcs(self.chord_mask)
+        self.chord_allowed_pcs = set(allowed)
+        self.chord_points = self.pos_index.points_for_mask(self.chord_mask)
+        self.apply_chord_forms()
+
+        notes = [pc_to_note_text(pc) for pc in allowed]
+        note_text = ", ".join(notes)
+        if len(note_text) > 80:
+            note_text = note_text[:80] + "..."
+        self.chord_hint = f"코드: {self.chord_name()}   음: {note_text}"
+        if self.forms_pending:
+            self.chord_hint += "   (폼 계산 중...)"
+
+    def apply_chord_forms(self):
+        bass_pc = self.pick_bass_pc_for_inversion(self.inversion_name)
+        args = (tuple(self.open_pc), self.max_fret, self.chord_mask, self.tonic_pc, bass_pc, self.voicing_constraints)
+        forms = chord_forms(*args) if self.forms_source is None else self.forms_source(args)
+        self.forms_pending = forms is None
+        self.forms = forms or ()
+        point_forms = {}
+        for i, voicing in enumerate(self.forms):
+            for p in voicing.points():
+                point_forms.setdefault(p, i)
+        self.point_forms = point_forms
+
+    def selected_form_index(self):
+        names = list(self.form_groups.keys())
+        if self.form_name in names:
+            return names.index(self.form_name)
+        return None
+
+    def chord_display_points(self):
+        # 폼을 고르면 그 보이싱의 음만, (전체)면 모든 코드톤
+        idx = self.selected_form_index()
+        if idx is None:
+            return self.chord_points
+        if idx < len(self.forms):
+            return frozenset(self.forms[idx].points())
+        return frozenset()
+
+    def chord_name(self) -> str:
+        if self.triad_name == NONE:
+            return "-"
+        # inversion display only
+        bass_pc = self.pick_bass_pc_for_inversion(self.inversion_name)
+        if self.inversion_name == "Root":
+            bass_pc = None
+        return format_chord_name(self.tonic_pc, self.triad_name, self.tension_name, bass_pc)
+
+    def pick_bass_pc_for_inversion(self, inv_name: str):
+        if not self.chord_mask:
+            return None
+        inv_index = self.inversion_defs.get(inv_name, 0)
+        rels = mask_to_pcs(transpose_mask(self.chord_mask, -self.tonic_pc))
+        if inv_index <= 0:
+            return self.tonic_pc
+        if inv_index >= len(rels):
+            inv_index = len(rels) - 1
+        return (self.tonic_pc + rels[inv_index]) % 12
+
+    # ----- cells -----
+    def cell_labels(self, s: int, fret: int):
+        pc = self.pos_index.pc_at(s, fret)
+        semis = (pc - self.tonic_pc) % 12
+        return tension_label(semis), pc_to_note_text(pc)
+
+    def chord_color_for_point(self, s: int, fret: int):
+        # 선택된 폼이 있으면 그 폼 색 하나로 통일.
+        if self.form_name != ALL_FORMS and self.form_name in self.form_groups:
+            fg = self.form_groups[self.form_name]
+            return fg["fill"], fg["text"]
+
+        # (전체)일 때: 폼 보이싱에 속한 음은 (가장 앞) 폼 색, 나머지 코드톤은 회색
+        idx = self.point_forms.get((s, fret))
+        if idx is None:
+            fg = CHORD_TONE_COLOR
+        else:
+            fg = self.form_groups[list(self.form_groups.keys())[idx]]
+        return fg["fill"], fg["text"]
+
+    # ----- click -----
+    def active_mask(self) -> int:
+        mask = 0
+        for (s, fret) in self.active_points:
+            mask |= 1 << self.pos_index.pc_at(s, fret)
+        return mask
+
+    def active_bass_pc(self):
+        # 가장 낮은 줄에서 가장 낮은 프렛의 활성 음 = 베이스
+        # (클릭은 같은 음을 넥 전체에서 토글하므로 모든 활성 음이 가장 낮은 줄에도 있음)
+        low = self.strings - 1
+        frets = [f for (s, f) in self.active_points if s == low]
+        if not frets:
+            return None
+        return self.pos_index.pc_at(low, min(frets))
+
+    def toggle_pc_at(self, s: int, fret: int) -> int:
+        pc = self.pos_index.pc_at(s, fret)
+        group = self.pos_index.points_for_pc(pc)
+        if any(p in self.active_points for p in group):
+            self.active_points.difference_update(group)
+        else:
+            self.active_points.update(group)
+        return pc
+
+    def lookup_index(self):
+        if self._lookup_index is None:
+            self._lookup_index = self.build_lookup_index()
+        return self._lookup_index
+
+    @property
+    def lookup_ready(self) -> bool:
+        return self._lookup_index is not None
+
+    def build_lookup_index(self):
+        # 모델을 바꾸지 않으므로 작업 스레드에서 불러도 됨 -> set_lookup_index()
+        from fretcore.lookup import ChordScaleIndex  # lookup 이 model 을 import 하므로 여기서
+        return ChordScaleIndex(self.scale_defs, self.triad_defs, self.tension_defs,
+                               self.inversion_defs).load_or_build()
+
+    def set_lookup_index(self, index):
+        self._lookup_index = index
+
+    def identify_active(self, limit: int = 8):
+        # 클릭한 음들을 포함하는 코드/스케일 (적합도 순)
+        mask = self.active_mask()
+        if not mask:
+            return [], []
+        return self.lookup_index().lookup(mask, self.active_bass_pc(), limit)
+
+    def position_text(self, s: int, fret: int) -> str:
+        if fret == 0:
+            where = "카포" if self.instrument.capo else "오픈"
+        else:
+            where = str(self.instrument.absolute_fret(fret)) + "프렛"
+        pc = self.pos_index.pc_at(s, fret)
+        return f"{s+1}번줄 {where}, {pc_to_note_text(pc)}, {tension_label((pc - self.tonic_pc) % 12)}"
+
+    def click_text(self, s: int, fret: int) -> str:
+        return "선택: " + self.position_text(s, fret)
+
+    def hover_text(self, s: int, fret: int) -> str:
+        # 마우스 아래 음 + 지금 스케일/코드에 들어 있는지
+        pc = self.pos_index.pc_at(s, fret)
+        parts = [self.position_text(s, fret)]
+        if self.scale_name != NONE:
+            parts.append(f"{self.scale_name} {'안' if self.scale_mask >> pc & 1 else '밖'}")
+        if self.triad_name != NONE:
+            parts.append(f"{self.chord_name()} {'코드톤' if self.chord_mask >> pc & 1 else '아님'}")
+        return "   ·   ".join(parts)
+
+    # ----- plain data -----
+    def describe(self) -> dict:
+        return {
+            "instrument": self.instrument.name,
+            "tuning": self.instrument.tuning_text(),
+            "capo": self.instrument.capo,
+            "key": self.key_item,
+            "tonic_pc": self.tonic_pc,
+            "scale": self.scale_name,
+            "triad": self.triad_name,
+            "tension": self.tension_name,
+            "inversion": self.inversion_name,
+            "form": self.form_name,
+            "chord_name": self.chord_name(),
+            "scale_pcs": list(mask_to_pcs(self.scale_mask)),
+            "chord_pcs": list(mask_to_pcs(self.chord_mask)),
+            "bass_pc": self.pick_bass_pc_for_inversion(self.inversion_name),
+            "forms": [v.tab() for v in self.forms],
+            "scale_points": sorted(self.scale_points),
+            "chord_points": sorted(self.chord_points),
+            "active_points": sorted(self.active_points),
+            "key_hint": key_hint_text(self.key_item),
+            "scale_hint": self.scale_hint,
+            "chord_hint": self.chord_hint,
+        }
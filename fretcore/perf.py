@@ -0,0 +1,121 @@
+# =========================
+# Performance tracing (opt-in)
+# =========================
+# 핸들러/레이어 그리기 시간을 재서 Chrome trace 형식(chrome://tracing, Perfetto)으로 내보낸다.
+# 꺼져 있을 때는 traced() 로 감싼 함수도 플래그 한 번 보는 것 말고는 비용 없음.
+#   RETBOARDS_PERF=1            -> 시작부터 켜짐 (화면 오버레이 포함)
+#   RETBOARDS_PERF=trace.json   -> 켜고, 끝날 때 그 경로로 trace 저장
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENV_VAR = "RETBOARDS_PERF"
+MAX_EVENTS = 200000
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, max_events: int = MAX_EVENTS):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.t0 = time.perf_counter()
+        self.pid = os.getpid()
+
+        # 마지막 프레임 요약 (오버레이용): 프레임 시간, 이름 -> ms
+        self.last = {}
+        self.frame_ms = 0.0
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self.t0) * 1e6
+
+    def record(self, name: str, cat: str, start_us: float, dur_us: float, args=None):
+        ev = {"name": name, "cat": cat, "ph": "X", "ts": start_us, "dur": dur_us,
+              "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            ev["args"] = args
+        self.events.append(ev)
+        self.last[name] = dur_us / 1000.0
+
+    def counter(self, name: str, **values):
+        if self.enabled:
+            self.events.append({"name": name, "ph": "C", "ts": self.now_us(), "pid": self.pid, "args": values})
+
+    def span(self, name: str, cat: str = "app"):
+        return _Span(self, name, cat)
+
+    def begin_frame(self):
+        self.last = {}
+
+    def end_frame(self, frame_ms: float):
+        self.frame_ms = frame_ms
+
+    def slowest(self, prefix: str = "draw_"):
+        found = [(ms, name) for name, ms in self.last.items() if name.startswith(prefix)]
+        return max(found) if found else None
+
+    def clear(self):
+        self.events.clear()
+
+    def dump(self, path: str) -> str:
+        data = {"traceEvents": list(self.events), "displayTimeUnit": "ms",
+                "otherData": {"app": "9retboards"}}
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+        return path
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "start")
+
+    def __init__(self, tracer, name, cat):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.start = self.tracer.now_us() if self.tracer.enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            self.tracer.record(self.name, self.cat, self.start, self.tracer.now_us() - self.start)
+        return False
+
+
+def env_setting():
+    value = os.environ.get(ENV_VAR, "").strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return False, None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True, None
+    return True, value
+
+
+TRACER = Tracer(enabled=env_setting()[0])
+
+
+def traced(name: str = None, cat: str = "app"):
+    # 메서드/함수 데코레이터. TRACER 가 꺼져 있으면 그냥 호출
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = TRACER
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = tracer.now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(label, cat, start, tracer.now_us() - start)
+        return wrapper
+    return deco
+
+
+def default_trace_path() -> str:
+    return os.path.abspath(time.strftime("9retboards-trace-%Y%m%d-%H%M%S.json"))
@@ -0,0 +1,304 @@
+# =========================
+# Pitch detection from WAV (offline)
+# =========================
+# NumPy 가 있을 때만 사용 가능 (pip install numpy).
+#   python -m fretcore pitch take.wav [--show 20]
+# 녹음(연습 테이크, 반주 스템)에서 단선율 음을 찾아 midi.Note 목록으로 -> MIDI 타임라인/운지 배정을 그대로 씀.
+#  - 파일은 CHUNK_SECONDS 씩 읽음 (한 시간짜리도 메모리는 청크 하나 + 프레임 몇 개)
+#  - 모노로 섞고 ANALYSIS_RATE 근처로 줄인 뒤, 청크 안의 모든 프레임을 한 번에 YIN (FFT 자기상관)
+#  - 프레임 음높이(반올림한 MIDI)를 3프레임 중앙값으로 다듬고 같은 음이 MIN_FRAMES 이상 이어지면 한 음
+# 결과의 음 길이 합으로 scale_defs 중 어울리는 (으뜸음, 스케일)을 추천한다.
+import argparse
+import sys
+import time
+import wave
+
+from fretcore.midi import Note
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 없음 -> 음높이 분석 불가 (나머지는 그대로 동작)
+    np = None
+
+ANALYSIS_RATE = 22050
+WINDOW = 2048          # 분석 창 (샘플, 줄인 뒤)
+HOP = 512
+MIN_HZ, MAX_HZ = 38.0, 1400.0   # 5현 베이스 낮은 B 근처 ~ 기타 24프렛 높은 E 위
+YIN_THRESHOLD = 0.15
+MAX_APERIODICITY = 0.35
+RMS_GATE = 0.01        # 이보다 조용한 프레임은 쉼
+MIN_FRAMES = 3         # 음 하나로 칠 최소 길이 (HOP 512 / 22050 Hz 면 약 70ms)
+CHUNK_SECONDS = 10.0
+# 분석 중 찾은 음을 화면으로 보내는 간격 (ms)
+PARTIAL_MS = 200
+
+
+def available() -> bool:
+    return np is not None
+
+
+# =========================
+# YIN (frames x lags, vectorized)
+# =========================
+def yin(frames, sr: float):
+    # frames: (n, WINDOW) -> (주파수 Hz 또는 0, 비주기성). 차분 함수를 FFT 자기상관으로 한 번에
+    n, w = frames.shape
+    tau_min = max(2, int(sr / MAX_HZ))
+    tau_max = min(w // 2, int(sr / MIN_HZ) + 1)
+    spec = np.fft.rfft(frames, 2 * w, axis=1)
+    acf = np.fft.irfft(spec * np.conj(spec), 2 * w, axis=1)[:, :tau_max + 1]
+    sq = np.concatenate([np.zeros((n, 1)), np.cumsum(frames * frames, axis=1)], axis=1)
+    taus = np.arange(tau_max + 1)
+    # d(tau) = sum_{j < w - tau} (x_j - x_{j+tau})^2
+    head = sq[:, w - taus]
+    tail = sq[:, [w]] - sq[:, taus]
+    diff = np.maximum(head + tail - 2 * acf, 0.0)
+
+    # 누적 평균으로 정규화 (d'(0) = 1)
+    cum = np.cumsum(diff[:, 1:], axis=1)
+    cmnd = np.ones_like(diff)
+    cmnd[:, 1:] = diff[:, 1:] * taus[1:] / np.maximum(cum, 1e-12)
+    cmnd[:, :tau_min] = 1.0
+
+    # 처음으로 문턱 아래로 내려간 구간의 최솟값 (없으면 전체 최솟값, 너무 크면 쉼)
+    below = cmnd < YIN_THRESHOLD
+    has = below.any(axis=1)
+    first = np.where(has, below.argmax(axis=1), 0)
+    after = taus[None, :] >= first[:, None]
+    run = np.logical_and.accumulate(below | ~after, axis=1) & after & has[:, None]
+    tau = np.where(has, np.where(run, cmnd, np.inf).argmin(axis=1), cmnd.argmin(axis=1))
+    ap = cmnd[np.arange(n), tau]
+
+    # 포물선 보간으로 소수점 tau
+    t = np.clip(tau, 1, tau_max - 1)
+    a, b, c = cmnd[np.arange(n), t - 1], cmnd[np.arange(n), t], cmnd[np.arange(n), t + 1]
+    denom = a - 2 * b + c
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / np.where(denom == 0, 1, denom), 0.0)
+    exact = t + np.clip(shift, -1, 1)
+
+    freq = np.where((ap < MAX_APERIODICITY) & (tau >= tau_min), sr / np.maximum(exact, 1e-9), 0.0)
+    return freq, ap
+
+
+def hz_to_midi(freq):
+    # 0 Hz -> -1 (쉼)
+    out = np.full(freq.shape, -1, dtype=np.int64)
+    voiced = freq > 0
+    out[voiced] = np.rint(69 + 12 * np.log2(freq[voiced] / 440.0)).astype(np.int64)
+    return out
+
+
+def median3(values):
+    a, b, c = values[:-2], values[1:-1], values[2:]
+    return np.maximum(np.minimum(a, b), np.minimum(np.maximum(a, b), c))
+
+
+# =========================
+# Streaming reader / tracker
+# =========================
+def _pcm_to_float(raw: bytes, width: int, channels: int):
+    if width == 1:
+        data = np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0
+        scale = 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32)
+        scale = 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        data = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)).astype(np.int32)
+        data = np.where(data >= 1 << 23, data - (1 << 24), data).astype(np.float32)
+        scale = float(1 << 23)
+    else:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32)
+        scale = float(1 << 31)
+    return data.reshape(-1, channels).mean(axis=1) / scale
+
+
+class PitchTracker:
+    # 청크를 넣으면(feed) 끝난 음을 돌려줌. 청크 경계에서 분석 창/중앙값/진행 중인 음을 이어 붙인다
+    def __init__(self, sr: float):
+        self.sr = sr
+        self.buf = np.zeros(0, dtype=np.float32)   # 아직 프레임으로 다 쓰지 않은 샘플
+        self.frame = 0                              # 다음 프레임 번호
+        self.raw_tail = np.zeros(0, dtype=np.int64)  # 중앙값용 직전 프레임 음높이 (최대 2개)
+        self.current = None                         # (midi, 시작 프레임, 프레임 수)
+
+    def seconds(self, frame: float) -> float:
+        return frame * HOP / self.sr
+
+    def feed(self, samples, final: bool = False):
+        self.buf = np.concatenate([self.buf, samples])
+        count = 0 if len(self.buf) < WINDOW else 1 + (len(self.buf) - WINDOW) // HOP
+        pitches = np.zeros(0, dtype=np.int64)
+        if count:
+            frames = np.lib.stride_tricks.sliding_window_view(self.buf, WINDOW)[::HOP][:count].astype(np.float64)
+            freq, _ = yin(frames, self.sr)
+            freq[np.sqrt((frames * frames).mean(axis=1)) < RMS_GATE] = 0.0
+            pitches = hz_to_midi(freq)
+            self.buf = self.buf[count * HOP:]
+
+        # 3프레임 중앙값: 마지막 프레임은 다음 청크를 보고 정함. 파일 처음/끝은 자기 값으로 채움
+        seq = np.concatenate([self.raw_tail, pitches])
+        start = self.frame - len(self.raw_tail)   # seq[0] 의 프레임 번호
+        self.frame += count
+        if start == 0 and len(seq):
+            seq, start = np.concatenate([seq[:1], seq]), -1
+        if final and len(seq):
+            seq = np.concatenate([seq, seq[-1:]])
+        if len(seq) < 3:
+            self.raw_tail = seq
+            return self.close() if final else []
+        self.raw_tail = seq[-2:]
+        notes = self.segment(median3(seq), start + 1)
+        if final:
+            notes += self.close()
+        return notes
+
+    def segment(self, pitches, first: int):
+        # 같은 값이 이어지는 구간(run) 단위로 처리 -> 파이썬 반복은 구간 수만큼
+        notes = []
+        if not len(pitches):
+            return notes
+        edges = np.flatnonzero(np.diff(pitches)) + 1
+        starts = np.concatenate([[0], edges])
+        ends = np.concatenate([edges, [len(pitches)]])
+        for s, e in zip(starts.tolist(), ends.tolist()):
+            midi = int(pitches[s])
+            cur = self.current
+            if cur is not None and cur[0] == midi:
+                self.current = (midi, cur[1], cur[2] + e - s)
+                continue
+            notes += self.close()
+            self.current = (midi, first + s, e - s) if midi >= 0 else None
+        return notes
+
+    def close(self):
+        cur, self.current = self.current, None
+        if cur is None or cur[2] < MIN_FRAMES:
+            return []
+        midi, start, frames = cur
+        # 프레임 중심 기준 시각
+        offset = WINDOW / 2 / HOP
+        return [Note(self.seconds(start + offset), self.seconds(start + frames + offset), midi, 0, 0)]
+
+
+def iter_wav_notes(path: str, cancel=None):
+    # (끝난 음 목록, 진행률 0..1, 파일 길이 초)를 청크마다. cancel() 이 True 면 멈춤
+    try:
+        w = wave.open(path, "rb")
+    except (wave.Error, EOFError) as exc:
+        raise ValueError(f"{path}: WAV 가 아님 또는 지원하지 않는 형식 (PCM 만): {exc}") from None
+    with w:
+        sr, width, channels, total = w.getframerate(), w.getsampwidth(), w.getnchannels(), w.getnframes()
+        if not sr or not total:
+            raise ValueError(f"{path}: 빈 WAV")
+        factor = max(1, round(sr / ANALYSIS_RATE))
+        tracker = PitchTracker(sr / factor)
+        # 줄이기(factor 개 평균)가 청크 경계에서 끊기지 않도록 청크 길이는 factor 의 배수
+        chunk = max(factor, int(CHUNK_SECONDS * sr) // factor * factor)
+        read = 0
+        duration = total / sr
+        while read < total:
+            if cancel is not None and cancel():
+                return
+            raw = w.readframes(chunk)
+            if not raw:
+                break
+            samples = _pcm_to_float(raw, width, channels)
+            read += len(samples)
+            usable = len(samples) // factor * factor
+            samples = samples[:usable].reshape(-1, factor).mean(axis=1) if factor > 1 else samples
+            yield tracker.feed(samples.astype(np.float32), final=read >= total), min(1.0, read / total), duration
+        if read < total:
+            yield tracker.feed(np.zeros(0, dtype=np.float32), final=True), 1.0, duration
+
+
+def detect_notes(path: str):
+    notes = []
+    for found, _, _ in iter_wav_notes(path):
+        notes += found
+    return notes
+
+
+# =========================
+# Scale suggestions
+# =========================
+def pc_weights(notes):
+    weights = [0.0] * 12
+    for n in notes:
+        weights[n.midi % 12] += n.end - n.start
+    return weights
+
+
+def suggest_scales(notes, scale_defs: dict, top: int = 5):
+    # (으뜸음, 스케일 이름, 포함 비율) 좋은 순. 음 길이 합 기준으로 스케일 밖 음이 적을수록,
+    # 같으면 작은 스케일, 으뜸음이 많이 울릴수록 위
+    weights = pc_weights(notes)
+    total = sum(weights)
+    if total <= 0:
+        return []
+    peak = max(weights)
+    ranked = []
+    for name, intervals in scale_defs.items():
+        for tonic in range(12):
+            inside = sum(weights[(tonic + i) % 12] for i in set(intervals)) / total
+            score = inside - 0.01 * len(set(intervals)) + 0.05 * weights[tonic] / peak
+            ranked.append((score, tonic, name, inside))
+    ranked.sort(key=lambda r: -r[0])
+    return [(tonic, name, inside) for _, tonic, name, inside in ranked[:top]]
+
+
+# =========================
+# Background analysis
+# =========================
+def analyze(job, path: str):
+    # workers.WorkerPool 작업: 새로 찾은 음을 PARTIAL_MS 마다 job.emit((음들, 진행률, 길이, 걸린 시간)).
+    # 끝나면(또는 job.cancel() 로 멈추면) 남은 음과 함께 (음들, 길이, 걸린 시간, 취소 여부)
+    t0 = time.perf_counter()
+    found_since = []
+    duration = 0.0
+    for found, progress, duration in iter_wav_notes(path, lambda: job.cancelled):
+        found_since += found
+        if job.due(PARTIAL_MS):
+            job.emit((found_since, progress, duration, time.perf_counter() - t0))
+            found_since = []
+    return found_since, duration, time.perf_counter() - t0, job.cancelled
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards pitch", description="WAV 녹음에서 음높이를 찾아 음/스케일 추천 출력")
+    ap.add_argument("path", help="PCM WAV 파일")
+    ap.add_argument("--show", type=int, default=0, help="앞에서부터 음 N 개를 출력")
+    ap.add_argument("--top", type=int, default=5, help="추천 스케일 수")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not available():
+        print("음높이 분석에는 NumPy 가 필요합니다 (pip install numpy)", file=sys.stderr)
+        return 1
+    from fretcore.instruments import midi_to_name
+    from fretcore.model import NOTE_FLAT, build_scale_library
+
+    t0 = time.perf_counter()
+    duration = 0.0
+    notes = []
+    try:
+        for found, _, duration in iter_wav_notes(args.path):
+            notes += found
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - t0
+
+    for n in notes[:args.show]:
+        print(f"{n.start:8.3f}s  {n.end - n.start:6.3f}s  {midi_to_name(n.midi)}")
+    for tonic, name, inside in suggest_scales(notes, build_scale_library(), args.top):
+        print(f"{NOTE_FLAT[tonic]} {name}: {inside * 100:.0f}%")
+    print(f"{len(notes)} notes in {duration:.1f}s of audio, {elapsed:.2f}s "
+          f"({duration / elapsed if elapsed else 0:.0f}x realtime)", file=sys.stderr)
+    return 0
@@ -0,0 +1,230 @@
+# =========================
+# Idle-time prefetch (derived state + overlay layers)
+# =========================
+# 키/스케일을 넘기며 볼 때 고를 때마다 apply_selected_scale / apply_selected_chord / 레이어 계산을 하지 않도록,
+# 화면이 한가할 때 "다음에 고를 것 같은" 선택(이웃 키, 이웃 스케일, 다른 전위/폼)을 미리 계산해 둔다.
+#  - PrefetchCache: 항목 수 + 대략적인 바이트로 묶인 LRU. BoardModel.derived_cache 로 모델도 같이 씀
+#  - Prefetcher: 계획(후보 선택 목록)을 작업용 모델로 한 조각(SLICE_MS)씩 계산. 화면은 after() 로 조각을 부름
+#  - 화면의 roots/scale/chord 레이어는 layer() 로 읽음: 캐시에 있으면 그대로, 없으면 만들어서 넣음
+# 적중률은 화면 쪽 조회(모델의 파생 데이터 + 레이어)만 센다. 미리 계산하면서 본 것은 세지 않음.
+# 모델의 폼을 작업 스레드가 계산하면(forms_source) 미리 계산도 폼은 작업 스레드에 맡기고, 아직 없으면 코드 레이어는 건너뜀.
+import sys
+import time
+from collections import OrderedDict, deque
+
+from fretcore import scene
+from fretcore.model import ALL_FORMS, NONE, BoardModel
+
+MAX_ENTRIES = 512
+MAX_BYTES = 32 * 1024 * 1024
+SLICE_MS = 6.0
+RECORD_LEN = 8
+
+LAYER_BUILDERS = {
+    "roots": scene.roots_layer,
+    "scale": scene.scale_layer,
+    "chord": scene.chord_layer,
+}
+
+
+def approx_size(obj) -> int:
+    # 메모리 표시용 어림값. 짧은 튜플(레코드: 그리기 항목, 파생 필드 묶음)은 원소를 다 보고,
+    # 나머지 컨테이너는 첫 원소 크기 x 개수 (전부 따라가면 레이어를 만드는 것보다 오래 걸림)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        if obj:
+            k, v = next(iter(obj.items()))
+            size += len(obj) * (approx_size(k) + approx_size(v))
+    elif isinstance(obj, tuple) and len(obj) <= RECORD_LEN:
+        size += sum(approx_size(x) for x in obj)
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        if obj:
+            size += len(obj) * approx_size(next(iter(obj)))
+    return size
+
+
+class PrefetchCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # key -> (value, 바이트)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.counting = True   # False 동안의 조회(미리 계산 중)는 적중률에 넣지 않음
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        hit = self.entries.get(key)
+        if hit is None:
+            if self.counting:
+                self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        if self.counting:
+            self.hits += 1
+        return hit[0]
+
+    def put(self, key, value):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        size = approx_size(value)
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            _, (_, dropped) = self.entries.popitem(last=False)
+            self.bytes -= dropped
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "evictions": self.evictions,
+        }
+
+
+def layer_key(name: str, model: BoardModel, layout, frets):
+    # 레이어를 결정하는 입력만: 루트 = 으뜸음, 스케일 = 스케일 입력, 코드 = 코드 입력 + 폼
+    if name == "roots":
+        selection = (model.tonic_pc, model.instrument)
+    elif name == "scale":
+        selection = model.scale_inputs()
+    else:
+        selection = model.chord_inputs() + (model.form_name,)
+    return "layer", name, selection, layout, frets
+
+
+def neighbours(items, value, steps):
+    # 목록에서 value 의 앞뒤 (끝에서는 처음으로 돌아감). value 가 목록에 없으면 없음
+    if value not in items:
+        return []
+    i = items.index(value)
+    return [items[(i + d) % len(items)] for d in steps]
+
+
+class Prefetcher:
+    def __init__(self, model: BoardModel, cache: PrefetchCache = None):
+        self.model = model
+        self.cache = cache or PrefetchCache()
+        model.derived_cache = self.cache
+        self.work = None
+        self.plan = deque()
+        self.layout = None
+        self.frets = None
+
+        self.prefetched = 0
+        self.slices = 0
+        self.busy_ms = 0.0
+
+    # ----- foreground -----
+    def layer(self, name: str, layout, frets) -> dict:
+        key = layer_key(name, self.model, layout, frets)
+        wanted = self.cache.get(key)
+        if wanted is None:
+            wanted = LAYER_BUILDERS[name](self.model, layout, frets)
+            if not (name == "chord" and self.model.forms_pending):   # 폼이 오면 다시 만듦
+                self.cache.put(key, wanted)
+        return wanted
+
+    def replan(self, key_items, scale_items, layout, frets):
+        # 지금 선택 기준으로 후보를 가까운 것부터: 키 +-1, 스케일 +-1, 다른 전위, 다른 폼, 키 +-2
+        m = self.model
+        current = (m.key_item, m.scale_name, m.triad_name, m.tension_name, m.inversion_name, m.form_name)
+        key, scale, triad, tension, inversion, form = current
+        plan = [(k, scale, triad, tension, inversion, form) for k in neighbours(key_items, key, (1, -1))]
+        plan += [(key, sc, triad, tension, inversion, form) for sc in neighbours(scale_items, scale, (1, -1))]
+        if triad != NONE:
+            plan += [(key, scale, triad, tension, inv, form) for inv in m.inversion_defs]
+            plan += [(key, scale, triad, tension, inversion, f) for f in [ALL_FORMS] + list(m.form_groups)]
+        plan += [(k, scale, triad, tension, inversion, form) for k in neighbours(key_items, key, (2, -2))]
+        self.plan = deque(dict.fromkeys(sel for sel in plan if sel != current))
+        self.layout, self.frets = layout, frets
+        if m.forms_source is not None:
+            m.forms_source.drop_warm()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.plan)
+
+    # ----- background (idle slices) -----
+    def scratch(self) -> BoardModel:
+        m = self.model
+        w = self.work
+        if w is None or w.instrument != m.instrument:
+            w = self.work = BoardModel(m.instrument)
+            w.pos_index = m.pos_index
+        w._theory = m.theory
+        w.extra_scales = m.extra_scales
+        w.voicing_constraints = m.voicing_constraints
+        w.derived_cache = self.cache
+        w.forms_source = None if m.forms_source is None else self.warm_forms
+        if w.forms_pending:
+            w._chord_inputs = None
+        return w
+
+    def warm_forms(self, args):
+        # 작업용 모델의 폼: 있으면 바로, 없으면 작업 스레드에 맡기고 None (이번에는 코드 레이어 없이)
+        source = self.model.forms_source
+        source.warm(args)
+        return source.peek(args)
+
+    def run(self, budget_ms: float = SLICE_MS) -> bool:
+        # 계획에서 하나씩 계산하다 budget_ms 가 지나면 멈춤. 남은 것이 있으면 True
+        t0 = time.perf_counter()
+        self.cache.counting = False
+        try:
+            while self.plan:
+                self.compute(self.plan.popleft())
+                if (time.perf_counter() - t0) * 1000.0 >= budget_ms:
+                    break
+        finally:
+            self.cache.counting = True
+        self.slices += 1
+        self.busy_ms += (time.perf_counter() - t0) * 1000.0
+        return bool(self.plan)
+
+    def compute(self, selection):
+        key, scale, triad, tension, inversion, form = selection
+        w = self.scratch()
+        w.set_key(key, update=False)
+        w.set_scale(scale, update=False)
+        w.set_chord(triad, tension, inversion, update=False)
+        w.set_form(form)
+        w.refresh({"key"})
+        for name, build in LAYER_BUILDERS.items():
+            if name == "chord" and w.forms_pending:
+                continue
+            key = layer_key(name, w, self.layout, self.frets)
+            if key not in self.cache:
+                self.cache.put(key, build(w, self.layout, self.frets))
+                self.prefetched += 1
+
+    def stats(self) -> dict:
+        st = self.cache.stats()
+        st.update(prefetched=self.prefetched, slices=self.slices, busy_ms=round(self.busy_ms, 1),
+                  queued=len(self.plan))
+        return st
+
+    def stats_text(self) -> str:
+        st = self.cache.stats()
+        return (f"prefetch {st['hit_rate'] * 100:.0f}% hit ({st['hits']}/{st['hits'] + st['misses']}), "
+                f"{st['entries']} entries ~{st['bytes'] / 1024 / 1024:.1f}MB")
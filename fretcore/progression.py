@@ -0,0 +1,190 @@
+# =========================
+# Chord progression playback
+# =========================
+# "C M maj7 | A m 7 | D m 9 | G M 7" 같은 진행을 읽어서
+#  - 재생 전에 단계별 코드 레이어와 단계 사이 변화분(delta)을 모두 미리 계산하고
+#  - 재생 중에는 바뀌는 셀만 고친다 (BeatClock 이 박자마다 on_tick 호출)
+# 마디 = "<루트> <트라이어드> [텐션] [전위]" (예: "E m 7 2nd") 또는 코드 기호 ("Em7/D", "F#m7b5 B7alt").
+# 단계마다 beats 박. 기호로 쓴 마디에 코드가 여럿이면 코드마다 한 단계.
+import re
+import time
+from typing import NamedTuple
+
+from fretcore import scene
+from fretcore.chordsym import SymbolError, parse_symbol
+from fretcore.model import NONE, NOTE_FLAT, BoardModel, note_name_to_pc
+
+NOTE_RE = re.compile(r"[A-Ga-g][#b]?")
+
+
+class Step(NamedTuple):
+    root_pc: int
+    triad: str
+    tension: str
+    inversion: str
+
+
+def parse_progression(text: str, model: BoardModel):
+    steps = []
+    bars = [bar.strip() for bar in text.split("|")]
+    for n, bar in enumerate(bars, 1):
+        if not bar:
+            continue
+        tokens = bar.split()
+        if len(tokens) < 2 or tokens[1] not in model.triad_defs:
+            # 코드 기호 마디
+            for token in tokens:
+                try:
+                    steps.append(Step(*parse_symbol(token)[:4]))
+                except SymbolError as exc:
+                    raise ValueError(f"{n}번째 마디 '{bar}': {exc}") from None
+            continue
+        if not NOTE_RE.fullmatch(tokens[0]):
+            raise ValueError(f"{n}번째 마디 '{bar}': 루트 음 이름이 아님 '{tokens[0]}'")
+        root_pc = note_name_to_pc(tokens[0])
+        triad = tokens[1]
+
+        rest = tokens[2:]
+        inversion = "Root"
+        if rest and rest[-1] in model.inversion_defs:
+            inversion = rest.pop()
+        tension = " ".join(rest) or NONE
+        if tension != NONE and tension not in model.tension_defs:
+            raise ValueError(f"{n}번째 마디 '{bar}': 텐션이 아님 '{tension}'")
+
+        tones = len(set(model.triad_defs[triad] + model.tension_defs.get(tension, [])))
+        if model.inversion_defs[inversion] >= tones:
+            raise ValueError(f"{n}번째 마디 '{bar}': {tones}음 코드에 {inversion} 전위 없음")
+        steps.append(Step(root_pc, triad, tension, inversion))
+    if not steps:
+        raise ValueError("진행이 비어 있음")
+    return steps
+
+
+class Progression:
+    def __init__(self, steps, beats: int = 4):
+        self.steps = list(steps)
+        self.beats = beats
+        self.names = []
+        self.layers = []   # 단계별 코드 레이어 {(s, fret): spec}
+        self.deltas = []   # deltas[i]: 단계 i-1 -> i (0 은 마지막 -> 처음, 반복 재생용)
+        self.voicings = []  # 단계별 첫 번째 폼의 줄별 프렛 (소리용), 없으면 None
+        self.leading = None  # 보이스 리딩으로 풀었으면 voiceleading.Leading
+
+    def prepare(self, model: BoardModel, layout, leader=None):
+        # 화면 모델은 건드리지 않고 같은 악기/폼 설정의 작업용 모델로 계산 (보이싱 캐시는 공유)
+        # leader(voiceleading.VoiceLeader)를 주면 단계마다 이동이 가장 적은 보이싱 하나 + 공통음만 표시
+        work = BoardModel(model.instrument)
+        work.voicing_constraints = model.voicing_constraints
+        work.set_form(model.form_name)
+
+        self.leading = leader.solve(self.steps) if leader is not None else None
+        if self.leading is not None:
+            return self.prepare_leading(work, layout)
+
+        # 같은 코드가 여러 번 나오면 한 번만 계산 (key_item_to_pc 는 첫 음 이름만 읽으므로 "Eb" 로 충분)
+        cache = {}
+        self.names = []
+        self.layers = []
+        self.voicings = []
+        for step in self.steps:
+            if step not in cache:
+                work.set_key(NOTE_FLAT[step.root_pc], update=False)
+                work.set_chord(step.triad, step.tension, step.inversion, update=False)
+                work.refresh({"key"})
+                frets = work.forms[0].frets if work.forms else None
+                cache[step] = (scene.chord_layer(work, layout), work.chord_name(), frets)
+            layer, name, frets = cache[step]
+            self.layers.append(layer)
+            self.names.append(name)
+            self.voicings.append(frets)
+
+        return self.prepare_deltas()
+
+    def prepare_leading(self, work: BoardModel, layout):
+        lead = self.leading
+        self.names = list(lead.names)
+        self.voicings = [v.frets if v is not None else None for v in lead.voicings]
+        self.layers = []
+        for step, voicing, common in zip(self.steps, lead.voicings, lead.common):
+            # 칸 글자(도수)는 그 단계 루트 기준
+            work.set_key(NOTE_FLAT[step.root_pc], update=False)
+            work.refresh({"key"})
+            self.layers.append(scene.voicing_layer(work, layout, voicing, common))
+        return self.prepare_deltas()
+
+    def prepare_deltas(self):
+        n = len(self.layers)
+        self.deltas = [scene.layer_delta(self.layers[i - 1], self.layers[i]) for i in range(n)]
+        return self
+
+    def interval(self, bpm: float) -> float:
+        return 60.0 / bpm * self.beats
+
+
+class BeatClock:
+    # 시작 시각 기준으로 다음 박 시각을 매번 다시 계산해서 after 지연이 쌓이지 않게 한다.
+    # 한 박 이상 늦으면(창 이동 등으로 이벤트 루프가 멈췄을 때) 밀린 박은 건너뛰고 현재 박으로 맞춤.
+    def __init__(self, after, after_cancel, on_tick, interval: float, clock=time.perf_counter):
+        self.after = after
+        self.after_cancel = after_cancel
+        self.on_tick = on_tick
+        self.interval = interval
+        self.clock = clock
+
+        self.t0 = None
+        self.index = 0
+        self.token = None
+
+        self.ticks = 0
+        self.skipped = 0
+        self.max_late_ms = 0.0
+        self.total_late_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.token is not None
+
+    def start(self, index: int = 0):
+        self.stop()
+        self.index = index
+        self.t0 = self.clock() - index * self.interval
+        self.tick()
+
+    def stop(self):
+        if self.token is not None:
+            self.after_cancel(self.token)
+            self.token = None
+
+    def set_interval(self, interval: float):
+        # 템포 변경: 지금 박 위치를 유지한 채 기준 시각만 다시 잡음
+        if self.t0 is not None:
+            pos = (self.clock() - self.t0) / self.interval
+            self.t0 = self.clock() - pos * interval
+        self.interval = interval
+
+    def tick(self):
+        now = self.clock()
+        due = int((now - self.t0) / self.interval)
+        if due > self.index:
+            self.skipped += due - self.index
+            self.index = due
+
+        late = max(0.0, (now - (self.t0 + self.index * self.interval)) * 1000.0)
+        self.ticks += 1
+        self.total_late_ms += late
+        self.max_late_ms = max(self.max_late_ms, late)
+
+        self.on_tick(self.index)
+        self.index += 1
+
+        delay = self.t0 + self.index * self.interval - self.clock()
+        self.token = self.after(max(0, int(round(delay * 1000))), self.tick)
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "mean_late_ms": self.total_late_ms / self.ticks if self.ticks else 0.0,
+            "max_late_ms": self.max_late_ms,
+        }
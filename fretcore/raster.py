@@ -0,0 +1,72 @@
+# =========================
+# Raster (PNG) backend
+# =========================
+# Pillow 가 있을 때만 사용 가능 (pip install pillow).
+import io
+
+from fretcore.svg import DEFAULT_FONT, PT_TO_PX, iter_scene_primitives
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow 없음 -> PNG 출력 불가, SVG 는 그대로 동작
+    Image = ImageDraw = ImageFont = None
+
+_font_cache = {}
+
+
+def available() -> bool:
+    return Image is not None
+
+
+def _font(font, scale: float):
+    family, size = font[0], font[1]
+    bold = "bold" in font[2:]
+    key = (family, size, bold, scale)
+    f = _font_cache.get(key)
+    if f is None:
+        px = max(1, round(size * PT_TO_PX * scale))
+        names = [f"{family} Bold.ttf", f"{family}bd.ttf", "DejaVuSans-Bold.ttf"] if bold \
+            else [f"{family}.ttf", "DejaVuSans.ttf"]
+        for name in names:
+            try:
+                f = ImageFont.truetype(name, px)
+                break
+            except OSError:
+                continue
+        else:
+            f = ImageFont.load_default()
+        _font_cache[key] = f
+    return f
+
+
+def render_png(board: dict, scale: float = 1.0) -> bytes:
+    if Image is None:
+        raise RuntimeError("PNG 출력에는 Pillow 가 필요합니다 (pip install pillow)")
+
+    w = round(board["width"] * scale)
+    h = round(board["height"] * scale)
+    img = Image.new("RGB", (w, h), board.get("background", "white"))
+    d = ImageDraw.Draw(img)
+
+    def xy(coords):
+        return [v * scale for v in coords]
+
+    for kind, coords, opts in iter_scene_primitives(board):
+        if opts.get("state") == "hidden":
+            continue
+        width = max(1, round(opts.get("width", 1) * scale))
+        if kind == "rect":
+            d.rectangle(xy(coords), fill=opts.get("fill") or None,
+                        outline=opts.get("outline", "black") or None, width=width)
+        elif kind == "oval":
+            d.ellipse(xy(coords), fill=opts.get("fill") or None,
+                      outline=opts.get("outline", "black") or None, width=width)
+        elif kind == "line":
+            d.line(xy(coords), fill=opts.get("fill", "black"), width=width)
+        elif kind == "text":
+            d.text(xy(coords), opts.get("text", ""), fill=opts.get("fill", "black"),
+                   font=_font(opts.get("font", DEFAULT_FONT), scale), anchor="mm")
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=False)
+    return buf.getvalue()
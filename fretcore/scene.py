@@ -0,0 +1,234 @@
+# =========================
+# Board scene (plain data)
+# =========================
+# 모델 + 레이아웃 -> 그리기 목록. 항목은 (kind, coords, opts) 튜플이고
+# kind 는 "rect" / "oval" / "line" / "text" 중 하나.
+# opts 는 Tk 캔버스 옵션 이름(fill, outline, width, text, font, state)을 그대로 쓴다.
+# 오버레이 레이어는 {(줄, 프렛): (항목, ...)} 형태라 이전 프레임과 바로 비교할 수 있다.
+# frets=(lo, hi) 를 주면 그 프렛 범위(화면에 보이는 부분)만 만든다.
+import math
+
+from fretcore.instruments import midi_to_name
+from fretcore.model import NONE
+
+LAYER_ORDER = ("roots", "scale", "chord", "active")
+# 화면 전용 레이어(탭 사용 빈도, MIDI 타임라인)까지 포함한 캔버스 쌓는 순서
+OVERLAY_ORDER = LAYER_ORDER + ("heat", "midi")
+
+WOOD = "#8b5a2b"
+# 실제 프렛 번호 기준 (카포가 있으면 보드 프렛 = 실제 - 카포)
+INLAY_FRETS = [3, 5, 7, 9, 12, 15, 17, 19, 21, 24]
+DOUBLE_INLAYS = (12, 24)
+# 보이스 리딩 재생: 고른 보이싱의 음, 앞 코드에서 이어지는 음
+LEAD_COLOR = "#1976d2"
+COMMON_TONE_COLOR = "#00897b"
+# 탭 사용 빈도: 적음 -> 많음. 단계로 나눠서 같은 단계면 셀 spec 이 그대로 (다시 그리지 않음)
+HEAT_COLORS = ("#fff59d", "#ffe082", "#ffca28", "#ffa726", "#fb8c00", "#f4511e", "#e53935", "#b71c1c")
+
+
+def board_inlay_frets(layout):
+    return [(f, f - layout.first_fret) for f in INLAY_FRETS if 1 <= f - layout.first_fret <= layout.max_fret]
+
+
+def in_frets(fret: int, frets) -> bool:
+    return frets is None or frets[0] <= fret <= frets[1]
+
+
+def neck_primitives(layout):
+    L = layout
+    prims = [
+        ("rect", (L.x0, L.y0, L.x1, L.y1), {"fill": WOOD, "outline": "black", "width": 2}),
+        ("line", (L.x0, L.y0, L.x0, L.y1), {"width": 8}),
+    ]
+    for i in range(1, L.max_fret + 1):
+        octave = (L.first_fret + i) % 12 == 0
+        prims.append(("line", (L.fret_x[i], L.y0, L.fret_x[i], L.y1), {"width": 3 if octave else 2}))
+    for s in range(L.strings):
+        y = L.string_y[s]
+        prims.append(("line", (L.x0, y, L.x1, y), {"width": s + 1}))
+    prims.extend(inlay_primitives(layout))
+    return prims
+
+
+def inlay_primitives(layout):
+    L = layout
+    radius = 7
+    center_y = (L.y0 + L.y1) / 2
+    offset_12 = 48
+    prims = []
+    for f, board_fret in board_inlay_frets(layout):
+        x_center = L.fret_center_x(board_fret)
+        if f in DOUBLE_INLAYS:
+            for cy in (center_y - offset_12, center_y + offset_12):
+                prims.append(("oval", (x_center - radius, cy - radius, x_center + radius, cy + radius),
+                              {"fill": "ivory", "outline": ""}))
+        else:
+            prims.append(("oval", (x_center - radius, center_y - radius, x_center + radius, center_y + radius),
+                          {"fill": "ivory", "outline": ""}))
+    return prims
+
+
+def fret_number_primitives(layout):
+    label_y = layout.y1 + 14
+    return [("text", (layout.fret_center_x(board_fret), label_y), {"text": str(f), "fill": "black"})
+            for f, board_fret in board_inlay_frets(layout)]
+
+
+def cell_primitives(model, layout, s: int, fret: int, fill: str, text_color: str, outline_width: int):
+    tension, note_text = model.cell_labels(s, fret)
+    left, top, right, bottom = layout.cell_bounds(s, fret)
+    cx = (left + right) / 2
+    cy = (top + bottom) / 2
+    return (
+        ("rect", (left + 2, top + 1, right - 2, bottom - 1),
+         {"fill": fill, "outline": "black", "width": outline_width}),
+        ("text", (cx, cy - 6), {"text": tension, "fill": text_color, "font": ("Arial", 10, "bold")}),
+        ("text", (cx, cy + 8), {"text": note_text, "fill": text_color, "font": ("Arial", 8, "bold")}),
+    )
+
+
+def roots_layer(model, layout, frets=None):
+    r = 12
+    wanted = {}
+    for (s, fret) in model.pos_index.points_for_pc(model.tonic_pc):
+        if not in_frets(fret, frets):
+            continue
+        y = layout.string_y[s]
+        x = layout.fret_center_x(fret)
+        wanted[(s, fret)] = (
+            ("oval", (x - r, y - r, x + r, y + r), {"fill": "white", "outline": "black", "width": 2}),
+            ("text", (x, y + 0.5), {"text": "R", "fill": "black", "font": ("Arial", 11, "bold")}),
+        )
+    return wanted
+
+
+def scale_layer(model, layout, frets=None):
+    return {(s, fret): cell_primitives(model, layout, s, fret, "#555555", "white", 1)
+            for (s, fret) in model.scale_points if in_frets(fret, frets)}
+
+
+def chord_layer(model, layout, frets=None):
+    wanted = {}
+    for (s, fret) in model.chord_display_points():
+        if not in_frets(fret, frets):
+            continue
+        fill_color, text_color = model.chord_color_for_point(s, fret)
+        wanted[(s, fret)] = cell_primitives(model, layout, s, fret, fill_color, text_color, 2)
+    return wanted
+
+
+def active_layer(model, layout, frets=None):
+    return {(s, fret): cell_primitives(model, layout, s, fret, "#111111", "white", 2)
+            for (s, fret) in model.active_points if in_frets(fret, frets)}
+
+
+def voicing_layer(model, layout, voicing, common=(), frets=None):
+    # 보이스 리딩으로 고른 보이싱 하나. 앞 코드에서 이어지는 음(공통음)은 다른 색 + 굵은 테두리
+    wanted = {}
+    for (s, fret) in (voicing.points() if voicing is not None else ()):
+        if not in_frets(fret, frets):
+            continue
+        fill = COMMON_TONE_COLOR if (s, fret) in common else LEAD_COLOR
+        wanted[(s, fret)] = cell_primitives(model, layout, s, fret, fill, "white", 4 if (s, fret) in common else 2)
+    return wanted
+
+
+def midi_layer(group, upcoming, layout, frets=None):
+    # MIDI 타임라인의 현재 묶음(채운 원 + 음 이름)과 다음 묶음(점선 원). 같은 셀이면 현재가 우선
+    r = 13
+    wanted = {}
+    for notes, current in ((upcoming, False), (group, True)):
+        for s, fret, m in notes or ():
+            if not in_frets(fret, frets):
+                continue
+            x = layout.fret_center_x(fret)
+            y = layout.string_y[s]
+            if current:
+                wanted[(s, fret)] = (
+                    ("oval", (x - r, y - r, x + r, y + r), {"fill": "#1565c0", "outline": "black", "width": 2}),
+                    ("text", (x, y + 0.5), {"text": midi_to_name(m), "fill": "white",
+                                            "font": ("Arial", 8, "bold")}),
+                )
+            else:
+                wanted[(s, fret)] = (
+                    ("oval", (x - r, y - r, x + r, y + r), {"fill": "", "outline": "#1565c0", "width": 2,
+                                                            "dash": (3, 2)}),
+                )
+    return wanted
+
+
+def pitch_points(model, midi: int):
+    # 이 음높이(옥타브까지 같음)를 낼 수 있는 모든 칸 -> midi_layer 의 (줄, 프렛, 음) 형식. 음역 밖이면 없음
+    return [(s, fret, midi) for s, fret in model.pos_index.points_for_pc(midi % 12)
+            if model.instrument.pitch(s, fret) == midi]
+
+
+def heat_level(count: int, peak: int) -> int:
+    # 로그 눈금 (몇 칸에 몰리는 탭 분포에서도 드문 칸 차이가 보이게)
+    if peak <= 1:
+        return len(HEAT_COLORS) - 1
+    return min(len(HEAT_COLORS) - 1, int(math.log(count) / math.log(peak) * len(HEAT_COLORS)))
+
+
+def heat_layer(counts, layout, frets=None):
+    # counts: {(줄, 프렛): 횟수} (tabs.heat_counts). 셀 아래쪽 띠로 그려서 스케일/코드 셀과 같이 보임
+    if not counts:
+        return {}
+    peak = max(counts.values())
+    wanted = {}
+    for (s, fret), count in counts.items():
+        if not in_frets(fret, frets):
+            continue
+        left, top, right, bottom = layout.cell_bounds(s, fret)
+        band = max(4, (bottom - top) * 0.3)
+        wanted[(s, fret)] = (
+            ("rect", (left + 2, bottom - band, right - 2, bottom - 1),
+             {"fill": HEAT_COLORS[heat_level(count, peak)], "outline": ""}),
+        )
+    return wanted
+
+
+def layer_delta(old: dict, new: dict) -> dict:
+    # old -> new 로 바꾸는 데 필요한 셀만: {(줄, 프렛): spec}, 지울 셀은 None
+    delta = {key: None for key in old if key not in new}
+    for key, spec in new.items():
+        if old.get(key) != spec:
+            delta[key] = spec
+    return delta
+
+
+def caption_primitives(model, layout):
+    # 인쇄용 제목 줄: 키 / 스케일 / 코드(전위 포함)
+    parts = [model.key_item]
+    if model.instrument.capo:
+        parts.insert(0, f"Capo {model.instrument.capo}")
+    if model.scale_name != NONE:
+        parts.append(model.scale_name)
+    if model.triad_name != NONE:
+        parts.append(model.chord_name())
+    return [("text", (layout.width / 2, layout.margin / 2 + 4), {"text": "   |   ".join(parts), "fill": "black",
+                                                                 "font": ("Arial", 10, "bold")})]
+
+
+LAYER_BUILDERS = {
+    "roots": roots_layer,
+    "scale": scale_layer,
+    "chord": chord_layer,
+    "active": active_layer,
+}
+
+
+def board_scene(model, layout, caption: bool = False) -> dict:
+    # draw() 한 번이 그리는 것 전체를 순수 데이터로
+    labels = fret_number_primitives(layout)
+    if caption:
+        labels += caption_primitives(model, layout)
+    return {
+        "width": layout.width,
+        "height": layout.height,
+        "background": "white",
+        "neck": neck_primitives(layout),
+        "layers": {name: LAYER_BUILDERS[name](model, layout) for name in LAYER_ORDER},
+        "labels": labels,
+        "state": model.describe(),
+    }
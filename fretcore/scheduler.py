@@ -0,0 +1,94 @@
+# =========================
+# Update scheduler (dirty flags)
+# =========================
+# 이벤트 핸들러는 "무엇이 바뀌었는지"만 표시(mark)하고, 실제 재계산/다시 그리기는
+# idle 콜백 한 번에 몰아서 한다. 직전 프레임에서 FRAME_MS 가 안 지났으면 다음 프레임까지 미룸.
+# Tk 에 의존하지 않도록 after / after_idle 를 함수로 받는다.
+import time
+from collections import deque
+
+FRAME_MS = 16
+
+# 바뀐 부분 -> 다시 그려야 하는 레이어
+LAYERS_FOR = {
+    "key": ("roots", "scale", "chord", "active", "heat"),
+    "scale": ("scale", "heat"),
+    "chord": ("chord",),
+    "form": ("chord",),
+    "active": ("active",),
+    "heat": ("heat",),
+    "midi": ("midi",),
+    "instrument": ("roots", "scale", "chord", "active", "heat", "midi"),
+    "layout": ("roots", "scale", "chord", "active", "heat", "midi"),
+    "view": (),   # 보이는 프렛 범위가 실제로 바뀌었을 때만 전부 (뷰에서 판단)
+}
+
+
+def layers_for(parts) -> set:
+    layers = set()
+    for part in parts:
+        layers.update(LAYERS_FOR[part])
+    return layers
+
+
+class UpdateScheduler:
+    def __init__(self, after, after_idle, flush, frame_ms: int = FRAME_MS, clock=time.perf_counter):
+        self.after = after
+        self.after_idle = after_idle
+        self.flush = flush
+        self.frame_ms = frame_ms
+        self.clock = clock
+
+        self.dirty = set()
+        self.pending = False
+        self.last_frame = None
+
+        # 통계: 프레임 수, mark 호출 수, 이미 예약된 프레임에 합쳐진 mark 수
+        self.frames = 0
+        self.marks = 0
+        self.coalesced = 0
+        self.frame_times = deque(maxlen=240)
+
+    def mark(self, *parts):
+        self.dirty.update(parts)
+        self.marks += 1
+        if self.pending:
+            self.coalesced += 1
+            return
+        self.pending = True
+
+        wait = 0.0
+        if self.last_frame is not None:
+            wait = self.frame_ms - (self.clock() - self.last_frame) * 1000.0
+        if wait > 0:
+            self.after(int(wait) + 1, self.run)
+        else:
+            self.after_idle(self.run)
+
+    def run(self):
+        if not self.pending:
+            return
+        parts, self.dirty = self.dirty, set()
+        self.pending = False
+        self.last_frame = self.clock()
+        self.frames += 1
+        self.frame_times.append(self.last_frame)
+        self.flush(parts)
+
+    def flush_now(self):
+        # 예약된 것을 바로 처리 (벤치/종료 직전용). 나중에 오는 예약 콜백은 pending 이 False 라 무시됨
+        self.run()
+
+    def fps(self, window: float = 1.0) -> float:
+        if not self.frame_times:
+            return 0.0
+        now = self.clock()
+        return sum(1 for t in self.frame_times if now - t <= window) / window
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "marks": self.marks,
+            "coalesced": self.coalesced,
+            "fps": self.fps(),
+        }
@@ -0,0 +1,363 @@
+# =========================
+# Diagram HTTP server
+# =========================
+#   python -m fretcore serve --port 8765 [--cache-dir DIR]
+#   GET /board.svg?key=Eb&scale=Dorian&triad=m&tension=9&inversion=1st&form=2
+#   GET /board.png?...&zoom=2          (Pillow 필요)
+#   GET /stats                         (캐시 적중/렌더링 수, JSON)
+# Tk 없이 asyncio 서버 하나 (스레드 없음). 파라미터를 정규화한 키로 결과를 LRU 에 두고,
+# ETag / If-None-Match 면 304. --cache-dir 을 주면 디스크에도 두어서 다시 시작해도 이어 씀.
+# 이름은 화면/일괄 출력과 같은 어휘(KEY_ITEMS, scale_defs, triad_defs, tension_defs)를 쓰고
+# export 처럼 slug 나 none 으로도 쓸 수 있다.
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+from fretcore import raster
+from fretcore.export import key_slug, render_job, slug, source_stamp, write_atomic
+from fretcore.instruments import DEFAULT_INSTRUMENT, FRET_CHOICES, PRESETS
+from fretcore.layout import BoardLayout
+from fretcore.model import (
+    ALL_FORMS, KEY_ITEMS, NONE, BoardModel, build_inversion_library, build_recommended_form_groups,
+    build_scale_library, build_tension_library, build_triad_library, key_item_to_pc, note_name_to_pc,
+)
+
+CACHE_ENTRIES = 512
+CACHE_BYTES = 64 * 1024 * 1024
+MAX_HEADER = 16 * 1024
+KEEP_ALIVE_S = 15
+CONTENT_TYPES = {"svg": "image/svg+xml; charset=utf-8", "png": "image/png"}
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Request Header Fields Too Large", 500: "Internal Server Error", 501: "Not Implemented"}
+
+
+# =========================
+# Parameters
+# =========================
+class ParamError(ValueError):
+    pass
+
+
+def _choose(value, choices, name: str):
+    # 이름 그대로, 대소문자/기호 무시(slug), 또는 none -> (없음)
+    if value is None:
+        return None
+    token = value.strip()
+    if token.lower() == "none":
+        token = NONE
+    if token in choices:
+        return token
+    want = slug(token).lower()
+    for c in choices:
+        if slug(c).lower() == want:
+            return c
+    raise ParamError(f"unknown {name}: {value!r}")
+
+
+class Vocabulary:
+    # 파라미터 -> 정규화된 렌더링 키. 같은 그림이면 같은 키가 나오도록 기본값/동의어를 모두 풀어 둔다
+    def __init__(self):
+        self.scales = [NONE] + list(build_scale_library())
+        self.triads = [NONE] + list(build_triad_library())
+        self.tensions = [NONE] + list(build_tension_library())
+        self.inversions = build_inversion_library()
+        self.forms = list(build_recommended_form_groups())
+        self.key_by_pc = {key_item_to_pc(item): item for item in KEY_ITEMS}
+
+    def key(self, value):
+        if value is None:
+            return KEY_ITEMS[0]
+        if value in KEY_ITEMS:
+            return value
+        token = value.strip()
+        for item in KEY_ITEMS:
+            if key_slug(item).lower() == slug(token).lower():   # "Fs" 처럼 출력 파일 이름과 같은 slug
+                return item
+        if not token or token[0].upper() not in "ABCDEFG" or token[1:].lower() not in ("", "#", "b"):
+            raise ParamError(f"unknown key: {value!r}")
+        return self.key_by_pc[note_name_to_pc(token)]
+
+    def inversion(self, value):
+        if value is None:
+            return "Root"
+        if value.strip().isdigit():
+            index = int(value)
+            for name, idx in self.inversions.items():
+                if idx == index:
+                    return name
+            raise ParamError(f"unknown inversion: {value!r}")
+        return _choose(value, list(self.inversions), "inversion")
+
+    def form(self, value):
+        # "2" 또는 "Form 2" 또는 "Form 2 (Blue)". 없거나 all 이면 (전체)
+        if value is None or value.strip().lower() in ("", "all"):
+            return ALL_FORMS
+        token = value.strip()
+        if token.isdigit():
+            token = f"Form {token}"
+        for name in self.forms:
+            if name == token or name.split(" (")[0].lower() == token.lower():
+                return name
+        raise ParamError(f"unknown form: {value!r}")
+
+    def instrument(self, params):
+        preset = _choose(params.get("instrument"), list(PRESETS), "instrument") or DEFAULT_INSTRUMENT.name
+        inst = PRESETS[preset]
+        try:
+            frets = int(params["frets"]) if "frets" in params else inst.max_fret
+            capo = int(params.get("capo", 0))
+        except ValueError:
+            raise ParamError("frets / capo must be integers") from None
+        if frets not in FRET_CHOICES:
+            raise ParamError(f"frets must be one of {', '.join(map(str, FRET_CHOICES))}")
+        if not 0 <= capo < 10:
+            raise ParamError("capo must be 0..9")
+        return inst.with_options(max_fret=frets, capo=capo)
+
+    def normalise(self, fmt: str, params: dict):
+        scale = _choose(params.get("scale"), self.scales, "scale") or NONE
+        triad = _choose(params.get("triad"), self.triads, "triad") or NONE
+        tension = _choose(params.get("tension"), self.tensions, "tension") or NONE
+        inversion = self.inversion(params.get("inversion"))
+        form = self.form(params.get("form"))
+        if triad == NONE:
+            # 코드가 없으면 텐션/전위/폼은 그림에 영향 없음
+            tension, inversion, form = NONE, "Root", ALL_FORMS
+        inst = self.instrument(params)
+        zoom = 1.0
+        if fmt == "png":
+            try:
+                zoom = float(params.get("zoom", 1))
+            except ValueError:
+                raise ParamError("zoom must be a number") from None
+            if not 0.25 <= zoom <= 4:
+                raise ParamError("zoom must be 0.25..4")
+        job = (self.key(params.get("key")), scale, triad, tension, inversion, form)
+        return (fmt, inst.name, inst.max_fret, inst.capo, zoom) + job
+
+
+# =========================
+# Cache
+# =========================
+class RenderCache:
+    # 정규화된 키 -> (본문, ETag). 개수와 전체 바이트 둘 다 넘지 않게 오래 안 쓴 것부터 버림.
+    # directory 가 있으면 디스크에도 (파일 이름 = 키 + 렌더링 코드 시각의 해시)
+    def __init__(self, entries: int = CACHE_ENTRIES, max_bytes: int = CACHE_BYTES, directory=None):
+        self.entries = entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.stamp = repr(source_stamp())
+        self.items = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def digest(self, key) -> str:
+        return hashlib.sha1(repr((self.stamp,) + key).encode("utf-8")).hexdigest()
+
+    def disk_path(self, key) -> str:
+        return os.path.join(self.directory, f"{self.digest(key)}.{key[0]}")
+
+    def get(self, key):
+        entry = self.items.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return entry
+        if self.directory:
+            try:
+                with open(self.disk_path(key), "rb") as f:
+                    body = f.read()
+            except OSError:
+                pass
+            else:
+                self.disk_hits += 1
+                return self.put(key, body, save=False)
+        self.misses += 1
+        return None
+
+    def put(self, key, body: bytes, save: bool = True):
+        entry = (body, f'"{hashlib.sha1(body).hexdigest()[:20]}"')
+        old = self.items.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        self.items[key] = entry
+        self.bytes += len(body)
+        while self.items and (len(self.items) > self.entries or self.bytes > self.max_bytes):
+            _, (dropped, _) = self.items.popitem(last=False)
+            self.bytes -= len(dropped)
+        if save and self.directory:
+            try:
+                write_atomic(self.disk_path(key), body)
+            except OSError as e:
+                print(f"disk cache: {e}", file=sys.stderr)
+        return entry
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self.items),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+# =========================
+# Server
+# =========================
+class DiagramServer:
+    def __init__(self, cache: RenderCache):
+        self.cache = cache
+        self.vocab = Vocabulary()
+        self.boards = {}   # 악기 -> (작업용 모델, 레이아웃). 렌더링은 이벤트 루프에서 하나씩이라 공유해도 됨
+        self.requests = 0
+        self.renders = 0
+        self.render_ms = 0.0
+        self.started = time.time()
+
+    def board_for(self, instrument):
+        board = self.boards.get(instrument)
+        if board is None:
+            layout = BoardLayout(strings=instrument.strings, max_fret=instrument.frets, first_fret=instrument.capo)
+            board = self.boards[instrument] = (BoardModel(instrument), layout)
+        return board
+
+    def render(self, key) -> bytes:
+        fmt, name, max_fret, capo, zoom = key[:5]
+        model, layout = self.board_for(PRESETS[name].with_options(max_fret=max_fret, capo=capo))
+        t = time.perf_counter()
+        body = render_job(model, layout, key[5:], fmt, zoom)
+        self.render_ms += (time.perf_counter() - t) * 1000.0
+        self.renders += 1
+        return body
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "renders": self.renders,
+            "mean_render_ms": self.render_ms / self.renders if self.renders else 0.0,
+            "uptime_s": time.time() - self.started,
+            "cache": self.cache.stats(),
+        }
+
+    def respond(self, method: str, target: str, headers: dict):
+        # -> (상태, 추가 헤더, 본문)
+        self.requests += 1
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b"only GET/HEAD\n"
+        url = urlsplit(target)
+        if url.path == "/stats":
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.stats(), indent=1).encode()
+        if url.path not in ("/board.svg", "/board.png"):
+            return 404, {}, b"try /board.svg?key=C&scale=Dorian or /board.png?...\n"
+        fmt = url.path.rsplit(".", 1)[1]
+        if fmt == "png" and not raster.available():
+            return 501, {}, "PNG 출력에는 Pillow 가 필요합니다 (pip install pillow)\n".encode()
+        try:
+            key = self.vocab.normalise(fmt, dict(parse_qsl(url.query)))
+        except ParamError as e:
+            return 400, {}, f"{e}\n".encode()
+
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = self.cache.put(key, self.render(key))
+        body, etag = entry
+        extra = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        if etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            return 304, extra, b""
+        extra["Content-Type"] = CONTENT_TYPES[fmt]
+        return 200, extra, body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # HTTP/1.1 keep-alive. 요청 본문은 받지 않음 (GET/HEAD 만)
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_S)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 413, {}, b"", True, False)
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self.send(writer, 400, {}, b"bad request line\n", True, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    status, extra, body = self.respond(method, target, headers)
+                except Exception as e:  # 렌더링 실패는 연결만 500 으로 닫고 서버는 계속
+                    print(f"{target}: {e!r}", file=sys.stderr)
+                    status, extra, body, keep = 500, {}, b"render failed\n", False
+                await self.send(writer, status, extra, body, method != "HEAD", keep)
+                if not keep:
+                    break
+        finally:
+            writer.close()
+
+    async def send(self, writer, status: int, extra: dict, body: bytes, with_body: bool, keep: bool):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep else 'close'}"]
+        if "Content-Type" not in extra and status != 304:
+            extra = dict(extra, **{"Content-Type": "text/plain; charset=utf-8"})
+        lines += [f"{k}: {v}" for k, v in extra.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if with_body and status != 304:
+            writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str, port: int, cache: RenderCache):
+    app = DiagramServer(cache)
+    server = await asyncio.start_server(app.handle, host, port, limit=MAX_HEADER)
+    where = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"serving diagrams on {where}  (cache {cache.entries} entries"
+          f"{', disk ' + cache.directory if cache.directory else ''})", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards serve", description="다이어그램 SVG/PNG 를 HTTP 로 제공")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--cache-size", type=int, default=CACHE_ENTRIES, help="메모리 캐시 개수")
+    ap.add_argument("--cache-mb", type=float, default=CACHE_BYTES / 1024 / 1024, help="메모리 캐시 크기 (MB)")
+    ap.add_argument("--cache-dir", help="디스크 캐시 디렉터리 (다시 시작해도 유지)")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    cache = RenderCache(args.cache_size, int(args.cache_mb * 1024 * 1024), args.cache_dir)
+    try:
+        asyncio.run(serve(args.host, args.port, cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
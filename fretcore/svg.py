@@ -0,0 +1,70 @@
+# =========================
+# SVG backend
+# =========================
+# scene.board_scene() 결과를 SVG 문자열로. Tk 캔버스의 draw() 결과와 같은 모양.
+from xml.sax.saxutils import escape, quoteattr
+
+# Tk 폰트 크기(pt) -> SVG px
+PT_TO_PX = 4 / 3
+DEFAULT_FONT = ("Arial", 9)
+
+
+def _num(v: float) -> str:
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def _paint(color) -> str:
+    return color if color else "none"
+
+
+def primitive_to_svg(kind: str, coords, opts) -> str:
+    if opts.get("state") == "hidden":
+        return ""
+    if kind == "rect":
+        x0, y0, x1, y1 = coords
+        return (f'<rect x="{_num(x0)}" y="{_num(y0)}" width="{_num(x1 - x0)}" height="{_num(y1 - y0)}" '
+                f'fill="{_paint(opts.get("fill"))}" stroke="{_paint(opts.get("outline", "black"))}" '
+                f'stroke-width="{_num(opts.get("width", 1))}"/>')
+    if kind == "oval":
+        x0, y0, x1, y1 = coords
+        return (f'<ellipse cx="{_num((x0 + x1) / 2)}" cy="{_num((y0 + y1) / 2)}" '
+                f'rx="{_num((x1 - x0) / 2)}" ry="{_num((y1 - y0) / 2)}" '
+                f'fill="{_paint(opts.get("fill"))}" stroke="{_paint(opts.get("outline", "black"))}" '
+                f'stroke-width="{_num(opts.get("width", 1))}"/>')
+    if kind == "line":
+        x0, y0, x1, y1 = coords
+        return (f'<line x1="{_num(x0)}" y1="{_num(y0)}" x2="{_num(x1)}" y2="{_num(y1)}" '
+                f'stroke="{_paint(opts.get("fill", "black"))}" stroke-width="{_num(opts.get("width", 1))}"/>')
+    if kind == "text":
+        x, y = coords
+        font = opts.get("font", DEFAULT_FONT)
+        family, size = font[0], font[1]
+        weight = "bold" if "bold" in font[2:] else "normal"
+        return (f'<text x="{_num(x)}" y="{_num(y)}" text-anchor="middle" dominant-baseline="central" '
+                f'font-family={quoteattr(family)} font-size="{_num(size * PT_TO_PX)}" font-weight="{weight}" '
+                f'fill="{_paint(opts.get("fill", "black"))}">{escape(opts.get("text", ""))}</text>')
+    raise ValueError(f"unknown primitive kind: {kind}")
+
+
+def iter_scene_primitives(board: dict):
+    # 그리는 순서: 넥 -> 오버레이(아래 -> 위) -> 프렛 번호/캡션
+    yield from board["neck"]
+    for layer in board["layers"].values():
+        for prims in layer.values():
+            yield from prims
+    yield from board["labels"]
+
+
+def render_svg(board: dict) -> str:
+    w, h = board["width"], board["height"]
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(w)}" height="{_num(h)}" '
+        f'viewBox="0 0 {_num(w)} {_num(h)}">',
+        f'<rect width="100%" height="100%" fill="{board.get("background", "white")}"/>',
+    ]
+    for kind, coords, opts in iter_scene_primitives(board):
+        el = primitive_to_svg(kind, coords, opts)
+        if el:
+            parts.append(el)
+    parts.append("</svg>")
+    return "\n".join(parts)
@@ -0,0 +1,191 @@
+# =========================
+# Plucked-string synthesis
+# =========================
+# NumPy 가 있을 때만 사용 가능 (pip install numpy).
+# Karplus-Strong: 한 주기(N 샘플)씩 블록 단위로 계산한다. 블록 k 는 블록 k-1 에만 의존하므로
+# 블록 안은 전부 벡터 연산 (낮은 E 2초 = 160 블록 정도).
+# 파형은 (줄의 개방음, 프렛) 단위로 WaveBank(LRU)에 보관하고, 스트럼은 캐시된 파형들을 한 번에 섞는다.
+#   python -m fretcore synth --chord "C M maj7" --out cmaj7.wav
+#   python -m fretcore synth --notes "E2 A2 D3" --strum 0 --out chord.wav
+import argparse
+import io
+import sys
+import wave
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 없음 -> 소리 없이 동작 (클릭/재생은 화면만)
+    np = None
+
+SAMPLE_RATE = 44100
+DURATION = 1.6
+STRUM_MS = 28
+BANK_SIZE = 256
+
+
+def available() -> bool:
+    return np is not None
+
+
+def midi_to_hz(midi: float) -> float:
+    return 440.0 * 2 ** ((midi - 69) / 12)
+
+
+def pluck(midi: int, duration: float = DURATION, sr: int = SAMPLE_RATE, brightness: float = 0.5,
+          seed: int = None):
+    # 주기 P = sr / f 를 정수 N + 분수 w 로 나눠서 y[n] = d * ((1-w) y[n-N] + w y[n-N-1])
+    # (두 탭 가중 평균 = 저역 통과 + 분수 지연이라 높은 음도 음정이 맞음)
+    freq = midi_to_hz(midi)
+    period = sr / freq
+    n = max(2, int(period))
+    w = period - n
+    total = int(duration * sr)
+
+    # 낮은 음일수록 오래 울림: 1초에 약 -40dB(저음) ~ -60dB(고음)
+    t60 = 3.0 - 1.8 * min(1.0, max(0.0, (midi - 40) / 48))
+    d = 10 ** (-3 / (t60 * freq))
+
+    rng = np.random.default_rng(midi if seed is None else seed)
+    burst = rng.uniform(-1.0, 1.0, n + 1)
+    # 부드러운 음색: 들뜬 잡음을 한 번 평균 (brightness 0 -> 강하게, 1 -> 그대로)
+    burst[1:] = brightness * burst[1:] + (1 - brightness) * 0.5 * (burst[1:] + burst[:-1])
+    burst -= burst.mean()
+
+    blocks = -(-total // n) + 1
+    y = np.empty(blocks * n + 1, dtype=np.float64)
+    y[:n + 1] = burst
+    a, b = d * (1 - w), d * w
+    for start in range(n + 1, len(y), n):
+        end = min(start + n, len(y))
+        y[start:end] = a * y[start - n:end - n] + b * y[start - n - 1:end - n - 1]
+
+    out = y[:total]
+    fade = min(total, int(0.01 * sr))
+    out[-fade:] *= np.linspace(1.0, 0.0, fade)
+    peak = np.abs(out).max()
+    if peak > 0:
+        out = out * (0.6 / peak)
+    return out.astype(np.float32)
+
+
+class WaveBank:
+    # (줄 개방음(카포 포함), 프렛) -> 파형. 최근에 쓴 것부터 BANK_SIZE 개
+    def __init__(self, size: int = BANK_SIZE, duration: float = DURATION, sr: int = SAMPLE_RATE):
+        self.size = size
+        self.duration = duration
+        self.sr = sr
+        self.waves = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, open_midi: int, fret: int):
+        key = (open_midi, fret)
+        wave_ = self.waves.get(key)
+        if wave_ is not None:
+            self.hits += 1
+            self.waves.move_to_end(key)
+            return wave_
+        self.misses += 1
+        # 감은 줄(낮은 개방음)은 조금 더 어두운 음색
+        brightness = 0.35 if open_midi < 52 else 0.6
+        wave_ = pluck(open_midi + fret, self.duration, self.sr, brightness, seed=open_midi * 64 + fret)
+        self.waves[key] = wave_
+        if len(self.waves) > self.size:
+            self.waves.popitem(last=False)
+        return wave_
+
+    def note(self, instrument, s: int, fret: int):
+        return self.get(instrument.pitch(s, 0), fret)
+
+    def strum(self, notes, spacing_ms: float = STRUM_MS):
+        # notes: [(open_midi, fret), ...] 낮은 줄부터. 시작 시각만 다른 같은 길이 파형들을
+        # (음, 샘플) 2차원으로 쌓아서 bincount 한 번으로 섞는다
+        if not notes:
+            return np.zeros(0, dtype=np.float32)
+        waves = np.stack([self.get(m, f) for m, f in notes])
+        count, length = waves.shape
+        step = int(spacing_ms * self.sr / 1000)
+        offsets = np.arange(count) * step
+        index = (offsets[:, None] + np.arange(length)[None, :]).ravel()
+        mixed = np.bincount(index, weights=waves.ravel(), minlength=length + offsets[-1])
+        mixed *= 1.0 / max(1.0, count ** 0.5)
+        peak = np.abs(mixed).max()
+        if peak > 0.98:
+            mixed *= 0.98 / peak
+        return mixed.astype(np.float32)
+
+    def stats(self) -> dict:
+        return {"waves": len(self.waves), "hits": self.hits, "misses": self.misses}
+
+
+# ===== WAV =====
+def to_wav_bytes(samples, sr: int = SAMPLE_RATE) -> bytes:
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def write_wav(path: str, samples, sr: int = SAMPLE_RATE) -> str:
+    with open(path, "wb") as f:
+        f.write(to_wav_bytes(samples, sr))
+    return path
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards synth", description="줄/프렛 음이나 코드 보이싱을 WAV 로 합성")
+    ap.add_argument("--out", required=True, help="출력 WAV 경로")
+    ap.add_argument("--notes", help='음 이름 (낮은 음 -> 높은 음). 예: "E2 B2 E3 G#3"')
+    ap.add_argument("--chord", help='진행 한 마디 형식. 예: "C M maj7", "A m 7 1st"')
+    ap.add_argument("--form", type=int, default=1, help="--chord 의 몇 번째 폼 (기본 1)")
+    ap.add_argument("--instrument", default=None, help="악기 프리셋 이름 (기본 Guitar 6 (Standard))")
+    ap.add_argument("--strum", type=float, default=STRUM_MS, help="줄 사이 간격 ms (0 = 동시에)")
+    ap.add_argument("--duration", type=float, default=DURATION, help="음 길이(초)")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not available():
+        print("합성에는 NumPy 가 필요합니다 (pip install numpy)", file=sys.stderr)
+        return 1
+
+    from fretcore.instruments import DEFAULT_INSTRUMENT, PRESETS, note_to_midi
+
+    if args.instrument and args.instrument not in PRESETS:
+        raise SystemExit(f"unknown instrument: {args.instrument!r} (choices: {', '.join(PRESETS)})")
+    instrument = PRESETS[args.instrument] if args.instrument else DEFAULT_INSTRUMENT
+    bank = WaveBank(duration=args.duration)
+
+    if args.notes:
+        notes = [(note_to_midi(t), 0) for t in args.notes.split()]
+        label = args.notes
+    elif args.chord:
+        from fretcore.model import BoardModel, NOTE_FLAT
+        from fretcore.progression import parse_progression
+
+        model = BoardModel(instrument)
+        step = parse_progression(args.chord, model)[0]
+        model.set_key(NOTE_FLAT[step.root_pc], update=False)
+        model.set_chord(step.triad, step.tension, step.inversion, update=False)
+        model.refresh({"key"})
+        if not model.forms:
+            raise SystemExit(f"{args.chord}: 잡을 수 있는 보이싱 없음")
+        voicing = model.forms[min(max(args.form, 1), len(model.forms)) - 1]
+        notes = instrument.voicing_notes(voicing.frets)
+        label = f"{model.chord_name()} {voicing.tab()}"
+    else:
+        raise SystemExit("--notes 또는 --chord 가 필요합니다")
+
+    samples = bank.strum(notes, args.strum)
+    write_wav(args.out, samples)
+    print(f"{label} -> {args.out} ({len(samples) / SAMPLE_RATE:.2f}s)")
+    return 0
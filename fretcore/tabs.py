@@ -0,0 +1,421 @@
+# =========================
+# Tab corpus (ASCII tabs -> fret usage)
+# =========================
+#   python -m fretcore tabs ~/tabs --jobs 8 [--strings 6] [--key G]
+# 폴더 아래 ASCII 탭(.txt/.tab/.crd)을 읽어 (줄, 프렛)별 사용 횟수와 곡 조(key)별 pitch class 분포를 모은다.
+#  - 파일은 줄 단위로 읽으며 보표(연속된 탭 줄) 하나씩만 들고 있음 (큰 파일도 메모리 일정)
+#  - 바뀐 파일만 프로세스 풀로 다시 읽고, 결과는 파일별로 작은 바이너리 캐시에 (mtime/크기가 같으면 재사용)
+#  - 조는 곡 전체 pitch class 분포를 장조 프로필과 비교해서 정함 (KEY_ITEMS 처럼 장조/나란한조는 같은 조)
+# 줄 순서는 instruments 와 같음: 탭 맨 윗줄 = 0 = 가장 높은 줄.
+import argparse
+import hashlib
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from fretcore.instruments import NOTE_INDEX, PRESETS
+from fretcore.lookup import cache_dir
+
+TABS_VERSION = 1
+MAGIC = b"9RTB"
+TAB_EXTENSIONS = (".txt", ".tab", ".crd")
+MAX_TAB_FRET = 24
+MIN_STRINGS, MAX_STRINGS = 4, 8
+# 바뀐 파일이 이보다 적으면 프로세스를 띄우지 않고 현재 프로세스에서
+SERIAL_LIMIT = 32
+CHUNKSIZE = 16
+# 읽는 중 진행 상황을 화면으로 보내는 간격 (ms)
+PARTIAL_MS = 200
+
+# 줄 이름표(선택) + 구분자 + 몸통. 몸통은 탭 기호만, 대시가 몇 개는 있어야 탭 줄로 봄
+TAB_LINE_RE = re.compile(r"\s*([A-Ga-g][#b]?)?\s*[|:]([-0-9|/\\~()<>^*.=:xXhpbrvst ]*)$")
+FRET_RE = re.compile(r"\d+")
+
+# 이름표가 없을 때 줄 수로 고르는 표준 튜닝
+STANDARD_TUNINGS = {inst.strings: inst.open_pc for inst in (
+    PRESETS["Bass 4 (Standard)"], PRESETS["Bass 5 (Standard)"], PRESETS["Guitar 6 (Standard)"],
+    PRESETS["Guitar 7 (Standard)"], PRESETS["Guitar 8 (Standard)"],
+)}
+
+# Krumhansl-Kessler 장조 프로필 (으뜸음 = 0)
+MAJOR_PROFILE = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)
+
+
+def cells(strings: int) -> int:
+    return strings * (MAX_TAB_FRET + 1)
+
+
+# =========================
+# Parse (one file, streaming)
+# =========================
+class TabFile:
+    # 파일 하나의 결과. usage: 줄 수 -> array('I') (줄 * (MAX_TAB_FRET + 1) + 프렛), pcs: 12칸
+    __slots__ = ("usage", "pcs", "key_pc")
+
+    def __init__(self, usage=None, pcs=None, key_pc=-1):
+        self.usage = usage if usage is not None else {}
+        self.pcs = pcs if pcs is not None else array("I", [0] * 12)
+        self.key_pc = key_pc
+
+    @property
+    def notes(self) -> int:
+        return sum(sum(u) for u in self.usage.values())
+
+
+def staff_tuning(labels):
+    # 이름표가 모두 음 이름이면 그 pitch class, 아니면 줄 수에 맞는 표준 튜닝 (없으면 None)
+    if all(labels):
+        return [(NOTE_INDEX[t[0].upper()] + {"#": 1, "b": -1}.get(t[1:], 0)) % 12 for t in labels]
+    return STANDARD_TUNINGS.get(len(labels))
+
+
+def add_staff(result: TabFile, staff):
+    n = len(staff)
+    if not MIN_STRINGS <= n <= MAX_STRINGS:
+        return
+    usage = result.usage.get(n)
+    if usage is None:
+        usage = result.usage[n] = array("I", [0] * cells(n))
+    tuning = staff_tuning([label for label, _ in staff])
+    for s, (_, body) in enumerate(staff):
+        for m in FRET_RE.finditer(body):
+            text = m.group()
+            fret = int(text)
+            if len(text) > 2 or fret > MAX_TAB_FRET:
+                continue
+            usage[s * (MAX_TAB_FRET + 1) + fret] += 1
+            if tuning is not None:
+                result.pcs[(tuning[s] + fret) % 12] += 1
+
+
+def detect_key(pcs) -> int:
+    # 장조 프로필과 상관이 가장 큰 으뜸음. 음이 없으면 -1
+    total = sum(pcs)
+    if not total:
+        return -1
+    mean_p = sum(MAJOR_PROFILE) / 12
+    mean_h = total / 12
+    best, best_pc = None, -1
+    for tonic in range(12):
+        score = sum((pcs[(tonic + i) % 12] - mean_h) * (MAJOR_PROFILE[i] - mean_p) for i in range(12))
+        if best is None or score > best:
+            best, best_pc = score, tonic
+    return best_pc
+
+
+def parse_lines(lines) -> TabFile:
+    result = TabFile()
+    staff = []
+    for line in lines:
+        m = TAB_LINE_RE.match(line.rstrip("\r\n"))
+        if m and m.group(2).count("-") >= 3:
+            staff.append((m.group(1), m.group(2)))
+            continue
+        if staff:
+            add_staff(result, staff)
+            staff = []
+    if staff:
+        add_staff(result, staff)
+    result.key_pc = detect_key(result.pcs)
+    return result
+
+
+def parse_file(path: str):
+    # 프로세스 풀에서 부름: (경로, TabFile 또는 None(못 읽음))
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return path, parse_lines(f)
+    except OSError:
+        return path, None
+
+
+# =========================
+# Cache file
+# =========================
+# MAGIC, 버전, 파일 수 / 파일마다: 경로 길이, mtime_ns, 크기, 조, 보표 종류 수, 경로(UTF-8), pcs(u32 x 12),
+# 보표 종류마다: 줄 수, 0 아닌 칸 수, 칸 번호(u16 ...), 횟수(u32 ...)
+HEADER = "<4sHI"
+ENTRY = "<HqqbB"
+PART = "<BH"
+
+
+def encode_entries(entries: dict) -> bytes:
+    out = [struct.pack(HEADER, MAGIC, TABS_VERSION, len(entries))]
+    for path, (mtime, size, tab) in entries.items():
+        raw = path.encode("utf-8", "surrogateescape")
+        out.append(struct.pack(ENTRY, len(raw), mtime, size, tab.key_pc, len(tab.usage)))
+        out.append(raw)
+        out.append(tab.pcs.tobytes())
+        for n, usage in tab.usage.items():
+            where = array("H", [i for i, c in enumerate(usage) if c])
+            counts = array("I", [usage[i] for i in where])
+            out.append(struct.pack(PART, n, len(where)))
+            out.append(where.tobytes())
+            out.append(counts.tobytes())
+    return b"".join(out)
+
+
+def decode_entries(data: bytes) -> dict:
+    magic, version, count = struct.unpack_from(HEADER, data)
+    if magic != MAGIC or version != TABS_VERSION:
+        raise ValueError("tab cache mismatch")
+    pos = struct.calcsize(HEADER)
+    entries = {}
+    for _ in range(count):
+        plen, mtime, size, key_pc, parts = struct.unpack_from(ENTRY, data, pos)
+        pos += struct.calcsize(ENTRY)
+        path = data[pos:pos + plen].decode("utf-8", "surrogateescape")
+        pos += plen
+        pcs = array("I")
+        pcs.frombytes(data[pos:pos + 48])
+        pos += 48
+        usage = {}
+        for _ in range(parts):
+            n, nnz = struct.unpack_from(PART, data, pos)
+            pos += struct.calcsize(PART)
+            where, counts = array("H"), array("I")
+            where.frombytes(data[pos:pos + 2 * nnz])
+            pos += 2 * nnz
+            counts.frombytes(data[pos:pos + 4 * nnz])
+            pos += 4 * nnz
+            grid = usage[n] = array("I", [0] * cells(n))
+            for i, c in zip(where, counts):
+                grid[i] = c
+        if len(pcs) != 12 or pos > len(data):
+            raise ValueError("tab cache truncated")
+        entries[path] = (mtime, size, TabFile(usage, pcs, key_pc))
+    return entries
+
+
+def cache_path(root: str, directory=None) -> str:
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+    return os.path.join(directory or cache_dir(), f"tabs-{digest}.bin")
+
+
+def load_entries(path: str) -> dict:
+    try:
+        with open(path, "rb") as f:
+            return decode_entries(f.read())
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        return {}
+
+
+def save_entries(path: str, entries: dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(encode_entries(entries))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # 캐시 저장 실패는 무시 (다음 실행 때 다시 읽음)
+
+
+# =========================
+# Corpus (aggregated counts)
+# =========================
+class Corpus:
+    # 파일별 결과를 조/줄 수별로 합친 것. usage[(줄 수, 조)] = array('I'), pcs[조] = 12칸, files[조] = 파일 수
+    def __init__(self, entries: dict):
+        self.usage = {}
+        self.pcs = {}
+        self.files = {}
+        for _, _, tab in entries.values():
+            key = tab.key_pc
+            self.files[key] = self.files.get(key, 0) + 1
+            hist = self.pcs.setdefault(key, array("I", [0] * 12))
+            for pc in range(12):
+                hist[pc] += tab.pcs[pc]
+            for n, usage in tab.usage.items():
+                total = self.usage.get((n, key))
+                if total is None:
+                    self.usage[(n, key)] = array("I", usage)
+                    continue
+                for i, c in enumerate(usage):
+                    if c:
+                        total[i] += c
+        self.file_count = len(entries)
+        self.note_count = sum(sum(u) for u in self.usage.values())
+
+    def string_counts(self):
+        return sorted({n for n, _ in self.usage})
+
+    def fret_usage(self, strings: int, key_pc=None):
+        # key_pc=None 이면 모든 조 (조를 못 정한 파일 포함)
+        grid = array("I", [0] * cells(strings))
+        for (n, key), usage in self.usage.items():
+            if n != strings or (key_pc is not None and key != key_pc):
+                continue
+            for i, c in enumerate(usage):
+                if c:
+                    grid[i] += c
+        return grid
+
+    def key_histogram(self, key_pc: int):
+        return list(self.pcs.get(key_pc, [0] * 12))
+
+
+def heat_counts(corpus: Corpus, instrument, key_pc=None, allowed_pcs=None) -> dict:
+    # 지금 악기 보드 좌표로: {(줄, 보드 프렛): 횟수}. 탭 프렛은 카포 없는 실제 프렛이라 카포만큼 당김.
+    # allowed_pcs 를 주면 그 pitch class 칸만 (스케일 음)
+    if corpus is None:
+        return {}
+    n = instrument.strings
+    grid = corpus.fret_usage(n, key_pc)
+    open_pc = instrument.open_pc
+    counts = {}
+    for s in range(n):
+        base = s * (MAX_TAB_FRET + 1)
+        for fret in range(instrument.frets + 1):
+            tab_fret = fret + instrument.capo
+            if tab_fret > MAX_TAB_FRET:
+                break
+            c = grid[base + tab_fret]
+            if c and (allowed_pcs is None or (open_pc[s] + fret) % 12 in allowed_pcs):
+                counts[(s, fret)] = c
+    return counts
+
+
+# =========================
+# Ingest (incremental)
+# =========================
+def scan(root: str) -> dict:
+    # 경로 -> (mtime_ns, 크기)
+    found = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(TAB_EXTENSIONS):
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found[path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _parsed(paths, jobs: int):
+    # (경로, TabFile) 를 끝나는 대로. 프로세스는 spawn (Tk 스레드가 있는 화면 프로세스에서도 안전하게)
+    if jobs <= 1 or len(paths) < SERIAL_LIMIT:
+        for path in paths:
+            yield parse_file(path)
+        return
+    pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield from pool.map(parse_file, paths, chunksize=CHUNKSIZE)
+    finally:
+        # 취소로 중간에 닫히면 아직 시작 안 한 묶음은 버림
+        pool.shutdown(cancel_futures=True)
+
+
+def ingest(root: str, jobs: int = 1, directory=None, progress=None, cancel=None):
+    # -> (Corpus, 통계). progress(끝난 수, 전체 수) 를 파일마다, cancel() 이 True 면 거기까지만 저장
+    t0 = time.perf_counter()
+    path = cache_path(root, directory)
+    cached = load_entries(path)
+    found = scan(root)
+
+    entries = {}
+    todo = []
+    for file, stamp in found.items():
+        hit = cached.get(file)
+        if hit is not None and hit[:2] == stamp:
+            entries[file] = hit
+        else:
+            todo.append(file)
+    removed = sum(1 for file in cached if file not in found)
+
+    parsed = failed = 0
+    cancelled = False
+    results = _parsed(todo, jobs)
+    try:
+        for file, tab in results:
+            if cancel is not None and cancel():
+                cancelled = True
+                break
+            if tab is None:
+                failed += 1
+            else:
+                entries[file] = found[file] + (tab,)
+                parsed += 1
+            if progress is not None:
+                progress(parsed + failed, len(todo))
+    finally:
+        results.close()
+    if parsed or removed or failed:
+        save_entries(path, entries)
+
+    corpus = Corpus(entries)
+    stats = {
+        "files": len(entries),
+        "parsed": parsed,
+        "reused": len(entries) - parsed,
+        "removed": removed,
+        "failed": failed,
+        "cancelled": cancelled,
+        "notes": corpus.note_count,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+    }
+    return corpus, stats
+
+
+def ingest_job(job, root: str, jobs: int = None):
+    # workers.WorkerPool 작업: ingest (안에서 프로세스 풀). 진행 (끝난 수, 전체 수)를 PARTIAL_MS 마다 job.emit,
+    # job.cancel() 이면 거기까지 저장하고 (Corpus, 통계)
+    def progress(done: int, total: int):
+        if job.due(PARTIAL_MS):
+            job.emit((done, total))
+
+    return ingest(root, jobs or os.cpu_count() or 1, progress=progress, cancel=lambda: job.cancelled)
+
+
+# =========================
+# Command line
+# =========================
+def build_parser():
+    ap = argparse.ArgumentParser(prog="9retboards tabs", description="ASCII 탭 폴더의 프렛 사용 빈도/조 분포 집계")
+    ap.add_argument("root", help="탭 파일(.txt/.tab/.crd) 폴더")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="프로세스 수 (1 이면 현재 프로세스에서)")
+    ap.add_argument("--strings", type=int, default=6, help="집계할 줄 수 (기본 6)")
+    ap.add_argument("--key", help="이 조의 곡만 (예: G, Eb)")
+    ap.add_argument("--top", type=int, default=12, help="가장 많이 쓴 칸 N 개 출력")
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    from fretcore.model import NOTE_FLAT, pc_to_note_text
+
+    if not os.path.isdir(args.root):
+        print(f"{args.root}: 폴더가 아님", file=sys.stderr)
+        return 1
+    key_pc = None
+    if args.key:
+        m = re.fullmatch(r"\s*([A-Ga-g])([#b]?)\s*", args.key)
+        if not m:
+            print(f"bad key: {args.key!r}", file=sys.stderr)
+            return 2
+        key_pc = (NOTE_INDEX[m.group(1).upper()] + {"#": 1, "b": -1, "": 0}[m.group(2)]) % 12
+
+    corpus, stats = ingest(args.root, args.jobs)
+    grid = corpus.fret_usage(args.strings, key_pc)
+    ranked = sorted(((c, i) for i, c in enumerate(grid) if c), reverse=True)[:args.top]
+    for c, i in ranked:
+        s, fret = divmod(i, MAX_TAB_FRET + 1)
+        print(f"string {s + 1} fret {fret:2d}: {c}")
+    keys = sorted(((n, k) for k, n in corpus.files.items() if k >= 0), reverse=True)
+    print("keys: " + ", ".join(f"{NOTE_FLAT[k]} {n}" for n, k in keys))
+    if key_pc is not None:
+        hist = corpus.key_histogram(key_pc)
+        total = sum(hist) or 1
+        print(f"pitch classes in {NOTE_FLAT[key_pc]}: "
+              + " ".join(f"{pc_to_note_text(pc)} {hist[pc] * 100 / total:.0f}%" for pc in range(12)))
+    print(f"{stats['files']} files ({stats['parsed']} parsed, {stats['reused']} cached, {stats['removed']} removed), "
+          f"{stats['notes']} notes, {stats['elapsed_ms']:.0f}ms", file=sys.stderr)
+    return 0
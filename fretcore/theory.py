@@ -0,0 +1,97 @@
+# =========================
+# Pitch-class bitmask engine
+# =========================
+# 음 집합을 12비트 정수로 다룬다. bit i = pitch class i (C=0 ... B=11).
+# 스케일/코드 라이브러리는 12개 조성으로 전부 미리 옮겨 두고,
+# 현재 튜닝에 대해 "pitch class -> (줄, 프렛)" 인덱스를 한 번만 만든다.
+# 키/스케일/코드 변경은 셀을 도는 루프 없이 표 조회로 끝난다.
+from functools import lru_cache
+
+FULL_MASK = 0xFFF
+
+
+def pcs_to_mask(pcs) -> int:
+    mask = 0
+    for pc in pcs:
+        mask |= 1 << (pc % 12)
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def mask_to_pcs(mask: int) -> tuple:
+    return tuple(pc for pc in range(12) if mask >> pc & 1)
+
+
+def transpose_mask(mask: int, n: int) -> int:
+    n %= 12
+    return ((mask << n) | (mask >> (12 - n))) & FULL_MASK
+
+
+def mask_from_intervals(intervals, root: int = 0) -> int:
+    return transpose_mask(pcs_to_mask(intervals), root)
+
+
+def transpositions(mask: int) -> tuple:
+    return tuple(transpose_mask(mask, n) for n in range(12))
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class TheoryTables:
+    # 라이브러리 항목마다 12개 조성의 마스크를 미리 만들어 둠
+    def __init__(self, scale_defs: dict, triad_defs: dict, tension_defs: dict):
+        self.scales = {name: transpositions(pcs_to_mask(iv)) for name, iv in scale_defs.items()}
+        self.triads = {name: transpositions(pcs_to_mask(iv)) for name, iv in triad_defs.items()}
+        self.tensions = {name: transpositions(pcs_to_mask(iv)) for name, iv in tension_defs.items()}
+
+    def add_scale(self, name: str, intervals):
+        self.scales[name] = transpositions(pcs_to_mask(intervals))
+
+    def scale_mask(self, name: str, tonic_pc: int) -> int:
+        masks = self.scales.get(name)
+        return masks[tonic_pc % 12] if masks else 0
+
+    def chord_mask(self, triad_name: str, tension_name: str, tonic_pc: int) -> int:
+        triad = self.triads.get(triad_name)
+        if not triad:
+            return 0
+        mask = triad[tonic_pc % 12]
+        tension = self.tensions.get(tension_name)
+        if tension:
+            mask |= tension[tonic_pc % 12]
+        return mask
+
+
+class PositionIndex:
+    # 튜닝(open_pc) + 프렛 수가 정해지면 한 번만 만든다
+    def __init__(self, open_pc, max_fret: int):
+        self.open_pc = tuple(open_pc)
+        self.max_fret = max_fret
+        self.strings = len(self.open_pc)
+
+        self.pc_grid = tuple(
+            tuple((self.open_pc[s] + f) % 12 for f in range(max_fret + 1))
+            for s in range(self.strings)
+        )
+        by_pc = [[] for _ in range(12)]
+        for s in range(self.strings):
+            for f in range(max_fret + 1):
+                by_pc[self.pc_grid[s][f]].append((s, f))
+        self.by_pc = tuple(tuple(pts) for pts in by_pc)
+
+        self._mask_points = {0: frozenset()}
+
+    def pc_at(self, s: int, fret: int) -> int:
+        return self.pc_grid[s][fret]
+
+    def points_for_pc(self, pc: int) -> tuple:
+        return self.by_pc[pc % 12]
+
+    def points_for_mask(self, mask: int) -> frozenset:
+        pts = self._mask_points.get(mask)
+        if pts is None:
+            pts = frozenset(p for pc in mask_to_pcs(mask) for p in self.by_pc[pc])
+            self._mask_points[mask] = pts
+        return pts
@@ -0,0 +1,165 @@
+# =========================
+# Voice leading across chord sequences
+# =========================
+# 진행(progression.parse_progression 의 Step 목록)의 코드마다 보이싱 후보(voicing.find_voicings)를 두고,
+# 앞 코드에서 성부/손 이동이 가장 적은 보이싱을 고른다. 단계별 후보를 잇는 최단 경로 = DP.
+#  - 후보는 점수 좋은 순 MAX_CANDIDATES 개만 (가지치기 1)
+#  - 이전 단계 비용이 지금까지 찾은 최선 이상이면 나머지 이전 후보는 보지 않음 (전이 비용 >= 0, 가지치기 2)
+#  - (이전 보이싱, 다음 보이싱) 전이 비용은 쌍마다 한 번만 계산해서 메모
+#  - DP 표를 단계별로 남겨 두고, 진행을 고치면 처음 달라진 단계부터만 다시 계산
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from fretcore.model import NOTE_FLAT, BoardModel
+from fretcore.voicing import Voicing, find_voicings
+
+MAX_CANDIDATES = 16
+VOICE_COST = 1.0    # 성부 이동 (반음당)
+HAND_COST = 0.8     # 손 위치(가장 낮은 눌러 잡는 프렛) 이동 (프렛당)
+SHAPE_COST = 0.5    # 보이싱 자체의 잡기 어려움 (find_voicings 의 score)
+
+
+class Candidate(NamedTuple):
+    voicing: Optional[Voicing]   # None = 잡을 수 있는 보이싱 없음 (앞뒤 전이 비용 0 으로 건너뜀)
+    pitches: Tuple[int, ...]     # 소리 나는 음 (MIDI, 낮은 -> 높은)
+
+
+NO_VOICING = Candidate(None, ())
+
+
+def voice_motion(a, b) -> float:
+    # 각 음을 상대 쪽의 가장 가까운 음으로 잇는 거리 (양쪽에서 재서 반). 음 수가 달라도 됨
+    if not a or not b:
+        return 0.0
+    there = sum(min(abs(x - y) for y in b) for x in a)
+    back = sum(min(abs(x - y) for x in a) for y in b)
+    return (there + back) / 2
+
+
+class Leading(NamedTuple):
+    names: list
+    voicings: list      # 단계별 Voicing 또는 None
+    common: list        # 단계별 앞 단계에서 이어지는 음의 (줄, 프렛)
+    cost: float
+    stats: dict
+
+
+class VoiceLeader:
+    # 악기/보이싱 제약 하나에 묶인 풀이기. 같은 VoiceLeader 로 solve() 를 다시 부르면
+    # 지난번 진행과 처음 달라진 단계부터만 DP 를 다시 돈다
+    def __init__(self, model: BoardModel):
+        self.instrument = model.instrument
+        self.constraints = model.voicing_constraints
+        self.work = BoardModel(model.instrument)
+        self.work._theory = model.theory
+
+        self.steps = []
+        self.cands = []    # 단계별 후보 튜플
+        self.cost = []     # 단계별 [후보 j 로 끝나는 최소 누적 비용]
+        self.back = []     # 단계별 [후보 j 의 최선 이전 후보 번호]
+        self.step_cache = {}   # Step -> (이름, 후보 튜플)
+        self.pair_cost = {}    # (이전 프렛, 다음 프렛) -> 전이 비용
+
+        self.pairs_computed = 0
+        self.pairs_reused = 0
+        self.pruned = 0
+
+    def matches(self, model: BoardModel) -> bool:
+        return model.instrument == self.instrument and model.voicing_constraints == self.constraints
+
+    def candidates(self, step):
+        hit = self.step_cache.get(step)
+        if hit is not None:
+            return hit
+        w = self.work
+        w.set_key(NOTE_FLAT[step.root_pc], update=False)
+        w.set_chord(step.triad, step.tension, step.inversion, update=False)
+        w.refresh({"key"})
+        bass_pc = w.pick_bass_pc_for_inversion(step.inversion)
+        voicings = find_voicings(tuple(w.open_pc), w.max_fret, w.chord_mask, w.tonic_pc, bass_pc,
+                                 self.constraints)[:MAX_CANDIDATES]
+        inst = self.instrument
+        cands = tuple(Candidate(v, tuple(sorted(inst.pitch(s, f) for s, f in v.points()))) for v in voicings)
+        hit = self.step_cache[step] = (w.chord_name(), cands or (NO_VOICING,))
+        return hit
+
+    def transition(self, a: Candidate, b: Candidate) -> float:
+        if a.voicing is None or b.voicing is None:
+            return 0.0
+        key = (a.voicing.frets, b.voicing.frets)
+        cost = self.pair_cost.get(key)
+        if cost is not None:
+            self.pairs_reused += 1
+            return cost
+        self.pairs_computed += 1
+        cost = self.pair_cost[key] = (VOICE_COST * voice_motion(a.pitches, b.pitches)
+                                      + HAND_COST * abs(a.voicing.position - b.voicing.position))
+        return cost
+
+    @staticmethod
+    def own_cost(c: Candidate) -> float:
+        return SHAPE_COST * c.voicing.score if c.voicing is not None else 0.0
+
+    def solve(self, steps) -> Leading:
+        t0 = time.perf_counter()
+        steps = list(steps)
+        computed, reused, pruned = self.pairs_computed, self.pairs_reused, self.pruned
+
+        # 지난번과 같은 앞부분은 DP 표를 그대로 씀
+        k = 0
+        while k < min(len(steps), len(self.steps)) and steps[k] == self.steps[k]:
+            k += 1
+        del self.cands[k:], self.cost[k:], self.back[k:]
+        self.steps = steps
+
+        for i in range(k, len(steps)):
+            cands = self.candidates(steps[i])[1]
+            self.cands.append(cands)
+            if i == 0:
+                self.cost.append([self.own_cost(c) for c in cands])
+                self.back.append(None)
+                continue
+            prev, prev_cost = self.cands[i - 1], self.cost[i - 1]
+            order = sorted(range(len(prev)), key=prev_cost.__getitem__)
+            row, pointers = [], []
+            for c in cands:
+                best_i, best = order[0], None
+                for n, p in enumerate(order):
+                    if best is not None and prev_cost[p] >= best:
+                        self.pruned += len(order) - n
+                        break
+                    total = prev_cost[p] + self.transition(prev[p], c)
+                    if best is None or total < best:
+                        best_i, best = p, total
+                row.append(best + self.own_cost(c))
+                pointers.append(best_i)
+            self.cost.append(row)
+            self.back.append(pointers)
+
+        names = [self.candidates(step)[0] for step in steps]
+        if not steps:
+            return Leading([], [], [], 0.0, {})
+        j = min(range(len(self.cost[-1])), key=self.cost[-1].__getitem__)
+        total = self.cost[-1][j]
+        path = [0] * len(steps)
+        for i in range(len(steps) - 1, -1, -1):
+            path[i] = j
+            if i:
+                j = self.back[i][j]
+        chosen = [self.cands[i][j] for i, j in enumerate(path)]
+
+        common = [frozenset()]
+        for a, b in zip(chosen, chosen[1:]):
+            held = set(a.pitches)
+            common.append(frozenset(p for p in (b.voicing.points() if b.voicing else ())
+                                    if self.instrument.pitch(*p) in held))
+
+        stats = {
+            "steps": len(steps),
+            "resolved": len(steps) - k,
+            "pairs_computed": self.pairs_computed - computed,
+            "pairs_reused": self.pairs_reused - reused,
+            "pruned": self.pruned - pruned,
+            "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+        }
+        return Leading(names, [c.voicing for c in chosen], common, total, stats)
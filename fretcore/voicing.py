@@ -0,0 +1,173 @@
+# =========================
+# Chord voicing search
+# =========================
+# 현재 코드(마스크)와 전위(베이스 음)로 실제 잡을 수 있는 보이싱을 찾는다.
+#  - 줄마다 한 음(또는 뮤트), 눌러 잡는 프렛 간격 <= max_span
+#  - 가장 낮은 소리 나는 줄 = 전위 베이스 음
+#  - 필수 코드톤(3도/7도/텐션 우선, 4음 이상이면 5도 생략 가능)을 모두 포함
+# 가지치기 DFS + (튜닝, 코드 마스크, 루트, 베이스, 제약) 단위 메모이제이션.
+# 줄 번호는 화면과 같이 0 = 1번줄(가장 높은 줄), 마지막 = 가장 낮은 줄.
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from fretcore.theory import popcount, transpose_mask
+
+# 필수 음 우선순위 (루트 기준 반음 수): 3도 -> 7도 -> 6/13 -> sus -> 텐션 -> 루트 -> 5도
+TONE_PRIORITY = (4, 3, 10, 11, 9, 5, 2, 1, 6, 8, 0, 7)
+
+
+@dataclass(frozen=True)
+class VoicingConstraints:
+    max_span: int = 4             # 눌러 잡는 프렛의 최고 - 최저
+    min_notes: int = 3
+    max_interior_mutes: int = 1   # 소리 나는 줄 사이에 끼인 뮤트 줄 수
+    max_fingers: int = 4          # 최저 프렛은 바레(검지 하나)로 셈
+    max_required: int = 5         # 필수 코드톤 최대 개수 (나머지는 있으면 가산점)
+    omit_fifth: bool = True       # 4음 이상 코드에서 완전5도 생략 허용
+    allow_open: bool = True
+    per_position: int = 2         # 포지션(최저 프렛)마다 보관할 후보 수
+    top_n: int = 5                # Form 1~5
+
+
+class Voicing(NamedTuple):
+    frets: Tuple[Optional[int], ...]   # 줄별 프렛, None = 뮤트
+    score: float
+    position: int                      # 가장 낮은 눌러 잡는 프렛 (개방현만이면 0)
+    span: int
+
+    def points(self):
+        return [(s, f) for s, f in enumerate(self.frets) if f is not None]
+
+    def tab(self) -> str:
+        # 낮은 줄 -> 높은 줄 순서 (관례적인 코드표 표기)
+        return "-".join("x" if f is None else str(f) for f in reversed(self.frets))
+
+
+def required_tones(chord_mask: int, root_pc: int, bass_pc: int, c: VoicingConstraints) -> int:
+    rel = transpose_mask(chord_mask, -root_pc)
+    bass_rel = (bass_pc - root_pc) % 12
+    count = popcount(rel)
+    required = 1 << bass_rel
+    n = 1
+    for iv in TONE_PRIORITY:
+        if n >= c.max_required:
+            break
+        if not rel >> iv & 1 or required >> iv & 1:
+            continue
+        if iv == 7 and c.omit_fifth and count >= 4:
+            continue
+        required |= 1 << iv
+        n += 1
+    return transpose_mask(required, root_pc)
+
+
+@lru_cache(maxsize=512)
+def find_voicings(open_pc: tuple, max_fret: int, chord_mask: int, root_pc: int, bass_pc: int,
+                  constraints: VoicingConstraints = VoicingConstraints()):
+    # 점수 순(낮을수록 좋음) 전체 후보. 포지션마다 per_position 개까지만 남긴다.
+    c = constraints
+    n = len(open_pc)
+    if not chord_mask or n == 0:
+        return ()
+
+    required = required_tones(chord_mask, root_pc, bass_pc, c)
+    optional = chord_mask & ~required
+
+    pc_of = [[(open_pc[s] + f) % 12 for f in range(max_fret + 1)] for s in range(n)]
+    fretted = [[f for f in range(1, max_fret + 1) if chord_mask >> pc_of[s][f] & 1] for s in range(n)]
+    open_ok = [c.allow_open and bool(chord_mask >> pc_of[s][0] & 1) for s in range(n)]
+
+    best = {}   # position -> [Voicing, ...]
+    frets = [None] * n
+
+    def record(lo, hi, covered, notes, interior):
+        position = lo if lo is not None else 0
+        span = (hi - lo) if lo is not None else 0
+        opens = 0
+        if lo is not None:
+            above = sum(1 for f in frets if f is not None and f > lo)
+            if above + 1 > c.max_fingers:
+                return
+            opens = sum(1 for f in frets if f == 0)
+        missing_optional = popcount(optional & ~covered)
+        # 높은 포지션에서 개방현을 섞는 폼은 손이 멀어서 감점
+        score = (span * 1.0 + position * 0.15 + interior * 2.0
+                 + (n - notes) * 0.5 + missing_optional * 0.3
+                 + opens * max(0, position - 2) * 0.3)
+        v = Voicing(tuple(frets), score, position, span)
+        bucket = best.setdefault(position, [])
+        if len(bucket) < c.per_position:
+            bucket.append(v)
+            bucket.sort(key=lambda x: x.score)
+        elif score < bucket[-1].score:
+            bucket[-1] = v
+            bucket.sort(key=lambda x: x.score)
+
+    def dfs(s, lo, hi, covered, notes, interior, pending):
+        if popcount(required & ~covered) > s + 1:
+            return
+        if s < 0:
+            if notes >= c.min_notes and covered & required == required:
+                record(lo, hi, covered, notes, interior)
+            return
+
+        # 뮤트 (위쪽 끝 뮤트는 나중에 pending 으로 남아 interior 로 세지 않음)
+        frets[s] = None
+        dfs(s - 1, lo, hi, covered, notes, interior, pending + 1)
+
+        gained = interior + pending
+        if gained > c.max_interior_mutes:
+            return
+
+        if open_ok[s]:
+            frets[s] = 0
+            dfs(s - 1, lo, hi, covered | 1 << pc_of[s][0], notes + 1, gained, 0)
+
+        cand = fretted[s]
+        if lo is None:
+            lo_i, hi_i = 0, len(cand)
+        else:
+            lo_i = bisect_left(cand, hi - c.max_span)
+            hi_i = bisect_right(cand, lo + c.max_span)
+        for f in cand[lo_i:hi_i]:
+            frets[s] = f
+            dfs(s - 1, f if lo is None or f < lo else lo, f if hi is None or f > hi else hi,
+                covered | 1 << pc_of[s][f], notes + 1, gained, 0)
+        frets[s] = None
+
+    # 베이스 줄을 고르고 그 아래(더 낮은 줄)는 모두 뮤트
+    for b in range(n - 1, -1, -1):
+        if b + 1 < c.min_notes:
+            break
+        for f in range(max_fret + 1):
+            if pc_of[b][f] != bass_pc or (f == 0 and not c.allow_open):
+                continue
+            frets[b] = f
+            lo = hi = f if f > 0 else None
+            dfs(b - 1, lo, hi, 1 << bass_pc, 1, 0, 0)
+            frets[b] = None
+
+    found = [v for bucket in best.values() for v in bucket]
+    found.sort(key=lambda v: (v.score, v.position))
+    return tuple(found)
+
+
+def pick_forms(voicings, top_n: int = 5, min_gap: int = 2):
+    # 점수 좋은 순서로, 이미 고른 것과 포지션이 min_gap 이상 떨어진 것만 -> 넥 아래쪽부터 Form 1..N
+    chosen = []
+    for v in voicings:
+        if all(abs(v.position - o.position) >= min_gap for o in chosen):
+            chosen.append(v)
+            if len(chosen) >= top_n:
+                break
+    chosen.sort(key=lambda v: v.position)
+    return chosen
+
+
+@lru_cache(maxsize=512)
+def chord_forms(open_pc: tuple, max_fret: int, chord_mask: int, root_pc: int, bass_pc: int,
+                constraints: VoicingConstraints = VoicingConstraints()):
+    voicings = find_voicings(open_pc, max_fret, chord_mask, root_pc, bass_pc, constraints)
+    return tuple(pick_forms(voicings, constraints.top_n))
@@ -0,0 +1,330 @@
+# =========================
+# Background workers
+# =========================
+# 무거운 계산(보이싱 탐색, 보이스 리딩, 역검색 색인, 음높이 분석, 탭 모음)을 작업 스레드에서 돌리고
+# 결과는 스레드 안전한 큐로 돌려받는다. Tk 위젯은 메인 스레드에서만 만지므로 화면은 after() 로 poll() 을 불러 큐를 비움.
+#  - 작업은 채널("forms", "lookup", ...)과 그 채널의 세대(generation) 번호를 달고 나감
+#  - 같은 채널에 새 작업을 내면 세대가 올라가고 이전 작업은 취소 표시: 시작 전이면 실행하지 않고,
+#    실행 중이면 작업 함수가 job.cancelled 를 보고 스스로 멈춤. 늦게 도착한 옛 세대 결과는 poll() 에서 버림
+#    (replace=False 면 지금 세대에 나란히 추가: 미리 계산처럼 여러 개를 내고 cancel(채널) 로 한꺼번에 취소)
+#  - 작업 함수 fn(job, *args) 는 job.emit(값) 으로 중간 결과를 보낼 수 있음 -> on_partial(job, 값)
+#  - 스레드 풀(프로세스 아님): 보이싱/이론 표 캐시(lru_cache)를 화면과 같이 쓰고, NumPy/파일 읽기는 GIL 을 놓음
+#  - workers=0 이면 submit 안에서 바로 실행하고 콜백도 바로 부름 (화면 없는 벤치마크/디버깅용)
+# 진단: 대기/실행 중 작업 수, 결과 큐 깊이, 대기·실행·전달 시간, 취소/건너뜀/버림 수 -> stats(), stats_text()
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+WORKERS = 4
+LATENCY_WINDOW = 256
+POLL_BUDGET_MS = 8.0
+
+PARTIAL, DONE, ERROR, SKIPPED = "partial", "done", "error", "skipped"
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Job:
+    def __init__(self, pool, channel: str, generation: int, fn, args, on_partial, on_done, on_error):
+        self.pool = pool
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.on_partial = on_partial
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self.cancelled = False
+        self.finished = False   # 결과(또는 오류/건너뜀)가 메인 스레드에 도착함
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.ended = None
+        self.last_emit = 0.0
+
+    def cancel(self):
+        # 작업 스레드는 이 값을 보고 멈춤. 시작 전이면 run() 이 실행하지 않고 SKIPPED 만 돌려보냄
+        if self.cancelled or self.finished:
+            return
+        self.cancelled = True
+        self.pool.cancelled += 1
+
+    @property
+    def stale(self) -> bool:
+        return self.generation != self.pool.generation(self.channel)
+
+    def emit(self, value):
+        # 작업 스레드에서: 중간 결과 (채널 세대가 바뀌었으면 poll() 에서 버려짐)
+        self.last_emit = time.perf_counter()
+        self.pool.deliver(self, PARTIAL, value)
+
+    def due(self, ms: float) -> bool:
+        # 중간 결과를 너무 자주 보내지 않도록: 마지막 emit 뒤 ms 가 지났으면 True
+        return (time.perf_counter() - self.last_emit) * 1000.0 >= ms
+
+
+class WorkerPool:
+    def __init__(self, workers: int = WORKERS, on_submit=None):
+        self.workers = workers
+        self.on_submit = on_submit   # 메인 스레드: 작업을 내면 불림 (화면이 poll 타이머를 켬)
+        self.executor = None
+        self.results = queue.Queue()
+        self.generations = {}   # 채널 -> 지금 세대
+        self.live = {}          # 채널 -> 아직 결과가 도착하지 않은 작업들
+
+        self.pending = 0        # 내고 아직 결과가 도착하지 않은 작업
+        self.running = 0        # 작업 스레드에서 바뀜 -> lock
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.skipped = 0        # 취소돼서 실행하지 않음
+        self.dropped = 0        # 옛 세대 결과라 버림
+        self.partials = 0
+        self.max_depth = 0
+        self.wait_ms = deque(maxlen=LATENCY_WINDOW)     # 내고 -> 시작
+        self.run_ms = deque(maxlen=LATENCY_WINDOW)      # 시작 -> 끝
+        self.latency_ms = deque(maxlen=LATENCY_WINDOW)  # 내고 -> 결과를 메인 스레드에서 받음
+
+    @property
+    def inline(self) -> bool:
+        return self.workers <= 0
+
+    @property
+    def busy(self) -> bool:
+        return self.pending > 0 or not self.results.empty()
+
+    def generation(self, channel: str) -> int:
+        return self.generations.get(channel, 0)
+
+    def jobs(self, channel: str):
+        return list(self.live.get(channel, ()))
+
+    def active(self, channel: str) -> bool:
+        # 그 채널에 결과를 기다리는 작업이 있음
+        return bool(self.live.get(channel))
+
+    # ----- main thread -----
+    def submit(self, channel: str, fn, *args, on_partial=None, on_done=None, on_error=None,
+               replace: bool = True) -> Job:
+        # 새 세대로 작업을 냄. 같은 채널의 이전 작업은 취소 (replace=False 면 지금 세대에 추가)
+        if replace:
+            self.cancel(channel)
+        job = Job(self, channel, self.generation(channel), fn, args, on_partial, on_done, on_error)
+        self.live.setdefault(channel, set()).add(job)
+        self.pending += 1
+        self.submitted += 1
+        if self.inline:
+            self.run(job)
+        else:
+            if self.executor is None:
+                # 첫 작업 때 (concurrent.futures 는 import 가 무거워서 시작 화면 뒤로)
+                from concurrent.futures import ThreadPoolExecutor
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="9retboards-worker")
+            self.executor.submit(self.run, job)
+            if self.on_submit is not None:
+                self.on_submit()
+        return job
+
+    def cancel(self, channel: str):
+        # 채널 세대를 올림: 지금 작업은 취소, 이미 나온 결과도 버려짐
+        self.generations[channel] = self.generation(channel) + 1
+        for job in self.live.pop(channel, ()):
+            job.cancel()
+
+    def poll(self, budget_ms: float = POLL_BUDGET_MS) -> bool:
+        # 도착한 결과를 콜백으로 넘김 (budget_ms 가 지나면 나머지는 다음 poll 로). 남은 일이 있으면 True
+        t0 = time.perf_counter()
+        self.max_depth = max(self.max_depth, self.results.qsize())
+        while (time.perf_counter() - t0) * 1000.0 < budget_ms:
+            try:
+                job, kind, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.dispatch(job, kind, value)
+        return self.busy
+
+    def dispatch(self, job: Job, kind: str, value):
+        if kind != PARTIAL:
+            job.finished = True
+            self.pending -= 1
+            self.live.get(job.channel, set()).discard(job)
+            if kind == SKIPPED:
+                self.skipped += 1
+                return
+            self.latency_ms.append((time.perf_counter() - job.submitted) * 1000.0)
+        if job.stale:
+            self.dropped += 1
+            return
+        if kind == PARTIAL:
+            self.partials += 1
+            if job.on_partial is not None:
+                job.on_partial(job, value)
+        elif kind == DONE:
+            self.completed += 1
+            if job.on_done is not None:
+                job.on_done(job, value)
+        else:
+            self.failed += 1
+            if job.on_error is not None:
+                job.on_error(job, value)
+            else:
+                import traceback
+                traceback.print_exception(type(value), value, value.__traceback__, file=sys.stderr)
+
+    def shutdown(self):
+        for channel in list(self.live):
+            self.cancel(channel)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    # ----- worker thread -----
+    def run(self, job: Job):
+        job.started = time.perf_counter()
+        self.wait_ms.append((job.started - job.submitted) * 1000.0)
+        if job.cancelled:
+            self.deliver(job, SKIPPED, None)
+            return
+        with self.lock:
+            self.running += 1
+        try:
+            value = job.fn(job, *job.args)
+        except Exception as exc:   # 작업 스레드가 조용히 죽지 않게 모두 메인 스레드로
+            kind, value = ERROR, exc
+        else:
+            kind = DONE
+        finally:
+            with self.lock:
+                self.running -= 1
+            job.ended = time.perf_counter()
+            self.run_ms.append((job.ended - job.started) * 1000.0)
+        self.deliver(job, kind, value)
+
+    def deliver(self, job: Job, kind: str, value):
+        if self.inline:
+            self.dispatch(job, kind, value)
+        else:
+            self.results.put((job, kind, value))
+
+    # ----- diagnostics -----
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "running": self.running,
+            "depth": self.results.qsize(),
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "skipped": self.skipped,
+            "dropped": self.dropped,
+            "partials": self.partials,
+            "wait_p50_ms": percentile(self.wait_ms, 0.5),
+            "run_p50_ms": percentile(self.run_ms, 0.5),
+            "run_max_ms": max(self.run_ms, default=0.0),
+            "latency_p50_ms": percentile(self.latency_ms, 0.5),
+            "latency_p99_ms": percentile(self.latency_ms, 0.99),
+        }
+
+    def stats_text(self) -> str:
+        st = self.stats()
+        return (f"workers {st['running']}/{st['workers']} run, {st['pending']} pending, queue {st['depth']} "
+                f"(max {st['max_depth']}), latency p50 {st['latency_p50_ms']:.1f}ms p99 {st['latency_p99_ms']:.1f}ms, "
+                f"cancelled {st['cancelled']} dropped {st['dropped']}")
+
+
+class BackgroundCache:
+    # 순수 함수 fn(*args) 의 값을 작업 스레드에서 계산해 두는 LRU. __call__ 은 있으면 값, 없으면 작업을 내고 None.
+    # 결과가 도착하면 on_ready() (메인 스레드) -> 호출한 쪽이 다시 물어봄. 새로 물어보면 이전 요청은 취소
+    def __init__(self, pool: WorkerPool, channel: str, fn, on_ready=None, size: int = 512):
+        self.pool = pool
+        self.channel = channel
+        self.fn = fn
+        self.on_ready = on_ready
+        self.size = size
+        self.values = OrderedDict()
+        self.waiting = None
+        self.warm_channel = channel + "-prefetch"
+        self.warming = set()
+        self.failed = None   # 연달아 실패한 값 (한 번 더 물어보게 한 뒤에도 실패하면 다시 알리지 않음)
+
+    def __call__(self, args):
+        hit = self.peek(args)
+        if hit is not None or args == self.waiting:
+            return hit
+        if args in self.warming:
+            # 미리 계산 중인 값: 같은 계산을 또 내지 않고 그 작업이 끝나면 (_done) on_ready
+            self.pool.cancel(self.channel)
+            self.waiting = args
+            return None
+        self.pool.submit(self.channel, self._compute, args, on_done=self._done, on_error=self._failed)
+        # 바로 실행하는 풀(workers=0)이면 이미 들어 있음
+        hit = self.peek(args)
+        self.waiting = None if hit is not None else args
+        return hit
+
+    def peek(self, args):
+        hit = self.values.get(args)
+        if hit is not None:
+            self.values.move_to_end(args)
+        return hit
+
+    def warm(self, args):
+        # 미리 계산만 (따로 채널: 화면이 기다리는 요청을 취소하지 않게). 도착해도 on_ready 는 부르지 않음
+        if args not in self.values and args not in self.warming:
+            self.warming.add(args)
+            self.pool.submit(self.warm_channel, self._compute, args, on_done=self._done, on_error=self._failed,
+                             replace=False)
+
+    def drop_warm(self):
+        # 선택이 바뀌어 미리 계산해 둘 것이 달라짐: 아직 시작하지 않은 것만 취소
+        # (계산 중인 것은 값이 틀린 게 아니므로 끝나면 그대로 넣음 - 다음 선택이 바로 그것일 때가 많음.
+        #  화면이 기다리는 값이 된 작업도 그대로 둠)
+        for job in self.pool.jobs(self.warm_channel):
+            if job.started is None and job.args[0] != self.waiting:
+                job.cancel()
+                self.warming.discard(job.args[0])
+
+    def _compute(self, job, args):
+        return self.fn(*args)
+
+    def _done(self, job, value):
+        args = job.args[0]
+        self.warming.discard(args)
+        if args == self.failed:
+            self.failed = None
+        self.values[args] = value
+        self.values.move_to_end(args)
+        while len(self.values) > self.size:
+            self.values.popitem(last=False)
+        if args == self.waiting:
+            self.waiting = None
+            if self.on_ready is not None:
+                self.on_ready()
+
+    def _failed(self, job, exc):
+        # 계산이 예외로 끝남: 기다리던 값이면 on_ready -> 호출한 쪽이 다시 물어보면 새로 냄.
+        # 같은 값이 연달아 실패하면 알리지 않음 (물어보고 실패하고를 끝없이 되풀이하지 않게)
+        import traceback
+        traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+        args = job.args[0]
+        self.warming.discard(args)
+        if args != self.waiting:
+            return
+        self.waiting = None
+        if args == self.failed:
+            return
+        self.failed = args
+        if self.on_ready is not None:
+            self.on_ready()